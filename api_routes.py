@@ -5,11 +5,17 @@ FastAPI router with endpoints for generating HEAVYMETA 3D asset metadata structu
 Includes both generation endpoints and parse endpoints for Blender GLTF extension data.
 """
 
-from fastapi import APIRouter, HTTPException
+import asyncio
+import json
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List
 
 from wallet_manager import WalletManager, WalletManagerError, WalletNotFoundError
+from job_manager import get_job_manager, JobCancelledError
 
 from hvym_metadata import (
     # Base/Widget
@@ -56,6 +62,11 @@ from hvym_metadata import (
 
 router = APIRouter(prefix="/api/v1", tags=["metadata"])
 
+# Deployment change stream: seconds between change checks, and between
+# keep-alive comments on a quiet stream
+DEPLOYMENT_EVENTS_POLL_SECONDS = 0.5
+DEPLOYMENT_EVENTS_KEEPALIVE_SECONDS = 15
+
 
 # =============================================================================
 # Request Models
@@ -376,10 +387,14 @@ async def health_check():
 
 @router.get("/status")
 async def get_status():
-    """API status and available endpoints."""
+    """API status, build toolchain versions and available endpoints."""
+    from toolchain import get_toolchain_registry
+
+    toolchain = await run_in_threadpool(get_toolchain_registry().status)
     return {
         "api_version": "1.0.0",
         "service": "HEAVYMETADATA",
+        "toolchain": toolchain,
         "endpoints": {
             "health": "/api/v1/health",
             "status": "/api/v1/status",
@@ -425,9 +440,29 @@ async def get_status():
             },
             "soroban": {
                 "generate": "/api/v1/soroban/generate",
+                "generate-batch": "/api/v1/soroban/generate/batch",
                 "types": "/api/v1/soroban/types",
                 "validate": "/api/v1/soroban/validate",
                 "templates": "/api/v1/soroban/templates",
+                "build-profiles": "/api/v1/soroban/build-profiles",
+                "build": "/api/v1/soroban/build",
+                "deploy": "/api/v1/soroban/deploy",
+                "deploy-batch": "/api/v1/soroban/deploy/batch",
+                "estimate": "/api/v1/soroban/estimate",
+                "estimate-batch": "/api/v1/soroban/estimate/batch",
+                "generate-and-build": "/api/v1/soroban/generate-and-build",
+                "generate-and-build-batch": "/api/v1/soroban/generate-and-build/batch",
+                "deployments": "/api/v1/soroban/deployments",
+                "deploy-states": "/api/v1/soroban/deploy-states",
+                "verify-deployments": "/api/v1/soroban/deployments/verify",
+                "search-deployments": "/api/v1/soroban/deployments/search",
+                "deployment-stats": "/api/v1/soroban/deployments/stats",
+                "export-deployments": "/api/v1/soroban/deployments/export",
+                "deployment-retention": "/api/v1/soroban/deployments/retention",
+                "deployment-events": "/api/v1/soroban/deployments/events",
+                "jobs": "/api/v1/soroban/jobs",
+                "build-cache": "/api/v1/soroban/build-cache",
+                "artifacts": "/api/v1/soroban/artifacts",
             }
         }
     }
@@ -1391,6 +1426,7 @@ class SorobanContractRequest(BaseModel):
     max_supply: int = Field(10000, description="Maximum NFT supply")
     nft_type: str = Field("HVYC", description="NFT type: HVYC, HVYI, HVYA, HVYW, HVYO, HVYG, HVYAU")
     val_props: Optional[Dict[str, SorobanValPropRequest]] = Field(None, description="Value properties configuration")
+    build_profile: Optional[str] = Field(None, description="Release build profile: min-size (default), balanced or fast-compile")
     write_to_disk: bool = Field(True, description="Write generated files to disk for compilation/deployment")
     output_dir: Optional[str] = Field(None, description="Custom output directory (uses temp dir if not specified)")
 
@@ -1401,6 +1437,8 @@ class SorobanGenerateResponse(BaseModel):
     contract_name: str
     files: Dict[str, str]
     output_path: Optional[str] = Field(None, description="Path where contract files were written (if write_to_disk=True)")
+    files_changed: Optional[List[str]] = Field(None, description="Files rewritten on disk (if write_to_disk=True)")
+    files_unchanged: Optional[List[str]] = Field(None, description="Files already on disk with identical content")
     build_command: str
     deploy_command: str
 
@@ -1422,6 +1460,35 @@ class SorobanTemplatesResponse(BaseModel):
     templates: List[SorobanTemplateInfo]
 
 
+class SorobanGenerateBatchRequest(BaseModel):
+    """Request model for bulk Soroban contract generation."""
+    contracts: List[SorobanContractRequest] = Field(..., min_length=1, description="Contract configs; per-contract write_to_disk and output_dir are ignored")
+    write_to_disk: bool = Field(True, description="Write generated files to disk")
+    output_dir: Optional[str] = Field(None, description="Parent directory; each contract goes to <output_dir>/<name_snake> (temp dirs if not specified)")
+    include_files: bool = Field(False, description="Include generated file contents in each result")
+    stream: bool = Field(False, description="Stream results as NDJSON, one line per contract as it completes")
+
+
+class SorobanGenerateBatchItem(BaseModel):
+    """Per-contract result of bulk generation."""
+    index: int
+    success: bool
+    contract_name: Optional[str] = None
+    output_path: Optional[str] = None
+    files: Optional[Dict[str, str]] = None
+    files_changed: Optional[List[str]] = None
+    error: Optional[str] = None
+
+
+class SorobanGenerateBatchResponse(BaseModel):
+    """Response model for bulk Soroban contract generation."""
+    success: bool
+    total: int
+    succeeded: int
+    failed: int
+    results: List[SorobanGenerateBatchItem]
+
+
 @router.post("/soroban/generate", response_model=SorobanGenerateResponse)
 async def generate_soroban_contract(req: SorobanContractRequest):
     """
@@ -1449,10 +1516,10 @@ async def generate_soroban_contract(req: SorobanContractRequest):
     The output_path in the response indicates where files were written.
     """
     from pathlib import Path
-    from soroban_generator import SorobanGenerator, ValidationError, TemplateError
+    from soroban_generator import get_soroban_generator, ValidationError, TemplateError
 
     try:
-        generator = SorobanGenerator()
+        generator = get_soroban_generator()
 
         # Convert Pydantic model to dict, handling nested models
         data = {
@@ -1463,10 +1530,12 @@ async def generate_soroban_contract(req: SorobanContractRequest):
             "val_props": {
                 name: prop.model_dump() if hasattr(prop, 'model_dump') else prop.dict()
                 for name, prop in (req.val_props or {}).items()
-            } if req.val_props else {}
+            } if req.val_props else {},
+            "build_profile": req.build_profile
         }
 
         output_path = None
+        manifest = {}
 
         if req.write_to_disk:
             # Generate and write files to disk
@@ -1475,6 +1544,7 @@ async def generate_soroban_contract(req: SorobanContractRequest):
             files = result["files"]
             output_path = str(result["output_path"])
             snake_name = result["contract_name_snake"]
+            manifest = result["manifest"]
         else:
             # Generate in memory only (legacy behavior)
             files = generator.generate(data)
@@ -1485,6 +1555,8 @@ async def generate_soroban_contract(req: SorobanContractRequest):
             contract_name=req.contract_name,
             files=files,
             output_path=output_path,
+            files_changed=manifest.get("changed"),
+            files_unchanged=manifest.get("unchanged"),
             build_command="soroban contract build",
             deploy_command=f"soroban contract deploy --wasm target/wasm32-unknown-unknown/release/{snake_name}.wasm --network testnet"
         )
@@ -1497,6 +1569,74 @@ async def generate_soroban_contract(req: SorobanContractRequest):
         raise HTTPException(status_code=500, detail=f"Generation failed: {str(e)}")
 
 
+def _generate_batch_items(req: SorobanGenerateBatchRequest):
+    """Run bulk generation and convert each result into a SorobanGenerateBatchItem."""
+    from pathlib import Path
+    from soroban_generator import get_soroban_generator
+
+    results = get_soroban_generator().generate_batch(
+        [_generation_data(c) for c in req.contracts],
+        output_root=Path(req.output_dir) if req.output_dir else None,
+        write_to_disk=req.write_to_disk
+    )
+    for item in results:
+        yield SorobanGenerateBatchItem(
+            index=item["index"],
+            success=item["success"],
+            contract_name=item["contract_name"],
+            output_path=str(item["output_path"]) if item["success"] and item["output_path"] else None,
+            files=item["files"] if req.include_files else None,
+            files_changed=item["manifest"]["changed"] if item["manifest"] else None,
+            error=item["error"]
+        )
+
+
+@router.post("/soroban/generate/batch")
+async def generate_soroban_contracts_batch(req: SorobanGenerateBatchRequest):
+    """
+    Generate many Soroban contracts in one request.
+
+    All configs are validated up front, then rendered on a worker pool and
+    written to disk with bounded I/O concurrency. Invalid configs are reported
+    per item and do not abort the batch.
+
+    With stream=true the response is NDJSON: one SorobanGenerateBatchItem per
+    line as each contract completes (completion order; use "index" to match
+    requests), followed by a summary line {"done": true, "total", "succeeded", "failed"}.
+    Otherwise a SorobanGenerateBatchResponse is returned with results in request order.
+    """
+    def _dump(item: SorobanGenerateBatchItem) -> Dict[str, Any]:
+        return item.model_dump() if hasattr(item, 'model_dump') else item.dict()
+
+    if req.stream:
+        def ndjson():
+            succeeded = failed = 0
+            for item in _generate_batch_items(req):
+                if item.success:
+                    succeeded += 1
+                else:
+                    failed += 1
+                yield json.dumps(_dump(item)) + "\n"
+            yield json.dumps({"done": True, "total": succeeded + failed,
+                              "succeeded": succeeded, "failed": failed}) + "\n"
+
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    try:
+        results = await run_in_threadpool(lambda: sorted(_generate_batch_items(req), key=lambda r: r.index))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch generation failed: {str(e)}")
+
+    succeeded = sum(1 for r in results if r.success)
+    return SorobanGenerateBatchResponse(
+        success=succeeded == len(results),
+        total=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        results=results
+    )
+
+
 @router.post("/soroban/types")
 async def generate_soroban_types(req: SorobanContractRequest):
     """
@@ -1504,10 +1644,10 @@ async def generate_soroban_types(req: SorobanContractRequest):
 
     Useful when you only need the type definitions without the full contract.
     """
-    from soroban_generator import SorobanGenerator, ValidationError, TemplateError
+    from soroban_generator import get_soroban_generator, ValidationError, TemplateError
 
     try:
-        generator = SorobanGenerator()
+        generator = get_soroban_generator()
 
         data = {
             "contract_name": req.contract_name,
@@ -1543,9 +1683,9 @@ async def validate_soroban_contract(req: SorobanContractRequest):
 
     Returns validation result with any errors found.
     """
-    from soroban_generator import SorobanGenerator
+    from soroban_generator import get_soroban_generator
 
-    generator = SorobanGenerator()
+    generator = get_soroban_generator()
 
     data = {
         "contract_name": req.contract_name,
@@ -1555,7 +1695,8 @@ async def validate_soroban_contract(req: SorobanContractRequest):
         "val_props": {
             name: prop.model_dump() if hasattr(prop, 'model_dump') else prop.dict()
             for name, prop in (req.val_props or {}).items()
-        } if req.val_props else {}
+        } if req.val_props else {},
+        "build_profile": req.build_profile
     }
 
     result = generator.validate(data)
@@ -1571,10 +1712,10 @@ async def list_soroban_templates():
     """
     List available Soroban contract templates and their descriptions.
     """
-    from soroban_generator import SorobanGenerator, TemplateError
+    from soroban_generator import get_soroban_generator, TemplateError
 
     try:
-        generator = SorobanGenerator()
+        generator = get_soroban_generator()
         templates = generator.list_templates()
 
         return SorobanTemplatesResponse(
@@ -1585,6 +1726,23 @@ async def list_soroban_templates():
         raise HTTPException(status_code=500, detail=f"Template error: {str(e)}")
 
 
+@router.get("/soroban/build-profiles")
+async def list_soroban_build_profiles():
+    """
+    List the release build profiles accepted as build_profile.
+
+    Each profile sets optimization level, LTO, codegen units, panic strategy
+    and symbol stripping. min-size gives the smallest WASM (lowest deploy
+    cost); fast-compile gives the shortest compile time.
+    """
+    from soroban_generator import SorobanGenerator
+
+    return {
+        "default": SorobanGenerator.DEFAULT_BUILD_PROFILE,
+        "profiles": SorobanGenerator.BUILD_PROFILES,
+    }
+
+
 # =============================================================================
 # Soroban Build & Deploy Endpoints (Testnet Only for API)
 # =============================================================================
@@ -1592,6 +1750,7 @@ async def list_soroban_templates():
 class SorobanBuildRequest(BaseModel):
     """Request model for building a Soroban contract."""
     contract_path: str = Field(..., description="Path to contract directory (from generate endpoint's output_path)")
+    strip_custom_sections: bool = Field(False, description="Strip custom/debug sections (keeps the Soroban contract spec and metadata)")
 
 
 class SorobanBuildResponse(BaseModel):
@@ -1600,8 +1759,12 @@ class SorobanBuildResponse(BaseModel):
     build_id: Optional[str] = None
     wasm_path: Optional[str] = None
     wasm_size: Optional[int] = None
+    cache_hit: bool = False
+    compile_time: Optional[float] = Field(None, description="Seconds spent in the compiler (0 for cache hits)")
+    wasm_report: Optional[Dict[str, Any]] = Field(None, description="Section sizes, exports and largest functions of the WASM")
     error: Optional[str] = None
     build_output: Optional[str] = None
+    diagnostics: List[Dict[str, Any]] = Field(default_factory=list, description="Compiler warnings and errors with source spans")
 
 
 class SorobanDeployRequest(BaseModel):
@@ -1609,6 +1772,7 @@ class SorobanDeployRequest(BaseModel):
     wasm_path: str = Field(..., description="Path to compiled WASM file (from build endpoint)")
     wallet_address: str = Field(..., description="Testnet wallet address for deployment")
     network: str = Field("testnet", description="Network to deploy to (testnet only via API)")
+    method: str = Field("rpc", description="rpc (native, uploads each distinct WASM once) or cli (stellar contract deploy)")
 
 
 class SorobanDeployResponse(BaseModel):
@@ -1618,9 +1782,67 @@ class SorobanDeployResponse(BaseModel):
     contract_id: Optional[str] = None
     network: Optional[str] = None
     stellar_expert_url: Optional[str] = None
+    transaction_hash: Optional[str] = None
+    wasm_hash: Optional[str] = None
+    wasm_reused: Optional[bool] = Field(None, description="True if the WASM was already installed and not uploaded again")
+    fees_paid: Optional[int] = Field(None, description="Fees charged in stroops")
+    stage_timings: Optional[Dict[str, float]] = Field(None, description="Seconds spent in each deploy stage")
+    error: Optional[str] = None
+
+
+class SorobanBatchDeployRequest(BaseModel):
+    """Request model for deploying several compiled contracts at once."""
+    wasm_paths: List[str] = Field(..., min_length=1, description="Compiled WASM files; each entry becomes a new contract instance")
+    wallet_addresses: Optional[List[str]] = Field(None, description="Testnet wallets to spread the deployments over (default: all testnet wallets)")
+    network: str = Field("testnet", description="Network to deploy to (testnet only via API)")
+    max_retries: int = Field(3, ge=0, le=10, description="Retries per contract after a transient failure")
+
+
+class SorobanBatchDeployItem(BaseModel):
+    """Outcome of one contract in a batch deployment."""
+    index: int
+    wasm_path: str
+    wallet_address: str
+    success: bool
+    deployment_id: Optional[str] = None
+    contract_id: Optional[str] = None
+    transaction_hash: Optional[str] = None
+    wasm_hash: Optional[str] = None
+    wasm_reused: Optional[bool] = None
+    fees_paid: Optional[int] = None
+    attempts: int = 1
+    stage_timings: Optional[Dict[str, float]] = None
+    error: Optional[str] = None
+
+
+class SorobanBatchDeployResponse(BaseModel):
+    """Response model for batch deployment."""
+    success: bool
+    network: str
+    results: List[SorobanBatchDeployItem]
+    wallets: List[str]
+    deployed: int
+    failed: int
+    retries: int
+    stored: int
     error: Optional[str] = None
 
 
+class SorobanEstimateRequest(BaseModel):
+    """Request model for simulated deployment cost estimation."""
+    wasm_path: str = Field(..., description="Path to compiled WASM file")
+    network: str = Field("testnet", description="Network whose fees to simulate")
+    wallet_address: Optional[str] = Field(None, description="Deploying wallet (optional; nothing is signed)")
+
+
+class SorobanEstimateBatchRequest(BaseModel):
+    """Request model for estimating many artifacts at once."""
+    wasm_paths: List[str] = Field(..., min_length=1, description="Compiled WASM files; each entry counts as one deployment")
+    network: str = Field("testnet", description="Network whose fees to simulate")
+    wallet_address: Optional[str] = Field(None, description="Deploying wallet (optional; nothing is signed)")
+    max_workers: int = Field(8, ge=1, le=32, description="Concurrent simulations")
+
+
 class SorobanDeploymentRecord(BaseModel):
     """Model for deployment record."""
     deployment_id: str
@@ -1635,11 +1857,35 @@ class SorobanDeploymentRecord(BaseModel):
     error: str = ""
 
 
+class SorobanVerifyDeploymentsRequest(BaseModel):
+    """Request model for bulk on-chain verification of deployment records."""
+    network: Optional[str] = Field(None, description="Only verify this network (default: all)")
+    deployment_ids: Optional[List[str]] = Field(None, description="Only verify these deployments (default: all with a contract id)")
+    concurrency: int = Field(4, ge=1, le=16, description="Maximum RPC requests in flight")
+    batch_size: int = Field(50, ge=1, le=200, description="Contracts looked up per RPC request")
+
+
+class SorobanRetentionRule(BaseModel):
+    """One deployment retention rule; the first rule matching a record applies."""
+    network: str = Field("*", description="Network the rule applies to, or * for any")
+    status: str = Field("*", description="Status the rule applies to, or * for any")
+    days: Optional[int] = Field(None, ge=0, description="Days to keep matching records (null = forever)")
+    action: str = Field("archive", description="archive (to the compressed archive) or delete")
+
+
+class SorobanRetentionPolicyRequest(BaseModel):
+    """Request model for updating the deployment retention policy; omitted fields are unchanged."""
+    rules: Optional[List[SorobanRetentionRule]] = Field(None, description="Replaces all rules, in order")
+    enabled: Optional[bool] = Field(None, description="Run the policy on a schedule")
+    interval_hours: Optional[float] = Field(None, gt=0, description="Hours between scheduled runs")
+
+
 class SorobanDeploymentsResponse(BaseModel):
     """Response model for listing deployments."""
     success: bool
     deployments: List[Dict[str, Any]]
     total: int
+    next_cursor: Optional[str] = None
 
 
 class SorobanGenerateAndBuildRequest(BaseModel):
@@ -1649,6 +1895,8 @@ class SorobanGenerateAndBuildRequest(BaseModel):
     max_supply: int = Field(10000, description="Maximum NFT supply")
     nft_type: str = Field("HVYC", description="NFT type")
     val_props: Optional[Dict[str, SorobanValPropRequest]] = Field(None, description="Value properties configuration")
+    build_profile: Optional[str] = Field(None, description="Release build profile: min-size (default), balanced or fast-compile")
+    output_dir: Optional[str] = Field(None, description="Contract directory to (re)generate into; reusing it lets cargo rebuild only what changed")
 
 
 class SorobanGenerateAndBuildResponse(BaseModel):
@@ -1656,25 +1904,52 @@ class SorobanGenerateAndBuildResponse(BaseModel):
     success: bool
     contract_name: str
     output_path: Optional[str] = None
+    files_changed: Optional[List[str]] = None
     wasm_path: Optional[str] = None
     wasm_size: Optional[int] = None
+    cache_hit: bool = False
+    build_profile: Optional[str] = None
+    compile_time: Optional[float] = None
     build_command: str
     deploy_command: str
     error: Optional[str] = None
 
 
-@router.post("/soroban/build", response_model=SorobanBuildResponse)
-async def build_soroban_contract(req: SorobanBuildRequest):
-    """
-    Build a Soroban contract from source files.
+class SorobanGenerateAndBuildBatchRequest(BaseModel):
+    """Request model for the batch generate + build pipeline."""
+    contracts: List[SorobanGenerateAndBuildRequest] = Field(..., min_length=1, description="Contracts to generate and build together")
+    build_profile: Optional[str] = Field(None, description="Release build profile for the whole workspace")
+    workspace_dir: Optional[str] = Field(None, description="Workspace directory to (re)generate into; per-contract output_dir is ignored")
 
-    Takes a contract directory path (typically from the /soroban/generate endpoint's output_path)
-    and compiles it using the Soroban CLI.
 
-    Requires:
-    - Soroban CLI installed (`cargo install soroban-cli`)
-    - Rust toolchain with wasm32-unknown-unknown target
-    """
+class SorobanGenerateAndBuildBatchResponse(BaseModel):
+    """Response model for the batch generate + build pipeline."""
+    success: bool
+    workspace_path: str
+    results: List[SorobanGenerateAndBuildResponse]
+    succeeded: int
+    failed: int
+    build_output: str = ""
+    error: Optional[str] = None
+
+
+def _generation_data(req: SorobanGenerateAndBuildRequest) -> Dict[str, Any]:
+    """Convert a generate + build request into SorobanGenerator input."""
+    return {
+        "contract_name": req.contract_name,
+        "symbol": req.symbol,
+        "max_supply": req.max_supply,
+        "nft_type": req.nft_type,
+        "val_props": {
+            name: prop.model_dump() if hasattr(prop, 'model_dump') else prop.dict()
+            for name, prop in (req.val_props or {}).items()
+        } if req.val_props else {},
+        "build_profile": req.build_profile
+    }
+
+
+def _build_contract_sync(req: SorobanBuildRequest, job=None) -> SorobanBuildResponse:
+    """Blocking build helper shared by /soroban/build and the build job."""
     from pathlib import Path
     from contract_builder import ContractBuilder
 
@@ -1685,7 +1960,16 @@ async def build_soroban_contract(req: SorobanBuildRequest):
         if not contract_path.exists():
             raise HTTPException(status_code=400, detail=f"Contract path not found: {req.contract_path}")
 
-        result = builder.build_contract(contract_path)
+        result = builder.build_contract(
+            contract_path,
+            progress_callback=job.report_progress if job else None,
+            event_callback=job.emit if job else None,
+            cancel_event=job.cancel_event if job else None,
+            strip_custom_sections=req.strip_custom_sections
+        )
+
+        if job:
+            job.check_cancelled()
 
         if result["success"]:
             metadata = result.get("metadata", {})
@@ -1694,36 +1978,33 @@ async def build_soroban_contract(req: SorobanBuildRequest):
                 build_id=result["build_id"],
                 wasm_path=result["wasm_path"],
                 wasm_size=metadata.get("wasm_size"),
-                build_output=metadata.get("build_output", "")
+                cache_hit=result.get("cache_hit", False),
+                compile_time=metadata.get("compile_time"),
+                wasm_report=metadata.get("wasm_report"),
+                build_output=metadata.get("build_output", ""),
+                diagnostics=metadata.get("diagnostics", [])
             )
         else:
             return SorobanBuildResponse(
                 success=False,
                 build_id=result.get("build_id"),
                 error=result.get("error", "Build failed"),
-                build_output=result.get("stderr", "") or result.get("stdout", "")
+                compile_time=result.get("compile_time"),
+                build_output=result.get("stderr", "") or result.get("stdout", ""),
+                diagnostics=result.get("diagnostics", [])
             )
 
-    except HTTPException:
+    except (HTTPException, JobCancelledError):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Build failed: {str(e)}")
 
 
-@router.post("/soroban/deploy", response_model=SorobanDeployResponse)
-async def deploy_soroban_contract(req: SorobanDeployRequest):
-    """
-    Deploy a compiled Soroban contract to testnet.
-
-    Takes a WASM file path (from the /soroban/build endpoint) and deploys it
-    using a testnet wallet.
-
-    **Security Note:** API deployment is restricted to testnet only.
-    Mainnet deployments must be done through the Metavinci UI.
-    """
+def _deploy_contract_sync(req: SorobanDeployRequest, job=None) -> SorobanDeployResponse:
+    """Blocking deploy helper shared by /soroban/deploy and the deploy job."""
     from pathlib import Path
     from contract_deployer import ContractDeployer
-    from deployment_manager import DeploymentManager
+    from deployment_manager import get_deployment_manager
 
     # Security: Only allow testnet deployments via API
     if req.network != "testnet":
@@ -1737,7 +2018,13 @@ async def deploy_soroban_contract(req: SorobanDeployRequest):
         if not wasm_path.exists():
             raise HTTPException(status_code=400, detail=f"WASM file not found: {req.wasm_path}")
 
-        deployer = ContractDeployer(network=req.network)
+        if job:
+            job.report_progress("Deploying contract...", 10)
+
+        if req.method not in ContractDeployer.DEPLOY_METHODS:
+            raise HTTPException(status_code=400, detail=f"Invalid deploy method: {req.method}")
+
+        deployer = ContractDeployer(network=req.network, method=req.method)
         result = deployer.deploy_contract(
             wasm_path=str(wasm_path),
             wallet_address=req.wallet_address
@@ -1745,7 +2032,7 @@ async def deploy_soroban_contract(req: SorobanDeployRequest):
 
         # Store deployment record
         if "deployment_record" in result:
-            deployment_manager = DeploymentManager()
+            deployment_manager = get_deployment_manager()
             deployment_manager.store_deployment(result["deployment_record"])
 
         if result["success"]:
@@ -1754,12 +2041,18 @@ async def deploy_soroban_contract(req: SorobanDeployRequest):
                 deployment_id=result["deployment_id"],
                 contract_id=result["contract_id"],
                 network=req.network,
-                stellar_expert_url=result.get("stellar_expert_url")
+                stellar_expert_url=result.get("stellar_expert_url"),
+                transaction_hash=result.get("transaction_hash"),
+                wasm_hash=result.get("wasm_hash"),
+                wasm_reused=result.get("wasm_reused"),
+                fees_paid=result.get("fees_paid"),
+                stage_timings=result.get("stage_timings")
             )
         else:
             return SorobanDeployResponse(
                 success=False,
                 deployment_id=result.get("deployment_id"),
+                stage_timings=result.get("stage_timings"),
                 error=result.get("error", "Deployment failed")
             )
 
@@ -1769,40 +2062,91 @@ async def deploy_soroban_contract(req: SorobanDeployRequest):
         raise HTTPException(status_code=500, detail=f"Deployment failed: {str(e)}")
 
 
-@router.post("/soroban/generate-and-build", response_model=SorobanGenerateAndBuildResponse)
-async def generate_and_build_soroban_contract(req: SorobanGenerateAndBuildRequest):
-    """
-    Generate and build a Soroban contract in one step.
+def _deploy_batch_sync(req: SorobanBatchDeployRequest, job=None) -> SorobanBatchDeployResponse:
+    """Blocking batch deploy helper shared by /soroban/deploy/batch and its job."""
+    from pathlib import Path
+    from deploy_scheduler import BatchDeployScheduler
 
-    Combines the /soroban/generate and /soroban/build endpoints for convenience.
-    Returns the compiled WASM path ready for deployment.
-    """
+    # Security: Only allow testnet deployments via API
+    if req.network != "testnet":
+        raise HTTPException(
+            status_code=403,
+            detail="API deployment is restricted to testnet only. Use Metavinci UI for mainnet deployments."
+        )
+
+    missing = [path for path in req.wasm_paths if not Path(path).exists()]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"WASM file not found: {', '.join(missing)}")
+
+    try:
+        scheduler = BatchDeployScheduler(network=req.network, wallet_addresses=req.wallet_addresses,
+                                         max_retries=req.max_retries)
+
+        progress_callback = None
+        if job:
+            job.report_progress(f"Deploying {len(req.wasm_paths)} contracts...", 5)
+
+            def progress_callback(done, total, result):
+                status = "deployed" if result["success"] else "failed"
+                job.report_progress(f"{done}/{total}: {Path(result['wasm_path']).name} {status}",
+                                    5 + int(90 * done / total))
+
+        result = scheduler.deploy(req.wasm_paths, progress_callback=progress_callback,
+                                  cancel_event=job.cancel_event if job else None)
+        if job:
+            job.check_cancelled()
+
+        return SorobanBatchDeployResponse(
+            success=result["success"],
+            network=req.network,
+            results=[SorobanBatchDeployItem(**item) for item in result["results"]],
+            wallets=result["wallets"],
+            deployed=result["deployed"],
+            failed=result["failed"],
+            retries=result["retries"],
+            stored=result["stored"],
+            error=result.get("error")
+        )
+
+    except (HTTPException, JobCancelledError):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch deployment failed: {str(e)}")
+
+
+def _generate_and_build_sync(req: SorobanGenerateAndBuildRequest, job=None) -> SorobanGenerateAndBuildResponse:
+    """Blocking generate + build helper shared by /soroban/generate-and-build and its job."""
     from pathlib import Path
-    from soroban_generator import SorobanGenerator, ValidationError, TemplateError
+    from soroban_generator import get_soroban_generator, ValidationError, TemplateError
     from contract_builder import ContractBuilder
 
     try:
         # 1. Generate contract
-        generator = SorobanGenerator()
+        generator = get_soroban_generator()
 
-        data = {
-            "contract_name": req.contract_name,
-            "symbol": req.symbol,
-            "max_supply": req.max_supply,
-            "nft_type": req.nft_type,
-            "val_props": {
-                name: prop.model_dump() if hasattr(prop, 'model_dump') else prop.dict()
-                for name, prop in (req.val_props or {}).items()
-            } if req.val_props else {}
-        }
+        data = _generation_data(req)
 
-        gen_result = generator.generate_and_write(data)
+        if job:
+            job.report_progress("Generating contract...", 5)
+
+        gen_result = generator.generate_and_write(data, Path(req.output_dir) if req.output_dir else None)
         output_path = gen_result["output_path"]
-        snake_name = gen_result["contract_name_snake"]
+        files_changed = gen_result["manifest"]["changed"]
+
+        if job:
+            job.check_cancelled()
 
         # 2. Build contract
         builder = ContractBuilder()
-        build_result = builder.build_contract(output_path)
+        build_result = builder.build_contract(
+            output_path,
+            progress_callback=job.report_progress if job else None,
+            event_callback=job.emit if job else None,
+            cancel_event=job.cancel_event if job else None
+        )
+
+        if job:
+            job.check_cancelled()
 
         if build_result["success"]:
             metadata = build_result.get("metadata", {})
@@ -1810,8 +2154,12 @@ async def generate_and_build_soroban_contract(req: SorobanGenerateAndBuildReques
                 success=True,
                 contract_name=req.contract_name,
                 output_path=str(output_path),
+                files_changed=files_changed,
                 wasm_path=build_result["wasm_path"],
                 wasm_size=metadata.get("wasm_size"),
+                cache_hit=build_result.get("cache_hit", False),
+                build_profile=data["build_profile"] or generator.DEFAULT_BUILD_PROFILE,
+                compile_time=metadata.get("compile_time"),
                 build_command="soroban contract build",
                 deploy_command=f"soroban contract deploy --wasm {build_result['wasm_path']} --network testnet"
             )
@@ -1820,6 +2168,7 @@ async def generate_and_build_soroban_contract(req: SorobanGenerateAndBuildReques
                 success=False,
                 contract_name=req.contract_name,
                 output_path=str(output_path),
+                files_changed=files_changed,
                 build_command="soroban contract build",
                 deploy_command="",
                 error=build_result.get("error", "Build failed")
@@ -1829,53 +2178,766 @@ async def generate_and_build_soroban_contract(req: SorobanGenerateAndBuildReques
         raise HTTPException(status_code=400, detail=str(e))
     except TemplateError as e:
         raise HTTPException(status_code=500, detail=f"Template error: {str(e)}")
+    except (HTTPException, JobCancelledError):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Generate and build failed: {str(e)}")
 
 
+def _generate_and_build_batch_sync(req: SorobanGenerateAndBuildBatchRequest,
+                                   job=None) -> SorobanGenerateAndBuildBatchResponse:
+    """Blocking batch helper shared by /soroban/generate-and-build/batch and its job."""
+    from pathlib import Path
+    from soroban_generator import get_soroban_generator, ValidationError, TemplateError
+    from contract_builder import ContractBuilder
+
+    try:
+        # 1. Render every contract into one Cargo workspace
+        if job:
+            job.report_progress(f"Generating {len(req.contracts)} contracts...", 2)
+
+        generator = get_soroban_generator()
+        workspace = generator.generate_workspace(
+            [_generation_data(c) for c in req.contracts],
+            Path(req.workspace_dir) if req.workspace_dir else None,
+            build_profile=req.build_profile
+        )
+        build_profile = req.build_profile or generator.DEFAULT_BUILD_PROFILE
+        members = workspace["members"]
+
+        if job:
+            job.check_cancelled()
+
+        # 2. Build all valid members in a single compiler run
+        member_paths = [m["path"] for m in members if m["path"] is not None]
+        build = {"results": [], "build_output": "", "error": None}
+        if member_paths:
+            builder = ContractBuilder()
+            build = builder.build_workspace(
+                workspace["output_path"],
+                member_paths,
+                progress_callback=job.report_progress if job else None
+            )
+        built = {r["contract_path"]: r for r in build["results"]}
+
+        # 3. Report per contract, in request order
+        results = []
+        for contract, member in zip(req.contracts, members):
+            item = built.get(str(member["path"])) if member["path"] is not None else None
+            if item and item["success"]:
+                results.append(SorobanGenerateAndBuildResponse(
+                    success=True,
+                    contract_name=contract.contract_name,
+                    output_path=str(member["path"]),
+                    files_changed=member["manifest"]["changed"],
+                    wasm_path=item["wasm_path"],
+                    wasm_size=item["wasm_size"],
+                    cache_hit=item["cache_hit"],
+                    build_profile=build_profile,
+                    compile_time=item["compile_time"],
+                    build_command="soroban contract build",
+                    deploy_command=f"soroban contract deploy --wasm {item['wasm_path']} --network testnet"
+                ))
+            else:
+                error = member["error"] or (item and item["error"]) or build["error"] or "Build failed"
+                results.append(SorobanGenerateAndBuildResponse(
+                    success=False,
+                    contract_name=contract.contract_name,
+                    output_path=str(member["path"]) if member["path"] is not None else None,
+                    files_changed=member["manifest"]["changed"] if member["manifest"] else None,
+                    build_command="soroban contract build",
+                    deploy_command="",
+                    error=error
+                ))
+
+        succeeded = sum(1 for r in results if r.success)
+        return SorobanGenerateAndBuildBatchResponse(
+            success=succeeded == len(results),
+            workspace_path=str(workspace["output_path"]),
+            results=results,
+            succeeded=succeeded,
+            failed=len(results) - succeeded,
+            build_output=build.get("stderr", "") or build["build_output"],
+            error=build["error"]
+        )
+
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except TemplateError as e:
+        raise HTTPException(status_code=500, detail=f"Template error: {str(e)}")
+    except (HTTPException, JobCancelledError):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch generate and build failed: {str(e)}")
+
+
+@router.post("/soroban/build", response_model=SorobanBuildResponse)
+async def build_soroban_contract(req: SorobanBuildRequest):
+    """
+    Build a Soroban contract from source files.
+
+    Takes a contract directory path (typically from the /soroban/generate endpoint's output_path)
+    and compiles it using the Soroban CLI.
+
+    The compile runs in a worker thread so other API requests are not blocked.
+    Use /soroban/jobs/build to get a job id back immediately instead.
+
+    Requires:
+    - Soroban CLI installed (`cargo install soroban-cli`)
+    - Rust toolchain with wasm32-unknown-unknown target
+    """
+    return await run_in_threadpool(_build_contract_sync, req)
+
+
+@router.post("/soroban/deploy", response_model=SorobanDeployResponse)
+async def deploy_soroban_contract(req: SorobanDeployRequest):
+    """
+    Deploy a compiled Soroban contract to testnet.
+
+    Takes a WASM file path (from the /soroban/build endpoint) and deploys it
+    using a testnet wallet.
+
+    **Security Note:** API deployment is restricted to testnet only.
+    Mainnet deployments must be done through the Metavinci UI.
+    """
+    return await run_in_threadpool(_deploy_contract_sync, req)
+
+
+@router.post("/soroban/deploy/batch", response_model=SorobanBatchDeployResponse)
+async def deploy_soroban_contracts_batch(req: SorobanBatchDeployRequest):
+    """
+    Deploy several compiled Soroban contracts to testnet at once.
+
+    Deployments are spread across the given testnet wallets: each wallet sends
+    one transaction at a time while wallets run in parallel. Each distinct WASM
+    is uploaded once, transient failures are retried, and every outcome is
+    stored in the deployment history in one write.
+
+    **Security Note:** API deployment is restricted to testnet only.
+    """
+    return await run_in_threadpool(_deploy_batch_sync, req)
+
+
+def _estimate_deployer(network: str):
+    from contract_deployer import ContractDeployer
+
+    if network not in ContractDeployer.NETWORK_CONFIG:
+        raise HTTPException(status_code=400, detail=f"Unknown network: {network}")
+    return ContractDeployer(network=network)
+
+
+@router.post("/soroban/estimate")
+async def estimate_soroban_deployment(req: SorobanEstimateRequest):
+    """
+    Estimate the fees of deploying a compiled contract.
+
+    Builds the upload and create transactions and runs them through Soroban RPC
+    simulation to get CPU instructions, read/write bytes and the resource fee.
+    Nothing is signed or submitted. Results are cached per WASM hash and network.
+    """
+    deployer = _estimate_deployer(req.network)
+    result = await run_in_threadpool(deployer.estimate_deployment_cost, req.wasm_path, req.wallet_address)
+    if not result["success"] and result["error"] == "WASM file not found":
+        raise HTTPException(status_code=400, detail=f"WASM file not found: {req.wasm_path}")
+    return result
+
+
+@router.post("/soroban/estimate/batch")
+async def estimate_soroban_deployments_batch(req: SorobanEstimateBatchRequest):
+    """
+    Estimate the fees of deploying many compiled contracts concurrently.
+
+    batch_fee_stroops budgets deploying every entry, with each distinct WASM
+    uploaded once (as /soroban/deploy/batch does).
+    """
+    deployer = _estimate_deployer(req.network)
+    return await run_in_threadpool(deployer.estimate_deployment_costs, req.wasm_paths, req.wallet_address,
+                                   req.max_workers)
+
+
+@router.post("/soroban/generate-and-build", response_model=SorobanGenerateAndBuildResponse)
+async def generate_and_build_soroban_contract(req: SorobanGenerateAndBuildRequest):
+    """
+    Generate and build a Soroban contract in one step.
+
+    Combines the /soroban/generate and /soroban/build endpoints for convenience.
+    Returns the compiled WASM path ready for deployment.
+    """
+    return await run_in_threadpool(_generate_and_build_sync, req)
+
+
+@router.post("/soroban/generate-and-build/batch", response_model=SorobanGenerateAndBuildBatchResponse)
+async def generate_and_build_soroban_batch(req: SorobanGenerateAndBuildBatchRequest):
+    """
+    Generate and build several Soroban contracts in one Cargo workspace.
+
+    All contracts are compiled by a single `stellar contract build` run, so shared
+    dependencies compile once and cargo spreads the contract crates across cores.
+    Each contract gets its own result; one invalid or failing contract does not
+    fail the others.
+    """
+    return await run_in_threadpool(_generate_and_build_batch_sync, req)
+
+
+# =============================================================================
+# Soroban Background Jobs
+# =============================================================================
+
+class SorobanJobResponse(BaseModel):
+    """Response model for job status."""
+    job_id: str
+    kind: str
+    status: str = Field(..., description="queued, running, succeeded, failed or cancelled")
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    progress: int = 0
+    message: str = ""
+    cancel_requested: bool = False
+    error: Optional[str] = None
+
+
+class SorobanJobListResponse(BaseModel):
+    """Response model for listing jobs."""
+    success: bool
+    jobs: List[SorobanJobResponse]
+    total: int
+
+
+def _submit_job(kind: str, func, req) -> SorobanJobResponse:
+    """Queue a sync helper on the job manager and return the job status."""
+    job = get_job_manager().submit(kind, lambda job: func(req, job).model_dump())
+    return SorobanJobResponse(**job.to_dict())
+
+
+def _get_job_or_404(job_id: str):
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job
+
+
+@router.post("/soroban/jobs/build", response_model=SorobanJobResponse, status_code=202)
+async def submit_build_job(req: SorobanBuildRequest):
+    """
+    Queue a contract build and return its job id immediately.
+
+    Poll /soroban/jobs/{job_id} for progress and fetch the SorobanBuildResponse
+    from /soroban/jobs/{job_id}/result once the job has finished.
+    """
+    return _submit_job("build", _build_contract_sync, req)
+
+
+@router.post("/soroban/jobs/deploy", response_model=SorobanJobResponse, status_code=202)
+async def submit_deploy_job(req: SorobanDeployRequest):
+    """
+    Queue a testnet contract deployment and return its job id immediately.
+    """
+    if req.network != "testnet":
+        raise HTTPException(
+            status_code=403,
+            detail="API deployment is restricted to testnet only. Use Metavinci UI for mainnet deployments."
+        )
+    return _submit_job("deploy", _deploy_contract_sync, req)
+
+
+@router.post("/soroban/jobs/deploy/batch", response_model=SorobanJobResponse, status_code=202)
+async def submit_deploy_batch_job(req: SorobanBatchDeployRequest):
+    """
+    Queue a testnet batch deployment and return its job id immediately.
+    """
+    if req.network != "testnet":
+        raise HTTPException(
+            status_code=403,
+            detail="API deployment is restricted to testnet only. Use Metavinci UI for mainnet deployments."
+        )
+    return _submit_job("deploy-batch", _deploy_batch_sync, req)
+
+
+@router.post("/soroban/jobs/generate-and-build", response_model=SorobanJobResponse, status_code=202)
+async def submit_generate_and_build_job(req: SorobanGenerateAndBuildRequest):
+    """
+    Queue a generate + build pipeline and return its job id immediately.
+    """
+    return _submit_job("generate-and-build", _generate_and_build_sync, req)
+
+
+@router.post("/soroban/jobs/generate-and-build/batch", response_model=SorobanJobResponse, status_code=202)
+async def submit_generate_and_build_batch_job(req: SorobanGenerateAndBuildBatchRequest):
+    """
+    Queue a batch generate + build and return its job id immediately.
+    """
+    return _submit_job("generate-and-build-batch", _generate_and_build_batch_sync, req)
+
+
+@router.get("/soroban/jobs", response_model=SorobanJobListResponse)
+async def list_soroban_jobs(kind: Optional[str] = None, status: Optional[str] = None):
+    """
+    List known jobs, newest first.
+
+    - kind: build, deploy, deploy-batch, generate-and-build or generate-and-build-batch
+    - status: queued, running, succeeded, failed or cancelled
+    """
+    jobs = get_job_manager().list_jobs(kind=kind, status=status)
+    return SorobanJobListResponse(
+        success=True,
+        jobs=[SorobanJobResponse(**j.to_dict()) for j in jobs],
+        total=len(jobs)
+    )
+
+
+@router.get("/soroban/jobs/{job_id}", response_model=SorobanJobResponse)
+async def get_soroban_job(job_id: str):
+    """
+    Get the status and progress of a job.
+    """
+    job = _get_job_or_404(job_id)
+    return SorobanJobResponse(**job.to_dict())
+
+
+@router.get("/soroban/jobs/{job_id}/result")
+async def get_soroban_job_result(job_id: str):
+    """
+    Get the result of a finished job.
+
+    Returns 409 while the job is still queued or running.
+    """
+    job = _get_job_or_404(job_id)
+
+    if not job.is_finished:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status.value}")
+
+    return job.to_dict(include_result=True)
+
+
+@router.get("/soroban/jobs/{job_id}/events")
+async def stream_soroban_job_events(job_id: str, request: Request):
+    """
+    Stream a job's progress as Server-Sent Events.
+
+    Emits "status", "progress", "compiling", "artifact", "diagnostic" and
+    "build-finished" events as they happen, then a final "end" event with the
+    job status. Each event id is its sequence number, so a reconnecting client
+    resumes from the Last-Event-ID header without missing events.
+    """
+    job = _get_job_or_404(job_id)
+    last_event_id = request.headers.get("last-event-id", "")
+    seq = int(last_event_id) if last_event_id.isdigit() else 0
+
+    async def event_stream():
+        nonlocal seq
+        while True:
+            for event in job.events_since(seq):
+                seq = event["seq"]
+                yield f"id: {seq}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+            if job.is_finished and not job.events_since(seq):
+                yield f"event: end\ndata: {json.dumps(job.to_dict())}\n\n"
+                return
+            if await request.is_disconnected():
+                return
+            await asyncio.sleep(0.25)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/soroban/jobs/{job_id}/cancel", response_model=SorobanJobResponse)
+async def cancel_soroban_job(job_id: str):
+    """
+    Cancel a queued or running job.
+
+    Queued jobs are cancelled immediately; running jobs stop at their next
+    cancellation check and are reported as cancelled.
+    """
+    job = _get_job_or_404(job_id)
+    if not get_job_manager().cancel(job_id):
+        raise HTTPException(status_code=409, detail=f"Job is already {job.status.value}")
+
+    return SorobanJobResponse(**job.to_dict())
+
+
+# =============================================================================
+# Soroban Build Cache
+# =============================================================================
+
+@router.get("/soroban/build-cache")
+async def get_soroban_build_cache():
+    """
+    Inspect the shared Cargo target cache used by contract builds.
+
+    Returns the cache location, size cap, total size and per-slot details.
+    """
+    from build_cache import get_target_cache
+
+    try:
+        info = await run_in_threadpool(get_target_cache().info)
+        return {"success": True, **info}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to read build cache: {str(e)}")
+
+
+@router.delete("/soroban/build-cache")
+async def clear_soroban_build_cache():
+    """
+    Clear the shared Cargo target cache.
+
+    Slots used by a build that is currently running are kept.
+    """
+    from build_cache import get_target_cache
+
+    try:
+        result = await run_in_threadpool(get_target_cache().clear)
+        return {"success": True, **result}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to clear build cache: {str(e)}")
+
+
+# =============================================================================
+# Soroban Build Artifacts
+# =============================================================================
+
+@router.get("/soroban/artifacts")
+async def list_soroban_artifacts():
+    """
+    List compiled WASM files kept in the artifact store.
+
+    Returns quota usage plus one entry per build and per cached WASM. Entries
+    referenced by a deployment record are marked pinned and are never evicted.
+    """
+    from artifact_store import get_artifact_store
+
+    try:
+        store = get_artifact_store()
+        info = await run_in_threadpool(store.info)
+        artifacts = await run_in_threadpool(store.list_artifacts)
+        return {"success": True, **info, "artifacts": artifacts}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to list artifacts: {str(e)}")
+
+
+@router.delete("/soroban/artifacts")
+async def cleanup_soroban_artifacts(older_than_days: Optional[int] = None):
+    """
+    Remove unpinned artifacts from the store.
+
+    Optional filters:
+    - older_than_days: Only remove artifacts unused for this many days
+    """
+    from artifact_store import get_artifact_store
+
+    if older_than_days is not None and older_than_days < 0:
+        raise HTTPException(status_code=400, detail="older_than_days must be zero or positive")
+
+    try:
+        result = await run_in_threadpool(get_artifact_store().cleanup, older_than_days)
+        return {"success": True, **result}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to clean up artifacts: {str(e)}")
+
+
+@router.delete("/soroban/artifacts/{build_id}")
+async def delete_soroban_artifact(build_id: str):
+    """
+    Remove a single build's WASM.
+
+    Returns 409 if a deployment record references the build.
+    """
+    from artifact_store import get_artifact_store
+
+    store = get_artifact_store()
+    if await run_in_threadpool(store.get_build, build_id) is None:
+        raise HTTPException(status_code=404, detail=f"Build not found: {build_id}")
+
+    if not await run_in_threadpool(store.remove_build, build_id):
+        raise HTTPException(status_code=409, detail="Build is referenced by a deployment record")
+
+    return {"success": True, "message": "Build artifact deleted"}
+
+
 @router.get("/soroban/deployments", response_model=SorobanDeploymentsResponse)
 async def list_soroban_deployments(
     network: Optional[str] = None,
     wallet_address: Optional[str] = None,
-    status: Optional[str] = None
+    status: Optional[str] = None,
+    sort_by: str = "timestamp",
+    order: str = "desc",
+    limit: int = 100,
+    cursor: Optional[str] = None
 ):
     """
-    List Soroban contract deployment records.
+    List Soroban contract deployment records, one page at a time.
 
     Optional filters:
     - network: Filter by network (testnet/mainnet/futurenet)
     - wallet_address: Filter by deploying wallet address
     - status: Filter by status (success/failed/pending/error)
+
+    Paging and sorting:
+    - sort_by: timestamp (default), contract_id, network, wallet_address, status or deployment_id
+    - order: desc (default) or asc
+    - limit: Records per page (default 100, max 1000)
+    - cursor: next_cursor from the previous page
     """
-    from deployment_manager import DeploymentManager
+    from deployment_manager import get_deployment_manager
+
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order must be asc or desc")
+    if not 1 <= limit <= 1000:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 1000")
 
     try:
-        manager = DeploymentManager()
-        deployments = manager.get_deployments(
+        manager = get_deployment_manager()
+        page = await run_in_threadpool(
+            manager.get_deployments_page,
             network=network,
             wallet_address=wallet_address,
-            status=status
+            status=status,
+            sort_by=sort_by,
+            descending=order == "desc",
+            limit=limit,
+            cursor=cursor
         )
 
-        return SorobanDeploymentsResponse(
-            success=True,
-            deployments=deployments,
-            total=len(deployments)
-        )
+        return SorobanDeploymentsResponse(success=True, **page)
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list deployments: {str(e)}")
 
 
+@router.post("/soroban/deployments/verify")
+async def verify_soroban_deployments(req: SorobanVerifyDeploymentsRequest):
+    """
+    Verify deployment records against the network in bulk.
+
+    Checks that each recorded contract still exists and runs the recorded WASM,
+    reading contract instances in batches over one pooled RPC connection per
+    network. Each record gets exists, wasm_match and verified_at.
+    """
+    from deployment_verifier import DeploymentVerifier
+
+    try:
+        verifier = DeploymentVerifier(concurrency=req.concurrency, batch_size=req.batch_size)
+        result = await run_in_threadpool(verifier.verify, req.network, req.deployment_ids)
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Verification failed: {str(e)}")
+
+
+@router.get("/soroban/deployments/export")
+async def export_soroban_deployments(
+    format: str = "jsonl",
+    network: Optional[str] = None,
+    wallet_address: Optional[str] = None,
+    status: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None
+):
+    """
+    Download deployment records, oldest first.
+
+    Records are read from the store in batches and encoded as they are sent,
+    so memory use does not grow with the size of the history.
+
+    - format: jsonl (default), json, csv or arrow (Arrow IPC stream; needs pyarrow)
+    - network, wallet_address, status: Optional filters
+    - since / until: Optional ISO 8601 timestamp range (since inclusive, until exclusive)
+    """
+    from deployment_export import EXPORT_FORMATS, check_format
+    from deployment_manager import get_deployment_manager
+
+    try:
+        format = check_format(format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    media_type, extension = EXPORT_FORMATS[format]
+    manager = get_deployment_manager()
+    return StreamingResponse(
+        manager.stream_export(format, network, wallet_address, status, since, until),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="deployments.{extension}"'}
+    )
+
+
+@router.get("/soroban/deployments/retention")
+async def get_soroban_retention_policy():
+    """
+    Get the deployment retention policy: rules, schedule and the last run.
+    """
+    from deployment_retention import get_deployment_retention
+
+    try:
+        policy = await run_in_threadpool(get_deployment_retention().get_policy)
+        return {"success": True, **policy}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get retention policy: {str(e)}")
+
+
+@router.put("/soroban/deployments/retention")
+async def update_soroban_retention_policy(req: SorobanRetentionPolicyRequest):
+    """
+    Update the deployment retention policy.
+
+    Rules are checked in order and the first rule matching a record's network
+    and status decides how long it is kept. Records no rule matches are kept.
+    """
+    from deployment_retention import get_deployment_retention
+
+    rules = ([rule.model_dump() if hasattr(rule, 'model_dump') else rule.dict() for rule in req.rules]
+             if req.rules is not None else None)
+    try:
+        policy = await run_in_threadpool(get_deployment_retention().set_policy, rules, req.enabled,
+                                         req.interval_hours)
+        return {"success": True, **policy}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to update retention policy: {str(e)}")
+
+
+@router.post("/soroban/deployments/retention/run")
+async def run_soroban_retention(dry_run: bool = False):
+    """
+    Apply the deployment retention policy now.
+
+    Expired records are appended to the compressed archive (or deleted, per
+    rule) and removed from the live store in one transaction, which is then
+    compacted. With dry_run=true nothing is changed and the counts show
+    what would happen.
+    """
+    from deployment_retention import get_deployment_retention
+
+    try:
+        return await run_in_threadpool(get_deployment_retention().run, dry_run)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Retention run failed: {str(e)}")
+
+
+@router.get("/soroban/deployments/stats")
+async def get_soroban_deployment_stats(
+    network: Optional[str] = None,
+    period: str = "day",
+    buckets: int = 30
+):
+    """
+    Deployment statistics: counts by status, network and wallet, plus a
+    timeline of deployments, success rate and WASM size per hour or day.
+
+    Counts are kept up to date as records are written, so this does not
+    read the deployment records.
+
+    - network: Optional network filter
+    - period: Timeline bucket size, hour or day (default day)
+    - buckets: Most recent buckets with deployments to return (default 30, max 1000)
+    """
+    from deployment_manager import get_deployment_manager
+
+    if period not in ("hour", "day"):
+        raise HTTPException(status_code=400, detail="period must be hour or day")
+    if not 1 <= buckets <= 1000:
+        raise HTTPException(status_code=400, detail="buckets must be between 1 and 1000")
+
+    try:
+        manager = get_deployment_manager()
+        stats = await run_in_threadpool(manager.get_deployment_stats, network)
+        timeline = await run_in_threadpool(manager.get_deployment_timeline, period, network, buckets)
+        return {"success": True, "stats": stats, "period": period, "timeline": timeline}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get deployment stats: {str(e)}")
+
+
+@router.get("/soroban/deployments/search", response_model=SorobanDeploymentsResponse)
+async def search_soroban_deployments(
+    q: str,
+    network: Optional[str] = None,
+    limit: int = 50,
+    prefix: bool = False
+):
+    """
+    Search deployment records by contract ID, wallet address, wallet name,
+    transaction hash or error text.
+
+    Matching is case-insensitive on any part of a field (or only the start of
+    a field with prefix=true). Exact matches come first, then prefix matches
+    (by matching value), then substring matches, otherwise newest first.
+
+    - q: Search text
+    - network: Optional network filter
+    - limit: Maximum results (default 50, max 1000)
+    """
+    from deployment_manager import get_deployment_manager
+
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="q must not be empty")
+    if not 1 <= limit <= 1000:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 1000")
+
+    try:
+        manager = get_deployment_manager()
+        results = await run_in_threadpool(manager.search_deployments, q, network, limit, prefix)
+        return SorobanDeploymentsResponse(success=True, deployments=results, total=len(results))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
+
+
+@router.get("/soroban/deployments/events")
+async def stream_soroban_deployment_events(request: Request):
+    """
+    Stream changes to the deployment records as Server-Sent Events.
+
+    Emits "insert", "update" and "delete" events with the changed
+    deployment_ids (and, for inserts and updates, the records themselves),
+    whichever process made the change. A "reload" event means the changes
+    can't be listed and clients should reload their view. Each event id is
+    the change sequence number, so a reconnecting client resumes from the
+    Last-Event-ID header; new connections start from the current state.
+    """
+    from deployment_manager import get_deployment_manager
+
+    manager = get_deployment_manager()
+    last_event_id = request.headers.get("last-event-id", "")
+    seq = int(last_event_id) if last_event_id.isdigit() else await run_in_threadpool(manager.last_change)
+
+    async def event_stream():
+        nonlocal seq
+        idle = 0.0
+        while True:
+            events = await run_in_threadpool(manager.events_since, seq)
+            for event in events:
+                seq = event["seq"]
+                yield f"id: {seq}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+            if await request.is_disconnected():
+                return
+            # Comment line so proxies don't close a quiet connection
+            idle = 0.0 if events else idle + DEPLOYMENT_EVENTS_POLL_SECONDS
+            if idle >= DEPLOYMENT_EVENTS_KEEPALIVE_SECONDS:
+                idle = 0.0
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(DEPLOYMENT_EVENTS_POLL_SECONDS)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/soroban/deployments/{deployment_id}")
 async def get_soroban_deployment(deployment_id: str):
     """
     Get a specific deployment record by ID.
     """
-    from deployment_manager import DeploymentManager
+    from deployment_manager import get_deployment_manager
 
     try:
-        manager = DeploymentManager()
+        manager = get_deployment_manager()
         deployment = manager.get_deployment_by_id(deployment_id)
 
         if deployment:
@@ -1894,10 +2956,10 @@ async def delete_soroban_deployment(deployment_id: str):
     """
     Delete a deployment record.
     """
-    from deployment_manager import DeploymentManager
+    from deployment_manager import get_deployment_manager
 
     try:
-        manager = DeploymentManager()
+        manager = get_deployment_manager()
         success = manager.delete_deployment(deployment_id)
 
         if success:
@@ -1911,6 +2973,47 @@ async def delete_soroban_deployment(deployment_id: str):
         raise HTTPException(status_code=500, detail=f"Failed to delete deployment: {str(e)}")
 
 
+@router.get("/soroban/deploy-states")
+async def list_soroban_deploy_states(
+    stage: Optional[str] = None,
+    network: Optional[str] = None,
+    limit: Optional[int] = 100
+):
+    """
+    List deployment state machines, newest first, with per-stage timings.
+
+    Optional filters:
+    - stage: queued, uploading, instantiating, confirmed or failed
+    - network: Filter by network
+    - limit: Maximum number of states returned (default 100)
+
+    timing_summary aggregates stage durations (count, mean, p95 seconds) over
+    confirmed deployments, showing where deploy latency goes.
+    """
+    from deploy_state import get_deploy_state_store, DeployStage
+
+    if stage is not None and stage not in {s.value for s in DeployStage}:
+        raise HTTPException(status_code=400, detail=f"Invalid stage: {stage}")
+
+    store = get_deploy_state_store()
+    states = await run_in_threadpool(store.list_states, stage, network, limit)
+    summary = await run_in_threadpool(store.timing_summary, network)
+    return {"success": True, "states": states, "total": len(states), "timing_summary": summary}
+
+
+@router.get("/soroban/deploy-states/{deployment_id}")
+async def get_soroban_deploy_state(deployment_id: str):
+    """
+    Get the stage, stage history and per-stage timings of one deployment.
+    """
+    from deploy_state import get_deploy_state_store
+
+    state = await run_in_threadpool(get_deploy_state_store().get, deployment_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Deployment state not found")
+    return {"success": True, "state": state}
+
+
 # ============================================================================
 # Wallet Management Endpoints (Testnet Only)
 # ============================================================================
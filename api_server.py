@@ -10,6 +10,7 @@ Can also run standalone for testing without PyQt5.
 import asyncio
 import logging
 import threading
+from contextlib import asynccontextmanager
 from typing import Optional
 
 # Try to import FastAPI first (needed for both modes)
@@ -151,6 +152,52 @@ class ApiServerWorker(QThread):
         self.start()
 
 
+# The server can be stopped and started again inside one app process;
+# interrupted deployments only need settling the first time
+_reconcile_started = False
+_reconcile_lock = threading.Lock()
+
+
+def _reconcile_deployments():
+    """Reconcile interrupted deployments against the network (once per process), logging the outcome."""
+    global _reconcile_started
+    with _reconcile_lock:
+        if _reconcile_started:
+            return
+        _reconcile_started = True
+    try:
+        from deploy_state import reconcile_deployments
+        reconciled = reconcile_deployments()
+        if reconciled:
+            logging.info(f"Reconciled {len(reconciled)} interrupted deployment(s): " +
+                         ", ".join(f"{s['deployment_id']}={s['stage']}" for s in reconciled))
+    except Exception as e:
+        logging.warning(f"Deployment reconciliation failed: {e}")
+
+
+# Deployment retention: first check shortly after startup, then this often;
+# each check runs the policy only if its interval has passed
+RETENTION_START_DELAY = 60
+RETENTION_CHECK_SECONDS = 15 * 60
+
+
+async def _retention_loop():
+    """Apply the deployment retention policy whenever it is due."""
+    await asyncio.sleep(RETENTION_START_DELAY)
+    while True:
+        try:
+            from deployment_retention import get_deployment_retention
+            retention = get_deployment_retention()
+            if await asyncio.to_thread(retention.due):
+                result = await asyncio.to_thread(retention.run)
+                if result["deleted"]:
+                    logging.info(f"Deployment retention archived {result['archived']} and removed "
+                                 f"{result['deleted']} record(s)")
+        except Exception as e:
+            logging.warning(f"Deployment retention failed: {e}")
+        await asyncio.sleep(RETENTION_CHECK_SECONDS)
+
+
 def create_api_app() -> 'FastAPI':
     """
     Create and configure the FastAPI application.
@@ -159,12 +206,22 @@ def create_api_app() -> 'FastAPI':
     """
     from api_routes import router
 
+    @asynccontextmanager
+    async def lifespan(app):
+        # Settle deployments a previous process left in flight; this talks to
+        # the network, so it runs off the startup path
+        threading.Thread(target=_reconcile_deployments, name="deploy-reconcile", daemon=True).start()
+        retention_task = asyncio.create_task(_retention_loop())
+        yield
+        retention_task.cancel()
+
     app = FastAPI(
         title="HEAVYMETADATA API",
         description="Local API server for generating HEAVYMETA 3D asset metadata structures",
         version="1.0.0",
         docs_url="/docs",
         redoc_url="/redoc",
+        lifespan=lifespan,
     )
 
     # Configure CORS for local development
@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+Soroban Build Artifact Store
+Holds every compiled contract WASM under the Metavinci data directory: a
+content-addressed cache keyed by a hash of the contract sources plus the
+toolchain version, and per-build copies handed out to callers. Both are
+indexed and kept within a disk quota by age and LRU eviction; WASMs that
+deployment records point at are pinned and never evicted.
+"""
+
+import os
+import sys
+import shutil
+import hashlib
+import threading
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional
+from tinydb import TinyDB, Query
+
+
+def _get_data_dir() -> Path:
+    """Get the platform-specific data directory for build artifacts."""
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Application Support"
+    else:
+        base = Path(os.environ.get("XDG_DATA_HOME", Path.home() / ".local" / "share"))
+
+    data_dir = base / "heavymeta" / "artifacts"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    return data_dir
+
+
+def compute_source_key(contract_path: Path, toolchain_version: str,
+                       extra_files: Optional[List[Path]] = None) -> str:
+    """
+    Hash the files that determine a contract's WASM output
+
+    Covers Cargo.toml and every src/*.rs file except the unit tests, which
+    are not compiled into the release WASM.
+
+    Args:
+        contract_path: Path to contract directory
+        toolchain_version: Compiler/CLI version string the WASM is built with
+        extra_files: Files outside the contract that also affect the build,
+                     such as a workspace root Cargo.toml carrying the profile
+
+    Returns:
+        Hex sha256 digest
+    """
+    contract_path = Path(contract_path)
+    sources = [contract_path / "Cargo.toml"]
+    sources += sorted(
+        p for p in (contract_path / "src").rglob("*.rs")
+        if p.name != "test.rs"
+    )
+
+    digest = hashlib.sha256()
+    digest.update(toolchain_version.strip().encode("utf-8"))
+    for path in sources:
+        # Relative path separators normalized so keys match across platforms
+        digest.update(b"\0" + path.relative_to(contract_path).as_posix().encode("utf-8") + b"\0")
+        digest.update(path.read_bytes())
+    for path in extra_files or []:
+        digest.update(b"\0" + Path(path).name.encode("utf-8") + b"\0")
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()
+
+
+class ArtifactStore:
+    """Stores compiled WASM files for reuse across builds and for deployment"""
+
+    DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024  # 2 GB
+    DEFAULT_MAX_AGE_DAYS = 30
+
+    def __init__(self, store_dir: Optional[Path] = None, max_bytes: Optional[int] = None,
+                 max_age_days: Optional[int] = None,
+                 pinned_paths: Optional[Callable[[], Iterable[str]]] = None):
+        """
+        Initialize the artifact store.
+
+        Args:
+            store_dir: Optional custom store directory.
+                       If not provided, uses platform-specific data directory.
+            max_bytes: Disk quota for all stored WASM files (default 2 GB)
+            max_age_days: Unused artifacts older than this are evicted (default 30)
+            pinned_paths: Optional callable returning WASM paths that must be kept.
+                          Defaults to the wasm_path of every DeploymentManager
+                          record that points into the store.
+        """
+        self.store_dir = Path(store_dir) if store_dir else _get_data_dir()
+        self.wasm_dir = self.store_dir / "wasm"
+        self.wasm_dir.mkdir(parents=True, exist_ok=True)
+        self.builds_dir = self.store_dir / "builds"
+        self.builds_dir.mkdir(parents=True, exist_ok=True)
+
+        self.max_bytes = max_bytes if max_bytes is not None else self.DEFAULT_MAX_BYTES
+        self.max_age_days = max_age_days if max_age_days is not None else self.DEFAULT_MAX_AGE_DAYS
+        self._pinned_paths = pinned_paths or (lambda: _deployment_wasm_paths(self.store_dir))
+
+        self.db = TinyDB(str(self.store_dir / "artifact_index.json"))
+        self.wasm_cache = self.db.table("wasm_cache")
+        self.builds = self.db.table("builds")
+        self._lock = threading.RLock()
+
+    def lookup(self, source_key: str) -> Optional[Dict]:
+        """
+        Find a cached WASM for a source key
+
+        Args:
+            source_key: Key from compute_source_key()
+
+        Returns:
+            Cache entry including "wasm_path", or None on a miss
+        """
+        query = Query()
+        with self._lock:
+            result = self.wasm_cache.search(query.source_key == source_key)
+            if not result:
+                return None
+
+            entry = result[0]
+            wasm_path = self.wasm_dir / entry["wasm_file"]
+            if not wasm_path.exists():
+                # Index points at a file that was removed behind our back
+                self.wasm_cache.remove(query.source_key == source_key)
+                return None
+
+            self.wasm_cache.update(
+                {"last_hit": datetime.utcnow().isoformat(), "hits": entry.get("hits", 0) + 1},
+                query.source_key == source_key
+            )
+
+        return {**entry, "wasm_path": str(wasm_path)}
+
+    def store(self, source_key: str, wasm_path: Path, metadata: Optional[Dict] = None) -> Dict:
+        """
+        Add a freshly built WASM to the cache
+
+        Args:
+            source_key: Key from compute_source_key()
+            wasm_path: Path to compiled WASM file
+            metadata: Optional extra fields to keep with the entry
+
+        Returns:
+            The stored cache entry including "wasm_path"
+        """
+        wasm_path = Path(wasm_path)
+        wasm_file = f"{source_key}.wasm"
+        dest = self.wasm_dir / wasm_file
+
+        # Copy to a temp name first so readers never see a partial file
+        tmp = dest.with_suffix(".wasm.tmp")
+        shutil.copy2(wasm_path, tmp)
+        os.replace(tmp, dest)
+
+        entry = {
+            **(metadata or {}),
+            "source_key": source_key,
+            "wasm_file": wasm_file,
+            "wasm_name": wasm_path.name,
+            "wasm_size": dest.stat().st_size,
+            "created_at": datetime.utcnow().isoformat(),
+            "hits": 0,
+        }
+
+        with self._lock:
+            self.wasm_cache.upsert(entry, Query().source_key == source_key)
+
+        self.enforce_quota(keep={dest})
+        return {**entry, "wasm_path": str(dest)}
+
+    def remove(self, source_key: str) -> bool:
+        """
+        Remove a cached WASM
+
+        Returns:
+            True if an entry was removed
+        """
+        with self._lock:
+            removed = self.wasm_cache.remove(Query().source_key == source_key)
+        (self.wasm_dir / f"{source_key}.wasm").unlink(missing_ok=True)
+        return len(removed) > 0
+
+    def add_build(self, build_id: str, wasm_path: Path, metadata: Optional[Dict] = None,
+                  wasm_name: Optional[str] = None) -> Dict:
+        """
+        Keep the WASM of a build under builds/<build_id>/ and index it
+
+        A file already in the store (a cache hit) is hard-linked rather than
+        copied where the filesystem allows it.
+
+        Args:
+            build_id: Unique build identifier
+            wasm_path: Path to the compiled WASM file
+            metadata: Optional extra fields to keep with the entry
+            wasm_name: File name to give the WASM (defaults to the source file name)
+
+        Returns:
+            The build entry including "wasm_path"
+        """
+        wasm_path = Path(wasm_path)
+        build_dir = self.builds_dir / build_id
+        build_dir.mkdir(parents=True, exist_ok=True)
+        dest = build_dir / (wasm_name or wasm_path.name)
+
+        try:
+            if self.store_dir.resolve() not in wasm_path.resolve().parents:
+                raise OSError("not a store file")
+            os.link(wasm_path, dest)
+        except OSError:
+            shutil.copy2(wasm_path, dest)
+
+        now = datetime.utcnow().isoformat()
+        entry = {
+            **(metadata or {}),
+            "build_id": build_id,
+            "wasm_file": dest.relative_to(self.store_dir).as_posix(),
+            "wasm_name": dest.name,
+            "wasm_size": dest.stat().st_size,
+            "created_at": now,
+            "last_used": now,
+        }
+
+        with self._lock:
+            self.builds.upsert(entry, Query().build_id == build_id)
+
+        self.enforce_quota(keep={dest})
+        return {**entry, "wasm_path": str(dest)}
+
+    def get_build(self, build_id: str) -> Optional[Dict]:
+        """
+        Look up a build's WASM and mark it as recently used
+
+        Returns:
+            Build entry including "wasm_path", or None if unknown or evicted
+        """
+        query = Query()
+        with self._lock:
+            result = self.builds.search(query.build_id == build_id)
+            if not result:
+                return None
+
+            entry = result[0]
+            wasm_path = self.store_dir / entry["wasm_file"]
+            if not wasm_path.exists():
+                self.builds.remove(query.build_id == build_id)
+                return None
+
+            self.builds.update({"last_used": datetime.utcnow().isoformat()}, query.build_id == build_id)
+
+        return {**entry, "wasm_path": str(wasm_path)}
+
+    def remove_build(self, build_id: str) -> bool:
+        """
+        Remove a build's WASM unless a deployment record references it
+
+        Returns:
+            True if the build was removed
+        """
+        with self._lock:
+            result = self.builds.search(Query().build_id == build_id)
+            if not result or self._is_pinned(result[0], self._pinned_set()):
+                return False
+            self._evict(result[0])
+        return True
+
+    def list_artifacts(self) -> List[Dict]:
+        """
+        List every stored WASM, newest use first
+
+        Returns:
+            Entries with kind ("build" or "cache"), id, wasm_path, wasm_size,
+            last_used and pinned
+        """
+        pinned = self._pinned_set()
+        with self._lock:
+            entries = self._entries()
+        entries.sort(key=lambda e: e["last_used"], reverse=True)
+        return [
+            {
+                "kind": e["kind"],
+                "id": e["id"],
+                "wasm_name": e.get("wasm_name"),
+                "wasm_path": str(self.store_dir / e["wasm_file"]),
+                "wasm_size": e.get("wasm_size", 0),
+                "contract_path": e.get("contract_path"),
+                "created_at": e.get("created_at"),
+                "last_used": e["last_used"],
+                "pinned": self._is_pinned(e, pinned),
+            }
+            for e in entries
+        ]
+
+    def info(self) -> Dict:
+        """Summary of store usage against the quota."""
+        artifacts = self.list_artifacts()
+        return {
+            "store_dir": str(self.store_dir),
+            "max_bytes": self.max_bytes,
+            "max_age_days": self.max_age_days,
+            "total_bytes": self._total_size(),
+            "builds": sum(1 for a in artifacts if a["kind"] == "build"),
+            "cached": sum(1 for a in artifacts if a["kind"] == "cache"),
+            "pinned": sum(1 for a in artifacts if a["pinned"]),
+        }
+
+    def enforce_quota(self, keep: Optional[Iterable[Path]] = None) -> Dict:
+        """
+        Evict unpinned artifacts past max_age_days, then least recently used
+        ones until the store fits max_bytes
+
+        Args:
+            keep: Optional WASM paths that must survive this pass
+
+        Returns:
+            Dict with evicted ids and freed_bytes
+        """
+        cutoff = (datetime.utcnow() - timedelta(days=self.max_age_days)).isoformat()
+        return self._evict_where(lambda e: e["last_used"] < cutoff, keep=keep, fit_quota=True)
+
+    def cleanup(self, older_than_days: Optional[int] = None) -> Dict:
+        """
+        Remove unpinned artifacts
+
+        Args:
+            older_than_days: Only remove artifacts unused for this many days;
+                             None removes every unpinned artifact
+
+        Returns:
+            Dict with evicted ids and freed_bytes
+        """
+        if older_than_days is None:
+            return self._evict_where(lambda e: True)
+        cutoff = (datetime.utcnow() - timedelta(days=older_than_days)).isoformat()
+        return self._evict_where(lambda e: e["last_used"] < cutoff)
+
+    def _evict_where(self, expired: Callable[[Dict], bool], keep: Optional[Iterable[Path]] = None,
+                     fit_quota: bool = False) -> Dict:
+        """
+        Evict expired entries, then LRU entries while over quota if fit_quota is set
+
+        Pins are only looked up once something is expired or the store is
+        over quota, so a pass with nothing to evict never reads deployment records.
+        """
+        evicted = {"evicted_builds": [], "evicted_cache": [], "freed_bytes": 0}
+
+        with self._lock:
+            entries = self._entries()
+            total = self._total_size() if fit_quota else 0
+            if total <= self.max_bytes and not any(expired(e) for e in entries):
+                return evicted
+
+            pinned = self._pinned_set()
+            keep_files = {str(Path(p).resolve()) for p in (keep or [])}
+            candidates = [
+                e for e in entries
+                if not self._is_pinned(e, pinned)
+                and str((self.store_dir / e["wasm_file"]).resolve()) not in keep_files
+            ]
+            candidates.sort(key=lambda e: e["last_used"])
+
+            for entry in [e for e in candidates if expired(e)]:
+                self._record_eviction(evicted, entry)
+
+            if fit_quota:
+                total -= evicted["freed_bytes"]
+                for entry in candidates:
+                    if total <= self.max_bytes:
+                        break
+                    if entry["id"] in evicted["evicted_builds"] + evicted["evicted_cache"]:
+                        continue
+                    freed = self._record_eviction(evicted, entry)
+                    total -= freed
+
+        return evicted
+
+    def _record_eviction(self, evicted: Dict, entry: Dict) -> int:
+        freed = self._evict(entry)
+        evicted["evicted_builds" if entry["kind"] == "build" else "evicted_cache"].append(entry["id"])
+        evicted["freed_bytes"] += freed
+        return freed
+
+    def _evict(self, entry: Dict) -> int:
+        """Delete an entry's file and index record. Caller holds the lock."""
+        wasm_path = self.store_dir / entry["wasm_file"]
+        freed = _unique_size(wasm_path)
+        wasm_path.unlink(missing_ok=True)
+
+        if entry["kind"] == "build":
+            self.builds.remove(Query().build_id == entry["id"])
+            shutil.rmtree(wasm_path.parent, ignore_errors=True)
+        else:
+            self.wasm_cache.remove(Query().source_key == entry["id"])
+        return freed
+
+    def _entries(self) -> List[Dict]:
+        """Builds and cache entries in one shape. Caller holds the lock."""
+        entries = [
+            {**e, "kind": "build", "id": e["build_id"], "last_used": e.get("last_used") or e.get("created_at", "")}
+            for e in self.builds.all()
+        ]
+        entries += [
+            {**e, "kind": "cache", "id": e["source_key"], "wasm_file": f"wasm/{e['wasm_file']}",
+             "last_used": e.get("last_hit") or e.get("created_at", "")}
+            for e in self.wasm_cache.all()
+        ]
+        return entries
+
+    def _total_size(self) -> int:
+        """Bytes on disk, counting hard-linked files once."""
+        seen = set()
+        total = 0
+        for root in (self.wasm_dir, self.builds_dir):
+            for path in root.rglob("*.wasm"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                if (stat.st_dev, stat.st_ino) not in seen:
+                    seen.add((stat.st_dev, stat.st_ino))
+                    total += stat.st_size
+        return total
+
+    def _pinned_set(self) -> set:
+        try:
+            return {str(Path(p).resolve()) for p in self._pinned_paths() if p}
+        except Exception:
+            # Without deployment records we cannot tell what is safe to delete
+            return {"*"}
+
+    def _is_pinned(self, entry: Dict, pinned: set) -> bool:
+        if "*" in pinned:
+            return True
+        return str((self.store_dir / entry["wasm_file"]).resolve()) in pinned
+
+
+def _unique_size(path: Path) -> int:
+    """Bytes freed by deleting path (0 while another hard link remains)."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return 0
+    return stat.st_size if stat.st_nlink <= 1 else 0
+
+
+def _deployment_wasm_paths(store_dir: Path) -> List[str]:
+    """WASM paths under store_dir referenced by stored deployment records."""
+    from deployment_manager import get_deployment_manager
+
+    manager = get_deployment_manager()
+    # Records keep the path as handed out, which may or may not be resolved
+    prefixes = {str(store_dir), str(store_dir.resolve())}
+    return [path for prefix in prefixes for path in manager.get_wasm_paths(os.path.join(prefix, ""))]
+
+
+# Process-wide store shared by all ContractBuilder instances
+_store: Optional[ArtifactStore] = None
+_store_lock = threading.Lock()
+
+
+def get_artifact_store() -> ArtifactStore:
+    """Get or create the global artifact store instance."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ArtifactStore()
+        return _store
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Deployment record storage: TinyDB JSON file vs SQLite
+
+Loads the same records into both DeploymentManager backends, then times single
+inserts and the lookups the API and UI make (by deployment id, by contract id,
+filtered listings, statistics and text search) on the full database.
+
+Usage:
+    python benchmarks/bench_deployment_store.py [--records 100000] [--repeat 10]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from deployment_manager import DeploymentManager
+
+
+NETWORKS = ("testnet", "mainnet", "futurenet", "local")
+STATUSES = ("success", "success", "success", "failed", "error")
+
+
+def make_record(index: int, wallets: int = 50) -> dict:
+    return {
+        "deployment_id": f"{index:08x}-0000-4000-8000-{index:012x}",
+        "contract_id": f"C{index:055d}",
+        "network": NETWORKS[index % len(NETWORKS)],
+        "wasm_path": f"/tmp/builds/{index}/contract.wasm",
+        "wasm_hash": f"{index:064x}",
+        "wallet_address": f"G{index % wallets:055d}",
+        "deployment_wallet": f"Wallet {index % wallets}",
+        "transaction_hash": f"{index * 7919:064x}",
+        "stellar_expert_url": f"https://stellar.expert/explorer/testnet/contract/C{index:055d}",
+        "timestamp": f"2026-{index % 12 + 1:02d}-{index % 28 + 1:02d}T{index % 24:02d}:00:{index % 60:02d}",
+        "status": STATUSES[index % len(STATUSES)],
+        "wasm_size": 20000 + index % 5000,
+        "fees_paid": 100000 + index % 1000,
+        "error": "",
+    }
+
+
+def measure(label: str, operation, repeat: int) -> float:
+    """Time operation() and print median and p95 in milliseconds."""
+    samples = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        operation(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    median = statistics.median(samples)
+    p95 = samples[max(0, int(len(samples) * 0.95) - 1)]
+    print(f"  {label:<38} median {median:10.3f} ms   p95 {p95:10.3f} ms")
+    return median
+
+
+def bench(name: str, manager: DeploymentManager, count: int, repeat: int) -> dict:
+    print(f"{name}")
+    start = time.perf_counter()
+    manager.store_deployments([make_record(i) for i in range(count)])
+    print(f"  {'bulk load':<38} {time.perf_counter() - start:10.2f} s")
+
+    rng = random.Random(7)
+    picks = [rng.randrange(count) for _ in range(repeat)]
+    return {
+        "insert": measure("store_deployment (one record)",
+                          lambda i: manager.store_deployment(make_record(count + i)), repeat),
+        "by_id": measure("get_deployment_by_id",
+                         lambda i: manager.get_deployment_by_id(make_record(picks[i])["deployment_id"]), repeat),
+        "by_contract": measure("get_deployments_by_contract_id",
+                               lambda i: manager.get_deployments_by_contract_id(f"C{picks[i]:055d}"), repeat),
+        "by_wallet": measure("get_deployments(network, wallet)",
+                             lambda i: manager.get_deployments(network="testnet",
+                                                               wallet_address=f"G{picks[i] % 50:055d}"), repeat),
+        "by_status": measure("get_deployments(network, status)",
+                             lambda i: manager.get_deployments(network="mainnet", status="failed"), repeat),
+        "stats": measure("get_deployment_stats + daily timeline",
+                         lambda i: (manager.get_deployment_stats(network=NETWORKS[i % len(NETWORKS)]),
+                                    manager.get_deployment_timeline("day")), repeat),
+        "search_id": measure("search_deployments(contract id part)",
+                             lambda i: manager.search_deployments(f"{picks[i]:08d}", limit=50), repeat),
+        "search_name": measure("search_deployments(wallet name)",
+                               lambda i: manager.search_deployments(f"Wallet {picks[i] % 50}", limit=50), repeat),
+        "search_prefix": measure("search_deployments(contract id prefix)",
+                                 lambda i: manager.search_deployments(f"C{picks[i]:055d}"[:-2], limit=50,
+                                                                      prefix=True), repeat),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=100_000, help="Records loaded before timing")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed operations of each kind")
+    args = parser.parse_args()
+
+    print(f"{args.records} records\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        tinydb = bench("TinyDB (deployments.json)", DeploymentManager(Path(tmp) / "deployments.json"),
+                       args.records, args.repeat)
+        print()
+        sqlite = bench("SQLite WAL (deployments.db)", DeploymentManager(Path(tmp) / "deployments.db"),
+                       args.records, args.repeat)
+
+    print("\nspeedup (TinyDB median / SQLite median)")
+    for key, value in tinydb.items():
+        print(f"  {key:<12} {value / sqlite[key]:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+End-to-end generate -> build -> deploy -> record pipeline throughput
+
+Runs the real SorobanGenerator, ContractBuilder, ContractDeployer,
+WalletManager and DeploymentManager against the offline stand-ins: the
+Soroban RPC/Horizon/Friendbot server in soroban_standin.py and the fake
+`stellar` CLI in stellar_cli_standin.py. Nothing touches the network or the
+user's data directory, so this runs on an air-gapped CI box.
+
+Each concurrency level deploys --contracts distinct contracts, one wallet per
+worker (the network accepts one pending transaction per account). Reports
+p50/p95 per stage and contracts per second for each level.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--contracts 24] [--concurrency 1,4,8]
+        [--rpc-latency 0.02] [--build-seconds 0.2] [--error-rate 0.0]
+        [--try-again-rate 0.0] [--build-failure-rate 0.0] [--method rpc]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stellar_sdk import Network
+
+import wallet_manager
+from artifact_store import ArtifactStore
+from build_cache import TargetCache
+from contract_builder import ContractBuilder
+from contract_deployer import ContractDeployer
+from deploy_state import DeployStateStore
+from deployment_manager import DeploymentManager
+from soroban_generator import SorobanGenerator
+from soroban_rpc import RpcDeployer, WasmInstallIndex
+from soroban_standin import StandinLedger, StandinRpcServer
+from stellar_cli_standin import install_cli_shim
+
+
+STAGES = ("generate", "build", "deploy", "record")
+
+
+def contract_config(level: int, index: int) -> dict:
+    """A distinct contract per run, so every build compiles fresh sources."""
+    return {
+        "contract_name": f"Bench C{level} N{index}",
+        "symbol": f"B{level}N{index}",
+        "max_supply": 1000,
+        "val_props": {
+            "health": {"default": 100, "min": 0, "max": 100, "prop_action_type": "Bicremental", "amount": 5},
+        },
+    }
+
+
+def percentile(samples: list, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[max(0, int(len(ordered) * fraction + 0.5) - 1)]
+
+
+def run_level(level: int, count: int, work_dir: Path, server: StandinRpcServer, method: str) -> dict:
+    """Push `count` contracts through the pipeline with `level` workers."""
+    level_dir = work_dir / f"c{level}"
+    level_dir.mkdir()
+    wallets = wallet_manager.WalletManager(level_dir / "wallets.json")
+    addresses = [wallets.create_testnet_wallet(label=f"bench-{i}").address for i in range(level)]
+    for address in addresses:
+        if not wallets.get_balance(address)["balances"]:
+            raise RuntimeError(f"Friendbot did not fund {address}")
+
+    generator = SorobanGenerator()
+    artifacts = ArtifactStore(level_dir / "artifacts", pinned_paths=lambda: [])
+    target_cache = TargetCache(level_dir / "targets")
+    deployer = ContractDeployer(network="testnet", wallet_manager=wallets, method=method, rpc_url=server.url,
+                                state_store=DeployStateStore(level_dir / "deploy_state.db"))
+    # Poll confirmations faster than the 1 s default: the stand-in has no ledger close time
+    deployer._rpc_deployer = RpcDeployer(server.url, Network.TESTNET_NETWORK_PASSPHRASE, poll_interval=0.05,
+                                         install_index=WasmInstallIndex(level_dir / "installs.json"))
+    records = DeploymentManager(str(level_dir / "deployments.db"))
+
+    timings = {stage: [] for stage in STAGES}
+    failures = {stage: 0 for stage in STAGES}
+
+    def pipeline(index: int):
+        address = addresses[index % level]
+
+        started = time.perf_counter()
+        generated = generator.generate_and_write(contract_config(level, index), level_dir / "src" / str(index))
+        timings["generate"].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        builder = ContractBuilder(target_cache=target_cache, artifact_store=artifacts)
+        build = builder.build_contract(generated["output_path"])
+        timings["build"].append(time.perf_counter() - started)
+        if not build["success"]:
+            failures["build"] += 1
+            return
+
+        started = time.perf_counter()
+        deployed = deployer.deploy_contract(build["wasm_path"], address)
+        timings["deploy"].append(time.perf_counter() - started)
+        if not deployed["success"]:
+            failures["deploy"] += 1
+        if "deployment_record" not in deployed:
+            return
+
+        started = time.perf_counter()
+        stored = records.store_deployment(deployed["deployment_record"])
+        timings["record"].append(time.perf_counter() - started)
+        if not stored:
+            failures["record"] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=level) as pool:
+        list(pool.map(pipeline, range(count)))
+    elapsed = time.perf_counter() - started
+
+    completed = count - sum(failures.values())
+    return {"timings": timings, "failures": failures, "elapsed": elapsed, "completed": completed}
+
+
+def report(level: int, count: int, result: dict):
+    print(f"concurrency {level}: {result['completed']}/{count} deployed in {result['elapsed']:.2f} s "
+          f"({result['completed'] / result['elapsed']:.2f} contracts/s)")
+    for stage in STAGES:
+        samples = [s * 1000 for s in result["timings"][stage]]
+        if not samples:
+            print(f"  {stage:<10} no samples")
+            continue
+        print(f"  {stage:<10} p50 {percentile(samples, 0.5):9.1f} ms   p95 {percentile(samples, 0.95):9.1f} ms"
+              f"   failed {result['failures'][stage]}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--contracts", type=int, default=24, help="Contracts per concurrency level")
+    parser.add_argument("--concurrency", default="1,4,8", help="Comma-separated worker counts")
+    parser.add_argument("--method", choices=ContractDeployer.DEPLOY_METHODS, default="rpc",
+                        help="Deploy natively over RPC or through the `stellar` CLI shim")
+    parser.add_argument("--rpc-latency", type=float, default=0.02, help="Seconds added to every stand-in request")
+    parser.add_argument("--pending-polls", type=int, default=0,
+                        help="getTransaction polls answered NOT_FOUND before a result")
+    parser.add_argument("--try-again-rate", type=float, default=0.0, help="Share of sends answered TRY_AGAIN_LATER")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of stand-in requests failed with 503")
+    parser.add_argument("--build-seconds", type=float, default=0.2, help="Simulated compile time per contract")
+    parser.add_argument("--build-failure-rate", type=float, default=0.0, help="Share of builds that fail")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for stand-in failure injection")
+    args = parser.parse_args()
+    levels = [int(level) for level in args.concurrency.split(",") if level.strip()]
+
+    ledger = StandinLedger(network_passphrase=Network.TESTNET_NETWORK_PASSPHRASE, latency=args.rpc_latency,
+                           try_again_rate=args.try_again_rate, pending_polls=args.pending_polls,
+                           auto_fund=False, seed=args.seed, error_rate=args.error_rate)
+
+    with tempfile.TemporaryDirectory() as tmp, StandinRpcServer(ledger) as server:
+        work_dir = Path(tmp)
+        bin_dir = install_cli_shim(work_dir / "bin", server.url, Network.TESTNET_NETWORK_PASSPHRASE,
+                                   build_seconds=args.build_seconds,
+                                   build_failure_rate=args.build_failure_rate).parent
+        os.environ["PATH"] = str(bin_dir) + os.pathsep + os.environ.get("PATH", "")
+        wallet_manager.NETWORKS["testnet"] = {**wallet_manager.NETWORKS["testnet"],
+                                              "horizon_url": server.horizon_url,
+                                              "friendbot_url": server.friendbot_url}
+
+        print(f"{args.contracts} contracts per level, method {args.method}, stand-in at {server.url}\n")
+        for level in levels:
+            report(level, args.contracts, run_level(level, args.contracts, work_dir, server, args.method))
+        print("stand-in calls:", ", ".join(f"{k}={v}" for k, v in sorted(ledger.calls.items())))
+
+
+if __name__ == "__main__":
+    main()
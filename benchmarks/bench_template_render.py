@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Per-request Soroban template render latency
+
+Compares a new SorobanGenerator per request (what the API routes used to do)
+with the shared generator, in development (auto-reload) and frozen-style
+(ahead-of-time compiled, no reload) configurations.
+
+Usage:
+    python benchmarks/bench_template_render.py [--requests 200]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import soroban_generator
+from soroban_generator import SorobanGenerator
+
+
+CONFIG = {
+    "contract_name": "Space Warriors",
+    "symbol": "SWARS",
+    "max_supply": 1000,
+    "val_props": {
+        "health": {"default": 100, "min": 0, "max": 100, "prop_action_type": "Bicremental", "amount": 5},
+        "level": {"default": 1, "min": 1, "max": 50, "prop_action_type": "Incremental", "amount": 1},
+        "name_tag": {"default": 0, "min": 0, "max": 1, "prop_action_type": "Setter"},
+    },
+}
+
+
+def measure(label: str, render, requests: int) -> float:
+    """Time render() per request and print median and p95 in milliseconds."""
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        render()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    median = statistics.median(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<42} median {median:8.3f} ms   p95 {p95:8.3f} ms")
+    return median
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="Renders per configuration")
+    args = parser.parse_args()
+
+    print(f"{args.requests} renders of a 3-property contract\n")
+
+    before = measure(
+        "new generator per request (before)",
+        lambda: SorobanGenerator(bytecode_cache=False, use_compiled=False).generate(CONFIG),
+        args.requests,
+    )
+    measure(
+        "new generator per request + bytecode cache",
+        lambda: SorobanGenerator(use_compiled=False).generate(CONFIG),
+        args.requests,
+    )
+
+    shared = SorobanGenerator(auto_reload=True, use_compiled=False)
+    shared.precompile()
+    reload_median = measure("shared generator, auto-reload", lambda: shared.generate(CONFIG), args.requests)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        compiled = SorobanGenerator(bytecode_cache=False).compile_templates(Path(tmp))
+        soroban_generator._get_compiled_template_dir = lambda: compiled
+        frozen = SorobanGenerator(auto_reload=False)
+        frozen.precompile()
+        frozen_median = measure("shared generator, precompiled (frozen)", lambda: frozen.generate(CONFIG),
+                                args.requests)
+
+    print(f"\nspeedup: {before / reload_median:.1f}x (development), {before / frozen_median:.1f}x (frozen)")
+
+
+if __name__ == "__main__":
+    main()
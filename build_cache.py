@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Shared Cargo Target Cache
+Keeps a size-capped CARGO_TARGET_DIR that is reused across builds of different
+generated contracts, so soroban-sdk and its dependency tree compile only once.
+"""
+
+import os
+import re
+import sys
+import shutil
+import threading
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+from tinydb import TinyDB, Query
+
+
+def _get_data_dir() -> Path:
+    """Get the platform-specific data directory for the build cache."""
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Application Support"
+    else:
+        base = Path(os.environ.get("XDG_DATA_HOME", Path.home() / ".local" / "share"))
+
+    data_dir = base / "heavymeta" / "build_cache"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    return data_dir
+
+
+def read_package_name(contract_path: Path) -> Optional[str]:
+    """
+    Read the [package] name from a contract's Cargo.toml
+
+    Returns:
+        Crate name with hyphens normalized to underscores, or None
+    """
+    try:
+        content = (Path(contract_path) / "Cargo.toml").read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+    match = re.search(r'^\[package\][^\[]*?^name\s*=\s*"([^"]+)"', content, re.MULTILINE | re.DOTALL)
+    return match.group(1).replace("-", "_") if match else None
+
+
+def _read_sdk_version(contract_path: Path) -> str:
+    """Get the soroban-sdk version requirement from a contract's Cargo.toml."""
+    try:
+        content = (Path(contract_path) / "Cargo.toml").read_text(encoding="utf-8")
+    except OSError:
+        return "unknown"
+
+    match = re.search(r'^soroban-sdk\s*=\s*(?:"([^"]+)"|\{[^}]*version\s*=\s*"([^"]+)")', content, re.MULTILINE)
+    if not match:
+        return "unknown"
+    return match.group(1) or match.group(2)
+
+
+def _dir_size(path: Path) -> int:
+    """Total size in bytes of all files below path."""
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def _profile_dirs(slot_dir: Path) -> Iterator[Path]:
+    """Cargo profile directories (release, debug, ...) of a target dir, host and per target triple."""
+    for top in (p for p in slot_dir.iterdir() if p.is_dir()):
+        if (top / "deps").is_dir():
+            yield top
+            continue
+        for sub in (p for p in top.iterdir() if p.is_dir()):
+            if (sub / "deps").is_dir():
+                yield sub
+
+
+def _crate_paths(slot_dir: Path, crate: str) -> List[Path]:
+    """
+    Build artifacts of one crate in a target dir
+
+    Only the directories cargo puts per-crate output in are listed, so the
+    cost does not depend on the size of the shared dependency builds.
+    """
+    paths = []
+    if not slot_dir.is_dir():
+        return paths
+    for profile in _profile_dirs(slot_dir):
+        for parent in (profile, profile / "deps", profile / ".fingerprint", profile / "build", profile / "incremental"):
+            try:
+                names = os.listdir(parent)
+            except OSError:
+                continue
+            for name in names:
+                # Match "<crate>.wasm", "<crate>-<hash>..." and "lib<crate>..." but not "<crate>_other"
+                stem = name[3:] if name.startswith("lib" + crate) else name
+                if stem.startswith(crate) and stem[len(crate):len(crate) + 1] in (".", "-"):
+                    paths.append(parent / name)
+    return paths
+
+
+def _paths_size(paths: List[Path]) -> int:
+    total = 0
+    for path in paths:
+        try:
+            total += _dir_size(path) if path.is_dir() else path.stat().st_size
+        except OSError:
+            pass
+    return total
+
+
+class TargetCache:
+    """
+    Manages shared Cargo target directories ("slots") for contract builds.
+
+    Contracts that depend on the same soroban-sdk version share one slot, so
+    only the generated contract crate is compiled for each new collection.
+    When the cache grows past max_bytes, artifacts of the least recently built
+    contract crates are evicted first, then whole least recently used slots.
+
+    Slot and crate sizes are tracked in the index: a release measures only the
+    crates just built, and a slot is walked in full when it is new, every
+    RESCAN_HOURS, and before anything is evicted.
+    """
+
+    DEFAULT_MAX_BYTES = 4 * 1024 * 1024 * 1024  # 4 GB
+    RESCAN_HOURS = 24
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: Optional[int] = None):
+        """
+        Initialize the target cache.
+
+        Args:
+            cache_dir: Optional custom cache directory.
+                       If not provided, uses platform-specific data directory.
+            max_bytes: Size cap for all slots together (default 4 GB)
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else _get_data_dir()
+        self.targets_dir = self.cache_dir / "targets"
+        self.targets_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes if max_bytes is not None else self.DEFAULT_MAX_BYTES
+
+        self.db = TinyDB(str(self.cache_dir / "target_index.json"))
+        self.slots = self.db.table("slots")
+        self.crates = self.db.table("crates")
+
+        self._lock = threading.Lock()
+        self._in_use: Dict[str, int] = {}
+
+    def slot_for(self, contract_path: Path) -> str:
+        """Get the slot name a contract builds into."""
+        version = _read_sdk_version(contract_path)
+        return "soroban-sdk-" + re.sub(r"[^A-Za-z0-9._-]", "_", version)
+
+    def acquire(self, contract_path: Path, crate_names: Optional[List[str]] = None) -> Path:
+        """
+        Reserve the shared target directory for a contract build.
+
+        Args:
+            contract_path: Path to contract directory
+            crate_names: Crates the build produces, when building a workspace
+                         (defaults to the contract's own package name)
+
+        Returns:
+            Directory to use as CARGO_TARGET_DIR
+        """
+        slot = self.slot_for(contract_path)
+        crates = crate_names or [read_package_name(contract_path) or Path(contract_path).name]
+        now = datetime.utcnow().isoformat()
+        query = Query()
+
+        with self._lock:
+            self._in_use[slot] = self._in_use.get(slot, 0) + 1
+            self.slots.upsert({"slot": slot, "last_used": now}, query.slot == slot)
+            for crate in crates:
+                self.crates.upsert(
+                    {"slot": slot, "crate": crate, "last_used": now},
+                    (query.slot == slot) & (query.crate == crate)
+                )
+
+        target_dir = self.targets_dir / slot
+        target_dir.mkdir(parents=True, exist_ok=True)
+        return target_dir
+
+    def release(self, target_dir: Path, keep_crate: Optional[str] = None,
+                keep_crates: Optional[List[str]] = None) -> Dict:
+        """
+        Release a slot after a build and enforce the size cap.
+
+        Args:
+            target_dir: Directory returned by acquire()
+            keep_crate: Crate that must not be evicted (the one just built)
+            keep_crates: Several crates to protect, for workspace builds
+
+        Returns:
+            Eviction summary from enforce_limit()
+        """
+        slot = Path(target_dir).name
+        with self._lock:
+            self._in_use[slot] = max(0, self._in_use.get(slot, 0) - 1)
+            if not self._in_use[slot]:
+                del self._in_use[slot]
+
+        crates = list(keep_crates or []) + ([keep_crate] if keep_crate else [])
+        self._record_sizes(slot, crates)
+        return self.enforce_limit(keep={(slot, crate) for crate in crates})
+
+    def enforce_limit(self, keep: Optional[set] = None) -> Dict:
+        """
+        Evict least recently used artifacts until the cache fits max_bytes.
+
+        Args:
+            keep: Optional set of (slot, crate) pairs to protect from eviction
+
+        Returns:
+            Dict with bytes before/after and what was evicted
+        """
+        keep = keep or set()
+        keep_slots = {slot for slot, _crate in keep}
+
+        total = self._tracked_size()
+        if total > self.max_bytes:
+            # The tracked total can drift from the disk; only evict against the real size
+            total = self._rescan()
+        summary = {"size_before": total, "evicted_crates": [], "evicted_slots": []}
+
+        with self._lock:
+            if total > self.max_bytes:
+                # 1. Per-contract crate artifacts, oldest first
+                for entry in sorted(self.crates.all(), key=lambda e: e.get("last_used", "")):
+                    if total <= self.max_bytes:
+                        break
+                    key = (entry["slot"], entry["crate"])
+                    if key in keep or entry["slot"] in self._in_use:
+                        continue
+                    total -= self._evict_crate(*key)
+                    summary["evicted_crates"].append("/".join(key))
+
+                # 2. Whole slots (shared dependency builds), oldest first
+                for entry in sorted(self.slots.all(), key=lambda e: e.get("last_used", "")):
+                    if total <= self.max_bytes:
+                        break
+                    slot = entry["slot"]
+                    if slot in keep_slots or slot in self._in_use:
+                        continue
+                    total -= self._evict_slot(slot)
+                    summary["evicted_slots"].append(slot)
+
+            summary["size_after"] = total
+            return summary
+
+    def info(self) -> Dict:
+        """
+        Describe the cache contents.
+
+        Returns:
+            Dict with cache location, size cap, total size and per-slot details
+        """
+        with self._lock:
+            slots: List[Dict] = []
+            for entry in sorted(self.slots.all(), key=lambda e: e.get("last_used", ""), reverse=True):
+                slot = entry["slot"]
+                crates = [c["crate"] for c in self.crates.search(Query().slot == slot)]
+                slots.append({
+                    "slot": slot,
+                    "path": str(self.targets_dir / slot),
+                    "size_bytes": _dir_size(self.targets_dir / slot),
+                    "last_used": entry.get("last_used", ""),
+                    "in_use": slot in self._in_use,
+                    "crates": sorted(crates),
+                })
+
+            return {
+                "cache_dir": str(self.cache_dir),
+                "max_bytes": self.max_bytes,
+                "total_bytes": sum(s["size_bytes"] for s in slots),
+                "slots": slots,
+            }
+
+    def clear(self) -> Dict:
+        """
+        Remove all slots that are not currently in use.
+
+        Returns:
+            Dict with freed bytes and cleared slot names
+        """
+        with self._lock:
+            freed = 0
+            cleared = []
+            for entry in self.slots.all():
+                slot = entry["slot"]
+                if slot in self._in_use:
+                    continue
+                freed += self._evict_slot(slot)
+                cleared.append(slot)
+
+            return {"freed_bytes": freed, "cleared_slots": cleared}
+
+    def _tracked_size(self) -> int:
+        """Total of the slot sizes recorded in the index."""
+        with self._lock:
+            return sum(entry.get("size_bytes", 0) for entry in self.slots.all())
+
+    def _record_sizes(self, slot: str, crates: List[str]):
+        """Update the index after a build, measuring only its crates unless the slot is due a full walk."""
+        slot_dir = self.targets_dir / slot
+        query = Query()
+        sizes = {crate: _paths_size(_crate_paths(slot_dir, crate)) for crate in crates}
+
+        with self._lock:
+            entry = self.slots.get(query.slot == slot) or {}
+        cutoff = (datetime.utcnow() - timedelta(hours=self.RESCAN_HOURS)).isoformat()
+        measured = _dir_size(slot_dir) if entry.get("measured_at", "") < cutoff else None
+
+        with self._lock:
+            entry = self.slots.get(query.slot == slot)
+            if entry is None:
+                return
+            if measured is None:
+                recorded = {c["crate"]: c.get("size_bytes", 0) for c in self.crates.search(query.slot == slot)}
+                size = entry.get("size_bytes", 0) + sum(sizes[c] - recorded.get(c, 0) for c in sizes)
+                self.slots.update({"size_bytes": max(0, size)}, query.slot == slot)
+            else:
+                self.slots.update({"size_bytes": measured, "measured_at": datetime.utcnow().isoformat()},
+                                  query.slot == slot)
+            for crate, size in sizes.items():
+                self.crates.update({"size_bytes": size}, (query.slot == slot) & (query.crate == crate))
+
+    def _rescan(self) -> int:
+        """Walk every slot and correct the recorded sizes; returns the total."""
+        with self._lock:
+            slots = [entry["slot"] for entry in self.slots.all()]
+        query = Query()
+        total = 0
+        for slot in slots:
+            size = _dir_size(self.targets_dir / slot)
+            with self._lock:
+                if self.slots.update({"size_bytes": size, "measured_at": datetime.utcnow().isoformat()},
+                                     query.slot == slot):
+                    total += size
+        return total
+
+    def _evict_slot(self, slot: str) -> int:
+        """Delete a whole slot directory. Caller holds the lock."""
+        slot_dir = self.targets_dir / slot
+        size = _dir_size(slot_dir) if slot_dir.exists() else 0
+        shutil.rmtree(slot_dir, ignore_errors=True)
+
+        query = Query()
+        self.slots.remove(query.slot == slot)
+        self.crates.remove(query.slot == slot)
+        return size
+
+    def _evict_crate(self, slot: str, crate: str) -> int:
+        """Delete the build artifacts of one contract crate in a slot. Caller holds the lock."""
+        paths = _crate_paths(self.targets_dir / slot, crate)
+        freed = _paths_size(paths)
+        for path in paths:
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                path.unlink(missing_ok=True)
+
+        query = Query()
+        self.crates.remove((query.slot == slot) & (query.crate == crate))
+        entry = self.slots.get(query.slot == slot)
+        if entry is not None:
+            self.slots.update({"size_bytes": max(0, entry.get("size_bytes", 0) - freed)}, query.slot == slot)
+        return freed
+
+
+# Process-wide cache shared by all ContractBuilder instances
+_cache: Optional[TargetCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_target_cache() -> TargetCache:
+    """Get or create the global target cache instance."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = TargetCache()
+        return _cache
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Inspect or clear the shared Soroban build cache")
+    parser.add_argument("command", choices=["info", "clear"], help="info: show cache contents, clear: delete all slots")
+    args = parser.parse_args()
+
+    cache = get_target_cache()
+    if args.command == "info":
+        print(json.dumps(cache.info(), indent=2))
+    else:
+        print(json.dumps(cache.clear(), indent=2))
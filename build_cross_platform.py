@@ -74,6 +74,19 @@ class CrossPlatformBuilder:
             ('contract_builder.py', 'contract_builder.py'),
             ('contract_deployer.py', 'contract_deployer.py'),
             ('deployment_manager.py', 'deployment_manager.py'),
+            ('job_manager.py', 'job_manager.py'),
+            ('build_cache.py', 'build_cache.py'),
+            ('artifact_store.py', 'artifact_store.py'),
+            ('cargo_progress.py', 'cargo_progress.py'),
+            ('wasm_analyzer.py', 'wasm_analyzer.py'),
+            ('toolchain.py', 'toolchain.py'),
+            ('soroban_rpc.py', 'soroban_rpc.py'),
+            ('deploy_scheduler.py', 'deploy_scheduler.py'),
+            ('deploy_state.py', 'deploy_state.py'),
+            ('deployment_verifier.py', 'deployment_verifier.py'),
+            ('deployment_store.py', 'deployment_store.py'),
+            ('deployment_export.py', 'deployment_export.py'),
+            ('deployment_retention.py', 'deployment_retention.py'),
             # Soroban contract generator
             ('soroban_generator.py', 'soroban_generator.py'),
             ('jinja2', 'jinja2'),
@@ -134,6 +147,14 @@ class CrossPlatformBuilder:
                     subprocess.run(['pyrcc5', str(qrc_src), '-o', str(resources_py)], check=True)
         except Exception as e:
             print(f"[WARN] Could not compile Qt resources: {e}")
+        # Compile Soroban templates to Python modules so the frozen app skips Jinja2 parsing
+        try:
+            cmd = [sys.executable, '-c',
+                   'from soroban_generator import SorobanGenerator; '
+                   'SorobanGenerator(bytecode_cache=False).compile_templates()']
+            subprocess.run(cmd, cwd=str(self.build_dir), check=True)
+        except Exception as e:
+            print(f"[WARN] Could not precompile Soroban templates: {e}")
     
     def build_executable(self, target_platform=None):
         """Build the executable using PyInstaller"""
@@ -179,6 +200,19 @@ class CrossPlatformBuilder:
             'contract_builder',
             'contract_deployer',
             'deployment_manager',
+            'job_manager',
+            'build_cache',
+            'artifact_store',
+            'cargo_progress',
+            'wasm_analyzer',
+            'toolchain',
+            'soroban_rpc',
+            'deploy_scheduler',
+            'deploy_state',
+            'deployment_verifier',
+            'deployment_store',
+            'deployment_export',
+            'deployment_retention',
             # Soroban contract generator
             'soroban_generator',
             'jinja2',
@@ -187,6 +221,7 @@ class CrossPlatformBuilder:
             'ui',
             'ui.soroban',
             'ui.soroban.deployment_list_dialog',
+            'ui.soroban.deployment_table_model',
             'ui.soroban.deployment_completion_dialog',
             'ui.soroban.wallet_selection_dialog',
             # Pinwheel daemon
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Cargo Build Progress
+Runs the contract compiler as a streaming subprocess and turns cargo's
+machine-readable (--message-format=json) output into progress events
+"""
+
+import os
+import re
+import sys
+import json
+import queue
+import shlex
+import signal
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+
+# Status lines cargo writes to stderr even in JSON mode, e.g. "   Compiling soroban-sdk v21.0.0"
+_COMPILING_RE = re.compile(r"^\s*Compiling (\S+) v(\S+)")
+
+
+def _package_name(package_id: str) -> Optional[str]:
+    """Package name from a cargo package id in either the old or the new format."""
+    if "#" in package_id:
+        # path+file:///work/sdk#soroban-sdk@21.0.0 or path+file:///work/my_crate#0.1.0
+        fragment = package_id.rsplit("#", 1)[1]
+        if "@" in fragment:
+            return fragment.split("@", 1)[0]
+        return package_id.rsplit("#", 1)[0].rstrip("/").rsplit("/", 1)[-1] or None
+    # soroban-sdk 21.0.0 (registry+https://github.com/rust-lang/crates.io-index)
+    return package_id.split(" ", 1)[0] or None
+
+
+def parse_cargo_command(line: str) -> Optional[Dict]:
+    """
+    Parse a command printed by `stellar contract build --print-commands-only`
+
+    Newer CLIs prefix the command with environment assignments
+    (e.g. CARGO_BUILD_RUSTFLAGS=...), which are returned separately.
+
+    Args:
+        line: One printed command line
+
+    Returns:
+        Dict with "env" and "args", or None if the line is not a cargo command
+    """
+    try:
+        tokens = shlex.split(line, posix=(sys.platform != "win32"))
+    except ValueError:
+        return None
+
+    env = {}
+    while tokens and "=" in tokens[0] and not tokens[0].startswith("-"):
+        key, _, value = tokens.pop(0).partition("=")
+        env[key] = value
+
+    if not tokens or Path(tokens[0]).stem != "cargo":
+        return None
+    return {"env": env, "args": tokens}
+
+
+def estimate_build_units(contract_path: Path, env: Optional[Dict] = None, timeout: int = 30) -> Optional[int]:
+    """
+    Estimate how many compiler artifacts a WASM build of a contract produces
+
+    Walks the resolved dependency graph from `cargo metadata`, following normal
+    and build dependencies only, and counts one unit per library plus one per
+    build script.
+
+    Args:
+        contract_path: Path to contract directory
+        env: Environment for the cargo process
+        timeout: Seconds to allow cargo metadata to run
+
+    Returns:
+        Unit count, or None if cargo metadata is unavailable
+    """
+    try:
+        result = subprocess.run(
+            ["cargo", "metadata", "--format-version", "1",
+             "--filter-platform", "wasm32-unknown-unknown"],
+            capture_output=True,
+            text=True,
+            cwd=str(contract_path),
+            env=env,
+            timeout=timeout,
+            encoding='utf-8',
+            errors='replace'
+        )
+        if result.returncode != 0:
+            return None
+        metadata = json.loads(result.stdout)
+    except (OSError, subprocess.TimeoutExpired, ValueError):
+        return None
+
+    resolve = metadata.get("resolve") or {}
+    nodes = {node["id"]: node for node in resolve.get("nodes", [])}
+    packages = {pkg["id"]: pkg for pkg in metadata.get("packages", [])}
+    roots = [resolve["root"]] if resolve.get("root") else list(metadata.get("workspace_members", []))
+
+    seen = set()
+    pending = list(roots)
+    while pending:
+        pkg_id = pending.pop()
+        if pkg_id in seen or pkg_id not in nodes:
+            continue
+        seen.add(pkg_id)
+        for dep in nodes[pkg_id].get("deps", []):
+            kinds = {k.get("kind") for k in dep.get("dep_kinds", [{"kind": None}])}
+            if kinds & {None, "build"}:
+                pending.append(dep["pkg"])
+
+    units = 0
+    for pkg_id in seen:
+        targets = packages.get(pkg_id, {}).get("targets", [])
+        units += 1
+        if any("custom-build" in t.get("kind", []) for t in targets):
+            units += 1
+    return units or None
+
+
+class CargoProgressParser:
+    """
+    Incremental parser for cargo JSON messages and stderr status lines
+
+    Feed it output lines as they arrive; it tracks compiled units, the crate
+    currently compiling and compiler diagnostics, and returns an event dict
+    for every line that changes the build state.
+    """
+
+    def __init__(self, total_units: Optional[int] = None):
+        """
+        Initialize the parser.
+
+        Args:
+            total_units: Expected number of artifacts (see estimate_build_units)
+        """
+        self.total_units = total_units
+        self.compiled = 0
+        self.current_crate: Optional[str] = None
+        self.diagnostics: List[Dict] = []
+        self.artifacts: Dict[str, List[str]] = {}
+        self.finished: Optional[bool] = None
+
+    @property
+    def error_count(self) -> int:
+        return sum(1 for d in self.diagnostics if d["level"] == "error")
+
+    @property
+    def warning_count(self) -> int:
+        return sum(1 for d in self.diagnostics if d["level"] == "warning")
+
+    def fraction(self) -> Optional[float]:
+        """Share of units compiled so far, or None when the total is unknown."""
+        if not self.total_units:
+            return None
+        return min(1.0, self.compiled / self.total_units)
+
+    def feed_stdout(self, line: str) -> Optional[Dict]:
+        """
+        Parse one line of cargo's JSON stdout
+
+        Returns:
+            Event dict ("artifact", "diagnostic" or "build-finished"), or None
+        """
+        line = line.strip()
+        if not line.startswith("{"):
+            return None
+        try:
+            message = json.loads(line)
+        except ValueError:
+            return None
+
+        reason = message.get("reason")
+        target = message.get("target") or {}
+
+        if reason == "compiler-artifact":
+            self.compiled += 1
+            name = target.get("name", "")
+            if "custom-build" in target.get("kind", []):
+                # Build script targets are all called build-script-build
+                name = f"{_package_name(message.get('package_id', '')) or name} (build script)"
+            else:
+                self.artifacts[name] = message.get("filenames", [])
+            return {
+                "type": "artifact",
+                "crate": name,
+                "fresh": message.get("fresh", False),
+                "compiled": self.compiled,
+                "total": self.total_units,
+            }
+
+        if reason == "compiler-message":
+            diagnostic = self._diagnostic(target.get("name"), message.get("message") or {})
+            if diagnostic is None:
+                return None
+            self.diagnostics.append(diagnostic)
+            return {"type": "diagnostic", **diagnostic}
+
+        if reason == "build-finished":
+            self.finished = bool(message.get("success"))
+            return {"type": "build-finished", "success": self.finished}
+
+        return None
+
+    def feed_stderr(self, line: str) -> Optional[Dict]:
+        """
+        Parse one line of cargo's stderr
+
+        Returns:
+            A "compiling" event when a new crate starts, otherwise None
+        """
+        match = _COMPILING_RE.match(line)
+        if not match:
+            return None
+        self.current_crate = match.group(1)
+        return {
+            "type": "compiling",
+            "crate": match.group(1),
+            "version": match.group(2),
+            "compiled": self.compiled,
+            "total": self.total_units,
+        }
+
+    def rendered_diagnostics(self) -> str:
+        """All diagnostics as cargo would have printed them."""
+        return "".join(d["rendered"] for d in self.diagnostics if d.get("rendered"))
+
+    @staticmethod
+    def _diagnostic(crate: Optional[str], message: Dict) -> Optional[Dict]:
+        """Reduce a rustc diagnostic to level, message, spans and rendered text."""
+        level = message.get("level", "")
+        if level not in ("error", "warning"):
+            # Drop notes/help that arrive as standalone messages and the
+            # "aborting due to previous error" summary
+            return None
+        if level == "error" and not message.get("spans") and message.get("message", "").startswith("aborting"):
+            return None
+
+        spans = [
+            {
+                "file": span.get("file_name"),
+                "line_start": span.get("line_start"),
+                "line_end": span.get("line_end"),
+                "column_start": span.get("column_start"),
+                "column_end": span.get("column_end"),
+                "label": span.get("label"),
+            }
+            for span in message.get("spans", [])
+            if span.get("is_primary")
+        ]
+        return {
+            "level": level,
+            "crate": crate,
+            "code": (message.get("code") or {}).get("code"),
+            "message": message.get("message", ""),
+            "spans": spans,
+            "rendered": message.get("rendered") or "",
+        }
+
+
+def run_streaming(cmd: List[str], cwd: Path, env: Optional[Dict] = None, timeout: int = 300,
+                  on_stdout: Optional[Callable[[str], None]] = None,
+                  on_stderr: Optional[Callable[[str], None]] = None,
+                  cancel_event: Optional[threading.Event] = None,
+                  should_abort: Optional[Callable[[], bool]] = None) -> Dict:
+    """
+    Run a command and hand each output line to a callback as it is produced
+
+    The process is killed as soon as cancel_event is set, should_abort()
+    returns True or the timeout passes, rather than after it exits.
+
+    Args:
+        cmd: Command and arguments
+        cwd: Working directory
+        env: Environment for the process
+        timeout: Seconds before the process is killed
+        on_stdout: Called with every stdout line
+        on_stderr: Called with every stderr line
+        cancel_event: Kill the process when this event is set
+        should_abort: Polled after each line; kill the process when it returns True
+
+    Returns:
+        Dict with returncode, stdout, stderr, timed_out, cancelled and aborted
+    """
+    popen_kwargs = {}
+    if sys.platform == "win32":
+        popen_kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        # Own process group so rustc children die with cargo
+        popen_kwargs["start_new_session"] = True
+
+    proc = subprocess.Popen(
+        cmd,
+        cwd=str(cwd),
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding='utf-8',
+        errors='replace',
+        bufsize=1,
+        **popen_kwargs
+    )
+
+    lines: "queue.Queue" = queue.Queue()
+
+    def reader(stream, name):
+        for line in stream:
+            lines.put((name, line))
+        lines.put((name, None))
+
+    readers = [
+        threading.Thread(target=reader, args=(proc.stdout, "stdout"), daemon=True),
+        threading.Thread(target=reader, args=(proc.stderr, "stderr"), daemon=True),
+    ]
+    for thread in readers:
+        thread.start()
+
+    stdout, stderr = [], []
+    open_streams = 2
+    deadline = time.monotonic() + timeout
+    outcome = {"timed_out": False, "cancelled": False, "aborted": False}
+
+    while open_streams:
+        if cancel_event is not None and cancel_event.is_set():
+            outcome["cancelled"] = True
+        elif time.monotonic() > deadline:
+            outcome["timed_out"] = True
+        elif should_abort is not None and should_abort():
+            outcome["aborted"] = True
+        if any(outcome.values()):
+            _kill(proc)
+            break
+
+        try:
+            name, line = lines.get(timeout=0.2)
+        except queue.Empty:
+            continue
+
+        if line is None:
+            open_streams -= 1
+        elif name == "stdout":
+            stdout.append(line)
+            if on_stdout:
+                on_stdout(line)
+        else:
+            stderr.append(line)
+            if on_stderr:
+                on_stderr(line)
+
+    try:
+        returncode = proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        _kill(proc)
+        returncode = proc.wait()
+
+    return {
+        "returncode": returncode,
+        "stdout": "".join(stdout),
+        "stderr": "".join(stderr),
+        **outcome,
+    }
+
+
+def _kill(proc: subprocess.Popen):
+    """Kill a process started by run_streaming and its children."""
+    if proc.poll() is not None:
+        return
+    try:
+        if sys.platform == "win32":
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(proc.pid)], capture_output=True)
+        else:
+            os.killpg(proc.pid, signal.SIGKILL)
+    except (OSError, subprocess.SubprocessError):
+        proc.kill()
@@ -4,36 +4,80 @@ Soroban Contract Build System
 Handles compilation of Soroban smart contracts from source files
 """
 
+import os
+import re
+import time
+import threading
 import subprocess
-import tempfile
 import uuid
-import shutil
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Optional, Callable
+from typing import Dict, List, Optional, Callable
+
+from build_cache import TargetCache, get_target_cache, read_package_name
+from artifact_store import ArtifactStore, get_artifact_store, compute_source_key
+from cargo_progress import CargoProgressParser, estimate_build_units, parse_cargo_command, run_streaming
+from toolchain import get_toolchain_registry
+from wasm_analyzer import WasmFormatError, analyze_wasm, strip_custom_sections as strip_wasm_sections
+
+
+def _newest_source_mtime(contract_path: Path) -> float:
+    """Modification time of the most recently changed Cargo.toml or src/ file."""
+    files = [contract_path / "Cargo.toml", *(contract_path / "src").rglob("*")]
+    return max((f.stat().st_mtime for f in files if f.is_file()), default=0.0)
 
 
 class ContractBuilder:
     """Builds Soroban contracts from source files using the Stellar CLI"""
 
-    def __init__(self):
-        self.temp_dir = Path(tempfile.mkdtemp(prefix="soroban_build_"))
+    def __init__(self, target_cache: Optional[TargetCache] = None, use_target_cache: bool = True,
+                 artifact_store: Optional[ArtifactStore] = None, use_artifact_cache: bool = True):
+        """
+        Initialize the contract builder.
+
+        Args:
+            target_cache: Optional shared Cargo target cache (defaults to the process-wide cache)
+            use_target_cache: Set False to build into the contract's own target/ directory
+            artifact_store: Optional WASM artifact store (defaults to the process-wide store)
+            use_artifact_cache: Set False to always compile, even for previously built sources
+        """
         self.cli_cmd = "stellar"
         self.build_status = {"status": "idle", "progress": 0}
+        self.target_cache = (target_cache or get_target_cache()) if use_target_cache else None
+        # Built WASMs live in the managed artifact store rather than per-builder temp dirs
+        self.artifact_store = artifact_store or get_artifact_store()
+        self.use_artifact_cache = use_artifact_cache
+        self._build_ids: List[str] = []
     
-    def build_contract(self, contract_path: Path, progress_callback: Optional[Callable] = None) -> Dict:
+    def build_contract(self, contract_path: Path, progress_callback: Optional[Callable] = None,
+                       event_callback: Optional[Callable[[Dict], None]] = None,
+                       cancel_event: Optional[threading.Event] = None,
+                       fail_fast: bool = True, strip_custom_sections: bool = False) -> Dict:
         """
         Build Soroban contract from source files
 
+        The compiler runs as a streaming subprocess. When the Stellar CLI can print
+        its cargo command, cargo is run directly with --message-format=json and
+        progress is reported per compiled crate as the messages arrive.
+
         Args:
             contract_path: Path to contract directory
             progress_callback: Optional callback for progress updates (message, percentage)
+            event_callback: Optional callback receiving structured build events:
+                "compiling" (crate, compiled, total), "artifact" (crate, fresh,
+                compiled, total), "diagnostic" (level, message, spans, rendered)
+                and "build-finished" (success)
+            cancel_event: Kill the compiler and return as soon as this event is set
+            fail_fast: Kill the compiler at the first error instead of letting it finish
+            strip_custom_sections: Remove custom sections other than the Soroban
+                contract spec/metadata from the returned WASM to cut upload size
 
         Returns:
             Dict containing build results or error information
         """
         build_id = str(uuid.uuid4())
         contract_path = Path(contract_path)
+        target_dir = None
 
         try:
             # 1. Input Validation
@@ -66,42 +110,111 @@ class ContractBuilder:
                     "build_id": build_id
                 }
 
-            # 5. Execute Soroban Build
+            # 5. Reuse the WASM from an earlier build of byte-identical sources
+            source_key = None
+            if self.use_artifact_cache:
+                source_key = compute_source_key(contract_path, soroban_check["version"])
+                cached = self.artifact_store.lookup(source_key)
+                if cached:
+                    return self._cached_build_result(build_id, contract_path, cached, soroban_check,
+                                                     progress_callback, strip_custom_sections)
+
+            # 6. Execute Soroban Build
             # soroban contract build must be run from within the contract directory
-            # It outputs to target/wasm32-unknown-unknown/release/{contract_name}.wasm
-            cmd = [self.cli_cmd, "contract", "build"]
+            # It outputs to <target>/wasm32-unknown-unknown/release/{contract_name}.wasm
+
+            # Point cargo at the shared target cache so dependencies compiled for
+            # earlier contracts are reused instead of rebuilt from scratch
+            env = os.environ.copy()
+            crate_name = read_package_name(contract_path)
+            if self.target_cache:
+                target_dir = self.target_cache.acquire(contract_path)
+                env["CARGO_TARGET_DIR"] = str(target_dir)
+
+            cmd, env, json_messages = self._compiler_command(contract_path, env)
+            parser = CargoProgressParser(estimate_build_units(contract_path, env) if json_messages else None)
 
             if progress_callback:
                 progress_callback("Compiling WASM...", 30)
 
-            result = subprocess.run(
+            def on_event(event: Optional[Dict]):
+                if event is None:
+                    return
+                if event_callback:
+                    event_callback(event)
+                if progress_callback and event["type"] in ("compiling", "artifact"):
+                    fraction = parser.fraction()
+                    total = parser.total_units or "?"
+                    progress_callback(
+                        f"Compiling {parser.current_crate or event['crate']} ({parser.compiled}/{total})",
+                        30 + int(50 * fraction) if fraction is not None else 30
+                    )
+
+            compile_started = time.monotonic()
+            result = run_streaming(
                 cmd,
-                capture_output=True,
-                text=True,
-                cwd=str(contract_path),
+                cwd=contract_path,
+                env=env,
                 timeout=300,  # 5 minute timeout for compilation
-                encoding='utf-8',
-                errors='replace'  # Handle encoding errors gracefully
+                on_stdout=(lambda line: on_event(parser.feed_stdout(line))) if json_messages else None,
+                on_stderr=lambda line: on_event(parser.feed_stderr(line)),
+                cancel_event=cancel_event,
+                should_abort=(lambda: parser.error_count > 0) if fail_fast else None
             )
 
+            compile_time = round(time.monotonic() - compile_started, 2)
+
+            # In JSON mode stdout is machine output; diagnostics are rendered from it
+            build_output = result["stderr"] + parser.rendered_diagnostics() if json_messages else result["stdout"]
+
             if progress_callback:
                 progress_callback("Processing build output...", 80)
 
-            # 6. Validate Build Results
-            if result.returncode != 0:
+            # 7. Validate Build Results
+            if result["cancelled"]:
+                return {
+                    "success": False,
+                    "error": "Build cancelled",
+                    "cancelled": True,
+                    "build_id": build_id
+                }
+
+            if result["timed_out"]:
+                return {
+                    "success": False,
+                    "error": "Build timed out after 5 minutes",
+                    "build_id": build_id
+                }
+
+            if result["returncode"] != 0 or result["aborted"]:
                 return {
                     "success": False,
                     "error": "Build failed",
-                    "stderr": result.stderr,
-                    "stdout": result.stdout,
+                    "stderr": result["stderr"] + parser.rendered_diagnostics(),
+                    "stdout": result["stdout"] if not json_messages else "",
+                    "diagnostics": parser.diagnostics,
+                    "compile_time": compile_time,
                     "build_id": build_id
                 }
 
-            # 7. Find Generated WASM Files
-            # The WASM is output to target/wasm32-unknown-unknown/release/ within contract_path
-            wasm_output_dir = contract_path / "target" / "wasm32-unknown-unknown" / "release"
+            # 8. Find Generated WASM Files
+            # The WASM is output to target/wasm32-unknown-unknown/release/ within the target dir
+            target_root = target_dir or (contract_path / "target")
+            wasm_output_dir = target_root / "wasm32-unknown-unknown" / "release"
+
             wasm_files = list(wasm_output_dir.glob("*.wasm")) if wasm_output_dir.exists() else []
 
+            # cargo reports the exact output file in its artifact message
+            reported = [Path(f) for f in parser.artifacts.get(crate_name or "", []) if f.endswith(".wasm")]
+            if reported and reported[0].exists():
+                wasm_files = reported
+
+            # A shared target dir holds every contract's WASM, so keep only this crate's
+            if crate_name:
+                named_wasm = [f for f in wasm_files if f.stem == crate_name]
+                if named_wasm or target_dir:
+                    wasm_files = named_wasm
+
             # Filter out deps and build script artifacts, keep only the main contract
             wasm_files = [f for f in wasm_files if not f.name.startswith("deps")]
 
@@ -114,22 +227,28 @@ class ContractBuilder:
                 return {
                     "success": False,
                     "error": "No WASM file generated. Check build output for errors.",
-                    "stderr": result.stderr,
-                    "stdout": result.stdout,
+                    "stderr": result["stderr"],
+                    "stdout": result["stdout"],
                     "build_id": build_id
                 }
 
             # Prefer the contract-named wasm file
             wasm_path = wasm_files[0]
 
-            # 8. Copy WASM to temp directory for deployment
-            build_dir = self.temp_dir / build_id
-            build_dir.mkdir(exist_ok=True)
+            # 9. Keep the WASM in the artifact store for deployment. The cache entry
+            # is stored first so the build copy can hard-link it.
+            source_wasm = wasm_path
+            if self.use_artifact_cache:
+                source_wasm = self.artifact_store.store(source_key, wasm_path, {
+                    "contract_path": str(contract_path),
+                    "soroban_version": soroban_check["version"],
+                })["wasm_path"]
 
-            dest_wasm_path = build_dir / wasm_path.name
-            shutil.copy2(wasm_path, dest_wasm_path)
+            dest_wasm_path, wasm_report = self._add_build(
+                build_id, source_wasm, contract_path, wasm_path.name, strip_custom_sections
+            )
 
-            # 9. Generate Build Metadata
+            # 10. Generate Build Metadata
             build_metadata = {
                 "build_id": build_id,
                 "contract_path": str(contract_path),
@@ -138,7 +257,14 @@ class ContractBuilder:
                 "wasm_size": dest_wasm_path.stat().st_size,
                 "build_time": datetime.utcnow().isoformat(),
                 "soroban_version": soroban_check["version"],
-                "build_output": result.stdout
+                "target_dir": str(target_root),
+                "source_key": source_key,
+                "cache_hit": False,
+                "compile_time": compile_time,
+                "wasm_report": wasm_report,
+                "warnings": parser.warning_count,
+                "diagnostics": parser.diagnostics,
+                "build_output": build_output
             }
 
             if progress_callback:
@@ -148,6 +274,7 @@ class ContractBuilder:
                 "success": True,
                 "build_id": build_id,
                 "wasm_path": str(dest_wasm_path),
+                "cache_hit": False,
                 "metadata": build_metadata
             }
 
@@ -163,7 +290,325 @@ class ContractBuilder:
                 "error": f"Build exception: {str(e)}",
                 "build_id": build_id
             }
+        finally:
+            if target_dir is not None:
+                self.target_cache.release(target_dir, keep_crate=crate_name)
+
+    def _compiler_command(self, contract_path: Path, env: Dict) -> tuple:
+        """
+        Work out how to invoke the compiler for a contract
+
+        Asks the Stellar CLI for the cargo command it would run, so cargo can be
+        started directly with JSON message output. Falls back to plain
+        `stellar contract build` when the CLI cannot print a single command.
+
+        Args:
+            contract_path: Path to contract directory
+            env: Base environment for the build
+
+        Returns:
+            Tuple of (command, environment, emits_json_messages)
+        """
+        try:
+            printed = subprocess.run(
+                [self.cli_cmd, "contract", "build", "--print-commands-only"],
+                capture_output=True,
+                text=True,
+                cwd=str(contract_path),
+                env=env,
+                timeout=30,
+                encoding='utf-8',
+                errors='replace'
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            printed = None
+
+        if printed is not None and printed.returncode == 0:
+            commands = [parse_cargo_command(line) for line in printed.stdout.splitlines() if line.strip()]
+            commands = [c for c in commands if c]
+            if len(commands) == 1:
+                return commands[0]["args"] + ["--message-format=json"], {**env, **commands[0]["env"]}, True
+
+        return [self.cli_cmd, "contract", "build"], env, False
     
+    def _cached_build_result(self, build_id: str, contract_path: Path, cached: Dict,
+                             soroban_check: Dict, progress_callback: Optional[Callable] = None,
+                             strip: bool = False) -> Dict:
+        """
+        Build result for a source key that is already in the artifact store
+
+        Args:
+            build_id: Unique build identifier
+            contract_path: Path to contract directory
+            cached: Entry returned by ArtifactStore.lookup()
+            soroban_check: Result of the Stellar CLI check
+            progress_callback: Optional progress callback
+            strip: Strip custom sections from the returned WASM
+
+        Returns:
+            Dict shaped like a successful build_contract() result
+        """
+        dest_wasm_path, wasm_report = self._add_build(
+            build_id, cached["wasm_path"], contract_path,
+            cached.get("wasm_name", Path(cached["wasm_path"]).name), strip
+        )
+
+        build_metadata = {
+            "build_id": build_id,
+            "contract_path": str(contract_path),
+            "wasm_path": str(dest_wasm_path),
+            "original_wasm_path": cached["wasm_path"],
+            "wasm_size": dest_wasm_path.stat().st_size,
+            "build_time": datetime.utcnow().isoformat(),
+            "soroban_version": soroban_check["version"],
+            "source_key": cached["source_key"],
+            "cache_hit": True,
+            "compile_time": 0.0,
+            "wasm_report": wasm_report,
+            "build_output": ""
+        }
+
+        if progress_callback:
+            progress_callback("Build complete (cached)!", 100)
+
+        return {
+            "success": True,
+            "build_id": build_id,
+            "wasm_path": str(dest_wasm_path),
+            "cache_hit": True,
+            "metadata": build_metadata
+        }
+
+    def build_workspace(self, workspace_path: Path, member_paths: List[Path],
+                        progress_callback: Optional[Callable] = None, timeout: int = 1800) -> Dict:
+        """
+        Build every member of a generated Cargo workspace in one compiler run
+
+        Cargo schedules the member crates across all cores and compiles the shared
+        dependencies once, so a batch costs roughly one contract build plus the
+        per-crate work rather than N full builds. Members whose sources are already
+        in the artifact store are served from it and not recompiled.
+
+        Args:
+            workspace_path: Workspace root containing the [workspace] Cargo.toml
+            member_paths: Member contract directories to collect WASM for
+            progress_callback: Optional callback for progress updates (message, percentage)
+            timeout: Seconds to allow for the whole workspace build
+
+        Returns:
+            Dict containing success, workspace_path, build_output and "results", a
+            per-member list of {contract_path, crate, success, build_id, wasm_path,
+            wasm_size, cache_hit, compile_time, error}. compile_time is the
+            duration of the shared compiler run.
+        """
+        workspace_path = Path(workspace_path)
+        member_paths = [Path(p) for p in member_paths]
+        workspace_toml = workspace_path / "Cargo.toml"
+        target_dir = None
+        pending = []
+        results = []
+
+        for member_path in member_paths:
+            item = {
+                "contract_path": str(member_path),
+                "crate": read_package_name(member_path),
+                "success": False,
+                "build_id": str(uuid.uuid4()),
+                "wasm_path": None,
+                "wasm_size": None,
+                "cache_hit": False,
+                "compile_time": 0.0,
+                "error": None,
+            }
+            results.append(item)
+            structure_check = self.validate_contract_structure(member_path)
+            if not structure_check["valid"]:
+                item["error"] = structure_check["error"]
+            elif not item["crate"]:
+                item["error"] = "Cargo.toml missing package name"
+
+        def summary(build_output: str = "", error: Optional[str] = None) -> Dict:
+            return {
+                "success": error is None and all(r["success"] for r in results),
+                "workspace_path": str(workspace_path),
+                "results": results,
+                "build_output": build_output,
+                "error": error,
+            }
+
+        if not workspace_toml.exists():
+            return summary(error="Workspace Cargo.toml not found")
+
+        soroban_check = self._check_stellar_cli()
+        if not soroban_check["available"]:
+            return summary(error=f"Stellar CLI not available: {soroban_check['error']}")
+
+        if progress_callback:
+            progress_callback("Checking build cache...", 5)
+
+        # 1. Serve members with unchanged sources from the artifact store
+        for item in results:
+            if item["error"]:
+                continue
+            item["source_key"] = None
+            if self.use_artifact_cache:
+                # The workspace root holds the release profile, so it is part of the key
+                item["source_key"] = compute_source_key(
+                    Path(item["contract_path"]), soroban_check["version"], [workspace_toml]
+                )
+                cached = self.artifact_store.lookup(item["source_key"])
+                if cached:
+                    self._fill_member_result(item, cached["wasm_path"], cache_hit=True)
+                    continue
+            pending.append(item)
+
+        if not pending:
+            if progress_callback:
+                progress_callback("Build complete (cached)!", 100)
+            return summary()
+
+        # 2. One stellar contract build at the workspace root builds all members
+        env = os.environ.copy()
+        crates = [item["crate"] for item in pending if item["crate"]]
+        if self.target_cache:
+            target_dir = self.target_cache.acquire(Path(pending[0]["contract_path"]), crate_names=crates)
+            env["CARGO_TARGET_DIR"] = str(target_dir)
+
+        if progress_callback:
+            progress_callback(f"Compiling {len(pending)} contracts...", 20)
+
+        try:
+            cmd, env, json_messages = self._compiler_command(workspace_path, env)
+            parser = CargoProgressParser()
+            started = time.monotonic()
+            result = run_streaming(
+                cmd,
+                cwd=workspace_path,
+                env=env,
+                timeout=timeout,
+                on_stdout=parser.feed_stdout if json_messages else None,
+                on_stderr=parser.feed_stderr
+            )
+
+            if result["timed_out"]:
+                return summary(error=f"Workspace build timed out after {timeout} seconds")
+
+            compile_time = round(time.monotonic() - started, 2)
+
+            if progress_callback:
+                progress_callback("Collecting WASM files...", 80)
+
+            # 3. Attribute results per member; a failing crate does not hide the others
+            wasm_output_dir = (target_dir or workspace_path / "target") / "wasm32-unknown-unknown" / "release"
+            failed_crates = set(re.findall(r"could not compile `([^`]+)`", result["stderr"]))
+
+            for item in pending:
+                crate = item["crate"]
+                crate_failed = crate in failed_crates or crate.replace("_", "-") in failed_crates
+                if json_messages:
+                    # cargo reports each package's output whether it was rebuilt or already up to date
+                    reported = [Path(f) for name in (crate, crate.replace("-", "_"))
+                                for f in parser.artifacts.get(name, []) if f.endswith(".wasm")]
+                    wasm_path = reported[0] if reported else None
+                else:
+                    wasm_path = wasm_output_dir / f"{crate}.wasm"
+                    # A clean exit means every member is current. After a failure cargo
+                    # may have stopped before reaching this package, so an output older
+                    # than the package's sources is a leftover, as cargo would judge it.
+                    if result["returncode"] != 0 and wasm_path.exists() and \
+                            wasm_path.stat().st_mtime < _newest_source_mtime(Path(item["contract_path"])):
+                        wasm_path = None
+
+                if crate_failed or wasm_path is None or not wasm_path.exists():
+                    item["error"] = "Build failed" if crate_failed or result["returncode"] != 0 \
+                        else "No WASM file generated. Check build output for errors."
+                    continue
+
+                if self.use_artifact_cache:
+                    wasm_path = self.artifact_store.store(item["source_key"], wasm_path, {
+                        "contract_path": item["contract_path"],
+                        "soroban_version": soroban_check["version"],
+                    })["wasm_path"]
+                self._fill_member_result(item, wasm_path, cache_hit=False)
+                item["compile_time"] = compile_time
+
+            if progress_callback:
+                progress_callback("Build complete!", 100)
+
+            # In JSON mode stdout is machine output; diagnostics are rendered from it
+            output = summary(result["stderr"] + parser.rendered_diagnostics() if json_messages else result["stdout"])
+            output["stderr"] = result["stderr"]
+            return output
+
+        except subprocess.TimeoutExpired:
+            return summary(error=f"Workspace build timed out after {timeout} seconds")
+        except Exception as e:
+            return summary(error=f"Build exception: {str(e)}")
+        finally:
+            if target_dir is not None:
+                self.target_cache.release(target_dir, keep_crates=crates)
+
+    def _fill_member_result(self, item: Dict, wasm_path: Path, cache_hit: bool) -> None:
+        """Add a member's WASM to the artifact store and mark the result successful."""
+        dest_wasm_path, _report = self._add_build(
+            item["build_id"], wasm_path, Path(item["contract_path"]), f"{item['crate']}.wasm"
+        )
+
+        item.update({
+            "success": True,
+            "wasm_path": str(dest_wasm_path),
+            "wasm_size": dest_wasm_path.stat().st_size,
+            "cache_hit": cache_hit,
+        })
+
+    def _add_build(self, build_id: str, wasm_path: Path, contract_path: Path, wasm_name: str,
+                   strip: bool = False) -> tuple:
+        """
+        Post-build stage: analyze the WASM, optionally strip custom sections, and
+        register the result in the artifact store
+
+        Args:
+            build_id: Unique build identifier
+            wasm_path: Compiled (or cached) WASM file
+            contract_path: Path to contract directory
+            wasm_name: File name for the stored WASM
+            strip: Remove custom sections other than the Soroban spec/metadata
+
+        Returns:
+            Tuple of (stored WASM path, analysis report). The report carries an
+            "error" key instead when the module could not be parsed.
+        """
+        source = Path(wasm_path)
+        stripped_path = None
+        removed = []
+
+        try:
+            data = source.read_bytes()
+            if strip:
+                stripped, removed = strip_wasm_sections(data)
+                if removed:
+                    # Written beside the source, never over it: the source may be a cache entry
+                    stripped_path = source.with_name(f".{build_id}.stripped.wasm")
+                    stripped_path.write_bytes(stripped)
+                    data = stripped
+            report = analyze_wasm(data)
+            if strip:
+                report["stripped_sections"] = removed
+                report["stripped_bytes"] = source.stat().st_size - len(data)
+        except WasmFormatError as e:
+            report = {"error": str(e)}
+
+        try:
+            stored = self.artifact_store.add_build(
+                build_id, stripped_path or source, {"contract_path": str(contract_path)}, wasm_name=wasm_name
+            )
+        finally:
+            if stripped_path is not None:
+                stripped_path.unlink(missing_ok=True)
+
+        self._build_ids.append(build_id)
+        return Path(stored["wasm_path"]), report
+
     def validate_contract_structure(self, contract_path: Path) -> Dict:
         """
         Validate required Soroban contract files
@@ -206,47 +651,14 @@ class ContractBuilder:
         """
         Check if Stellar CLI is available and get version
 
+        Served from the shared toolchain registry, which only spawns
+        `stellar --version` again when PATH or the binary changes.
+
         Returns:
             Dict with availability status and version info
         """
-        try:
-            result = subprocess.run(
-                [self.cli_cmd, "--version"],
-                capture_output=True,
-                text=True,
-                timeout=10,
-                encoding='utf-8',
-                errors='replace'
-            )
-
-            if result.returncode == 0:
-                version = result.stdout.strip()
-                return {
-                    "available": True,
-                    "version": version
-                }
-            else:
-                return {
-                    "available": False,
-                    "error": "Stellar CLI returned non-zero exit code"
-                }
+        return get_toolchain_registry().check_stellar_cli(self.cli_cmd)
 
-        except subprocess.TimeoutExpired:
-            return {
-                "available": False,
-                "error": "Stellar CLI command timed out"
-            }
-        except FileNotFoundError:
-            return {
-                "available": False,
-                "error": "Stellar CLI not found in PATH. Install with: cargo install stellar-cli"
-            }
-        except Exception as e:
-            return {
-                "available": False,
-                "error": f"Error checking Stellar CLI: {str(e)}"
-            }
-    
     def get_build_output(self, build_id: str) -> Dict:
         """
         Retrieve build results for a specific build ID
@@ -257,50 +669,46 @@ class ContractBuilder:
         Returns:
             Dict with build results or error
         """
-        build_dir = self.temp_dir / build_id
-        
-        if not build_dir.exists():
+        entry = self.artifact_store.get_build(build_id)
+
+        if entry is None:
             return {"success": False, "error": "Build ID not found"}
-        
-        # Find WASM file
-        wasm_files = list(build_dir.rglob("*.wasm"))
-        if not wasm_files:
-            return {"success": False, "error": "No WASM file found"}
-        
+
+        wasm_path = Path(entry["wasm_path"])
         return {
             "success": True,
-            "wasm_path": str(wasm_files[0]),
-            "build_dir": str(build_dir)
+            "wasm_path": str(wasm_path),
+            "build_dir": str(wasm_path.parent)
         }
     
     def cleanup_build_artifacts(self, build_id: str) -> bool:
         """
-        Clean up temporary build files
-        
+        Remove a build's WASM from the artifact store
+
+        Builds referenced by a deployment record are pinned and kept.
+
         Args:
             build_id: Unique build identifier
-            
+
         Returns:
             True if cleanup successful, False otherwise
         """
         try:
-            build_dir = self.temp_dir / build_id
-            if build_dir.exists():
-                shutil.rmtree(build_dir)
-            return True
+            return self.artifact_store.remove_build(build_id)
         except Exception:
             return False
     
     def cleanup_all_artifacts(self) -> bool:
         """
-        Clean up all temporary build artifacts
-        
+        Remove every unpinned build made by this builder from the artifact store
+
         Returns:
             True if cleanup successful, False otherwise
         """
         try:
-            if self.temp_dir.exists():
-                shutil.rmtree(self.temp_dir)
+            for build_id in self._build_ids:
+                self.artifact_store.remove_build(build_id)
+            self._build_ids = []
             return True
         except Exception:
             return False
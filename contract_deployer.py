@@ -1,21 +1,29 @@
 #!/usr/bin/env python3
 """
 Soroban Contract Deployment System
-Handles deployment of compiled Soroban contracts to Stellar networks using the Soroban CLI
+Handles deployment of compiled Soroban contracts to Stellar networks, natively
+through Soroban RPC (default) or with the Stellar CLI
 """
 
 import subprocess
 import uuid
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from pathlib import Path
 
-from wallet_manager import WalletManager
+from wallet_manager import WalletManager, get_wallet_manager
+from toolchain import get_toolchain_registry
+from deploy_state import DeployStateStore, DeployStage, STAGE_STATUS, get_deploy_state_store, stage_timings
 
 
 class ContractDeployer:
-    """Deploys compiled Soroban contracts to Stellar networks using soroban CLI"""
+    """Deploys compiled Soroban contracts to Stellar networks via Soroban RPC or the stellar CLI"""
+
+    # Deployment methods: "rpc" signs and submits with stellar_sdk and uploads
+    # each distinct WASM once; "cli" shells out to `stellar contract deploy`
+    DEPLOY_METHODS = ("rpc", "cli")
 
     # Network configurations
     NETWORK_CONFIG = {
@@ -41,20 +49,35 @@ class ContractDeployer:
         }
     }
 
-    def __init__(self, network: str = "testnet"):
+    def __init__(self, network: str = "testnet", wallet_manager: Optional[WalletManager] = None,
+                 method: str = "rpc", rpc_url: Optional[str] = None,
+                 state_store: Optional[DeployStateStore] = None):
         self.network = network
-        self.wallet_manager = WalletManager()
+        # Shared instance so each deployer does not reopen the wallet database
+        self.wallet_manager = wallet_manager if wallet_manager is not None else get_wallet_manager()
+        # Durable stage tracking, readable from any deployer instance and across restarts
+        self.state_store = state_store if state_store is not None else get_deploy_state_store()
         self.cli_cmd = "stellar"
         self.deployment_status = {}
 
         if network not in self.NETWORK_CONFIG:
             raise ValueError(f"Unknown network: {network}. Valid networks: {list(self.NETWORK_CONFIG.keys())}")
+        if method not in self.DEPLOY_METHODS:
+            raise ValueError(f"Unknown deploy method: {method}. Valid methods: {list(self.DEPLOY_METHODS)}")
 
-        self.config = self.NETWORK_CONFIG[network]
+        self.method = method
+        self.config = dict(self.NETWORK_CONFIG[network])
+        if rpc_url:
+            self.config["rpc_url"] = rpc_url
+        self._rpc_deployer = None
 
     def deploy_contract(self, wasm_path: str, wallet_address: str, wallet_password: str = None) -> Dict:
         """
-        Deploy compiled contract to specified network using soroban CLI
+        Deploy compiled contract to specified network
+
+        With the "rpc" method the WASM is uploaded only if this network has not
+        seen the same code before; otherwise a new instance is created from the
+        installed hash. The secret key never appears on a command line.
 
         Args:
             wasm_path: Path to compiled WASM file
@@ -62,10 +85,30 @@ class ContractDeployer:
             wallet_password: Password for mainnet wallet (if required)
 
         Returns:
-            Dict containing deployment results or error information
+            Dict containing deployment results or error information, with the
+            per-stage timings in stage_timings
         """
         deployment_id = str(uuid.uuid4())
+        self.state_store.create(deployment_id, self.network, wallet_address, str(wasm_path), self.method,
+                                self.config["rpc_url"], self.config["network_passphrase"])
+
+        result = self._deploy(deployment_id, wasm_path, wallet_address, wallet_password)
+
+        if result["success"]:
+            state = self.state_store.advance(
+                deployment_id, DeployStage.CONFIRMED.value,
+                contract_id=result["contract_id"],
+                transaction_hash=result.get("transaction_hash"),
+                wasm_hash=result.get("wasm_hash"),
+                fees_paid=result.get("fees_paid")
+            )
+        else:
+            state = self.state_store.advance(deployment_id, DeployStage.FAILED.value, error=result.get("error", ""))
+        result["stage_timings"] = stage_timings(state) if state else {}
+        return result
 
+    def _deploy(self, deployment_id: str, wasm_path: str, wallet_address: str, wallet_password: str = None) -> Dict:
+        """Run one deployment; deploy_contract tracks its stages around this."""
         try:
             # 1. Validate WASM file exists
             wasm_file = Path(wasm_path)
@@ -103,6 +146,9 @@ class ContractDeployer:
                     "deployment_id": deployment_id
                 }
 
+            if self.method == "rpc":
+                return self._deploy_via_rpc(deployment_id, wasm_file, wallet, secret_key)
+
             # 4. Check Soroban CLI availability
             cli_check = self._check_stellar_cli()
             if not cli_check["available"]:
@@ -127,6 +173,7 @@ class ContractDeployer:
 
             # 6. Execute deployment
             self.deployment_status[deployment_id] = "deploying"
+            self.state_store.advance(deployment_id, DeployStage.INSTANTIATING.value)
 
             result = subprocess.run(
                 cmd,
@@ -273,51 +320,101 @@ class ContractDeployer:
                 "deployment_record": error_record
             }
 
-    def _check_stellar_cli(self) -> Dict:
+    def get_rpc_deployer(self):
+        """Soroban RPC deployer for this network, created on first use."""
+        if self._rpc_deployer is None:
+            from soroban_rpc import RpcDeployer
+            self._rpc_deployer = RpcDeployer(self.config["rpc_url"], self.config["network_passphrase"])
+        return self._rpc_deployer
+
+    def _deploy_via_rpc(self, deployment_id: str, wasm_file: Path, wallet, secret_key: str) -> Dict:
         """
-        Check if Stellar CLI is available and get version
+        Deploy through Soroban RPC (upload once, instantiate many)
 
         Returns:
-            Dict with availability status and version info
+            Deployment result in the same shape as the CLI path, with the
+            transaction hash and fees filled in
         """
-        try:
-            result = subprocess.run(
-                [self.cli_cmd, "--version"],
-                capture_output=True,
-                text=True,
-                timeout=10,
-                encoding='utf-8',
-                errors='replace'
-            )
+        from stellar_sdk import Keypair
+        from stellar_sdk.exceptions import ConnectionError as RpcConnectionError
+        from soroban_rpc import RpcDeployError
 
-            if result.returncode == 0:
-                version = result.stdout.strip()
-                return {
-                    "available": True,
-                    "version": version
-                }
-            else:
-                return {
-                    "available": False,
-                    "error": "Stellar CLI returned non-zero exit code"
-                }
+        record = {
+            "deployment_id": deployment_id,
+            "contract_id": "",
+            "network": self.network,
+            "wasm_path": str(wasm_file),
+            "wasm_hash": "",
+            "wallet_address": wallet.address,
+            "deployment_wallet": wallet.label or wallet.address[:8] + "...",
+            "transaction_hash": "",
+            "stellar_expert_url": "",
+            "timestamp": datetime.utcnow().isoformat(),
+            "status": "",
+            "wasm_size": wasm_file.stat().st_size,
+            "fees_paid": 0,
+            "error": ""
+        }
 
-        except subprocess.TimeoutExpired:
-            return {
-                "available": False,
-                "error": "Stellar CLI command timed out"
-            }
-        except FileNotFoundError:
-            return {
-                "available": False,
-                "error": "Stellar CLI not found in PATH. Install with: cargo install stellar-cli"
-            }
-        except Exception as e:
+        self.deployment_status[deployment_id] = "deploying"
+        try:
+            result = self.get_rpc_deployer().deploy(
+                Keypair.from_secret(secret_key), wasm_file.read_bytes(),
+                on_stage=lambda stage, **fields: self.state_store.advance(deployment_id, stage, **fields)
+            )
+        except (RpcDeployError, RpcConnectionError) as e:
+            failure = e if isinstance(e, RpcDeployError) else RpcDeployError(f"RPC unreachable: {e}", transient=True)
+            record.update(status="failed", error=str(failure), transaction_hash=failure.transaction_hash or "",
+                          fees_paid=failure.fee_charged)
+            self.deployment_status[deployment_id] = "failed"
             return {
-                "available": False,
-                "error": f"Error checking Stellar CLI: {str(e)}"
+                "success": False,
+                "deployment_id": deployment_id,
+                "error": str(failure),
+                # Transient failures (congestion, stale sequence, timeout) may succeed on retry
+                "retryable": failure.transient,
+                "deployment_record": record
             }
 
+        contract_id = result["contract_id"]
+        stellar_expert_url = None
+        if self.config["explorer_base"]:
+            stellar_expert_url = f"{self.config['explorer_base']}/contract/{contract_id}"
+
+        record.update(
+            contract_id=contract_id,
+            wasm_hash=result["wasm_hash"],
+            transaction_hash=result["transaction_hash"],
+            stellar_expert_url=stellar_expert_url or "",
+            status="success",
+            fees_paid=result["fees_paid"]
+        )
+        self.deployment_status[deployment_id] = "success"
+
+        return {
+            "success": True,
+            "deployment_id": deployment_id,
+            "contract_id": contract_id,
+            "stellar_expert_url": stellar_expert_url,
+            "transaction_hash": result["transaction_hash"],
+            "wasm_hash": result["wasm_hash"],
+            "wasm_reused": result["wasm_reused"],
+            "fees_paid": result["fees_paid"],
+            "deployment_record": record
+        }
+
+    def _check_stellar_cli(self) -> Dict:
+        """
+        Check if Stellar CLI is available and get version
+
+        Served from the shared toolchain registry, which only spawns
+        `stellar --version` again when PATH or the binary changes.
+
+        Returns:
+            Dict with availability status and version info
+        """
+        return get_toolchain_registry().check_stellar_cli(self.cli_cmd)
+
     def _is_valid_contract_id(self, contract_id: str) -> bool:
         """Check if a string looks like a valid Soroban contract ID"""
         # Contract IDs start with 'C' and are 56 characters (strkey encoded)
@@ -342,19 +439,38 @@ class ContractDeployer:
             deployment_id: Unique deployment identifier
 
         Returns:
-            Dict with deployment status
+            Dict with deployment status, and stage, stage history and
+            per-stage timings when the deployment is tracked
         """
+        state = self.state_store.get(deployment_id)
+        if state is None:
+            return {
+                "deployment_id": deployment_id,
+                "status": self.deployment_status.get(deployment_id, "unknown")
+            }
         return {
             "deployment_id": deployment_id,
-            "status": self.deployment_status.get(deployment_id, "unknown")
+            "status": STAGE_STATUS[state["stage"]],
+            "stage": state["stage"],
+            "history": state["history"],
+            "stage_timings": state["stage_timings"],
+            "error": state["error"]
         }
 
-    def estimate_deployment_cost(self, wasm_path: str) -> Dict:
+    # Account reserve kept aside on top of fees when budgeting a deployment
+    MINIMUM_BALANCE_XLM = 1.0
+
+    def estimate_deployment_cost(self, wasm_path: str, wallet_address: Optional[str] = None) -> Dict:
         """
-        Estimate deployment fees and costs
+        Estimate deployment fees by simulating the deploy transactions
+
+        Uses the network's own resource metering (CPU instructions, read/write
+        bytes, resource fee) rather than a size heuristic. Results are cached
+        per WASM hash and network.
 
         Args:
             wasm_path: Path to WASM file
+            wallet_address: Deploying wallet (optional; simulation does not sign)
 
         Returns:
             Dict with cost estimation
@@ -364,38 +480,86 @@ class ContractDeployer:
             if not wasm_file.exists():
                 return {
                     "success": False,
+                    "wasm_path": str(wasm_path),
                     "error": "WASM file not found"
                 }
 
             wasm_size = wasm_file.stat().st_size
+            estimate = self.get_rpc_deployer().estimate(wasm_file.read_bytes(), wallet_address)
+            fee_xlm = estimate["total_fee"] / 10_000_000
 
-            # Rough estimation based on WASM size
-            # Soroban charges based on resource usage, this is approximate
-            # Base fee + size-based fee
-            base_fee_xlm = 0.001  # Minimum transaction fee
-            size_fee_xlm = (wasm_size / 1024) * 0.0001  # ~0.0001 XLM per KB
-
-            # Account minimum balance requirement for contract deployment
-            minimum_balance = 1.0  # XLM minimum
-
-            estimated_total = base_fee_xlm + size_fee_xlm + minimum_balance
+            if estimate["complete"]:
+                note = "Simulated against the network; actual fees can differ if network settings change."
+            else:
+                note = ("WASM is not installed yet: only the upload was simulated. The create cost "
+                        "can be simulated once the code is installed.")
 
             return {
                 "success": True,
+                "wasm_path": str(wasm_path),
                 "wasm_size_bytes": wasm_size,
                 "wasm_size_kb": round(wasm_size / 1024, 2),
-                "estimated_fee_xlm": round(base_fee_xlm + size_fee_xlm, 7),
-                "minimum_balance_xlm": minimum_balance,
-                "total_required_xlm": round(estimated_total, 4),
-                "note": "This is a rough estimate. Actual fees depend on network conditions and resource usage."
+                "wasm_hash": estimate["wasm_hash"],
+                "network": self.network,
+                "installed": estimate["installed"],
+                "install": estimate["install"],
+                "create": estimate["create"],
+                "estimated_fee_stroops": estimate["total_fee"],
+                "estimated_fee_xlm": round(fee_xlm, 7),
+                "minimum_balance_xlm": self.MINIMUM_BALANCE_XLM,
+                "total_required_xlm": round(fee_xlm + self.MINIMUM_BALANCE_XLM, 7),
+                "complete": estimate["complete"],
+                "cached": estimate["cached"],
+                "note": note
             }
 
         except Exception as e:
             return {
                 "success": False,
+                "wasm_path": str(wasm_path),
                 "error": f"Cost estimation failed: {str(e)}"
             }
 
+    def estimate_deployment_costs(self, wasm_paths: List[str], wallet_address: Optional[str] = None,
+                                  max_workers: int = 8) -> Dict:
+        """
+        Estimate many artifacts concurrently
+
+        Args:
+            wasm_paths: WASM files; each entry counts as one deployment
+            wallet_address: Deploying wallet (optional)
+            max_workers: Concurrent simulations
+
+        Returns:
+            Dict with estimates (input order) and batch_fee_stroops / batch_fee_xlm,
+            the cost of deploying every entry with each distinct WASM uploaded once
+        """
+        distinct = list(dict.fromkeys(wasm_paths))
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(distinct)))) as pool:
+            by_path = dict(zip(distinct, pool.map(
+                lambda path: self.estimate_deployment_cost(path, wallet_address), distinct
+            )))
+        estimates = [by_path[path] for path in wasm_paths]
+
+        batch_fee = 0
+        uploaded = set()
+        for estimate in estimates:
+            if not estimate["success"]:
+                continue
+            if estimate["install"] and estimate["wasm_hash"] not in uploaded:
+                uploaded.add(estimate["wasm_hash"])
+                batch_fee += estimate["install"]["fee"]
+            if estimate["create"]:
+                batch_fee += estimate["create"]["fee"]
+
+        return {
+            "success": all(e["success"] for e in estimates),
+            "estimates": estimates,
+            "batch_fee_stroops": batch_fee,
+            "batch_fee_xlm": round(batch_fee / 10_000_000, 7),
+            "complete": all(e["success"] and e["complete"] for e in estimates)
+        }
+
     def verify_contract(self, contract_id: str) -> Dict:
         """
         Verify a deployed contract exists on the network
@@ -444,7 +608,8 @@ class ContractDeployer:
 
 
 # Utility function for easy access
-def deploy_contract(wasm_path: str, wallet_address: str, wallet_password: str = None, network: str = "testnet") -> Dict:
+def deploy_contract(wasm_path: str, wallet_address: str, wallet_password: str = None, network: str = "testnet",
+                    method: str = "rpc") -> Dict:
     """
     Convenience function to deploy a contract
 
@@ -453,9 +618,10 @@ def deploy_contract(wasm_path: str, wallet_address: str, wallet_password: str =
         wallet_address: Stellar wallet address
         wallet_password: Password for mainnet wallet (if required)
         network: Target network (testnet/mainnet/futurenet/local)
+        method: "rpc" (default) or "cli"
 
     Returns:
         Deployment result dictionary
     """
-    deployer = ContractDeployer(network=network)
+    deployer = ContractDeployer(network=network, method=method)
     return deployer.deploy_contract(wasm_path, wallet_address, wallet_password)
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Batch Deploy Scheduler
+Deploys many compiled contracts at once, fanning the transactions out across
+several wallets. Each wallet deploys one contract at a time (the network only
+accepts one pending transaction per source account) while different wallets
+run in parallel. Sequence numbers are tracked locally by the shared RPC
+deployer, transient failures are retried, and every outcome is recorded with
+a single write to the deployment database.
+"""
+
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from contract_deployer import ContractDeployer
+from deployment_manager import DeploymentManager, get_deployment_manager
+from wallet_manager import WalletManager, get_wallet_manager
+
+
+class BatchDeployScheduler:
+    """Deploys a batch of WASM files concurrently across multiple wallets"""
+
+    def __init__(self, network: str = "testnet", wallet_addresses: Optional[List[str]] = None,
+                 wallet_manager: Optional[WalletManager] = None,
+                 deployment_manager: Optional[DeploymentManager] = None,
+                 max_retries: int = 3, retry_delay: float = 2.0, rpc_url: Optional[str] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            network: Network to deploy to
+            wallet_addresses: Source wallets to spread deployments over
+                              (default: every wallet on the network)
+            wallet_manager: Wallet manager (defaults to the shared instance)
+            deployment_manager: Where outcomes are recorded (default: the shared manager)
+            max_retries: Retries per contract after a transient failure
+            retry_delay: Base seconds to wait before a retry (grows linearly per attempt)
+            rpc_url: Optional Soroban RPC endpoint overriding the network default
+        """
+        self.network = network
+        self.wallet_manager = wallet_manager if wallet_manager is not None else get_wallet_manager()
+        self.deployment_manager = deployment_manager
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.wallet_addresses = wallet_addresses
+        # One deployer for the whole batch so every worker shares its install
+        # index, RPC connection and locally tracked sequence numbers
+        self.deployer = ContractDeployer(network=network, wallet_manager=self.wallet_manager,
+                                         method="rpc", rpc_url=rpc_url)
+
+    def deploy(self, wasm_paths: List[str], progress_callback: Optional[Callable[[int, int, Dict], None]] = None,
+               cancel_event: Optional[threading.Event] = None) -> Dict:
+        """
+        Deploy every WASM file, each as a new contract instance
+
+        Args:
+            wasm_paths: Compiled WASM files (the same file may appear more than once)
+            progress_callback: Called as (completed, total, result) after each contract
+            cancel_event: When set, contracts not yet started are skipped
+
+        Returns:
+            Dict with success (all deployed), results (in input order), wallets,
+            stored (records written) and deployed/failed/retries counts
+        """
+        wallets = self._resolve_wallets()
+        if not wallets:
+            return {"success": False, "error": f"No usable {self.network} wallets for batch deploy",
+                    "results": [], "wallets": [], "stored": 0, "deployed": 0, "failed": len(wasm_paths),
+                    "retries": 0}
+
+        total = len(wasm_paths)
+        results: List[Optional[Dict]] = [None] * total
+        records: List[Dict] = []
+        state_lock = threading.Lock()
+        completed = [0]
+
+        self._install_distinct(wasm_paths, wallets, cancel_event)
+
+        pending = queue.Queue()
+        for index, path in enumerate(wasm_paths):
+            pending.put((index, path, 0))
+
+        def finish(index: int, result: Dict, record: Optional[Dict] = None):
+            with state_lock:
+                results[index] = result
+                if record is not None:
+                    records.append(record)
+                completed[0] += 1
+                done = completed[0]
+            if progress_callback:
+                progress_callback(done, total, result)
+
+        def worker(address: str):
+            while True:
+                try:
+                    index, path, attempt = pending.get_nowait()
+                except queue.Empty:
+                    return
+                if cancel_event is not None and cancel_event.is_set():
+                    finish(index, self._result(index, path, address, attempt, None, "Cancelled"))
+                    continue
+
+                outcome = self.deployer.deploy_contract(path, address)
+                if not outcome["success"] and outcome.get("retryable") and attempt < self.max_retries:
+                    # Back off, then let whichever wallet is free next pick it up
+                    time.sleep(self.retry_delay * (attempt + 1))
+                    pending.put((index, path, attempt + 1))
+                    continue
+                finish(index, self._result(index, path, address, attempt, outcome),
+                       outcome.get("deployment_record"))
+
+        threads = [threading.Thread(target=worker, args=(address,), daemon=True) for address in wallets]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stored = 0
+        if records:
+            manager = self.deployment_manager if self.deployment_manager is not None else get_deployment_manager()
+            stored = manager.store_deployments(records)
+
+        deployed = sum(1 for result in results if result["success"])
+        return {
+            "success": deployed == total,
+            "results": results,
+            "wallets": list(wallets),
+            "stored": stored,
+            "deployed": deployed,
+            "failed": total - deployed,
+            "retries": sum(result["attempts"] - 1 for result in results),
+        }
+
+    def _resolve_wallets(self) -> List[str]:
+        """Wallet addresses whose keys can be loaded without a password."""
+        if self.wallet_addresses is None:
+            addresses = [wallet.address for wallet in self.wallet_manager.list_wallets(network=self.network)]
+        else:
+            addresses = list(dict.fromkeys(self.wallet_addresses))
+
+        usable = []
+        for address in addresses:
+            try:
+                self.wallet_manager.get_secret_key(address)
+            except Exception:
+                continue
+            usable.append(address)
+        return usable
+
+    def _install_distinct(self, wasm_paths: List[str], wallets: List[str],
+                          cancel_event: Optional[threading.Event]):
+        """
+        Upload each distinct WASM once before any instance is created
+
+        Without this, several wallets deploying the same new code at the same
+        time would each upload it. Uploads are spread over the wallets; any
+        failure is left for the per-contract deploy to retry and report.
+        """
+        from stellar_sdk import Keypair
+
+        rpc = self.deployer.get_rpc_deployer()
+        distinct: Dict[str, bytes] = {}
+        for path in dict.fromkeys(wasm_paths):
+            try:
+                wasm = Path(path).read_bytes()
+            except OSError:
+                continue
+            wasm_hash = rpc.wasm_hash(wasm)
+            if wasm_hash not in distinct and rpc.install_index.get(rpc.network_passphrase, wasm_hash) is None:
+                distinct[wasm_hash] = wasm
+
+        pending = queue.Queue()
+        for wasm in distinct.values():
+            pending.put(wasm)
+
+        def installer(address: str):
+            keypair = Keypair.from_secret(self.wallet_manager.get_secret_key(address))
+            while not (cancel_event is not None and cancel_event.is_set()):
+                try:
+                    wasm = pending.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    rpc.ensure_installed(keypair, wasm)
+                except Exception:
+                    pass
+
+        threads = [threading.Thread(target=installer, args=(address,), daemon=True)
+                   for address in wallets[:len(distinct)]]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    @staticmethod
+    def _result(index: int, wasm_path: str, wallet_address: str, attempt: int,
+                outcome: Optional[Dict], error: str = "") -> Dict:
+        """Flatten a ContractDeployer outcome into one batch result entry."""
+        outcome = outcome or {}
+        return {
+            "index": index,
+            "wasm_path": wasm_path,
+            "wallet_address": wallet_address,
+            "success": bool(outcome.get("success")),
+            "deployment_id": outcome.get("deployment_id"),
+            "contract_id": outcome.get("contract_id"),
+            "transaction_hash": outcome.get("transaction_hash"),
+            "wasm_hash": outcome.get("wasm_hash"),
+            "wasm_reused": outcome.get("wasm_reused"),
+            "fees_paid": outcome.get("fees_paid"),
+            "attempts": attempt + 1,
+            "stage_timings": outcome.get("stage_timings"),
+            "error": error or outcome.get("error"),
+        }
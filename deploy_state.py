@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Deployment State Tracking
+Persists every contract deployment as a small state machine
+(queued -> uploading -> instantiating -> confirmed | failed) with a timestamp
+for each stage, so status survives across requests and daemon restarts and
+per-stage latency can be measured. States live in a table of the SQLite
+deployments database, indexed by stage, so each transition is one small
+write; finished states are pruned after FINAL_STATE_DAYS. Deployments left in flight by an earlier
+process are reconciled against the network on startup.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from tinydb import TinyDB
+
+
+def _get_data_dir() -> Path:
+    """Get the platform-specific data directory for deployment storage."""
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Application Support"
+    else:
+        base = Path(os.environ.get("XDG_DATA_HOME", Path.home() / ".local" / "share"))
+
+    data_dir = base / "heavymeta" / "deployments"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    return data_dir
+
+
+class DeployStage(Enum):
+    """Deployment lifecycle stages."""
+    QUEUED = "queued"
+    UPLOADING = "uploading"
+    INSTANTIATING = "instantiating"
+    CONFIRMED = "confirmed"
+    FAILED = "failed"
+
+
+# Owner recorded in the states this process creates. The API server can be
+# restarted inside a running app while its deploys carry on, so only states
+# owned by another (earlier) process are treated as interrupted.
+PROCESS_ID = f"{os.getpid()}-{uuid.uuid4().hex[:12]}"
+
+FINAL_STAGES = {DeployStage.CONFIRMED.value, DeployStage.FAILED.value}
+
+# Confirmed and failed states older than this many days are deleted
+FINAL_STATE_DAYS = 30
+
+# Legacy ContractDeployer status names for each stage
+STAGE_STATUS = {
+    "queued": "queued",
+    "uploading": "deploying",
+    "instantiating": "deploying",
+    "confirmed": "success",
+    "failed": "failed",
+}
+
+
+def stage_timings(state: Dict) -> Dict[str, float]:
+    """
+    Seconds spent in each stage of a deployment
+
+    A stage lasts until the next one starts; the final stage has no duration.
+    Still-running stages are measured up to now. "total" covers queued to the
+    final stage (or now).
+    """
+    history = state.get("history", [])
+    timings: Dict[str, float] = {}
+    for current, following in zip(history, history[1:] + [None]):
+        if current["stage"] in FINAL_STAGES:
+            continue
+        end = following["t"] if following else time.time()
+        timings[current["stage"]] = round(timings.get(current["stage"], 0.0) + end - current["t"], 3)
+    if history:
+        end = history[-1]["t"] if history[-1]["stage"] in FINAL_STAGES else time.time()
+        timings["total"] = round(end - history[0]["t"], 3)
+    return timings
+
+
+class DeployStateStore:
+    """Durable per-deployment stage tracking in SQLite"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS deploy_states (
+            deployment_id TEXT PRIMARY KEY,
+            stage TEXT NOT NULL,
+            network TEXT NOT NULL DEFAULT '',
+            owner TEXT NOT NULL DEFAULT '',
+            created_at TEXT NOT NULL DEFAULT '',
+            updated_at TEXT NOT NULL DEFAULT '',
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS deploy_states_stage ON deploy_states (stage, created_at);
+        CREATE INDEX IF NOT EXISTS deploy_states_created ON deploy_states (created_at);
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        Initialize the store.
+
+        Args:
+            db_path: Optional SQLite path (default: deployments.db in the deployments dir,
+                     alongside the deployment records)
+        """
+        self.db_path = Path(db_path) if db_path else _get_data_dir() / "deployments.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        # One connection shared by all threads; the lock serializes its use
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA busy_timeout=5000")
+        self.conn.executescript(self.SCHEMA)
+        if db_path is None:
+            self.import_json(self.db_path.with_name("deploy_state.json"))
+
+    @contextmanager
+    def _transaction(self):
+        """Hold the connection for one write transaction, rolled back on error."""
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def _write(self, conn, state: Dict):
+        conn.execute(
+            "INSERT OR REPLACE INTO deploy_states (deployment_id, stage, network, owner, created_at, updated_at, "
+            "data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (state["deployment_id"], state["stage"], state.get("network", ""), state.get("owner", ""),
+             state.get("created_at", ""), state.get("updated_at", ""), json.dumps(state)),
+        )
+
+    def _select(self, where: str = "", params: tuple = (), suffix: str = "") -> List[Dict]:
+        with self._lock:
+            rows = self.conn.execute(f"SELECT data FROM deploy_states {where} {suffix}", params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def import_json(self, json_path: Path) -> int:
+        """
+        One-time import of states from the former TinyDB deploy_state.json
+
+        States are copied in one transaction (existing ones are kept) and the
+        file is renamed to deploy_state.json.migrated.
+
+        Returns:
+            Number of states imported
+        """
+        json_path = Path(json_path)
+        if not json_path.is_file():
+            return 0
+        legacy = TinyDB(str(json_path))
+        try:
+            states = [dict(s) for s in legacy.table("states").all()]
+        finally:
+            legacy.close()
+        imported = 0
+        with self._transaction() as conn:
+            for state in states:
+                if state.get("deployment_id") and conn.execute(
+                        "SELECT 1 FROM deploy_states WHERE deployment_id = ?", (state["deployment_id"],)).fetchone() is None:
+                    self._write(conn, state)
+                    imported += 1
+        json_path.replace(json_path.with_name(json_path.name + ".migrated"))
+        return imported
+
+    def create(self, deployment_id: str, network: str, wallet_address: str, wasm_path: str,
+               method: str = "rpc", rpc_url: str = "", network_passphrase: str = "") -> Dict:
+        """Start tracking a deployment in the queued stage."""
+        now = time.time()
+        state = {
+            "deployment_id": deployment_id,
+            "stage": DeployStage.QUEUED.value,
+            "owner": PROCESS_ID,
+            "network": network,
+            "method": method,
+            "rpc_url": rpc_url,
+            "network_passphrase": network_passphrase,
+            "wallet_address": wallet_address,
+            "wasm_path": wasm_path,
+            "wasm_hash": "",
+            "install_transaction_hash": "",
+            "transaction_hash": "",
+            "contract_id": "",
+            "fees_paid": 0,
+            "error": "",
+            "created_at": datetime.utcfromtimestamp(now).isoformat(),
+            "updated_at": datetime.utcfromtimestamp(now).isoformat(),
+            "history": [{"stage": DeployStage.QUEUED.value, "at": datetime.utcfromtimestamp(now).isoformat(), "t": now}],
+        }
+        with self._transaction() as conn:
+            self._write(conn, state)
+        return state
+
+    def advance(self, deployment_id: str, stage: str, **fields) -> Optional[Dict]:
+        """
+        Move a deployment to a stage and update its fields
+
+        Re-entering the current stage only updates fields (e.g. the transaction
+        hash once it is known). Finished deployments are not moved again.
+
+        Returns:
+            The updated state, or None if the deployment is not tracked
+        """
+        stage = DeployStage(stage).value
+        with self._transaction() as conn:
+            row = conn.execute("SELECT data FROM deploy_states WHERE deployment_id = ?", (deployment_id,)).fetchone()
+            if row is None:
+                return None
+            state = json.loads(row[0])
+            if state["stage"] in FINAL_STAGES and stage != state["stage"]:
+                return state
+            now = time.time()
+            if stage != state["stage"]:
+                state["history"].append({"stage": stage, "at": datetime.utcfromtimestamp(now).isoformat(), "t": now})
+                state["stage"] = stage
+            state.update({key: value for key, value in fields.items() if value is not None})
+            state["updated_at"] = datetime.utcfromtimestamp(now).isoformat()
+            self._write(conn, state)
+            return state
+
+    def get(self, deployment_id: str) -> Optional[Dict]:
+        """State of one deployment with its stage timings, or None."""
+        states = self._select("WHERE deployment_id = ?", (deployment_id,))
+        if not states:
+            return None
+        return {**states[0], "stage_timings": stage_timings(states[0])}
+
+    def list_states(self, stage: Optional[str] = None, network: Optional[str] = None,
+                    limit: Optional[int] = None) -> List[Dict]:
+        """States newest first, optionally filtered by stage and network."""
+        clauses, params = [], []
+        for column, value in (("stage", stage), ("network", network)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        suffix = "ORDER BY created_at DESC" + (" LIMIT ?" if limit else "")
+        states = self._select(where, tuple(params) + ((limit,) if limit else ()), suffix)
+        return [{**s, "stage_timings": stage_timings(s)} for s in states]
+
+    def in_flight(self, interrupted_only: bool = False) -> List[Dict]:
+        """
+        Deployments that have not reached confirmed or failed
+
+        Args:
+            interrupted_only: Leave out deployments this process is still running
+        """
+        where = "WHERE stage IN (?, ?, ?)"
+        params = (DeployStage.QUEUED.value, DeployStage.UPLOADING.value, DeployStage.INSTANTIATING.value)
+        if interrupted_only:
+            where += " AND owner != ?"
+            params += (PROCESS_ID,)
+        return self._select(where, params)
+
+    def prune(self, days: int = FINAL_STATE_DAYS) -> int:
+        """Delete confirmed and failed states last updated more than `days` ago; returns how many."""
+        cutoff = datetime.utcfromtimestamp(time.time() - days * 86400).isoformat()
+        with self._transaction() as conn:
+            return conn.execute("DELETE FROM deploy_states WHERE stage IN (?, ?) AND updated_at < ?",
+                                (*sorted(FINAL_STAGES), cutoff)).rowcount
+
+    def timing_summary(self, network: Optional[str] = None) -> Dict[str, Dict]:
+        """Count, mean and p95 seconds per stage over confirmed deployments."""
+        samples: Dict[str, List[float]] = {}
+        for state in self.list_states(stage=DeployStage.CONFIRMED.value, network=network):
+            for stage, seconds in state["stage_timings"].items():
+                samples.setdefault(stage, []).append(seconds)
+
+        summary = {}
+        for stage, values in samples.items():
+            values.sort()
+            summary[stage] = {
+                "count": len(values),
+                "mean": round(sum(values) / len(values), 3),
+                "p95": values[max(0, int(len(values) * 0.95 + 0.5) - 1)],
+            }
+        return summary
+
+
+def reconcile_deployments(store: Optional[DeployStateStore] = None, deployment_manager=None,
+                          rpc_factory: Optional[Callable[[str, str], object]] = None) -> List[Dict]:
+    """
+    Settle deployments left in flight by an earlier process
+
+    Deployments started by this process are left alone, since they may still
+    be running (e.g. when only the API server was restarted).
+    RPC deployments with a known transaction hash are looked up on the network:
+    a successful create transaction (or a live contract instance) confirms the
+    deployment and stores its record; anything else is marked failed. CLI
+    deployments cannot be looked up and are marked failed. Finished states
+    past FINAL_STATE_DAYS are pruned first.
+
+    Args:
+        store: State store (defaults to the shared store)
+        deployment_manager: Where confirmed/failed records are stored (default: the shared manager)
+        rpc_factory: Builds an RpcDeployer from (rpc_url, network_passphrase)
+
+    Returns:
+        The reconciled states
+    """
+    from deployment_manager import get_deployment_manager
+
+    store = store if store is not None else get_deploy_state_store()
+    store.prune()
+    pending = store.in_flight(interrupted_only=True)
+    if not pending:
+        return []
+
+    if rpc_factory is None:
+        from soroban_rpc import RpcDeployer
+        rpc_factory = RpcDeployer
+    manager = deployment_manager if deployment_manager is not None else get_deployment_manager()
+    rpc_clients: Dict[str, object] = {}
+    reconciled = []
+
+    for state in pending:
+        outcome = {"stage": DeployStage.FAILED.value, "error": f"Interrupted while {state['stage']}"}
+        try:
+            if state["method"] == "rpc" and state["rpc_url"]:
+                key = state["rpc_url"] + state["network_passphrase"]
+                if key not in rpc_clients:
+                    rpc_clients[key] = rpc_factory(state["rpc_url"], state["network_passphrase"])
+                outcome = _reconcile_rpc_state(rpc_clients[key], state) or outcome
+        except Exception as e:
+            outcome = {"stage": DeployStage.FAILED.value, "error": f"Interrupted while {state['stage']}; "
+                                                                   f"reconcile failed: {e}"}
+
+        stage = outcome.pop("stage")
+        updated = store.advance(state["deployment_id"], stage, **outcome)
+        if manager.get_deployment_by_id(state["deployment_id"]) is None:
+            manager.store_deployment(_deployment_record(updated))
+        reconciled.append(updated)
+
+    return reconciled
+
+
+def _reconcile_rpc_state(rpc, state: Dict) -> Optional[Dict]:
+    """Network-derived outcome of one interrupted RPC deployment, or None if unknown."""
+    if state["wasm_hash"] and state["install_transaction_hash"]:
+        install = rpc.transaction_status(state["install_transaction_hash"])
+        if install["status"] == "SUCCESS":
+            rpc.install_index.record(state["network_passphrase"], state["wasm_hash"],
+                                     state["install_transaction_hash"], install["fee_charged"])
+
+    if state["stage"] != DeployStage.INSTANTIATING.value or not state["transaction_hash"]:
+        return None
+
+    create = rpc.transaction_status(state["transaction_hash"])
+    if create["status"] == "SUCCESS" or (create["status"] == "NOT_FOUND" and state["contract_id"]
+                                         and rpc.contract_exists(state["contract_id"])):
+        return {"stage": DeployStage.CONFIRMED.value, "error": "",
+                "fees_paid": state["fees_paid"] + create["fee_charged"]}
+    if create["status"] == "FAILED":
+        return {"stage": DeployStage.FAILED.value, "error": "Create contract transaction failed",
+                "fees_paid": state["fees_paid"] + create["fee_charged"]}
+    return None
+
+
+def _deployment_record(state: Dict) -> Dict:
+    """DeploymentManager record for a reconciled state."""
+    confirmed = state["stage"] == DeployStage.CONFIRMED.value
+    wasm_file = Path(state["wasm_path"])
+    return {
+        "deployment_id": state["deployment_id"],
+        "contract_id": state["contract_id"] if confirmed else "",
+        "network": state["network"],
+        "wasm_path": state["wasm_path"],
+        "wasm_hash": state["wasm_hash"],
+        "wallet_address": state["wallet_address"],
+        "deployment_wallet": state["wallet_address"][:8] + "...",
+        "transaction_hash": state["transaction_hash"],
+        "stellar_expert_url": "",
+        "timestamp": state["created_at"],
+        "status": "success" if confirmed else "failed",
+        "wasm_size": wasm_file.stat().st_size if wasm_file.is_file() else 0,
+        "fees_paid": state["fees_paid"],
+        "error": state["error"],
+    }
+
+
+# Process-wide store shared by all deployers
+_store: Optional[DeployStateStore] = None
+_store_lock = threading.Lock()
+
+
+def get_deploy_state_store() -> DeployStateStore:
+    """Get or create the global deployment state store instance."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = DeployStateStore()
+        return _store
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Deployment Record Export
+Streams deployment records out as JSON, JSON Lines, CSV or Arrow IPC. Each
+format is a generator of byte chunks that consumes records one at a time, so
+an export can be written to a file or returned as an HTTP streaming response
+without holding the whole history in memory.
+"""
+
+import csv
+import io
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Iterator
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    pyarrow = None
+
+
+# Columns written by the tabular formats (CSV, Arrow), in order. Other record
+# fields are only kept by the JSON formats.
+EXPORT_FIELDS = (
+    "deployment_id", "contract_id", "network", "wasm_path", "wasm_hash", "wallet_address",
+    "deployment_wallet", "transaction_hash", "stellar_expert_url", "timestamp", "status",
+    "wasm_size", "fees_paid", "error", "verified_at", "exists", "wasm_match",
+)
+
+INTEGER_FIELDS = ("wasm_size", "fees_paid")
+BOOLEAN_FIELDS = ("exists", "wasm_match")
+
+# Format name -> (media type, file extension)
+EXPORT_FORMATS = {
+    "json": ("application/json", "json"),
+    "jsonl": ("application/x-ndjson", "jsonl"),
+    "csv": ("text/csv", "csv"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrow"),
+}
+
+# Records per Arrow record batch
+ARROW_BATCH_SIZE = 1000
+
+# Encoded output is handed on in chunks of about this many bytes
+CHUNK_SIZE = 64 * 1024
+
+
+def _iter_json(records: Iterable[Dict]) -> Iterator[bytes]:
+    yield b"["
+    separator = b"\n"
+    for record in records:
+        yield separator + json.dumps(record, indent=2).encode()
+        separator = b",\n"
+    yield b"\n]\n"
+
+
+def _iter_jsonl(records: Iterable[Dict]) -> Iterator[bytes]:
+    for record in records:
+        yield json.dumps(record, separators=(",", ":")).encode() + b"\n"
+
+
+def _iter_csv(records: Iterable[Dict]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    yield buffer.getvalue().encode()
+    buffer.seek(0)
+    buffer.truncate()
+    for record in records:
+        writer.writerow(record)
+        # Hand each row on so the buffer never grows past one line
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def _arrow_schema():
+    def field_type(name):
+        if name in INTEGER_FIELDS:
+            return pyarrow.int64()
+        if name in BOOLEAN_FIELDS:
+            return pyarrow.bool_()
+        return pyarrow.string()
+    return pyarrow.schema([(name, field_type(name)) for name in EXPORT_FIELDS])
+
+
+def _arrow_value(record: Dict, name: str):
+    value = record.get(name)
+    if value is None:
+        return None
+    if name in INTEGER_FIELDS:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+    if name in BOOLEAN_FIELDS:
+        return bool(value)
+    return str(value)
+
+
+class _ChunkSink:
+    """Write target for the Arrow stream writer that hands back what was written"""
+
+    closed = False
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _iter_arrow(records: Iterable[Dict]) -> Iterator[bytes]:
+    schema = _arrow_schema()
+    sink = _ChunkSink()
+    writer = pyarrow.ipc.new_stream(sink, schema)
+
+    def write_batch(batch):
+        writer.write_batch(pyarrow.record_batch(
+            [[_arrow_value(r, name) for r in batch] for name in EXPORT_FIELDS], schema=schema))
+
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == ARROW_BATCH_SIZE:
+            write_batch(batch)
+            batch = []
+            yield sink.drain()
+    if batch:
+        write_batch(batch)
+    writer.close()
+    yield sink.drain()
+
+
+def _coalesce(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Join small chunks into ones of about CHUNK_SIZE bytes."""
+    pending, size = [], 0
+    for chunk in chunks:
+        pending.append(chunk)
+        size += len(chunk)
+        if size >= CHUNK_SIZE:
+            yield b"".join(pending)
+            pending, size = [], 0
+    if pending:
+        yield b"".join(pending)
+
+
+def check_format(format: str) -> str:
+    """
+    Normalize an export format name
+
+    Raises:
+        ValueError: For an unknown format, or arrow without pyarrow installed
+    """
+    format = format.lower()
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {format}. Formats: {list(EXPORT_FORMATS)}")
+    if format == "arrow" and not PYARROW_AVAILABLE:
+        raise ValueError("Arrow export requires the pyarrow package")
+    return format
+
+
+def iter_export(records: Iterable[Dict], format: str = "jsonl") -> Iterator[bytes]:
+    """
+    Encode records as a stream of byte chunks
+
+    Args:
+        records: Records to export (consumed lazily)
+        format: json, jsonl, csv or arrow (Arrow IPC stream)
+
+    Raises:
+        ValueError: For an unsupported format (raised before any record is read)
+    """
+    format = check_format(format)
+    encoders = {"json": _iter_json, "jsonl": _iter_jsonl, "csv": _iter_csv, "arrow": _iter_arrow}
+    return _coalesce(encoders[format](records))
+
+
+def export_to_file(records: Iterable[Dict], path: Path, format: str = "jsonl") -> int:
+    """
+    Write records to a file in the given format
+
+    The file is written under a temporary name and renamed into place, so a
+    failed export does not leave a truncated file behind.
+
+    Returns:
+        Number of records written
+    """
+    path = Path(path)
+    count = 0
+
+    def counted():
+        nonlocal count
+        for record in records:
+            count += 1
+            yield record
+
+    chunks = iter_export(counted(), format)
+    partial = path.with_name(path.name + ".partial")
+    try:
+        with open(partial, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        partial.replace(path)
+    finally:
+        if partial.exists():
+            partial.unlink()
+    return count
@@ -4,12 +4,18 @@ Deployment Record Management System
 Handles storage and retrieval of Soroban contract deployment records
 """
 
+import base64
+import json
 import os
 import sys
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional
-from tinydb import TinyDB, Query
+from typing import Callable, Dict, Iterator, List, Optional
+
+from deployment_export import check_format, export_to_file, iter_export
+from deployment_store import INDEXED_FIELDS, migrate_tinydb_to_sqlite, open_deployment_store
 
 
 def _get_data_dir() -> Path:
@@ -34,6 +40,7 @@ class DeploymentRecord:
         self.contract_id: str = ""
         self.network: str = ""
         self.wasm_path: str = ""
+        self.wasm_hash: str = ""
         self.wallet_address: str = ""
         self.deployment_wallet: str = ""
         self.transaction_hash: str = ""
@@ -43,6 +50,9 @@ class DeploymentRecord:
         self.wasm_size: int = 0
         self.fees_paid: int = 0
         self.error: str = ""
+        self.verified_at: str = ""  # last on-chain verification (empty if never verified)
+        self.exists: Optional[bool] = None
+        self.wasm_match: Optional[bool] = None
     
     def from_dict(self, data: Dict):
         """Populate from dictionary"""
@@ -58,6 +68,7 @@ class DeploymentRecord:
             "contract_id": self.contract_id,
             "network": self.network,
             "wasm_path": self.wasm_path,
+            "wasm_hash": self.wasm_hash,
             "wallet_address": self.wallet_address,
             "deployment_wallet": self.deployment_wallet,
             "transaction_hash": self.transaction_hash,
@@ -66,28 +77,69 @@ class DeploymentRecord:
             "status": self.status,
             "wasm_size": self.wasm_size,
             "fees_paid": self.fees_paid,
-            "error": self.error
+            "error": self.error,
+            "verified_at": self.verified_at,
+            "exists": self.exists,
+            "wasm_match": self.wasm_match
         }
 
 
+def _encode_cursor(sort_by: str, descending: bool, key: list) -> str:
+    raw = json.dumps([sort_by, descending, key], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort_by: str, descending: bool) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, cursor_descending, key = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+    if cursor_sort != sort_by or cursor_descending != descending:
+        raise ValueError("Cursor belongs to a different sort order")
+    return key
+
+
 class DeploymentManager:
     """Manages deployment records storage and retrieval"""
 
-    def __init__(self, db_path: Optional[str] = None):
+    # Fields listings can be sorted by
+    SORT_FIELDS = INDEXED_FIELDS
+
+    # Seconds between checks for changes made by other processes while anyone is subscribed
+    WATCH_INTERVAL = 1.0
+    # Insert/update events carry the changed records up to this many ids
+    EVENT_RECORD_LIMIT = 100
+
+    def __init__(self, db_path: Optional[str] = None, backend: Optional[str] = None):
         """
         Initialize the deployment manager.
 
         Args:
             db_path: Optional custom path for deployment database.
-                     If not provided, uses platform-specific data directory.
+                     If not provided, uses deployments.db in the platform-specific
+                     data directory, importing an existing deployments.json once.
+            backend: "sqlite" or "tinydb" (default: TinyDB for .json paths, else SQLite)
         """
         if db_path is None:
-            self.db_path = _get_data_dir() / "deployments.json"
+            data_dir = _get_data_dir()
+            self.db_path = data_dir / "deployments.db"
+            self.store = open_deployment_store(self.db_path, backend or "sqlite")
+            if self.store.backend == "sqlite":
+                migrate_tinydb_to_sqlite(data_dir / "deployments.json", self.store)
         else:
             self.db_path = Path(db_path)
+            self.store = open_deployment_store(self.db_path, backend)
+
+        self._subscribers: List[Callable[[Dict], None]] = []
+        self._events_lock = threading.Lock()
+        self._published = self.store.last_change()
+        self._watcher: Optional[threading.Thread] = None
 
-        self.db = TinyDB(str(self.db_path))
-        self.deployments = self.db.table('deployments')
+    @staticmethod
+    def _filters(**fields) -> Dict[str, str]:
+        """Equality filters from keyword arguments, ignoring empty and "all" values."""
+        return {field: value for field, value in fields.items() if value and value != "all"}
     
     def store_deployment(self, record: Dict) -> bool:
         """
@@ -106,13 +158,39 @@ class DeploymentManager:
                 if field not in record:
                     record[field] = "" if field == 'deployment_id' else datetime.utcnow().isoformat() if field == 'timestamp' else 'unknown'
             
-            self.deployments.insert(record)
-            return True
+            stored = self.store.insert([record]) == 1
+            self._changed()
+            return stored
         except Exception as e:
             print(f"Failed to store deployment: {e}")
             return False
     
-    def get_deployments(self, network: str = None, wallet_address: str = None, status: str = None) -> List[Dict]:
+    def store_deployments(self, records: List[Dict]) -> int:
+        """
+        Store several deployment records in one write
+
+        Args:
+            records: Deployment record dictionaries
+
+        Returns:
+            Number of records stored (0 on failure)
+        """
+        try:
+            for record in records:
+                record.setdefault('deployment_id', "")
+                record.setdefault('timestamp', datetime.utcnow().isoformat())
+                record.setdefault('status', 'unknown')
+
+            stored = self.store.insert(records)
+            self._changed()
+            return stored
+        except Exception as e:
+            print(f"Failed to store deployments: {e}")
+            return 0
+
+    def get_deployments(self, network: str = None, wallet_address: str = None, status: str = None,
+                        sort_by: str = "timestamp", descending: bool = True, limit: Optional[int] = None,
+                        cursor: Optional[str] = None) -> List[Dict]:
         """
         Get deployments with optional filtering
         
@@ -120,38 +198,46 @@ class DeploymentManager:
             network: Filter by network (testnet/mainnet/futurenet/local)
             wallet_address: Filter by wallet address
             status: Filter by status (success/failed/pending/error)
+            sort_by: Field to sort by (see SORT_FIELDS)
+            descending: Sort direction (default: newest first)
+            limit: Maximum records to return (default: all)
+            cursor: next_cursor from get_deployments_page, to continue after that page
             
         Returns:
             List of deployment records
+
+        Raises:
+            ValueError: For an unknown sort field or a cursor from a different sort
         """
-        query = Query()
-        
-        # Build query based on filters
-        conditions = []
-        
-        if network and network != "all":
-            conditions.append(query.network == network)
-        
-        if wallet_address:
-            conditions.append(query.wallet_address == wallet_address)
-        
-        if status and status != "all":
-            conditions.append(query.status == status)
-        
-        # Execute query
-        if conditions:
-            # Combine all conditions with AND
-            combined_query = conditions[0]
-            for condition in conditions[1:]:
-                combined_query = combined_query & condition
-            deployments = self.deployments.search(combined_query)
-        else:
-            deployments = self.deployments.all()
-        
-        # Sort by timestamp (newest first)
-        deployments.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-        
-        return deployments
+        return self.get_deployments_page(network, wallet_address, status, sort_by, descending, limit, cursor,
+                                         with_total=False)["deployments"]
+
+    def get_deployments_page(self, network: str = None, wallet_address: str = None, status: str = None,
+                             sort_by: str = "timestamp", descending: bool = True, limit: Optional[int] = 100,
+                             cursor: Optional[str] = None, with_total: bool = True) -> Dict:
+        """
+        Get one page of deployments
+
+        Pages are keyset-paginated: next_cursor encodes the sort key of the last
+        record returned, so records stored while paging do not shift later pages.
+
+        Returns:
+            Dict with deployments, next_cursor (None on the last page) and
+            total (matching records, when with_total is set)
+
+        Raises:
+            ValueError: For an unknown sort field or a cursor from a different sort
+        """
+        filters = self._filters(network=network, wallet_address=wallet_address, status=status)
+        after = _decode_cursor(cursor, sort_by, descending) if cursor else None
+        deployments, last_key = self.store.page(filters, sort_by, descending, limit, after)
+        page = {
+            "deployments": deployments,
+            "next_cursor": _encode_cursor(sort_by, descending, last_key) if last_key else None,
+        }
+        if with_total:
+            page["total"] = self.store.count(filters)
+        return page
     
     def get_deployment_by_id(self, deployment_id: str) -> Optional[Dict]:
         """
@@ -163,9 +249,7 @@ class DeploymentManager:
         Returns:
             Deployment record or None if not found
         """
-        query = Query()
-        result = self.deployments.search(query.deployment_id == deployment_id)
-        return result[0] if result else None
+        return self.store.get(deployment_id)
     
     def get_deployments_by_contract_id(self, contract_id: str) -> List[Dict]:
         """
@@ -177,13 +261,20 @@ class DeploymentManager:
         Returns:
             List of deployment records
         """
-        query = Query()
-        deployments = self.deployments.search(query.contract_id == contract_id)
-        
-        # Sort by timestamp (newest first)
-        deployments.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-        
-        return deployments
+        # Newest first
+        return self.store.find({"contract_id": contract_id})
+
+    def get_wasm_paths(self, under: str = "") -> List[str]:
+        """
+        WASM files referenced by deployment records
+
+        Args:
+            under: Only paths starting with this prefix (e.g. a directory)
+
+        Returns:
+            Distinct wasm_path values, sorted
+        """
+        return self.store.wasm_paths(under)
     
     def delete_deployment(self, deployment_id: str) -> bool:
         """
@@ -196,10 +287,9 @@ class DeploymentManager:
             True if successful, False otherwise
         """
         try:
-            query = Query()
-            removed = self.deployments.remove(query.deployment_id == deployment_id)
-            # remove() returns list of removed doc IDs, convert to bool
-            return len(removed) > 0
+            deleted = self.store.delete([deployment_id]) > 0
+            self._changed()
+            return deleted
         except Exception:
             return False
     
@@ -216,92 +306,161 @@ class DeploymentManager:
             True if successful, False otherwise
         """
         try:
-            query = Query()
             updates = {"status": status}
             if error:
                 updates["error"] = error
             
-            return self.deployments.update(updates, query.deployment_id == deployment_id)
+            updated = self.store.update([(deployment_id, updates)]) > 0
+            self._changed()
+            return updated
         except Exception:
             return False
     
+    def update_verifications(self, results: List[Dict]) -> int:
+        """
+        Write on-chain verification results back to deployment records in one write
+
+        Args:
+            results: Dicts with deployment_id, exists, verified_at, and optionally
+                     wasm_match and onchain_wasm_hash
+
+        Returns:
+            Number of results written (0 on failure)
+        """
+        try:
+            updates = []
+            for result in results:
+                fields = {"exists": result["exists"], "verified_at": result["verified_at"]}
+                if "wasm_match" in result:
+                    fields["wasm_match"] = result["wasm_match"]
+                if result.get("onchain_wasm_hash") and not result.get("wasm_hash"):
+                    # Records deployed with the CLI have no hash; take it from the chain
+                    fields["wasm_hash"] = result["onchain_wasm_hash"]
+                updates.append((result["deployment_id"], fields))
+
+            self.store.update(updates)
+            self._changed()
+            return len(updates)
+        except Exception as e:
+            print(f"Failed to store verification results: {e}")
+            return 0
+    
     def get_deployment_stats(self, network: str = None) -> Dict:
         """
         Get deployment statistics
         
+        Counts are maintained by the store as records are written, so this
+        does not read the records.
+        
         Args:
             network: Optional network filter
             
         Returns:
             Dictionary with deployment statistics
         """
-        deployments = self.get_deployments(network=network)
-        
-        stats = {
-            "total": len(deployments),
-            "successful": 0,
-            "failed": 0,
-            "pending": 0,
-            "error": 0,
-            "by_network": {},
-            "by_wallet": {}
+        counts = self.store.stats(self._filters(network=network).get("network"))
+        by_status = counts["by_status"]
+        return {
+            "total": counts["total"],
+            "successful": by_status.get("success", 0),
+            "failed": by_status.get("failed", 0),
+            "pending": by_status.get("pending", 0),
+            "error": by_status.get("error", 0),
+            "by_status": by_status,
+            "by_network": counts["by_network"],
+            "by_wallet": counts["by_wallet"]
         }
+
+    def get_deployment_timeline(self, period: str = "day", network: str = None, limit: int = 30) -> List[Dict]:
+        """
+        Get deployment counts, success rate and WASM sizes per hour or day
         
-        for deployment in deployments:
-            # Count by status
-            status = deployment.get('status', 'unknown')
-            if status in stats:
-                stats[status] += 1
+        Args:
+            period: Bucket size ("hour" or "day")
+            network: Optional network filter
+            limit: Number of most recent buckets with deployments
             
-            # Count by network
-            network_name = deployment.get('network', 'unknown')
-            if network_name not in stats["by_network"]:
-                stats["by_network"][network_name] = 0
-            stats["by_network"][network_name] += 1
+        Returns:
+            Buckets oldest first, each with bucket, total, by_status,
+            success_rate, wasm_count, wasm_bytes and avg_wasm_size
+
+        Raises:
+            ValueError: For an unknown period
+        """
+        return self.store.timeline(period, self._filters(network=network).get("network"), limit)
+
+    def rebuild_stats(self):
+        """Recount the stored statistics from the deployment records."""
+        self.store.rebuild_stats()
+    
+    def iter_deployments(self, network: str = None, wallet_address: str = None, status: str = None,
+                         since: str = None, until: str = None) -> Iterator[Dict]:
+        """
+        Iterate over deployments oldest first without loading them all
+        
+        Args:
+            network: Filter by network
+            wallet_address: Filter by wallet address
+            status: Filter by status
+            since: Only deployments with timestamp >= since (ISO 8601)
+            until: Only deployments with timestamp < until (ISO 8601)
+        """
+        filters = self._filters(network=network, wallet_address=wallet_address, status=status)
+        return self.store.scan(filters, since=since, until=until)
+
+    def stream_export(self, format: str = "jsonl", network: str = None, wallet_address: str = None,
+                      status: str = None, since: str = None, until: str = None) -> Iterator[bytes]:
+        """
+        Export deployments as a stream of byte chunks (see deployment_export)
+        
+        Args:
+            format: json, jsonl, csv or arrow
+            network, wallet_address, status, since, until: As for iter_deployments
             
-            # Count by wallet
-            wallet = deployment.get('deployment_wallet', 'unknown')
-            if wallet not in stats["by_wallet"]:
-                stats["by_wallet"][wallet] = 0
-            stats["by_wallet"][wallet] += 1
+        Raises:
+            ValueError: For an unsupported format
+        """
+        return iter_export(self.iter_deployments(network, wallet_address, status, since, until), format)
+
+    def export_deployments_to_file(self, path: str, format: str = "jsonl", network: str = None,
+                                   wallet_address: str = None, status: str = None, since: str = None,
+                                   until: str = None) -> int:
+        """
+        Export deployments straight to a file
         
-        return stats
-    
+        Returns:
+            Number of records written
+            
+        Raises:
+            ValueError: For an unsupported format
+        """
+        check_format(format)
+        return export_to_file(self.iter_deployments(network, wallet_address, status, since, until), path, format)
+
     def export_deployments(self, network: str = None, format: str = "json") -> str:
         """
         Export deployment records
         
+        Builds the whole export in memory; use stream_export or
+        export_deployments_to_file for large histories.
+        
         Args:
             network: Optional network filter
-            format: Export format (json/csv)
+            format: Export format (json/jsonl/csv)
             
         Returns:
             Exported data as string
         """
-        deployments = self.get_deployments(network=network)
-        
-        if format.lower() == "csv":
-            import csv
-            import io
-            
-            if not deployments:
-                return "No deployments found"
-            
-            output = io.StringIO()
-            fieldnames = deployments[0].keys()
-            writer = csv.DictWriter(output, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(deployments)
-            return output.getvalue()
-        
-        else:  # JSON format
-            import json
-            return json.dumps(deployments, indent=2)
+        if check_format(format) == "arrow":
+            raise ValueError("Arrow exports are binary; use export_deployments_to_file")
+        return b"".join(self.stream_export(format, network=network)).decode()
     
     def cleanup_old_deployments(self, days: int = 30) -> int:
         """
         Clean up old deployment records
         
+        For per-network/status rules with archiving, see deployment_retention.
+        
         Args:
             days: Delete records older than this many days
             
@@ -314,70 +473,171 @@ class DeploymentManager:
             cutoff_date = datetime.utcnow() - timedelta(days=days)
             cutoff_str = cutoff_date.isoformat()
             
-            query = Query()
-            old_deployments = self.deployments.search(query.timestamp < cutoff_str)
+            old_ids = [deployment['deployment_id'] for deployment in self.store.scan(until=cutoff_str)]
             
-            # Delete old deployments
-            deleted_count = 0
-            for deployment in old_deployments:
-                if self.delete_deployment(deployment['deployment_id']):
-                    deleted_count += 1
-            
-            return deleted_count
+            # Delete old deployments in one transaction, then reclaim the space
+            deleted = self.store.delete(old_ids)
+            self._changed()
+            self.store.compact(min_free_ratio=0.2)
+            return deleted
         except Exception:
             return 0
     
-    def search_deployments(self, search_term: str, network: str = None) -> List[Dict]:
+    def count_deployments(self, network: str = None, wallet_address: str = None, status: str = None) -> int:
+        """Number of deployments matching the filters."""
+        return self.store.count(self._filters(network=network, wallet_address=wallet_address, status=status))
+
+    def search_deployments(self, search_term: str, network: str = None, limit: Optional[int] = None,
+                           prefix: bool = False) -> List[Dict]:
         """
-        Search deployments by contract ID, wallet address, or wallet name
+        Search deployments by contract ID, wallet address, wallet name, transaction hash or error
         
         Args:
-            search_term: Search term
+            search_term: Search term (case-insensitive)
             network: Optional network filter
+            limit: Maximum records to return (default: all)
+            prefix: Only match fields that start with the search term
             
         Returns:
-            List of matching deployment records
+            Matching deployment records, exact matches first, then prefix
+            matches, then substring matches; newest first within each
         """
-        deployments = self.get_deployments(network=network)
+        return self.store.search(search_term, self._filters(network=network), limit, prefix)
+
+
+    # -- Change events -----------------------------------------------------
+
+    def last_change(self) -> int:
+        """Sequence number of the latest stored change; pass to events_since to get later events."""
+        return self.store.last_change()
+
+    def events_since(self, seq: int) -> List[Dict]:
+        """
+        Change events after a sequence number, oldest first
         
-        search_term = search_term.lower()
-        matches = []
+        Consecutive changes of one kind are grouped into one event:
+        {"type": "insert"|"update"|"delete", "seq": n, "deployment_ids": [...]}.
+        Insert and update events also carry "deployments" (the current records)
+        when at most EVENT_RECORD_LIMIT ids changed. A single
+        {"type": "reload", "seq": n} event means the changes can't be listed
+        (too far behind, or the file was rewritten elsewhere) and readers
+        should reload everything.
         
-        for deployment in deployments:
-            # Search in contract ID
-            if search_term in deployment.get('contract_id', '').lower():
-                matches.append(deployment)
-                continue
-            
-            # Search in wallet address
-            if search_term in deployment.get('wallet_address', '').lower():
-                matches.append(deployment)
-                continue
-            
-            # Search in wallet name
-            if search_term in deployment.get('deployment_wallet', '').lower():
-                matches.append(deployment)
-                continue
-            
-            # Search in transaction hash
-            if search_term in deployment.get('transaction_hash', '').lower():
-                matches.append(deployment)
+        Args:
+            seq: Last sequence number already seen (see last_change)
+        """
+        changes = self.store.changes(seq)
+        if not changes:
+            return []
+        if changes[0][0] != seq + 1 or any(op == "reload" for _, op, _ in changes):
+            return [{"type": "reload", "seq": changes[-1][0]}]
+
+        events = []
+        for change_seq, op, deployment_id in changes:
+            if not events or events[-1]["type"] != op:
+                events.append({"type": op, "seq": change_seq, "deployment_ids": []})
+            event = events[-1]
+            event["seq"] = change_seq
+            if deployment_id not in event["deployment_ids"]:
+                event["deployment_ids"].append(deployment_id)
+        for event in events:
+            if event["type"] != "delete" and len(event["deployment_ids"]) <= self.EVENT_RECORD_LIMIT:
+                records = (self.store.get(deployment_id) for deployment_id in event["deployment_ids"])
+                event["deployments"] = [record for record in records if record is not None]
+        return events
+
+    def subscribe(self, callback: Callable[[Dict], None]) -> Callable[[], None]:
+        """
+        Call callback(event) for every change event (see events_since)
         
-        return matches
+        Changes made through this manager are published as soon as they are
+        stored. Changes made by other processes are picked up by a watcher
+        thread every WATCH_INTERVAL seconds while anyone is subscribed.
+        Callbacks run on the writing thread or the watcher thread.
+        
+        Returns:
+            Function that cancels the subscription
+        """
+        with self._events_lock:
+            if not self._subscribers:
+                self._published = self.store.last_change()
+            self._subscribers.append(callback)
+            if self._watcher is None:
+                self._watcher = threading.Thread(target=self._watch, name="deployment-watch", daemon=True)
+                self._watcher.start()
+
+        def unsubscribe():
+            with self._events_lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    def publish_changes(self) -> List[Dict]:
+        """Send subscribers the events since the last publish; returns them."""
+        with self._events_lock:
+            if not self._subscribers:
+                return []
+            events = self.events_since(self._published)
+            if not events:
+                return []
+            self._published = events[-1]["seq"]
+            subscribers = list(self._subscribers)
+        for event in events:
+            for callback in subscribers:
+                try:
+                    callback(event)
+                except Exception as e:
+                    print(f"Deployment event subscriber failed: {e}")
+        return events
+
+    def _changed(self):
+        if self._subscribers:
+            self.publish_changes()
+
+    def _watch(self):
+        while True:
+            with self._events_lock:
+                if not self._subscribers:
+                    self._watcher = None
+                    return
+            try:
+                self.publish_changes()
+            except Exception as e:
+                print(f"Failed to check for deployment changes: {e}")
+            time.sleep(self.WATCH_INTERVAL)
+
+
+# Shared instance
+_manager: Optional[DeploymentManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_deployment_manager() -> DeploymentManager:
+    """
+    Get or create the process-wide deployment manager.
+    
+    Shares one open store (and its change subscriptions) across the API
+    routes, background jobs and UI instead of reopening it per call.
+    """
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = DeploymentManager()
+        return _manager
 
 
 # Utility functions for easy access
 def store_deployment(record: Dict) -> bool:
     """Store a deployment record"""
-    manager = DeploymentManager()
+    manager = get_deployment_manager()
     return manager.store_deployment(record)
 
 def get_deployments(network: str = None, wallet_address: str = None) -> List[Dict]:
     """Get deployments with optional filtering"""
-    manager = DeploymentManager()
+    manager = get_deployment_manager()
     return manager.get_deployments(network=network, wallet_address=wallet_address)
 
 def get_deployment_by_id(deployment_id: str) -> Optional[Dict]:
     """Get deployment by ID"""
-    manager = DeploymentManager()
+    manager = get_deployment_manager()
     return manager.get_deployment_by_id(deployment_id)
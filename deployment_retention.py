@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Deployment Record Retention
+Applies age limits to deployment history per network and status. Expired
+records are appended to a gzip-compressed JSON Lines archive (or dropped),
+removed from the live store in one transaction, and the store is compacted
+afterwards. Scheduled runs are opt-in: once enabled, the API server applies the
+policy on its interval. It can also be run on demand.
+"""
+
+import gzip
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from tinydb import TinyDB
+from tinydb.table import Document
+
+
+RETENTION_ACTIONS = ("archive", "delete")
+
+
+@dataclass
+class RetentionRule:
+    """Records matching network and status ("*" = any) are kept for `days` (None = forever)."""
+    network: str = "*"
+    status: str = "*"
+    days: Optional[int] = None
+    action: str = "archive"
+
+    def __post_init__(self):
+        if self.days is not None and (not isinstance(self.days, int) or self.days < 0):
+            raise ValueError(f"Retention days must be a non-negative integer or null, got {self.days!r}")
+        if self.action not in RETENTION_ACTIONS:
+            raise ValueError(f"Unknown retention action: {self.action}. Actions: {list(RETENTION_ACTIONS)}")
+
+    def matches(self, record: Dict) -> bool:
+        return (self.network in ("*", record.get("network"))
+                and self.status in ("*", record.get("status")))
+
+    def filters(self) -> Dict[str, str]:
+        """Store filters selecting this rule's records."""
+        return {field: value for field, value in (("network", self.network), ("status", self.status))
+                if value != "*"}
+
+
+# Rules are checked in order and the first match decides; records no rule
+# matches are kept forever. Successful mainnet deployments are never expired.
+DEFAULT_RULES = [
+    RetentionRule(network="mainnet", status="success", days=None),
+    RetentionRule(network="mainnet", status="*", days=90),
+    RetentionRule(network="*", status="success", days=None),
+    RetentionRule(network="*", status="pending", days=None),
+    RetentionRule(network="*", status="*", days=7),
+]
+
+DEFAULT_INTERVAL_HOURS = 24
+
+# Scheduled runs remove history, so they only happen once a user enables them
+DEFAULT_ENABLED = False
+
+# Rebuild the SQLite file once this share of its pages is free
+COMPACT_FREE_RATIO = 0.2
+
+
+def _get_data_dir() -> Path:
+    """Get the platform-specific data directory for deployment storage."""
+    from deployment_manager import _get_data_dir as deployments_dir
+    return deployments_dir()
+
+
+class DeploymentRetention:
+    """Retention policy and the job that applies it"""
+
+    def __init__(self, data_dir: Optional[Path] = None, manager=None):
+        """
+        Initialize retention.
+
+        Args:
+            data_dir: Directory holding retention.json and the archive/ folder.
+                      If not provided, uses the deployments data directory.
+            manager: DeploymentManager to prune (default: the shared manager)
+        """
+        self.data_dir = Path(data_dir) if data_dir else _get_data_dir()
+        self.archive_dir = self.data_dir / "archive"
+        self._manager = manager
+        self.db = TinyDB(str(self.data_dir / "retention.json"))
+        self.settings = self.db.table("settings")
+        self._lock = threading.Lock()
+
+    @property
+    def manager(self):
+        if self._manager is None:
+            from deployment_manager import get_deployment_manager
+            self._manager = get_deployment_manager()
+        return self._manager
+
+    # -- Policy ------------------------------------------------------------
+
+    def get_policy(self) -> Dict:
+        """Rules, schedule and the last run's summary."""
+        saved = self.settings.get(doc_id=1) or {}
+        return {
+            "enabled": saved.get("enabled", DEFAULT_ENABLED),
+            "interval_hours": saved.get("interval_hours", DEFAULT_INTERVAL_HOURS),
+            "rules": saved.get("rules", [asdict(rule) for rule in DEFAULT_RULES]),
+            "last_run": saved.get("last_run"),
+        }
+
+    def rules(self) -> List[RetentionRule]:
+        return [RetentionRule(**rule) for rule in self.get_policy()["rules"]]
+
+    def set_policy(self, rules: Optional[List[Dict]] = None, enabled: Optional[bool] = None,
+                   interval_hours: Optional[float] = None) -> Dict:
+        """
+        Update the policy; arguments left as None are unchanged
+
+        Raises:
+            ValueError: For an invalid rule or interval
+        """
+        policy = self.get_policy()
+        if rules is not None:
+            policy["rules"] = [asdict(RetentionRule(**rule)) for rule in rules]
+        if enabled is not None:
+            policy["enabled"] = enabled
+        if interval_hours is not None:
+            if interval_hours <= 0:
+                raise ValueError("interval_hours must be positive")
+            policy["interval_hours"] = interval_hours
+        self.settings.upsert(Document(policy, doc_id=1))
+        return policy
+
+    # -- Running -----------------------------------------------------------
+
+    def _expired(self, rules: List[RetentionRule], now: datetime) -> Iterator[tuple]:
+        """Yield (rule index, rule, record) for each record its first matching rule says to remove."""
+        for index, rule in enumerate(rules):
+            if rule.days is None:
+                continue
+            cutoff = (now - timedelta(days=rule.days)).isoformat()
+            for record in self.manager.store.scan(rule.filters(), until=cutoff):
+                # An earlier rule that also matches takes precedence
+                if next(r for r in rules if r.matches(record)) is rule:
+                    yield index, rule, record
+
+    def run(self, dry_run: bool = False, now: Optional[datetime] = None) -> Dict:
+        """
+        Apply the retention rules once
+
+        Archived records are written (and synced) to this month's archive
+        file before anything is deleted; the deletion is one transaction.
+
+        Args:
+            dry_run: Only count what would be archived or deleted
+            now: Reference time for record ages (default: current UTC time)
+
+        Returns:
+            Dict with archived, deleted, per-rule counts, archive_file and compacted
+        """
+        now = now or datetime.utcnow()
+        with self._lock:
+            rules = self.rules()
+            archive_path = self.archive_dir / f"deployments-{now:%Y-%m}.jsonl.gz"
+            counts = [0] * len(rules)
+            archived, deleted_ids = 0, []
+
+            raw = archive = None
+            try:
+                for index, rule, record in self._expired(rules, now):
+                    if not record.get("deployment_id"):
+                        # The store deletes by id; records without one are left alone
+                        continue
+                    counts[index] += 1
+                    deleted_ids.append(record["deployment_id"])
+                    if rule.action == "archive":
+                        archived += 1
+                        if not dry_run:
+                            if archive is None:
+                                self.archive_dir.mkdir(parents=True, exist_ok=True)
+                                # Appending adds a gzip member; readers see one continuous stream
+                                raw = open(archive_path, "ab")
+                                archive = gzip.GzipFile(fileobj=raw, mode="ab")
+                            archive.write(json.dumps(record, separators=(",", ":")).encode() + b"\n")
+                if archive is not None:
+                    archive.close()
+                    raw.flush()
+                    os.fsync(raw.fileno())
+            finally:
+                if archive is not None:
+                    archive.close()
+                    raw.close()
+
+            deleted = len(deleted_ids) if dry_run else self.manager.store.delete(deleted_ids)
+            if not dry_run:
+                self.manager.publish_changes()
+            compacted = False if dry_run else self.manager.store.compact(COMPACT_FREE_RATIO)
+
+            result = {
+                "success": True,
+                "dry_run": dry_run,
+                "ran_at": now.isoformat(),
+                "archived": archived,
+                "deleted": deleted,
+                "rules": [{**asdict(rule), "matched": count} for rule, count in zip(rules, counts)],
+                "archive_file": str(archive_path) if archived and not dry_run else None,
+                "compacted": compacted,
+            }
+            if not dry_run:
+                policy = self.get_policy()
+                policy["last_run"] = {key: result[key] for key in ("ran_at", "archived", "deleted", "compacted")}
+                self.settings.upsert(Document(policy, doc_id=1))
+            return result
+
+    def due(self, now: Optional[datetime] = None) -> bool:
+        """Whether a scheduled run is due."""
+        policy = self.get_policy()
+        if not policy["enabled"]:
+            return False
+        last_run = (policy["last_run"] or {}).get("ran_at")
+        if last_run is None:
+            return True
+        now = now or datetime.utcnow()
+        return now - datetime.fromisoformat(last_run) >= timedelta(hours=policy["interval_hours"])
+
+    def iter_archive(self) -> Iterator[Dict]:
+        """Yield every archived record, oldest archive file first."""
+        for path in sorted(self.archive_dir.glob("deployments-*.jsonl.gz")):
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+
+# Global instance
+_retention: Optional[DeploymentRetention] = None
+_retention_lock = threading.Lock()
+
+
+def get_deployment_retention() -> DeploymentRetention:
+    """Get or create the global retention instance."""
+    global _retention
+    with _retention_lock:
+        if _retention is None:
+            _retention = DeploymentRetention()
+        return _retention
@@ -0,0 +1,946 @@
+#!/usr/bin/env python3
+"""
+Deployment Record Storage Backends
+Storage behind DeploymentManager. The SQLite backend (WAL journal) keeps each
+record as JSON next to indexed columns for the fields records are looked up
+and filtered by, so inserts are appends and lookups are index seeks. The
+TinyDB backend is the original JSON-file storage, kept for existing files and
+as the source of the one-time migration to SQLite.
+
+Both backends keep deployment statistics (counts per network, status and
+wallet, and hourly/daily buckets) up to date as records are written, so
+reading them does not depend on the number of records. They also keep a
+change log (insert/update/delete per deployment id, numbered in order) that
+DeploymentManager turns into change events.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from tinydb import TinyDB, Query
+from tinydb.table import Document
+
+
+# Record fields stored in their own indexed columns; listings can be sorted by any of them
+INDEXED_FIELDS = ("deployment_id", "contract_id", "network", "wallet_address", "status", "timestamp")
+
+
+# Record fields covered by deployment search
+SEARCH_FIELDS = ("contract_id", "wallet_address", "deployment_wallet", "transaction_hash", "error")
+
+
+def _match_rank(record: Dict, term: str) -> Optional[tuple]:
+    """
+    Sort key of a record's best match, or None if it does not match
+
+    (0, "") = a field equals term, (1, value) = a field starts with it (lowest
+    such value first), (2, "") = a field contains it.
+    """
+    best = None
+    for field in SEARCH_FIELDS:
+        value = str(record.get(field) or "").lower()
+        if value == term:
+            return 0, ""
+        if value.startswith(term):
+            best = min(best, (1, value)) if best else (1, value)
+        elif best is None and term in value:
+            best = (2, "")
+    return best
+
+
+def _rank_matches(records: List[Dict], term: str, limit: Optional[int], prefix: bool) -> List[Dict]:
+    """Order newest-first records by match rank without an index."""
+    if not term:
+        return []
+    ranked = [(rank, r) for r in records
+              if (rank := _match_rank(r, term)) is not None and (rank[0] < 2 or not prefix)]
+    ranked.sort(key=lambda item: item[0])
+    return [r for _, r in ranked[:limit]]
+
+
+# Most recent changes kept in the change log; readers further behind than
+# this must reload instead of applying changes one by one
+CHANGE_LOG_SIZE = 10000
+
+
+# Time bucket sizes for deployment statistics, as the length of the timestamp
+# prefix naming the bucket ("2026-01-20T14" for an hour, "2026-01-20" for a day)
+STATS_PERIODS = {"hour": 13, "day": 10}
+
+
+def _wasm_size(record: Dict) -> int:
+    try:
+        return int(record.get("wasm_size") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _summarize_totals(rows: Iterable[tuple]) -> Dict:
+    """Fold (network, status, deployment_wallet, count) rows into totals."""
+    stats = {"total": 0, "by_status": {}, "by_network": {}, "by_wallet": {}}
+    for network, status, wallet, count in rows:
+        if count <= 0:
+            continue
+        stats["total"] += count
+        for key, value in (("by_status", status), ("by_network", network), ("by_wallet", wallet)):
+            stats[key][value] = stats[key].get(value, 0) + count
+    return stats
+
+
+def _summarize_timeline(rows: Iterable[tuple]) -> List[Dict]:
+    """Fold (bucket, status, count, wasm_count, wasm_bytes) rows into per-bucket entries, oldest first."""
+    buckets: Dict[str, Dict] = {}
+    for bucket, status, count, wasm_count, wasm_bytes in rows:
+        if count <= 0:
+            continue
+        entry = buckets.setdefault(bucket, {"bucket": bucket, "total": 0, "by_status": {},
+                                            "wasm_count": 0, "wasm_bytes": 0})
+        entry["total"] += count
+        entry["by_status"][status] = entry["by_status"].get(status, 0) + count
+        entry["wasm_count"] += wasm_count
+        entry["wasm_bytes"] += wasm_bytes
+    timeline = [buckets[bucket] for bucket in sorted(buckets)]
+    for entry in timeline:
+        entry["success_rate"] = round(entry["by_status"].get("success", 0) / entry["total"], 4)
+        entry["avg_wasm_size"] = entry["wasm_bytes"] // entry["wasm_count"] if entry["wasm_count"] else 0
+    return timeline
+
+
+def _check_period(period: str):
+    if period not in STATS_PERIODS:
+        raise ValueError(f"Unknown stats period: {period}. Periods: {list(STATS_PERIODS)}")
+
+
+class _StatsCounters:
+    """The SQLite stats tables as dicts, for the TinyDB backend"""
+
+    def __init__(self):
+        self.totals: Dict[tuple, int] = {}
+        self.buckets: Dict[tuple, List[int]] = {}
+
+    def apply(self, record: Dict, sign: int):
+        """Count a record in (sign=1) or out (sign=-1)."""
+        network, status = str(record.get("network") or ""), str(record.get("status") or "")
+        key = (network, status, str(record.get("deployment_wallet") or ""))
+        self.totals[key] = self.totals.get(key, 0) + sign
+        wasm_size = _wasm_size(record)
+        timestamp = str(record.get("timestamp") or "")
+        for period, length in STATS_PERIODS.items():
+            counts = self.buckets.setdefault((period, timestamp[:length], network, status), [0, 0, 0])
+            counts[0] += sign
+            counts[1] += sign * (wasm_size > 0)
+            counts[2] += sign * wasm_size
+
+    def to_doc(self) -> Dict:
+        return {
+            "totals": [list(key) + [count] for key, count in self.totals.items() if count > 0],
+            "buckets": [list(key) + counts for key, counts in self.buckets.items() if counts[0] > 0],
+        }
+
+    @classmethod
+    def from_doc(cls, doc: Dict) -> "_StatsCounters":
+        counters = cls()
+        counters.totals = {tuple(row[:3]): row[3] for row in doc.get("totals", [])}
+        counters.buckets = {tuple(row[:4]): list(row[4:]) for row in doc.get("buckets", [])}
+        return counters
+
+
+def _stats_delta_sql(row: str, sign: str) -> str:
+    """Trigger statements counting the `row` record (new/old) in ('+') or out ('-')."""
+    wallet = f"coalesce(json_extract({row}.data, '$.deployment_wallet'), '')"
+    wasm_size = f"coalesce(CAST(json_extract({row}.data, '$.wasm_size') AS INTEGER), 0)"
+    statements = [
+        f"INSERT INTO deployment_totals VALUES ({row}.network, {row}.status, {wallet}, {sign}1) "
+        "ON CONFLICT (network, status, deployment_wallet) DO UPDATE SET count = count + excluded.count;"
+    ]
+    for period, length in STATS_PERIODS.items():
+        statements.append(
+            f"INSERT INTO deployment_buckets VALUES ('{period}', substr({row}.timestamp, 1, {length}), "
+            f"{row}.network, {row}.status, {sign}1, {sign}({wasm_size} > 0), {sign}{wasm_size}) "
+            "ON CONFLICT (period, bucket, network, status) DO UPDATE SET count = count + excluded.count, "
+            "wasm_count = wasm_count + excluded.wasm_count, wasm_bytes = wasm_bytes + excluded.wasm_bytes;"
+        )
+    return "\n".join(statements)
+
+
+def _check_sort(sort_by: str):
+    if sort_by not in INDEXED_FIELDS:
+        raise ValueError(f"Cannot sort deployments by {sort_by}. Sortable fields: {list(INDEXED_FIELDS)}")
+
+
+class TinyDBDeploymentStore:
+    """Deployment records in a TinyDB JSON file (every write rewrites the file)"""
+
+    backend = "tinydb"
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db = TinyDB(str(self.db_path))
+        self.deployments = self.db.table("deployments")
+        self._stats_table = self.db.table("stats")
+        saved = self._stats_table.get(doc_id=1)
+        if saved is None:
+            self.rebuild_stats()
+        else:
+            self._stats = _StatsCounters.from_doc(saved)
+        # The change log only covers writes made through this instance;
+        # writes by anyone else are noticed from the file's modification time.
+        # Writes and change checks are serialized so a check never sees a
+        # half-finished write of our own as an outside change.
+        self._lock = threading.RLock()
+        self._changes: List[Tuple[int, str, str]] = []
+        self._last_change = 0
+        self._file_state = self._stat_file()
+
+    def _stat_file(self) -> Optional[tuple]:
+        try:
+            stat = os.stat(self.db_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _log(self, op: str, deployment_ids: Iterable[str]):
+        for deployment_id in deployment_ids:
+            self._last_change += 1
+            self._changes.append((self._last_change, op, deployment_id))
+        del self._changes[:-CHANGE_LOG_SIZE]
+        self._file_state = self._stat_file()
+
+    def last_change(self) -> int:
+        return self._last_change
+
+    def changes(self, after: int) -> List[Tuple[int, str, str]]:
+        """(seq, op, deployment_id) changes after seq; op "reload" if the file was changed elsewhere."""
+        with self._lock:
+            file_state = self._stat_file()
+            if file_state != self._file_state:
+                self._file_state = file_state
+                saved = self._stats_table.get(doc_id=1)
+                if saved is not None:
+                    self._stats = _StatsCounters.from_doc(saved)
+                self._last_change += 1
+                self._changes.append((self._last_change, "reload", ""))
+            return [change for change in self._changes if change[0] > after]
+
+    def _save_stats(self):
+        self._stats_table.upsert(Document(self._stats.to_doc(), doc_id=1))
+
+    def rebuild_stats(self):
+        """Recount statistics from the records."""
+        self._stats = _StatsCounters()
+        for record in self.deployments.all():
+            self._stats.apply(record, 1)
+        self._save_stats()
+
+    def insert(self, records: List[Dict]) -> int:
+        with self._lock:
+            inserted = len(self.deployments.insert_multiple(records))
+            for record in records:
+                self._stats.apply(record, 1)
+            self._save_stats()
+            self._log("insert", [record.get("deployment_id", "") for record in records])
+            return inserted
+
+    def get(self, deployment_id: str) -> Optional[Dict]:
+        result = self.deployments.search(Query().deployment_id == deployment_id)
+        return dict(result[0]) if result else None
+
+    def find(self, filters: Optional[Dict[str, str]] = None, before: Optional[str] = None) -> List[Dict]:
+        """Records matching every field in filters (and older than `before`), newest first."""
+        filters = filters or {}
+        records = [
+            dict(r) for r in self.deployments.all()
+            if all(r.get(field) == value for field, value in filters.items())
+            and (before is None or r.get("timestamp", "") < before)
+        ]
+        records.sort(key=lambda r: r.get("timestamp", ""), reverse=True)
+        return records
+
+    def page(self, filters: Optional[Dict[str, str]] = None, sort_by: str = "timestamp", descending: bool = True,
+             limit: Optional[int] = None, after: Optional[list] = None) -> Tuple[List[Dict], Optional[list]]:
+        """Sorted slice of the matching records; see SQLiteDeploymentStore.page."""
+        _check_sort(sort_by)
+        filters = filters or {}
+        keyed = sorted(
+            ((str(r.get(sort_by) or ""), r.doc_id), r) for r in self.deployments.all()
+            if all(r.get(field) == value for field, value in filters.items())
+        )
+        if descending:
+            keyed.reverse()
+        if after is not None:
+            after = (after[0], after[1])
+            keyed = [(key, r) for key, r in keyed if (key < after if descending else key > after)]
+        if limit is None or len(keyed) <= limit:
+            return [dict(r) for _, r in keyed], None
+        keyed = keyed[:limit]
+        return [dict(r) for _, r in keyed], list(keyed[-1][0])
+
+    def scan(self, filters: Optional[Dict[str, str]] = None, since: Optional[str] = None,
+             until: Optional[str] = None, batch_size: int = 500) -> Iterator[Dict]:
+        """Matching records oldest first; see SQLiteDeploymentStore.scan."""
+        records = [r for r in self.find(filters, before=until)
+                   if since is None or r.get("timestamp", "") >= since]
+        yield from reversed(records)
+
+    def wasm_paths(self, under: str = "") -> List[str]:
+        """Distinct wasm_path values starting with `under`."""
+        return sorted({r["wasm_path"] for r in self.deployments.all()
+                       if isinstance(r.get("wasm_path"), str) and r["wasm_path"].startswith(under)})
+
+    def search(self, term: str, filters: Optional[Dict[str, str]] = None, limit: Optional[int] = None,
+               prefix: bool = False) -> List[Dict]:
+        """Ranked substring (or prefix) search; see SQLiteDeploymentStore.search."""
+        return _rank_matches(self.find(filters), term.strip().lower(), limit, prefix)
+
+    def update(self, changes: List[Tuple[str, Dict]]) -> int:
+        """Apply (deployment_id, fields) updates in one write; returns records updated."""
+        with self._lock:
+            query = Query()
+            changed = query.deployment_id.one_of([deployment_id for deployment_id, _ in changes])
+            for record in self.deployments.search(changed):
+                self._stats.apply(record, -1)
+            updated = self.deployments.update_multiple(
+                [(fields, query.deployment_id == deployment_id) for deployment_id, fields in changes]
+            )
+            changed_records = self.deployments.search(changed)
+            for record in changed_records:
+                self._stats.apply(record, 1)
+            self._save_stats()
+            self._log("update", [record.get("deployment_id", "") for record in changed_records])
+            return len(updated)
+
+    def delete(self, deployment_ids: Iterable[str]) -> int:
+        with self._lock:
+            deleted = Query().deployment_id.one_of(list(deployment_ids))
+            removed_records = self.deployments.search(deleted)
+            for record in removed_records:
+                self._stats.apply(record, -1)
+            removed = len(self.deployments.remove(deleted))
+            self._save_stats()
+            self._log("delete", [record.get("deployment_id", "") for record in removed_records])
+            return removed
+
+    def count(self, filters: Optional[Dict[str, str]] = None) -> int:
+        if not filters:
+            return len(self.deployments)
+        return sum(1 for r in self.deployments.all() if all(r.get(f) == v for f, v in filters.items()))
+
+    def stats(self, network: Optional[str] = None) -> Dict:
+        """Record counts; see SQLiteDeploymentStore.stats."""
+        return _summarize_totals(key + (count,) for key, count in self._stats.totals.items()
+                                 if network is None or key[0] == network)
+
+    def compact(self, min_free_ratio: float = 0.0) -> bool:
+        """Nothing to do: every TinyDB write already rewrites the whole file."""
+        return False
+
+    def timeline(self, period: str = "day", network: Optional[str] = None, limit: int = 30) -> List[Dict]:
+        """Per-bucket counts; see SQLiteDeploymentStore.timeline."""
+        _check_period(period)
+        rows = [(key[1], key[3], *counts) for key, counts in self._stats.buckets.items()
+                if key[0] == period and (network is None or key[2] == network) and counts[0] > 0]
+        latest = set(sorted({row[0] for row in rows}, reverse=True)[:limit])
+        return _summarize_timeline(row for row in rows if row[0] in latest)
+
+    def close(self):
+        self.db.close()
+
+
+class SQLiteDeploymentStore:
+    """Deployment records in SQLite with indexed lookup columns"""
+
+    backend = "sqlite"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS deployments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            deployment_id TEXT NOT NULL DEFAULT '',
+            contract_id TEXT NOT NULL DEFAULT '',
+            network TEXT NOT NULL DEFAULT '',
+            wallet_address TEXT NOT NULL DEFAULT '',
+            status TEXT NOT NULL DEFAULT '',
+            timestamp TEXT NOT NULL DEFAULT '',
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_deployments_deployment_id ON deployments (deployment_id);
+        CREATE INDEX IF NOT EXISTS idx_deployments_contract_id ON deployments (contract_id);
+        CREATE INDEX IF NOT EXISTS idx_deployments_network ON deployments (network, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_deployments_wallet_address ON deployments (wallet_address, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_deployments_status ON deployments (status, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_deployments_timestamp ON deployments (timestamp);
+        CREATE INDEX IF NOT EXISTS idx_deployments_wasm_path ON deployments (json_extract(data, '$.wasm_path'));
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+    """
+
+    # Trigram full-text index over SEARCH_FIELDS, kept in step with the
+    # deployments table by triggers so every insert, update and delete is
+    # indexed in the same transaction
+    SEARCH_SCHEMA = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS deployments_search USING fts5(
+            contract_id, wallet_address, deployment_wallet, transaction_hash, error,
+            tokenize = 'trigram'
+        );
+        CREATE TRIGGER IF NOT EXISTS deployments_search_insert AFTER INSERT ON deployments BEGIN
+            INSERT INTO deployments_search (rowid, contract_id, wallet_address, deployment_wallet,
+                                            transaction_hash, error)
+            VALUES (new.id, new.contract_id, new.wallet_address,
+                    coalesce(json_extract(new.data, '$.deployment_wallet'), ''),
+                    coalesce(json_extract(new.data, '$.transaction_hash'), ''),
+                    coalesce(json_extract(new.data, '$.error'), ''));
+        END;
+        CREATE TRIGGER IF NOT EXISTS deployments_search_delete AFTER DELETE ON deployments BEGIN
+            DELETE FROM deployments_search WHERE rowid = old.id;
+        END;
+        CREATE TRIGGER IF NOT EXISTS deployments_search_update AFTER UPDATE ON deployments BEGIN
+            DELETE FROM deployments_search WHERE rowid = old.id;
+            INSERT INTO deployments_search (rowid, contract_id, wallet_address, deployment_wallet,
+                                            transaction_hash, error)
+            VALUES (new.id, new.contract_id, new.wallet_address,
+                    coalesce(json_extract(new.data, '$.deployment_wallet'), ''),
+                    coalesce(json_extract(new.data, '$.transaction_hash'), ''),
+                    coalesce(json_extract(new.data, '$.error'), ''));
+        END;
+    """
+
+    # Lower-cased SEARCH_FIELDS values per record, so exact and prefix matches
+    # are index range lookups. Keyed (key, id DESC) so each key's records come
+    # out newest first without sorting.
+    SEARCH_KEYS_SCHEMA = """
+        CREATE TABLE IF NOT EXISTS deployment_search_keys (
+            key TEXT NOT NULL,
+            id INTEGER NOT NULL,
+            PRIMARY KEY (key, id DESC)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_deployment_search_keys_id ON deployment_search_keys (id);
+        CREATE TRIGGER IF NOT EXISTS deployments_search_keys_insert AFTER INSERT ON deployments BEGIN
+            INSERT OR IGNORE INTO deployment_search_keys (key, id)
+            SELECT lower(value), new.id FROM (
+                SELECT new.contract_id AS value UNION ALL SELECT new.wallet_address
+                UNION ALL SELECT json_extract(new.data, '$.deployment_wallet')
+                UNION ALL SELECT json_extract(new.data, '$.transaction_hash')
+                UNION ALL SELECT json_extract(new.data, '$.error')
+            ) WHERE coalesce(value, '') != '';
+        END;
+        CREATE TRIGGER IF NOT EXISTS deployments_search_keys_delete AFTER DELETE ON deployments BEGIN
+            DELETE FROM deployment_search_keys WHERE id = old.id;
+        END;
+        CREATE TRIGGER IF NOT EXISTS deployments_search_keys_update AFTER UPDATE ON deployments BEGIN
+            DELETE FROM deployment_search_keys WHERE id = old.id;
+            INSERT OR IGNORE INTO deployment_search_keys (key, id)
+            SELECT lower(value), new.id FROM (
+                SELECT new.contract_id AS value UNION ALL SELECT new.wallet_address
+                UNION ALL SELECT json_extract(new.data, '$.deployment_wallet')
+                UNION ALL SELECT json_extract(new.data, '$.transaction_hash')
+                UNION ALL SELECT json_extract(new.data, '$.error')
+            ) WHERE coalesce(value, '') != '';
+        END;
+    """
+
+    # Statistics kept current by triggers, so reading them costs the same at
+    # any record count. Rows whose count drops to zero are left in place.
+    STATS_SCHEMA = f"""
+        CREATE TABLE IF NOT EXISTS deployment_totals (
+            network TEXT NOT NULL,
+            status TEXT NOT NULL,
+            deployment_wallet TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (network, status, deployment_wallet)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS deployment_buckets (
+            period TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            network TEXT NOT NULL,
+            status TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            wasm_count INTEGER NOT NULL,
+            wasm_bytes INTEGER NOT NULL,
+            PRIMARY KEY (period, bucket, network, status)
+        ) WITHOUT ROWID;
+        CREATE TRIGGER IF NOT EXISTS deployments_stats_insert AFTER INSERT ON deployments BEGIN
+            {_stats_delta_sql("new", "+")}
+        END;
+        CREATE TRIGGER IF NOT EXISTS deployments_stats_delete AFTER DELETE ON deployments BEGIN
+            {_stats_delta_sql("old", "-")}
+        END;
+        CREATE TRIGGER IF NOT EXISTS deployments_stats_update AFTER UPDATE ON deployments BEGIN
+            {_stats_delta_sql("old", "-")}
+            {_stats_delta_sql("new", "+")}
+        END;
+    """
+
+    # Change log written by triggers, so writes from any connection or
+    # process are seen by every reader of the database
+    CHANGES_SCHEMA = f"""
+        CREATE TABLE IF NOT EXISTS deployment_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            op TEXT NOT NULL,
+            deployment_id TEXT NOT NULL
+        );
+        CREATE TRIGGER IF NOT EXISTS deployments_changes_insert AFTER INSERT ON deployments BEGIN
+            INSERT INTO deployment_changes (op, deployment_id) VALUES ('insert', new.deployment_id);
+        END;
+        CREATE TRIGGER IF NOT EXISTS deployments_changes_update AFTER UPDATE ON deployments BEGIN
+            INSERT INTO deployment_changes (op, deployment_id) VALUES ('update', new.deployment_id);
+        END;
+        CREATE TRIGGER IF NOT EXISTS deployments_changes_delete AFTER DELETE ON deployments BEGIN
+            INSERT INTO deployment_changes (op, deployment_id) VALUES ('delete', old.deployment_id);
+        END;
+        CREATE TRIGGER IF NOT EXISTS deployment_changes_trim AFTER INSERT ON deployment_changes BEGIN
+            DELETE FROM deployment_changes WHERE seq <= new.seq - {CHANGE_LOG_SIZE};
+        END;
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        # One connection shared by all threads; the lock serializes its use
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA busy_timeout=5000")
+        self.conn.executescript(self.SCHEMA)
+        self.searchable = self._create_search_index()
+        self._create_search_keys()
+        self.conn.executescript(self.STATS_SCHEMA)
+        if self.get_meta("stats") is None:
+            self.rebuild_stats()
+        self.conn.executescript(self.CHANGES_SCHEMA)
+
+    def _create_search_index(self) -> bool:
+        """Create the search index (indexing existing records once); False if FTS5 is unavailable."""
+        with self._lock:
+            try:
+                created = self.get_meta("search_index") is None
+                self.conn.executescript(self.SEARCH_SCHEMA)
+            except sqlite3.OperationalError:
+                return False
+            if created:
+                with self._transaction():
+                    self.conn.execute("DELETE FROM deployments_search")
+                    self.conn.execute(
+                        "INSERT INTO deployments_search (rowid, contract_id, wallet_address, deployment_wallet, "
+                        "transaction_hash, error) SELECT id, contract_id, wallet_address, "
+                        "coalesce(json_extract(data, '$.deployment_wallet'), ''), "
+                        "coalesce(json_extract(data, '$.transaction_hash'), ''), "
+                        "coalesce(json_extract(data, '$.error'), '') FROM deployments"
+                    )
+                    self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('search_index', 'trigram')")
+        return True
+
+    def _create_search_keys(self):
+        """Create the exact/prefix lookup table, filling it from existing records once."""
+        with self._lock:
+            created = self.get_meta("search_keys") is None
+            self.conn.executescript(self.SEARCH_KEYS_SCHEMA)
+            if created:
+                with self._transaction():
+                    self.conn.execute("DELETE FROM deployment_search_keys")
+                    for field in SEARCH_FIELDS:
+                        value = field if field in INDEXED_FIELDS else f"json_extract(data, '$.{field}')"
+                        self.conn.execute(
+                            f"INSERT OR IGNORE INTO deployment_search_keys (key, id) SELECT lower({value}), id "
+                            f"FROM deployments WHERE coalesce({value}, '') != ''"
+                        )
+                    self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('search_keys', '1')")
+
+    @contextmanager
+    def _transaction(self):
+        """Hold the connection for one write transaction, rolled back on error."""
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    @staticmethod
+    def _row(record: Dict) -> tuple:
+        return tuple(str(record.get(field) or "") for field in INDEXED_FIELDS) + (json.dumps(record),)
+
+    def insert(self, records: List[Dict], meta: Optional[Dict[str, str]] = None) -> int:
+        """Insert records, and set the given meta keys, in one transaction."""
+        with self._transaction():
+            self.conn.executemany(
+                f"INSERT INTO deployments ({', '.join(INDEXED_FIELDS)}, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [self._row(record) for record in records]
+            )
+            self.conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (meta or {}).items())
+        return len(records)
+
+    def get(self, deployment_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT data FROM deployments WHERE deployment_id = ? ORDER BY id LIMIT 1", (deployment_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def find(self, filters: Optional[Dict[str, str]] = None, before: Optional[str] = None) -> List[Dict]:
+        """Records matching every field in filters (and older than `before`), newest first."""
+        clauses, params = self._where(filters, before)
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT data FROM deployments {clauses} ORDER BY timestamp DESC, id DESC", params
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def page(self, filters: Optional[Dict[str, str]] = None, sort_by: str = "timestamp", descending: bool = True,
+             limit: Optional[int] = None, after: Optional[list] = None) -> Tuple[List[Dict], Optional[list]]:
+        """
+        Sorted slice of the matching records (keyset pagination)
+
+        Args:
+            filters: Field equality filters
+            sort_by: Indexed field to sort by; ties are broken by insertion order
+            descending: Sort direction
+            limit: Maximum records to return (default: all)
+            after: Key of the last record of the previous page
+
+        Returns:
+            Tuple of (records, key of the last record if more follow, else None)
+        """
+        _check_sort(sort_by)
+        clauses, params = self._where(filters)
+        if after is not None:
+            op = "<" if descending else ">"
+            # Written so the leading comparison can seek the sort index
+            clauses += (" AND " if clauses else "WHERE ") + f"{sort_by} {op}= ? AND ({sort_by} {op} ? OR id {op} ?)"
+            params += [after[0], after[0], after[1]]
+        direction = "DESC" if descending else "ASC"
+        sql = f"SELECT id, {sort_by}, data FROM deployments {clauses} ORDER BY {sort_by} {direction}, id {direction}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit + 1)
+
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        next_key = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_key = [rows[-1][1], rows[-1][0]]
+        return [json.loads(row[2]) for row in rows], next_key
+
+    def scan(self, filters: Optional[Dict[str, str]] = None, since: Optional[str] = None,
+             until: Optional[str] = None, batch_size: int = 500) -> Iterator[Dict]:
+        """
+        Yield matching records oldest first, reading batch_size rows at a time
+
+        The connection is only held while a batch is read, so a slow consumer
+        (e.g. a streamed download) does not block writers.
+
+        Args:
+            filters: Field equality filters
+            since: Only records with timestamp >= since
+            until: Only records with timestamp < until
+            batch_size: Rows read per query
+        """
+        clauses, params = self._where(filters, before=until, since=since)
+        after = None
+        while True:
+            where, args = clauses, list(params)
+            if after is not None:
+                where += (" AND " if where else "WHERE ") + "timestamp >= ? AND (timestamp > ? OR id > ?)"
+                args += [after[0], after[0], after[1]]
+            with self._lock:
+                rows = self.conn.execute(
+                    f"SELECT id, timestamp, data FROM deployments {where} ORDER BY timestamp, id LIMIT ?",
+                    args + [batch_size]
+                ).fetchall()
+            for row in rows:
+                yield json.loads(row[2])
+            if len(rows) < batch_size:
+                return
+            after = (rows[-1][1], rows[-1][0])
+
+    def search(self, term: str, filters: Optional[Dict[str, str]] = None, limit: Optional[int] = None,
+               prefix: bool = False) -> List[Dict]:
+        """
+        Ranked case-insensitive search over SEARCH_FIELDS
+
+        Runs in tiers, each read in index order and stopped as soon as
+        `limit` records are found: records where a field equals the term
+        (newest first), then fields starting with it (by matched value, then
+        newest first), then fields containing it (newest first). Substrings of
+        three or more characters are looked up in the trigram index; shorter
+        ones scan the lower-cased values newest first, so a short term that
+        matches nothing reads every value (about 80 ms at 100k records).
+
+        Args:
+            term: Text to find
+            filters: Field equality filters
+            limit: Maximum records to return (default: all)
+            prefix: Only match fields that start with the term
+        """
+        term = term.strip().lower()
+        if not term or limit == 0:
+            return []
+
+        where, filter_params = self._where(filters, table="d.")
+        filtered = (" AND " + where[len("WHERE "):]) if where else ""
+        # Joins are written CROSS JOIN so SQLite keeps the index order of the
+        # left table rather than sorting every match
+        tiers = [
+            ("SELECT k.id FROM deployment_search_keys k CROSS JOIN deployments d ON d.id = k.id "
+             f"WHERE k.key = ?{filtered} ORDER BY k.key, k.id DESC", [term]),
+            # Every string starting with term sorts below term + the highest code point
+            ("SELECT k.id FROM deployment_search_keys k CROSS JOIN deployments d ON d.id = k.id "
+             f"WHERE k.key > ? AND k.key < ?{filtered} ORDER BY k.key, k.id DESC", [term, term + "\U0010ffff"]),
+        ]
+        if not prefix:
+            if self.searchable and len(term) >= 3:
+                # A quoted FTS5 string is a phrase; with trigram tokens that is a substring match
+                tiers.append(("SELECT s.rowid FROM deployments_search s CROSS JOIN deployments d ON d.id = s.rowid "
+                              f"WHERE deployments_search MATCH ?{filtered} ORDER BY s.rowid DESC",
+                              ['"' + term.replace('"', '""') + '"']))
+            else:
+                # Walks the id index of the lookup table, which holds every
+                # value already lower-cased, newest record first
+                tiers.append(("SELECT k.id FROM deployment_search_keys k CROSS JOIN deployments d ON d.id = k.id "
+                              f"WHERE instr(k.key, ?) > 0{filtered} ORDER BY k.id DESC", [term]))
+
+        found: Dict[int, None] = {}
+        with self._lock:
+            for sql, params in tiers:
+                # Rows are stepped through lazily, so a tier costs what it returns
+                for (row_id,) in self.conn.execute(sql, params + filter_params):
+                    found.setdefault(row_id)
+                    if len(found) == limit:
+                        break
+                if len(found) == limit:
+                    break
+            ids = list(found)
+            rows = {}
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                rows.update(self.conn.execute(
+                    f"SELECT id, data FROM deployments WHERE id IN ({', '.join('?' * len(chunk))})", chunk))
+        return [json.loads(rows[row_id]) for row_id in ids]
+
+    def wasm_paths(self, under: str = "") -> List[str]:
+        """
+        Distinct wasm_path values starting with `under`
+
+        Read from the wasm_path expression index as a range, so the cost
+        follows the number of matching paths rather than of records.
+        """
+        wasm_path = "json_extract(data, '$.wasm_path')"
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT DISTINCT {wasm_path} FROM deployments WHERE {wasm_path} >= ? AND {wasm_path} < ? "
+                f"ORDER BY {wasm_path}", (under, under + "\U0010ffff")
+            ).fetchall()
+        return [row[0] for row in rows if isinstance(row[0], str)]
+
+    @staticmethod
+    def _where(filters: Optional[Dict[str, str]], before: Optional[str] = None, since: Optional[str] = None,
+               table: str = "") -> Tuple[str, list]:
+        conditions, params = [], []
+        for field, value in (filters or {}).items():
+            if field not in INDEXED_FIELDS:
+                raise ValueError(f"Cannot filter deployments by {field}")
+            conditions.append(f"{table}{field} = ?")
+            params.append(value)
+        if before is not None:
+            conditions.append(f"{table}timestamp < ?")
+            params.append(before)
+        if since is not None:
+            conditions.append(f"{table}timestamp >= ?")
+            params.append(since)
+        return ("WHERE " + " AND ".join(conditions)) if conditions else "", params
+
+    def update(self, changes: List[Tuple[str, Dict]]) -> int:
+        """Apply (deployment_id, fields) updates in one transaction; returns records updated."""
+        updated = 0
+        with self._transaction():
+            for deployment_id, fields in changes:
+                rows = self.conn.execute(
+                    "SELECT id, data FROM deployments WHERE deployment_id = ?", (deployment_id,)
+                ).fetchall()
+                for row_id, data in rows:
+                    record = {**json.loads(data), **fields}
+                    self.conn.execute(
+                        f"UPDATE deployments SET {', '.join(f'{f} = ?' for f in INDEXED_FIELDS)}, data = ? "
+                        "WHERE id = ?", self._row(record) + (row_id,)
+                    )
+                    updated += 1
+        return updated
+
+    def delete(self, deployment_ids: Iterable[str]) -> int:
+        deployment_ids = list(deployment_ids)
+        deleted = 0
+        with self._transaction():
+            # Stay below SQLite's bound-parameter limit
+            for start in range(0, len(deployment_ids), 500):
+                chunk = deployment_ids[start:start + 500]
+                deleted += self.conn.execute(
+                    f"DELETE FROM deployments WHERE deployment_id IN ({', '.join('?' * len(chunk))})", chunk
+                ).rowcount
+        return deleted
+
+    def count(self, filters: Optional[Dict[str, str]] = None) -> int:
+        clauses, params = self._where(filters)
+        with self._lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM deployments {clauses}", params).fetchone()[0]
+
+    def stats(self, network: Optional[str] = None) -> Dict:
+        """
+        Record counts: total, by_status, by_network and by_wallet (deployment wallet name)
+
+        Args:
+            network: Only count records for this network
+        """
+        sql = "SELECT network, status, deployment_wallet, count FROM deployment_totals WHERE count > 0"
+        params = []
+        if network is not None:
+            sql += " AND network = ?"
+            params.append(network)
+        with self._lock:
+            return _summarize_totals(self.conn.execute(sql, params).fetchall())
+
+    def timeline(self, period: str = "day", network: Optional[str] = None, limit: int = 30) -> List[Dict]:
+        """
+        Deployment counts, success rate and WASM sizes per hour or day
+
+        Args:
+            period: "hour" or "day"
+            network: Only count records for this network
+            limit: Number of most recent buckets with deployments to return
+
+        Returns:
+            Oldest first, one dict per bucket with bucket, total, by_status,
+            success_rate, wasm_count, wasm_bytes and avg_wasm_size
+        """
+        _check_period(period)
+        condition, params = "period = ? AND count > 0", [period]
+        if network is not None:
+            condition += " AND network = ?"
+            params.append(network)
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT bucket, status, SUM(count), SUM(wasm_count), SUM(wasm_bytes) FROM deployment_buckets "
+                f"WHERE {condition} AND bucket IN (SELECT DISTINCT bucket FROM deployment_buckets "
+                f"WHERE {condition} ORDER BY bucket DESC LIMIT ?) GROUP BY bucket, status",
+                params + params + [limit]
+            ).fetchall()
+        return _summarize_timeline(rows)
+
+    def rebuild_stats(self):
+        """Recount statistics from the records."""
+        wallet = "coalesce(json_extract(data, '$.deployment_wallet'), '')"
+        wasm_size = "coalesce(CAST(json_extract(data, '$.wasm_size') AS INTEGER), 0)"
+        with self._transaction():
+            self.conn.execute("DELETE FROM deployment_totals")
+            self.conn.execute("DELETE FROM deployment_buckets")
+            self.conn.execute(
+                f"INSERT INTO deployment_totals SELECT network, status, {wallet}, COUNT(*) FROM deployments "
+                f"GROUP BY network, status, {wallet}"
+            )
+            for period, length in STATS_PERIODS.items():
+                self.conn.execute(
+                    f"INSERT INTO deployment_buckets SELECT ?, substr(timestamp, 1, {length}) AS bucket, network, "
+                    f"status, COUNT(*), SUM({wasm_size} > 0), SUM({wasm_size}) FROM deployments "
+                    "GROUP BY bucket, network, status", (period,)
+                )
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('stats', '1')")
+
+    def compact(self, min_free_ratio: float = 0.0) -> bool:
+        """
+        Merge the search index and give free pages back to the filesystem
+
+        The database file is only rebuilt (VACUUM) when at least
+        min_free_ratio of its pages are free, e.g. after a large delete.
+
+        Returns:
+            True if the file was rebuilt
+        """
+        with self._lock:
+            if self.searchable:
+                self.conn.execute("INSERT INTO deployments_search (deployments_search) VALUES ('optimize')")
+            pages = self.conn.execute("PRAGMA page_count").fetchone()[0]
+            free = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+            vacuum = pages > 0 and free > 0 and free / pages >= min_free_ratio
+            if vacuum:
+                self.conn.execute("VACUUM")
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return vacuum
+
+    def last_change(self) -> int:
+        """Sequence number of the latest change (0 if there has been none)."""
+        with self._lock:
+            row = self.conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'deployment_changes'").fetchone()
+        return row[0] if row else 0
+
+    def changes(self, after: int) -> List[Tuple[int, str, str]]:
+        """(seq, op, deployment_id) changes after seq, oldest first."""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT seq, op, deployment_id FROM deployment_changes WHERE seq > ? ORDER BY seq", (after,)
+            ).fetchall()
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        with self._transaction():
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+def migrate_tinydb_to_sqlite(json_path: Path, store: SQLiteDeploymentStore) -> int:
+    """
+    One-time import of a TinyDB deployments.json into a SQLite store
+
+    Records are copied, and the store marked as migrated, in a single
+    transaction; the JSON file is then renamed to deployments.json.migrated. Does nothing if the
+    store has already been migrated or the JSON file does not exist.
+
+    Returns:
+        Number of records imported
+    """
+    json_path = Path(json_path)
+    if store.get_meta("migrated_from") is not None or not json_path.is_file():
+        return 0
+
+    legacy = TinyDB(str(json_path))
+    try:
+        records = [dict(r) for r in legacy.table("deployments").all()]
+    finally:
+        legacy.close()
+
+    # Oldest first, so insertion order matches the original file
+    records.sort(key=lambda r: r.get("timestamp", ""))
+    # The marker is written with the records, so a crash cannot leave them
+    # imported but unmarked (and imported again on the next start)
+    imported = store.insert(records, meta={"migrated_from": str(json_path)})
+    json_path.replace(json_path.with_name(json_path.name + ".migrated"))
+    return imported
+
+
+def open_deployment_store(db_path: Path, backend: Optional[str] = None):
+    """
+    Open the storage backend for a deployments database
+
+    Args:
+        db_path: Database file. A .json path opens the TinyDB backend unless
+                 backend says otherwise.
+        backend: "sqlite" or "tinydb" (default: chosen from the file suffix)
+    """
+    db_path = Path(db_path)
+    backend = backend or ("tinydb" if db_path.suffix == ".json" else "sqlite")
+    if backend == "tinydb":
+        return TinyDBDeploymentStore(db_path)
+    if backend == "sqlite":
+        return SQLiteDeploymentStore(db_path)
+    raise ValueError(f"Unknown deployment storage backend: {backend}")
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Bulk Deployment Verifier
+Checks deployment history against the network: whether each recorded contract
+still exists and runs the recorded WASM. Contract instances are read in
+batches through getLedgerEntries over one pooled RPC connection per network,
+with a bounded number of requests in flight, and the results are written back
+to the deployment records in one write.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from contract_deployer import ContractDeployer
+from deployment_manager import DeploymentManager, get_deployment_manager
+
+
+class DeploymentVerifier:
+    """Verifies many deployment records on chain concurrently"""
+
+    def __init__(self, deployment_manager: Optional[DeploymentManager] = None, concurrency: int = 4,
+                 batch_size: int = 50, rpc_urls: Optional[Dict[str, str]] = None):
+        """
+        Initialize the verifier.
+
+        Args:
+            deployment_manager: Deployment records to verify (default: the shared manager)
+            concurrency: Maximum getLedgerEntries requests in flight
+            batch_size: Contracts looked up per request (Soroban RPC allows up to 200 keys)
+            rpc_urls: Optional per-network RPC endpoint overrides
+        """
+        self.deployment_manager = deployment_manager if deployment_manager is not None else get_deployment_manager()
+        self.concurrency = max(1, concurrency)
+        self.batch_size = max(1, min(batch_size, 200))
+        self.rpc_urls = rpc_urls or {}
+        self._rpc_clients: Dict[str, object] = {}
+
+    def verify(self, network: Optional[str] = None, deployment_ids: Optional[List[str]] = None,
+               progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict:
+        """
+        Verify deployment records and store the results on them
+
+        Args:
+            network: Only verify this network (default: all)
+            deployment_ids: Only verify these deployments (default: every record with a contract id)
+            progress_callback: Called as (contracts_checked, total) after each batch
+
+        Returns:
+            Dict with success, results, verified, exists, missing, wasm_mismatch,
+            errors and stored counts
+        """
+        if deployment_ids is None:
+            candidates = self.deployment_manager.iter_deployments(network=network)
+        else:
+            # Indexed lookups of just the requested records
+            found = (self.deployment_manager.get_deployment_by_id(d) for d in dict.fromkeys(deployment_ids))
+            candidates = (r for r in found if r is not None and (network is None or r.get("network") == network))
+        records = [
+            r for r in candidates
+            if r.get("contract_id") and r.get("network") in ContractDeployer.NETWORK_CONFIG
+        ]
+
+        batches = []
+        for net in sorted({r["network"] for r in records}):
+            net_records = [r for r in records if r["network"] == net]
+            for start in range(0, len(net_records), self.batch_size):
+                batches.append((net, net_records[start:start + self.batch_size]))
+
+        results: List[Dict] = []
+        checked = 0
+        if batches:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(batches))) as pool:
+                for batch_results in pool.map(lambda batch: self._verify_batch(*batch), batches):
+                    results.extend(batch_results)
+                    checked += len(batch_results)
+                    if progress_callback:
+                        progress_callback(checked, len(records))
+
+        verified = [r for r in results if r["error"] is None]
+        stored = self.deployment_manager.update_verifications(verified) if verified else 0
+        return {
+            "success": len(verified) == len(results),
+            "results": results,
+            "verified": len(verified),
+            "exists": sum(1 for r in verified if r["exists"]),
+            "missing": sum(1 for r in verified if not r["exists"]),
+            "wasm_mismatch": sum(1 for r in verified if r.get("wasm_match") is False),
+            "errors": len(results) - len(verified),
+            "stored": stored,
+        }
+
+    def _rpc(self, network: str):
+        """One RPC client (and HTTP connection pool) per network, created on first use."""
+        if network not in self._rpc_clients:
+            from soroban_rpc import RpcDeployer
+
+            config = ContractDeployer.NETWORK_CONFIG[network]
+            self._rpc_clients[network] = RpcDeployer(self.rpc_urls.get(network, config["rpc_url"]),
+                                                     config["network_passphrase"])
+        return self._rpc_clients[network]
+
+    def _verify_batch(self, network: str, records: List[Dict]) -> List[Dict]:
+        """Look up one batch of contracts and compare them with their records."""
+        verified_at = datetime.utcnow().isoformat()
+        try:
+            onchain = self._rpc(network).contract_wasm_hashes([r["contract_id"] for r in records])
+        except Exception as e:
+            return [self._result(r, verified_at, error=f"Verification failed: {e}") for r in records]
+        return [self._result(r, verified_at, onchain[r["contract_id"]]) for r in records]
+
+    @staticmethod
+    def _result(record: Dict, verified_at: str, onchain_wasm_hash: Optional[str] = None,
+                error: Optional[str] = None) -> Dict:
+        result = {
+            "deployment_id": record.get("deployment_id", ""),
+            "contract_id": record["contract_id"],
+            "network": record["network"],
+            "wasm_hash": record.get("wasm_hash", ""),
+            "onchain_wasm_hash": onchain_wasm_hash,
+            "exists": onchain_wasm_hash is not None,
+            "verified_at": verified_at,
+            "error": error,
+        }
+        if result["exists"] and result["wasm_hash"]:
+            result["wasm_match"] = onchain_wasm_hash == result["wasm_hash"]
+        return result
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Background Job Engine
+Runs long Soroban build/deploy work on a bounded executor so API handlers
+can return a job id immediately instead of blocking the event loop.
+"""
+
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+
+class JobStatus(Enum):
+    """Job lifecycle states."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+FINISHED_STATES = {JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED}
+
+# Events kept per job for streaming; older ones are dropped first
+MAX_JOB_EVENTS = 1000
+
+
+class JobCancelledError(Exception):
+    """Raised by job functions that notice a cancellation request."""
+    pass
+
+
+@dataclass
+class Job:
+    """A unit of background work and its observable state."""
+    job_id: str
+    kind: str
+    status: JobStatus = JobStatus.QUEUED
+    created_at: str = ""
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    progress: int = 0
+    message: str = ""
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+    future: Optional[Future] = field(default=None, repr=False)
+    events: List[Dict[str, Any]] = field(default_factory=list, repr=False)
+    _event_seq: int = field(default=0, repr=False)
+    _events_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def cancel_requested(self) -> bool:
+        """True once cancel() has been called for this job."""
+        return self.cancel_event.is_set()
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def report_progress(self, message: str, percentage: int):
+        """Progress callback compatible with ContractBuilder.build_contract."""
+        self.message = message
+        self.progress = max(0, min(100, int(percentage)))
+        self.emit({"type": "progress", "message": self.message, "progress": self.progress})
+
+    def emit(self, event: Dict[str, Any]):
+        """
+        Record an event for streaming to clients.
+
+        Compatible with ContractBuilder.build_contract's event_callback. Each
+        event gets an increasing "seq" number clients can resume from.
+        """
+        with self._events_lock:
+            self._event_seq += 1
+            self.events.append({**event, "seq": self._event_seq, "time": datetime.utcnow().isoformat()})
+            if len(self.events) > MAX_JOB_EVENTS:
+                del self.events[:len(self.events) - MAX_JOB_EVENTS]
+
+    def events_since(self, seq: int) -> List[Dict[str, Any]]:
+        """Events with a sequence number greater than seq, oldest first."""
+        with self._events_lock:
+            return [e for e in self.events if e["seq"] > seq]
+
+    def check_cancelled(self):
+        """Raise JobCancelledError if cancellation was requested."""
+        if self.cancel_event.is_set():
+            raise JobCancelledError(f"Job {self.job_id} cancelled")
+
+    def to_dict(self, include_result: bool = False) -> Dict[str, Any]:
+        """Public job info for API responses."""
+        data = {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "status": self.status.value,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "progress": self.progress,
+            "message": self.message,
+            "cancel_requested": self.cancel_requested,
+            "error": self.error,
+        }
+        if include_result:
+            data["result"] = self.result
+        return data
+
+
+class JobManager:
+    """
+    Tracks background jobs and runs them on a bounded thread pool.
+
+    Job functions are called as ``func(job)`` and return a result dict.
+    They may call ``job.report_progress`` and should poll
+    ``job.cancel_event`` (or ``job.check_cancelled()``) between steps.
+    """
+
+    def __init__(self, max_workers: int = 2, max_finished_jobs: int = 200):
+        """
+        Initialize the job manager.
+
+        Args:
+            max_workers: Maximum number of jobs running concurrently.
+            max_finished_jobs: How many finished jobs to keep for status/result lookups.
+        """
+        self.max_workers = max_workers
+        self.max_finished_jobs = max_finished_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hvym_job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, func: Callable[[Job], Dict[str, Any]]) -> Job:
+        """
+        Queue a job for execution.
+
+        Args:
+            kind: Job type label (e.g. "build", "deploy")
+            func: Callable invoked with the Job; its return value becomes the result
+
+        Returns:
+            The queued Job
+        """
+        job = Job(
+            job_id=str(uuid.uuid4()),
+            kind=kind,
+            created_at=datetime.utcnow().isoformat(),
+        )
+
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._prune_finished()
+
+        job.future = self._executor.submit(self._run, job, func)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job by ID."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self, kind: Optional[str] = None, status: Optional[str] = None) -> List[Job]:
+        """List jobs (newest first), optionally filtered by kind and status."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+
+        if kind:
+            jobs = [j for j in jobs if j.kind == kind]
+        if status:
+            jobs = [j for j in jobs if j.status.value == status]
+
+        jobs.sort(key=lambda j: j.created_at, reverse=True)
+        return jobs
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Request cancellation of a job.
+
+        Queued jobs are cancelled immediately. Running jobs are signalled via
+        their cancel_event and finish as CANCELLED once the job function returns.
+
+        Returns:
+            True if the job exists and was not already finished
+        """
+        job = self.get(job_id)
+        if job is None or job.is_finished:
+            return False
+
+        job.cancel_event.set()
+
+        if job.future is not None and job.future.cancel():
+            self._finish(job, JobStatus.CANCELLED, error="Cancelled before start")
+
+        return True
+
+    def shutdown(self, wait: bool = False):
+        """Cancel queued jobs, signal running ones and stop the executor."""
+        for job in self.list_jobs():
+            if not job.is_finished:
+                self.cancel(job.job_id)
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job: Job, func: Callable[[Job], Dict[str, Any]]):
+        """Executor entry point wrapping the job function."""
+        if job.cancel_requested:
+            self._finish(job, JobStatus.CANCELLED, error="Cancelled before start")
+            return
+
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.utcnow().isoformat()
+        job.emit({"type": "status", "status": job.status.value})
+
+        try:
+            result = func(job)
+        except JobCancelledError:
+            self._finish(job, JobStatus.CANCELLED, error="Cancelled")
+            return
+        except Exception as e:
+            # HTTPException carries its message in .detail
+            self._finish(job, JobStatus.FAILED, error=str(getattr(e, "detail", None) or e))
+            return
+
+        if job.cancel_requested:
+            self._finish(job, JobStatus.CANCELLED, error="Cancelled")
+        else:
+            job.progress = 100
+            self._finish(job, JobStatus.SUCCEEDED, result=result)
+
+    def _finish(self, job: Job, status: JobStatus, result: Optional[Dict] = None, error: Optional[str] = None):
+        """Move a job into a terminal state."""
+        job.result = result
+        job.error = error
+        job.finished_at = datetime.utcnow().isoformat()
+        # Emit before flipping the status so streams that stop on is_finished see it
+        job.emit({"type": "status", "status": status.value, "error": error})
+        job.status = status
+
+    def _prune_finished(self):
+        """Drop the oldest finished jobs beyond max_finished_jobs. Caller holds the lock."""
+        finished = [j for j in self._jobs.values() if j.is_finished]
+        excess = len(finished) - self.max_finished_jobs
+        if excess <= 0:
+            return
+
+        finished.sort(key=lambda j: j.finished_at or "")
+        for job in finished[:excess]:
+            del self._jobs[job.job_id]
+
+
+# Process-wide job manager shared by the API routes
+_manager: Optional[JobManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """Get or create the global job manager instance."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = JobManager()
+        return _manager
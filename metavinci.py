@@ -103,13 +103,14 @@ except ImportError:
 try:
     from contract_builder import ContractBuilder
     from contract_deployer import ContractDeployer
-    from deployment_manager import DeploymentManager
+    from deployment_manager import DeploymentManager, get_deployment_manager
     HAS_SOROBAN = True
 except ImportError:
     HAS_SOROBAN = False
     ContractBuilder = None
     ContractDeployer = None
     DeploymentManager = None
+    get_deployment_manager = None
 
 # Try to import Pinwheel daemon
 try:
@@ -515,6 +516,29 @@ class PressInstallWorker(LoadingWorker):
             self.error.emit(f"Error installing Press: {e}")
 
 
+class DeploymentVerifyWorker(LoadingWorker):
+    """Verifies the Soroban deployment history on chain in the background."""
+
+    def __init__(self, network=None):
+        super().__init__(self._verify_worker)
+        self.network = network
+
+    def _verify_worker(self):
+        from deployment_verifier import DeploymentVerifier
+
+        result = DeploymentVerifier().verify(network=self.network)
+        if not result["results"]:
+            self.success.emit("No deployments to verify")
+            return
+        message = (f"Verified {result['verified']} deployment(s): {result['exists']} on chain, "
+                   f"{result['missing']} missing")
+        if result["wasm_mismatch"]:
+            message += f", {result['wasm_mismatch']} running different WASM"
+        if result["errors"]:
+            message += f"; {result['errors']} could not be checked"
+        self.success.emit(message)
+
+
 class HvymPressInstallWorker(LoadingWorker):
     """Custom worker for hvym_press installation using direct downloads."""
     
@@ -1722,6 +1746,9 @@ class Metavinci(QMainWindow):
         self.soroban_deployments_action = QAction(self.stellar_icon, "Soroban Deployments", self)
         self.soroban_deployments_action.triggered.connect(self._show_soroban_deployments)
 
+        self.soroban_verify_action = QAction(self.stellar_icon, "Verify Deployments", self)
+        self.soroban_verify_action.triggered.connect(self._verify_soroban_deployments)
+
         # Set initial visibility based on PINTHEON_ACTIVE state
         self.run_pintheon_action.setVisible(not self.PINTHEON_ACTIVE)
         self.stop_pintheon_action.setVisible(self.PINTHEON_ACTIVE)
@@ -1900,6 +1927,7 @@ class Metavinci(QMainWindow):
         self.tray_wallet_menu.addAction(self.wallet_recover_action)
         self.tray_wallet_menu.addSeparator()
         self.tray_wallet_menu.addAction(self.soroban_deployments_action)
+        self.tray_wallet_menu.addAction(self.soroban_verify_action)
 
     def _start_api_server(self):
         """Start the local metadata API server."""
@@ -2111,6 +2139,34 @@ class Metavinci(QMainWindow):
                 f"Failed to open Soroban deployments: {str(e)}"
             )
 
+    def _verify_soroban_deployments(self):
+        """Check every recorded deployment on chain and store the results."""
+        if not HAS_SOROBAN:
+            self.open_msg_dialog('Soroban deployment management is not available.')
+            return
+
+        loading_window = AnimatedLoadingWindow(self, 'VERIFYING DEPLOYMENTS', self.LOADING_GIF)
+        loading_window.show()
+        loading_window.raise_()
+        loading_window.activateWindow()
+        loading_window.start_animation()
+        QApplication.processEvents()
+
+        worker = DeploymentVerifyWorker()
+
+        def _on_done(msg):
+            loading_window.stop_animation()
+            loading_window.close()
+            self.hide()
+            self.open_msg_dialog(msg)
+
+        worker.success.connect(lambda msg: QTimer.singleShot(0, lambda: _on_done(msg)))
+        worker.error.connect(lambda msg: QTimer.singleShot(0, lambda: _on_done(f"Verification failed: {msg}")))
+        worker.start()
+        # Keep references
+        self._current_loading_window = loading_window
+        self._current_worker = worker
+
     # =========================================================================
     # Pinwheel Methods
     # =========================================================================
@@ -2487,7 +2543,7 @@ class Metavinci(QMainWindow):
         # Check DeploymentManager
         if HAS_SOROBAN:
             try:
-                dm = DeploymentManager()
+                dm = get_deployment_manager()
                 deps = dm.list_deployments()
                 for d in deps:
                     if 'pin_service' in d.get('contract_name', '') and d.get('status') == 'success':
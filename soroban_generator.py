@@ -5,12 +5,17 @@ Generates Stellar Soroban smart contracts from HEAVYMETA collection metadata.
 Ports the ICP/Motoko contract generation system to Rust-based Soroban contracts.
 """
 
+import hashlib
+import os
 import re
 import sys
+import tempfile
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 
-from jinja2 import Environment, FileSystemLoader, TemplateNotFound
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, ModuleLoader, TemplateNotFound
 
 
 def _get_template_dir() -> Path:
@@ -25,6 +30,50 @@ def _get_template_dir() -> Path:
     return base_path / "templates" / "soroban"
 
 
+def _get_compiled_template_dir() -> Path:
+    """Directory holding templates compiled to Python modules by compile_templates()."""
+    return _get_template_dir().parent / "soroban_compiled"
+
+
+def _get_bytecode_cache_dir() -> Path:
+    """Get the platform-specific directory for the Jinja2 bytecode cache."""
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Application Support"
+    else:
+        base = Path(os.environ.get("XDG_DATA_HOME", Path.home() / ".local" / "share"))
+
+    cache_dir = base / "heavymeta" / "template_cache"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def _file_sha256(path: Path) -> Optional[str]:
+    """SHA-256 of a file's content, or None if it cannot be read."""
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write a file through a temporary sibling and rename it into place."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
 class SorobanGeneratorError(Exception):
     """Base exception for Soroban generator errors."""
     pass
@@ -58,24 +107,70 @@ class SorobanGenerator:
     # Valid NFT types
     VALID_NFT_TYPES = {'HVYC', 'HVYI', 'HVYA', 'HVYW', 'HVYO', 'HVYG', 'HVYAU'}
 
-    def __init__(self, template_dir: Optional[Path] = None):
+    # Release profile settings per build profile. panic stays "abort" in every
+    # profile: wasm32-unknown-unknown has no unwinding support.
+    BUILD_PROFILES = {
+        # Smallest WASM and lowest deploy cost; slowest to compile
+        'min-size': {'opt_level': 'z', 'lto': True, 'codegen_units': 1,
+                     'panic': 'abort', 'strip': 'symbols', 'incremental': False},
+        # Near min-size output with parallel codegen and thin LTO
+        'balanced': {'opt_level': 's', 'lto': 'thin', 'codegen_units': 4,
+                     'panic': 'abort', 'strip': 'symbols', 'incremental': False},
+        # Quick iteration builds; larger WASM, not meant for mainnet
+        'fast-compile': {'opt_level': 1, 'lto': False, 'codegen_units': 16,
+                         'panic': 'abort', 'strip': 'debuginfo', 'incremental': True},
+    }
+    DEFAULT_BUILD_PROFILE = 'min-size'
+
+    # Templates rendered for every contract; compiled up front by the shared generator
+    CONTRACT_TEMPLATES = ('Cargo.toml.j2', 'lib.rs.j2', 'types.rs.j2', 'storage.rs.j2', 'test.rs.j2')
+
+    def __init__(self, template_dir: Optional[Path] = None, auto_reload: Optional[bool] = None,
+                 bytecode_cache: bool = True, use_compiled: bool = True):
         """
         Initialize the Soroban generator.
 
         Args:
             template_dir: Optional custom template directory path.
                          If not provided, uses the default templates/soroban/ directory.
+            auto_reload: Recompile a template when its file's mtime changes.
+                         Defaults to on in development and off in frozen builds.
+            bytecode_cache: Keep compiled template bytecode on disk so a new
+                            process does not recompile unchanged templates.
+            use_compiled: Load templates compiled ahead of time with
+                          compile_templates() when they exist and auto_reload is off.
         """
         self.template_dir = template_dir or _get_template_dir()
+        if auto_reload is None:
+            auto_reload = not getattr(sys, 'frozen', False)
 
         if not self.template_dir.exists():
             raise TemplateError(f"Template directory not found: {self.template_dir}")
 
+        compiled_dir = _get_compiled_template_dir()
+        self.precompiled = (
+            use_compiled and not auto_reload and template_dir is None and compiled_dir.is_dir()
+        )
+
+        options = {}
+        if self.precompiled:
+            loader = ModuleLoader(str(compiled_dir))
+        else:
+            loader = FileSystemLoader(str(self.template_dir))
+            if bytecode_cache:
+                try:
+                    options['bytecode_cache'] = FileSystemBytecodeCache(str(_get_bytecode_cache_dir()))
+                except OSError:
+                    # Read-only home directory: compile in memory only
+                    pass
+
         self.env = Environment(
-            loader=FileSystemLoader(str(self.template_dir)),
+            loader=loader,
             trim_blocks=True,
             lstrip_blocks=True,
             keep_trailing_newline=True,
+            auto_reload=auto_reload,
+            **options,
         )
 
         # Add custom filters
@@ -83,6 +178,40 @@ class SorobanGenerator:
         self.env.filters['pascal_case'] = self._to_pascal_case
         self.env.filters['upper'] = str.upper
         self.env.filters['capitalize'] = str.capitalize
+        self.env.filters['toml'] = self._to_toml_value
+
+    def precompile(self) -> None:
+        """Load and compile every contract template now instead of on first render."""
+        for name in self.CONTRACT_TEMPLATES + ('Cargo.workspace.toml.j2',):
+            try:
+                self.env.get_template(name)
+            except TemplateNotFound as e:
+                raise TemplateError(f"Template not found: {e}")
+
+    def compile_templates(self, target_dir: Optional[Path] = None) -> Path:
+        """
+        Compile all templates to Python modules for ModuleLoader.
+
+        Run at package build time so frozen builds skip template compilation.
+
+        Args:
+            target_dir: Output directory (default: templates/soroban_compiled)
+
+        Returns:
+            Path to the directory of compiled modules
+        """
+        target_dir = Path(target_dir or _get_compiled_template_dir())
+        target_dir.mkdir(parents=True, exist_ok=True)
+        for old in target_dir.glob("tmpl_*.py"):
+            old.unlink()
+        self.env.compile_templates(
+            str(target_dir),
+            extensions=["j2"],
+            zip=None,
+            ignore_errors=False,
+            log_function=None,
+        )
+        return target_dir
 
     def generate(self, data: Dict[str, Any]) -> Dict[str, str]:
         """
@@ -95,6 +224,8 @@ class SorobanGenerator:
                 - max_supply: Maximum NFT supply
                 - nft_type: Optional NFT type (default: "HVYC")
                 - val_props: Optional dictionary of value properties
+                - build_profile: Optional release profile, one of BUILD_PROFILES
+                  (default: "min-size")
 
         Returns:
             Dictionary mapping file paths to generated content:
@@ -110,19 +241,7 @@ class SorobanGenerator:
         """
         self._validate(data)
         template_data = self._build_template_data(data)
-
-        try:
-            return {
-                "Cargo.toml": self._render("Cargo.toml.j2", template_data),
-                "src/lib.rs": self._render("lib.rs.j2", template_data),
-                "src/types.rs": self._render("types.rs.j2", template_data),
-                "src/storage.rs": self._render("storage.rs.j2", template_data),
-                "src/test.rs": self._render("test.rs.j2", template_data),
-            }
-        except TemplateNotFound as e:
-            raise TemplateError(f"Template not found: {e}")
-        except Exception as e:
-            raise TemplateError(f"Template rendering failed: {e}")
+        return self._render_files(template_data)
 
     def generate_and_write(self, data: Dict[str, Any], output_dir: Optional[Path] = None) -> Dict[str, Any]:
         """
@@ -137,12 +256,12 @@ class SorobanGenerator:
                 - files: Dict mapping file paths to content
                 - output_path: Path where files were written
                 - contract_name_snake: Snake case contract name
+                - manifest: Changed and unchanged files (see write_files())
 
         Raises:
             ValidationError: If input data is invalid
             TemplateError: If template rendering fails
         """
-        import tempfile
         import uuid
 
         # Generate the files in memory first
@@ -159,20 +278,206 @@ class SorobanGenerator:
 
         output_dir = Path(output_dir)
 
-        # Write files to disk
-        self.write_to_directory(files, output_dir)
+        # Write files to disk, leaving unchanged files alone
+        manifest = self.write_files(files, output_dir)
 
         return {
             "files": files,
             "output_path": output_dir,
             "contract_name_snake": contract_name_snake,
+            "manifest": manifest,
+        }
+
+    def generate_workspace(self, configs: List[Dict[str, Any]], output_dir: Optional[Path] = None,
+                           build_profile: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Generate several contracts into one Cargo workspace and write it to disk.
+
+        Each contract becomes a member crate under contracts/<name_snake>/, and the
+        workspace root Cargo.toml carries the shared release profile, so a single
+        build compiles the common dependencies once for all members.
+
+        Invalid configs do not abort the batch; they are reported per item and
+        left out of the workspace.
+
+        Args:
+            configs: List of contract configuration dictionaries (see generate())
+            output_dir: Optional workspace directory. If not provided, creates a temp directory.
+            build_profile: Release profile for the whole workspace (default: "min-size").
+                           Cargo only honours profiles at the workspace root, so
+                           per-config build_profile values are ignored.
+
+        Returns:
+            Dictionary containing:
+                - output_path: Workspace root directory
+                - members: Per-config results in input order, each with contract_name,
+                  contract_name_snake, path (None on error), manifest (see write_files())
+                  and error (None on success)
+
+        Raises:
+            ValidationError: If build_profile is not a known profile
+            TemplateError: If template rendering fails
+        """
+        import uuid
+
+        if build_profile and build_profile not in self.BUILD_PROFILES:
+            raise ValidationError(f"Invalid build_profile: {build_profile}. Valid profiles: {', '.join(self.BUILD_PROFILES)}")
+
+        if output_dir is None:
+            base_temp = Path(tempfile.gettempdir()) / "soroban_contracts"
+            base_temp.mkdir(exist_ok=True)
+            output_dir = base_temp / f"workspace_{uuid.uuid4().hex[:8]}"
+
+        output_dir = Path(output_dir)
+        members = []
+        seen = set()
+
+        for data in configs:
+            item = {
+                "contract_name": data.get("contract_name"),
+                "contract_name_snake": None,
+                "path": None,
+                "manifest": None,
+                "error": None,
+            }
+            members.append(item)
+
+            result = self.validate({**data, "build_profile": None})
+            if not result["valid"]:
+                item["error"] = "; ".join(result["errors"])
+                continue
+
+            template_data = self._build_template_data(data)
+            name_snake = template_data["contract"]["name_snake"]
+            item["contract_name_snake"] = name_snake
+
+            if name_snake in seen:
+                item["error"] = f"Duplicate contract name in batch: {name_snake}"
+                continue
+            seen.add(name_snake)
+
+            template_data["workspace_member"] = True
+            member_dir = output_dir / "contracts" / name_snake
+            item["manifest"] = self.write_files(self._render_files(template_data), member_dir)
+            item["path"] = member_dir
+
+        member_names = [m["contract_name_snake"] for m in members if m["path"] is not None]
+        workspace_toml = self._render("Cargo.workspace.toml.j2", {
+            "members": member_names,
+            "build_profile": self._build_profile(build_profile),
+        })
+        output_dir.mkdir(parents=True, exist_ok=True)
+        root_manifest = output_dir / "Cargo.toml"
+        workspace_bytes = workspace_toml.encode("utf-8")
+        if _file_sha256(root_manifest) != hashlib.sha256(workspace_bytes).hexdigest():
+            _write_atomic(root_manifest, workspace_bytes)
+
+        return {
+            "output_path": output_dir,
+            "members": members,
         }
 
+    def generate_batch(self, configs: List[Dict[str, Any]], output_root: Optional[Path] = None,
+                       write_to_disk: bool = True, render_workers: int = 4,
+                       io_workers: int = 4) -> Iterator[Dict[str, Any]]:
+        """
+        Generate many independent contracts, yielding each result as it completes.
+
+        All configs are validated up front; invalid ones are yielded first.
+        Valid contracts are rendered on a pool of render_workers threads and,
+        when write_to_disk is set, written by a separate pool of io_workers
+        threads, which bounds how many output directories are written at once.
+        Results are yielded in completion order, not input order.
+
+        Args:
+            configs: List of contract configuration dictionaries (see generate())
+            output_root: Optional parent directory; each contract is written to
+                         <output_root>/<name_snake>. If not provided, each contract
+                         gets its own temp directory.
+            write_to_disk: Write the generated files (see write_files())
+            render_workers: Threads rendering templates
+            io_workers: Threads writing output directories
+
+        Yields:
+            Dictionaries with index (position in configs), contract_name,
+            contract_name_snake, success, files, output_path, manifest and error
+        """
+        import uuid
+
+        items = []
+        seen = set()
+        for index, data in enumerate(configs):
+            item = {
+                "index": index,
+                "contract_name": data.get("contract_name"),
+                "contract_name_snake": None,
+                "success": False,
+                "files": None,
+                "output_path": None,
+                "manifest": None,
+                "error": None,
+            }
+            items.append(item)
+
+            result = self.validate(data)
+            if not result["valid"]:
+                item["error"] = "; ".join(result["errors"])
+                continue
+
+            name_snake = self._to_snake_case(data["contract_name"])
+            item["contract_name_snake"] = name_snake
+            if output_root is not None:
+                if name_snake in seen:
+                    item["error"] = f"Duplicate contract name in batch: {name_snake}"
+                    continue
+                seen.add(name_snake)
+                item["output_path"] = Path(output_root) / name_snake
+            elif write_to_disk:
+                base_temp = Path(tempfile.gettempdir()) / "soroban_contracts"
+                base_temp.mkdir(exist_ok=True)
+                item["output_path"] = base_temp / f"{name_snake}_{uuid.uuid4().hex[:8]}"
+
+        for item in items:
+            if item["error"] is not None:
+                yield item
+
+        with ThreadPoolExecutor(max_workers=render_workers, thread_name_prefix="soroban_render") as render_pool, \
+                ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="soroban_write") as io_pool:
+            pending = {}
+            for item in items:
+                if item["error"] is None:
+                    data = configs[item["index"]]
+                    future = render_pool.submit(self._render_files, self._build_template_data(data))
+                    pending[future] = ("render", item)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, item = pending.pop(future)
+                    try:
+                        value = future.result()
+                    except Exception as e:
+                        item["error"] = str(e)
+                        yield item
+                        continue
+
+                    if stage == "render":
+                        item["files"] = value
+                        if write_to_disk:
+                            pending[io_pool.submit(self.write_files, value, item["output_path"])] = ("write", item)
+                            continue
+                    else:
+                        item["manifest"] = value
+
+                    item["success"] = True
+                    yield item
+
     def write_to_directory(self, files: Dict[str, str], output_dir: Path) -> Path:
         """
         Write generated contract files to a directory.
 
-        Creates the directory structure and writes all files.
+        Creates the directory structure and writes all files. Files whose
+        content is unchanged are left untouched (see write_files()).
 
         Args:
             files: Dictionary mapping file paths to content (from generate())
@@ -181,6 +486,29 @@ class SorobanGenerator:
         Returns:
             Path to the output directory
 
+        Raises:
+            IOError: If writing files fails
+        """
+        self.write_files(files, output_dir)
+        return Path(output_dir)
+
+    def write_files(self, files: Dict[str, str], output_dir: Path) -> Dict[str, Any]:
+        """
+        Write generated files, skipping those whose content already matches.
+
+        Each rendered file is hashed against the file on disk. Only changed
+        files are written, each through a temporary file renamed into place,
+        so unchanged files keep their mtime and cargo does not see them as
+        modified when a contract is regenerated into the same directory.
+
+        Args:
+            files: Dictionary mapping file paths to content (from generate())
+            output_dir: Directory to write files to
+
+        Returns:
+            Manifest with changed and unchanged (relative paths) and
+            hashes (relative path -> sha256 of the content)
+
         Raises:
             IOError: If writing files fails
         """
@@ -188,17 +516,22 @@ class SorobanGenerator:
 
         # Create the directory structure
         output_dir.mkdir(parents=True, exist_ok=True)
-        src_dir = output_dir / "src"
-        src_dir.mkdir(exist_ok=True)
+        (output_dir / "src").mkdir(exist_ok=True)
 
-        # Write each file
+        manifest = {"changed": [], "unchanged": [], "hashes": {}}
         for file_path, content in files.items():
+            data = content.encode("utf-8")
+            digest = hashlib.sha256(data).hexdigest()
+            manifest["hashes"][file_path] = digest
+
             full_path = output_dir / file_path
-            # Ensure parent directory exists (for src/ files)
-            full_path.parent.mkdir(parents=True, exist_ok=True)
-            full_path.write_text(content, encoding="utf-8")
+            if _file_sha256(full_path) == digest:
+                manifest["unchanged"].append(file_path)
+            else:
+                _write_atomic(full_path, data)
+                manifest["changed"].append(file_path)
 
-        return output_dir
+        return manifest
 
     def generate_types_only(self, data: Dict[str, Any]) -> str:
         """
@@ -259,6 +592,10 @@ class SorobanGenerator:
             if data["nft_type"] not in self.VALID_NFT_TYPES:
                 errors.append(f"Invalid nft_type: {data['nft_type']}. Valid types: {', '.join(self.VALID_NFT_TYPES)}")
 
+        # Validate build_profile if provided
+        if data.get("build_profile") and data["build_profile"] not in self.BUILD_PROFILES:
+            errors.append(f"Invalid build_profile: {data['build_profile']}. Valid profiles: {', '.join(self.BUILD_PROFILES)}")
+
         # Validate val_props
         if "val_props" in data and data["val_props"]:
             val_props = data["val_props"]
@@ -286,6 +623,8 @@ class SorobanGenerator:
             {"name": "types.rs.j2", "description": "Type definitions, error enums, and property constants"},
             {"name": "storage.rs.j2", "description": "Storage key definitions for persistent and instance data"},
             {"name": "Cargo.toml.j2", "description": "Cargo build configuration for Soroban contract"},
+            {"name": "Cargo.workspace.toml.j2", "description": "Cargo workspace root for batch builds of several contracts"},
+            {"name": "profile.toml.j2", "description": "Release build profile shared by contract and workspace manifests"},
             {"name": "test.rs.j2", "description": "Unit test scaffolding for contract functions"},
         ]
 
@@ -397,8 +736,37 @@ class SorobanGenerator:
                 "nft_type": data.get("nft_type", "HVYC"),
             },
             "val_props": val_props,
+            "build_profile": self._build_profile(data.get("build_profile")),
         }
 
+    def _build_profile(self, name: Optional[str]) -> Dict[str, Any]:
+        """Release profile settings for a build profile name (default if None)."""
+        name = name or self.DEFAULT_BUILD_PROFILE
+        return {"name": name, **self.BUILD_PROFILES[name]}
+
+    def _render_files(self, template_data: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Render every contract file from prepared template data.
+
+        Args:
+            template_data: Output of _build_template_data()
+
+        Returns:
+            Dictionary mapping file paths to generated content
+        """
+        try:
+            return {
+                "Cargo.toml": self._render("Cargo.toml.j2", template_data),
+                "src/lib.rs": self._render("lib.rs.j2", template_data),
+                "src/types.rs": self._render("types.rs.j2", template_data),
+                "src/storage.rs": self._render("storage.rs.j2", template_data),
+                "src/test.rs": self._render("test.rs.j2", template_data),
+            }
+        except TemplateNotFound as e:
+            raise TemplateError(f"Template not found: {e}")
+        except Exception as e:
+            raise TemplateError(f"Template rendering failed: {e}")
+
     def _render(self, template_name: str, data: Dict[str, Any]) -> str:
         """
         Render a template with the given data.
@@ -413,6 +781,15 @@ class SorobanGenerator:
         template = self.env.get_template(template_name)
         return template.render(**data)
 
+    @staticmethod
+    def _to_toml_value(value: Any) -> str:
+        """Render a Python scalar as a TOML value."""
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if isinstance(value, int):
+            return str(value)
+        return f'"{value}"'
+
     @staticmethod
     def _to_snake_case(name: str) -> str:
         """
@@ -476,7 +853,7 @@ def generate_soroban_contract(data: Dict[str, Any]) -> Dict[str, str]:
     """
     Generate a complete Soroban contract from collection metadata.
 
-    This is a convenience function that creates a SorobanGenerator instance
+    This is a convenience function that uses the shared SorobanGenerator instance
     and generates all contract files.
 
     Args:
@@ -494,5 +871,20 @@ def generate_soroban_contract(data: Dict[str, Any]) -> Dict[str, str]:
         ValidationError: If input data is invalid
         TemplateError: If template rendering fails
     """
-    generator = SorobanGenerator()
-    return generator.generate(data)
+    return get_soroban_generator().generate(data)
+
+
+# Shared generator: one Jinja2 environment with compiled templates for all requests
+_generator: Optional[SorobanGenerator] = None
+_generator_lock = threading.Lock()
+
+
+def get_soroban_generator() -> SorobanGenerator:
+    """Get or create the global Soroban generator with its templates precompiled."""
+    global _generator
+    with _generator_lock:
+        if _generator is None:
+            generator = SorobanGenerator()
+            generator.precompile()
+            _generator = generator
+        return _generator
@@ -0,0 +1,545 @@
+#!/usr/bin/env python3
+"""
+Soroban RPC Deployer
+Deploys contracts natively through Soroban RPC with stellar_sdk instead of the
+stellar CLI. WASM code is uploaded once per network and recorded in a local
+install index keyed by WASM hash; later deploys of the same code only create
+a new contract instance from the stored hash.
+"""
+
+import hashlib
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from tinydb import TinyDB, Query
+from stellar_sdk import Account, Keypair, SorobanServer, TransactionBuilder
+from stellar_sdk import xdr as stellar_xdr
+from stellar_sdk.address import Address
+from stellar_sdk.exceptions import PrepareTransactionException
+from stellar_sdk.soroban_rpc import GetTransactionStatus, SendTransactionStatus
+
+
+def _get_data_dir() -> Path:
+    """Get the platform-specific data directory for deployment storage."""
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Application Support"
+    else:
+        base = Path(os.environ.get("XDG_DATA_HOME", Path.home() / ".local" / "share"))
+
+    data_dir = base / "heavymeta" / "deployments"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    return data_dir
+
+
+class RpcDeployError(Exception):
+    """Raised when a deploy transaction fails to simulate, submit or apply."""
+
+    def __init__(self, message: str, transaction_hash: Optional[str] = None, fee_charged: int = 0,
+                 transient: bool = False):
+        super().__init__(message)
+        self.transaction_hash = transaction_hash
+        self.fee_charged = fee_charged
+        # True when retrying the same deploy may succeed (congestion, stale sequence, timeout)
+        self.transient = transient
+
+
+# Result codes worth retrying: the sequence number moved underneath us, or the
+# fee bid was too low for current surge pricing
+TRANSIENT_RESULT_CODES = {"txBAD_SEQ", "txINSUFFICIENT_FEE", "txTOO_LATE"}
+
+
+class AccountSequencer:
+    """
+    Tracks source account sequence numbers locally
+
+    Each account is loaded from the network once and its sequence number is
+    then advanced locally for every transaction. reserve() holds a per-account
+    lock from build to confirmation, since the network queues only one
+    transaction per source account at a time; different accounts proceed in
+    parallel. After any failure the account is reloaded on next use.
+    """
+
+    def __init__(self, server: SorobanServer):
+        self.server = server
+        self._accounts: Dict[str, object] = {}
+        self._account_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def reserve(self, address: str):
+        """Yield the account object for building one transaction from address."""
+        with self._lock:
+            account_lock = self._account_locks.setdefault(address, threading.Lock())
+        with account_lock:
+            account = self._accounts.pop(address, None) or self.server.load_account(address)
+            yield account
+            # Only reached when the block exited cleanly; TransactionBuilder has
+            # already advanced account.sequence, so keep it for the next build
+            self._accounts[address] = account
+
+    def forget(self, address: str):
+        """Drop the cached sequence number of an account."""
+        self._accounts.pop(address, None)
+
+
+class WasmInstallIndex:
+    """Local index of WASM code already uploaded to a network, keyed by hash"""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        Initialize the index.
+
+        Args:
+            db_path: Optional TinyDB path (default: wasm_installs.json in the deployments dir)
+        """
+        self.db_path = Path(db_path) if db_path else _get_data_dir() / "wasm_installs.json"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = TinyDB(self.db_path)
+        self.installs = self.db.table("installs")
+        self._lock = threading.Lock()
+
+    def get(self, network_passphrase: str, wasm_hash: str) -> Optional[Dict]:
+        """Install record for a WASM hash on a network, or None."""
+        q = Query()
+        with self._lock:
+            return self.installs.get((q.network_passphrase == network_passphrase) & (q.wasm_hash == wasm_hash))
+
+    def record(self, network_passphrase: str, wasm_hash: str, transaction_hash: Optional[str] = None,
+               fee_charged: int = 0, wasm_size: int = 0) -> Dict:
+        """Remember that a WASM hash is installed on a network."""
+        q = Query()
+        entry = {
+            "network_passphrase": network_passphrase,
+            "wasm_hash": wasm_hash,
+            "transaction_hash": transaction_hash or "",
+            "fee_charged": fee_charged,
+            "wasm_size": wasm_size,
+            "installed_at": datetime.utcnow().isoformat(),
+        }
+        with self._lock:
+            self.installs.upsert(entry, (q.network_passphrase == network_passphrase) & (q.wasm_hash == wasm_hash))
+        return entry
+
+    def remove(self, network_passphrase: str, wasm_hash: str) -> bool:
+        """Forget an install, e.g. after its code entry expired on chain."""
+        q = Query()
+        with self._lock:
+            return bool(self.installs.remove((q.network_passphrase == network_passphrase) & (q.wasm_hash == wasm_hash)))
+
+    def list_installs(self, network_passphrase: Optional[str] = None) -> List[Dict]:
+        """All install records, optionally for one network."""
+        with self._lock:
+            if network_passphrase is None:
+                return self.installs.all()
+            return self.installs.search(Query().network_passphrase == network_passphrase)
+
+
+class FeeEstimateCache:
+    """
+    Simulated deploy costs keyed by network, WASM hash and install state
+
+    Resource fees follow network settings that change rarely, so estimates are
+    reused for ttl seconds instead of simulating again for every request.
+    """
+
+    def __init__(self, ttl: float = 3600):
+        self.ttl = ttl
+        self._entries: Dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, network_passphrase: str, wasm_hash: str, installed: bool) -> Optional[Dict]:
+        """Cached estimate, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get((network_passphrase, wasm_hash, installed))
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            return None
+        return entry[1]
+
+    def put(self, network_passphrase: str, wasm_hash: str, installed: bool, estimate: Dict):
+        """Store an estimate."""
+        with self._lock:
+            self._entries[(network_passphrase, wasm_hash, installed)] = (time.monotonic(), estimate)
+
+    def clear(self):
+        """Drop all cached estimates."""
+        with self._lock:
+            self._entries.clear()
+
+
+class RpcDeployer:
+    """Uploads WASM and creates contract instances through Soroban RPC"""
+
+    def __init__(self, rpc_url: str, network_passphrase: str, install_index: Optional[WasmInstallIndex] = None,
+                 timeout: int = 120, poll_interval: float = 1.0, base_fee: int = 100, send_retries: int = 3,
+                 server: Optional[SorobanServer] = None, fee_cache: Optional[FeeEstimateCache] = None):
+        """
+        Initialize the deployer.
+
+        Args:
+            rpc_url: Soroban RPC endpoint
+            network_passphrase: Network the transactions are signed for
+            install_index: WASM install index (defaults to the process-wide index)
+            timeout: Seconds to wait for each transaction to be applied
+            poll_interval: Seconds between getTransaction polls
+            base_fee: Inclusion fee per operation in stroops (resource fee comes from simulation)
+            send_retries: Resubmissions when the RPC answers TRY_AGAIN_LATER
+            server: Optional SorobanServer to use instead of connecting to rpc_url
+            fee_cache: Fee estimate cache (defaults to the process-wide cache)
+        """
+        self.rpc_url = rpc_url
+        self.network_passphrase = network_passphrase
+        self.install_index = install_index if install_index is not None else get_wasm_install_index()
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.base_fee = base_fee
+        self.send_retries = send_retries
+        self.server = server or SorobanServer(rpc_url)
+        self.sequencer = AccountSequencer(self.server)
+        self.fee_cache = fee_cache if fee_cache is not None else get_fee_estimate_cache()
+
+    @staticmethod
+    def wasm_hash(wasm: bytes) -> str:
+        """Hex SHA-256 of WASM bytes, the id the network stores code under."""
+        return hashlib.sha256(wasm).hexdigest()
+
+    def code_exists(self, wasm_hash: str) -> bool:
+        """Check whether contract code with this hash is live on the network."""
+        key = stellar_xdr.LedgerKey(
+            stellar_xdr.LedgerEntryType.CONTRACT_CODE,
+            contract_code=stellar_xdr.LedgerKeyContractCode(hash=stellar_xdr.Hash(bytes.fromhex(wasm_hash))),
+        )
+        return bool(self.server.get_ledger_entries([key]).entries)
+
+    def contract_exists(self, contract_id: str) -> bool:
+        """Check whether a contract instance is live on the network."""
+        return self.contract_wasm_hashes([contract_id])[contract_id] is not None
+
+    def contract_wasm_hashes(self, contract_ids: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Look up many contract instances with one getLedgerEntries call
+
+        Returns:
+            Dict mapping each contract id to the hex WASM hash it runs, "" for
+            non-WASM (built-in asset) contracts, or None if it is not on the network
+        """
+        keys = [
+            stellar_xdr.LedgerKey(
+                stellar_xdr.LedgerEntryType.CONTRACT_DATA,
+                contract_data=stellar_xdr.LedgerKeyContractData(
+                    contract=Address(contract_id).to_xdr_sc_address(),
+                    key=stellar_xdr.SCVal(stellar_xdr.SCValType.SCV_LEDGER_KEY_CONTRACT_INSTANCE),
+                    durability=stellar_xdr.ContractDataDurability.PERSISTENT,
+                ),
+            )
+            for contract_id in contract_ids
+        ]
+        found: Dict[str, Optional[str]] = {contract_id: None for contract_id in contract_ids}
+        if not keys:
+            return found
+
+        for entry in self.server.get_ledger_entries(keys).entries or []:
+            data = stellar_xdr.LedgerEntryData.from_xdr(entry.xdr).contract_data
+            executable = data.val.instance.executable
+            wasm_hash = executable.wasm_hash.hash.hex() if executable.wasm_hash else ""
+            found[Address.from_xdr_sc_address(data.contract).address] = wasm_hash
+        return found
+
+    def transaction_status(self, tx_hash: str) -> Dict:
+        """
+        Look up a submitted transaction once, without waiting
+
+        Returns:
+            Dict with status (SUCCESS, FAILED or NOT_FOUND) and fee_charged
+        """
+        response = self.server.get_transaction(tx_hash)
+        return {"status": response.status.value, "fee_charged": _fee_charged(response.result_xdr)}
+
+    def estimate(self, wasm: bytes, source: Optional[str] = None) -> Dict:
+        """
+        Estimate deploy resources and fees by simulating the transactions
+
+        Code the network does not have yet gets a simulated upload; the create
+        transaction can only be simulated once the code is installed, so it is
+        None (and complete False) until then. Nothing is signed or submitted.
+
+        Args:
+            wasm: Contract WASM bytes
+            source: Deploying account address (default: a throwaway address)
+
+        Returns:
+            Dict with wasm_hash, wasm_size, installed, install and create (each
+            cpu_instructions, read_bytes, write_bytes, resource_fee, inclusion_fee
+            and fee in stroops, or None), total_fee, complete and cached
+
+        Raises:
+            RpcDeployError: If a simulation fails
+        """
+        wasm_hash = self.wasm_hash(wasm)
+        installed = self.code_exists(wasm_hash)
+        cached = self.fee_cache.get(self.network_passphrase, wasm_hash, installed)
+        if cached is not None:
+            return {**cached, "cached": True}
+
+        source = source or Keypair.random().public_key
+        install = None
+        create = None
+        if installed:
+            create = self._simulate(
+                source, lambda builder: builder.append_create_contract_op(wasm_id=wasm_hash, address=source)
+            )
+        else:
+            install = self._simulate(source, lambda builder: builder.append_upload_contract_wasm_op(wasm))
+
+        estimate = {
+            "wasm_hash": wasm_hash,
+            "wasm_size": len(wasm),
+            "installed": installed,
+            "install": install,
+            "create": create,
+            "total_fee": (install["fee"] if install else 0) + (create["fee"] if create else 0),
+            "complete": create is not None,
+        }
+        self.fee_cache.put(self.network_passphrase, wasm_hash, installed, estimate)
+        return {**estimate, "cached": False}
+
+    def deploy(self, keypair: Keypair, wasm: bytes, on_stage: Optional[Callable[..., None]] = None) -> Dict:
+        """
+        Deploy a contract, uploading its WASM only if the network does not have it yet
+
+        Args:
+            keypair: Signing keypair of the deploying account
+            wasm: Contract WASM bytes
+            on_stage: Optional callback, called as on_stage(stage, **fields) when
+                      the upload ("uploading") or create ("instantiating") starts and
+                      again with the transaction hash once each is submitted
+
+        Returns:
+            Dict with contract_id, wasm_hash, transaction_hash (create transaction),
+            install_transaction_hash ("" when the code was already installed),
+            wasm_reused, fees_paid (stroops, install + create), install_fee and create_fee
+
+        Raises:
+            RpcDeployError: If a transaction fails
+        """
+        wasm_hash = self.wasm_hash(wasm)
+        indexed = self.install_index.get(self.network_passphrase, wasm_hash) is not None
+        install = None if indexed else self.ensure_installed(keypair, wasm, on_stage)
+
+        try:
+            create = self.create_contract(keypair, wasm_hash, on_stage)
+        except RpcDeployError:
+            # The index may point at code whose ledger entry has since expired
+            if not indexed or self.code_exists(wasm_hash):
+                raise
+            self.install_index.remove(self.network_passphrase, wasm_hash)
+            install = self.ensure_installed(keypair, wasm, on_stage)
+            create = self.create_contract(keypair, wasm_hash, on_stage)
+
+        install_fee = install["fee_charged"] if install else 0
+        return {
+            "contract_id": create["contract_id"],
+            "wasm_hash": wasm_hash,
+            "transaction_hash": create["transaction_hash"],
+            "install_transaction_hash": install["transaction_hash"] if install else "",
+            "wasm_reused": install is None or install["reused"],
+            "fees_paid": install_fee + create["fee_charged"],
+            "install_fee": install_fee,
+            "create_fee": create["fee_charged"],
+        }
+
+    def install_wasm(self, keypair: Keypair, wasm: bytes, on_stage: Optional[Callable[..., None]] = None) -> Dict:
+        """
+        Upload WASM code and record it in the install index
+
+        Returns:
+            Dict with wasm_hash, transaction_hash, fee_charged and reused (False)
+        """
+        wasm_hash = self.wasm_hash(wasm)
+        on_sent = None
+        if on_stage:
+            on_stage("uploading", wasm_hash=wasm_hash)
+            on_sent = lambda tx_hash, return_value: on_stage("uploading", install_transaction_hash=tx_hash)
+        result = self._submit(keypair, lambda builder: builder.append_upload_contract_wasm_op(wasm), on_sent)
+        self.install_index.record(self.network_passphrase, wasm_hash, result["transaction_hash"],
+                                  result["fee_charged"], len(wasm))
+        return {"wasm_hash": wasm_hash, "transaction_hash": result["transaction_hash"],
+                "fee_charged": result["fee_charged"], "reused": False}
+
+    def create_contract(self, keypair: Keypair, wasm_hash: str,
+                        on_stage: Optional[Callable[..., None]] = None) -> Dict:
+        """
+        Create a contract instance from installed code
+
+        Returns:
+            Dict with contract_id, transaction_hash and fee_charged
+        """
+        on_sent = None
+        if on_stage:
+            on_stage("instantiating", wasm_hash=wasm_hash)
+            on_sent = lambda tx_hash, return_value: on_stage("instantiating", transaction_hash=tx_hash,
+                                                             contract_id=_contract_address(return_value))
+        result = self._submit(
+            keypair,
+            lambda builder: builder.append_create_contract_op(wasm_id=wasm_hash, address=keypair.public_key),
+            on_sent
+        )
+        contract_id = _contract_address(result["return_value"])
+        if contract_id is None:
+            raise RpcDeployError("Create contract did not return a contract address", result["transaction_hash"],
+                                 result["fee_charged"])
+        return {
+            "contract_id": contract_id,
+            "transaction_hash": result["transaction_hash"],
+            "fee_charged": result["fee_charged"],
+        }
+
+    def ensure_installed(self, keypair: Keypair, wasm: bytes, on_stage: Optional[Callable[..., None]] = None) -> Dict:
+        """
+        Upload WASM unless the network already has it; record it in the index either way
+
+        Returns:
+            Dict with wasm_hash, transaction_hash ("" if not uploaded), fee_charged and reused
+        """
+        wasm_hash = self.wasm_hash(wasm)
+        if self.code_exists(wasm_hash):
+            self.install_index.record(self.network_passphrase, wasm_hash, wasm_size=len(wasm))
+            return {"wasm_hash": wasm_hash, "transaction_hash": "", "fee_charged": 0, "reused": True}
+        return self.install_wasm(keypair, wasm, on_stage)
+
+    def _submit(self, keypair: Keypair, append_op: Callable[[TransactionBuilder], TransactionBuilder],
+                on_sent: Optional[Callable[[str, Optional[stellar_xdr.SCVal]], None]] = None) -> Dict:
+        """
+        Build, simulate, prepare, sign, send and confirm a one-operation transaction
+
+        on_sent, if given, is called with the transaction hash and simulated
+        return value once the network has accepted the transaction.
+
+        Returns:
+            Dict with transaction_hash, fee_charged (stroops) and return_value
+            (SCVal result of the simulation)
+        """
+        with self.sequencer.reserve(keypair.public_key) as account:
+            builder = TransactionBuilder(account, self.network_passphrase, base_fee=self.base_fee).set_timeout(300)
+            transaction = append_op(builder).build()
+
+            simulation = self.server.simulate_transaction(transaction)
+            if simulation.error:
+                raise RpcDeployError(f"Simulation failed: {simulation.error}")
+            try:
+                transaction = self.server.prepare_transaction(transaction, simulation)
+            except PrepareTransactionException as e:
+                raise RpcDeployError(f"Failed to prepare transaction: {e}")
+            transaction.sign(keypair)
+
+            return_value = None
+            if simulation.results:
+                return_value = stellar_xdr.SCVal.from_xdr(simulation.results[0].xdr)
+
+            tx_hash = self._send(transaction)
+            if on_sent:
+                on_sent(tx_hash, return_value)
+            fee_charged = self._wait(tx_hash)
+
+        return {"transaction_hash": tx_hash, "fee_charged": fee_charged, "return_value": return_value}
+
+    def _simulate(self, source: str, append_op: Callable[[TransactionBuilder], TransactionBuilder]) -> Dict:
+        """Simulate a one-operation transaction and return its resources and fees."""
+        # Simulation ignores the sequence number, so the account is not loaded
+        builder = TransactionBuilder(Account(source, 0), self.network_passphrase,
+                                     base_fee=self.base_fee).set_timeout(300)
+        simulation = self.server.simulate_transaction(append_op(builder).build())
+        if simulation.error:
+            raise RpcDeployError(f"Simulation failed: {simulation.error}")
+
+        resources = stellar_xdr.SorobanTransactionData.from_xdr(simulation.transaction_data).resources
+        resource_fee = int(simulation.min_resource_fee)
+        return {
+            "cpu_instructions": resources.instructions.uint32,
+            "read_bytes": resources.disk_read_bytes.uint32,
+            "write_bytes": resources.write_bytes.uint32,
+            "resource_fee": resource_fee,
+            "inclusion_fee": self.base_fee,
+            "fee": resource_fee + self.base_fee,
+        }
+
+    def _send(self, transaction) -> str:
+        """Submit a signed transaction, retrying while the RPC asks to try again."""
+        for attempt in range(self.send_retries + 1):
+            response = self.server.send_transaction(transaction)
+            if response.status in (SendTransactionStatus.PENDING, SendTransactionStatus.DUPLICATE):
+                return response.hash
+            if response.status == SendTransactionStatus.ERROR:
+                code = _result_code(response.error_result_xdr)
+                raise RpcDeployError(f"Transaction rejected: {code}", response.hash,
+                                     transient=code in TRANSIENT_RESULT_CODES)
+            time.sleep(self.poll_interval * (attempt + 1))
+        raise RpcDeployError("Transaction not accepted: RPC kept answering TRY_AGAIN_LATER", transient=True)
+
+    def _wait(self, tx_hash: str) -> int:
+        """Poll until a submitted transaction is applied; return the fee charged."""
+        deadline = time.monotonic() + self.timeout
+        while True:
+            response = self.server.get_transaction(tx_hash)
+            if response.status == GetTransactionStatus.SUCCESS:
+                return _fee_charged(response.result_xdr)
+            if response.status == GetTransactionStatus.FAILED:
+                raise RpcDeployError(f"Transaction failed: {_result_code(response.result_xdr)}", tx_hash,
+                                     _fee_charged(response.result_xdr))
+            if time.monotonic() > deadline:
+                raise RpcDeployError(f"Transaction not confirmed after {self.timeout} seconds", tx_hash,
+                                     transient=True)
+            time.sleep(self.poll_interval)
+
+
+def _contract_address(return_value: Optional[stellar_xdr.SCVal]) -> Optional[str]:
+    if return_value is None or return_value.type != stellar_xdr.SCValType.SCV_ADDRESS:
+        return None
+    return Address.from_xdr_sc_address(return_value.address).address
+
+
+def _fee_charged(result_xdr: Optional[str]) -> int:
+    if not result_xdr:
+        return 0
+    return stellar_xdr.TransactionResult.from_xdr(result_xdr).fee_charged.int64
+
+
+def _result_code(result_xdr: Optional[str]) -> str:
+    if not result_xdr:
+        return "unknown error"
+    return stellar_xdr.TransactionResult.from_xdr(result_xdr).result.code.name
+
+
+# Process-wide install index shared by all deployers
+_install_index: Optional[WasmInstallIndex] = None
+_install_index_lock = threading.Lock()
+
+
+def get_wasm_install_index() -> WasmInstallIndex:
+    """Get or create the global WASM install index instance."""
+    global _install_index
+    with _install_index_lock:
+        if _install_index is None:
+            _install_index = WasmInstallIndex()
+        return _install_index
+
+
+# Process-wide fee estimate cache shared by all deployers
+_fee_cache: Optional[FeeEstimateCache] = None
+_fee_cache_lock = threading.Lock()
+
+
+def get_fee_estimate_cache() -> FeeEstimateCache:
+    """Get or create the global fee estimate cache instance."""
+    global _fee_cache
+    with _fee_cache_lock:
+        if _fee_cache is None:
+            _fee_cache = FeeEstimateCache()
+        return _fee_cache
@@ -0,0 +1,612 @@
+#!/usr/bin/env python3
+"""
+Soroban RPC Stand-in
+A local, in-memory imitation of the Soroban JSON-RPC API covering the calls
+ContractDeployer makes (account loading, WASM upload, contract creation and
+ledger entry reads), plus the Horizon account lookup and Friendbot funding
+WalletManager uses, so deploys can be tested and benchmarked offline. The
+matching `stellar` CLI shim lives in stellar_cli_standin.py.
+
+Transactions are parsed and signature-checked with stellar_sdk; effects are
+applied to an in-memory ledger. Resource numbers and fees are deterministic
+functions of the WASM size, not real host metering.
+
+Usage:
+    python soroban_standin.py [--port 8000] [--latency 0.05] [--try-again-rate 0.1] [--error-rate 0.01]
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+from stellar_sdk import Keypair, Network, StrKey, TransactionEnvelope
+from stellar_sdk import xdr as stellar_xdr
+from stellar_sdk.address import Address
+
+
+STANDIN_PASSPHRASE = "Standalone Network ; February 2017"
+DEFAULT_BALANCE = 10_000 * 10_000_000  # stroops
+INCLUSION_FEE = 100
+
+
+def compute_contract_id(deployer: str, salt: bytes, network_passphrase: str) -> str:
+    """Contract address created by `deployer` with `salt`, as the host derives it."""
+    preimage = stellar_xdr.HashIDPreimage(
+        type=stellar_xdr.EnvelopeType.ENVELOPE_TYPE_CONTRACT_ID,
+        contract_id=stellar_xdr.HashIDPreimageContractID(
+            network_id=stellar_xdr.Hash(Network(network_passphrase).network_id()),
+            contract_id_preimage=stellar_xdr.ContractIDPreimage(
+                type=stellar_xdr.ContractIDPreimageType.CONTRACT_ID_PREIMAGE_FROM_ADDRESS,
+                from_address=stellar_xdr.ContractIDPreimageFromAddress(
+                    address=Address(deployer).to_xdr_sc_address(),
+                    salt=stellar_xdr.Uint256(salt),
+                ),
+            ),
+        ),
+    )
+    return StrKey.encode_contract(hashlib.sha256(preimage.to_xdr_bytes()).digest())
+
+
+def _code_key(wasm_hash: bytes) -> stellar_xdr.LedgerKey:
+    return stellar_xdr.LedgerKey(
+        stellar_xdr.LedgerEntryType.CONTRACT_CODE,
+        contract_code=stellar_xdr.LedgerKeyContractCode(hash=stellar_xdr.Hash(wasm_hash)),
+    )
+
+
+def _instance_key(contract_id: str) -> stellar_xdr.LedgerKey:
+    return stellar_xdr.LedgerKey(
+        stellar_xdr.LedgerEntryType.CONTRACT_DATA,
+        contract_data=stellar_xdr.LedgerKeyContractData(
+            contract=Address(contract_id).to_xdr_sc_address(),
+            key=stellar_xdr.SCVal(stellar_xdr.SCValType.SCV_LEDGER_KEY_CONTRACT_INSTANCE),
+            durability=stellar_xdr.ContractDataDurability.PERSISTENT,
+        ),
+    )
+
+
+def _result_xdr(code: stellar_xdr.TransactionResultCode, fee_charged: int = 0,
+                op_success: Optional[bytes] = None) -> str:
+    results = None
+    if code in (stellar_xdr.TransactionResultCode.txSUCCESS, stellar_xdr.TransactionResultCode.txFAILED):
+        host_code = (stellar_xdr.InvokeHostFunctionResultCode.INVOKE_HOST_FUNCTION_SUCCESS if op_success is not None
+                     else stellar_xdr.InvokeHostFunctionResultCode.INVOKE_HOST_FUNCTION_TRAPPED)
+        results = [stellar_xdr.OperationResult(
+            code=stellar_xdr.OperationResultCode.opINNER,
+            tr=stellar_xdr.OperationResultTr(
+                type=stellar_xdr.OperationType.INVOKE_HOST_FUNCTION,
+                invoke_host_function_result=stellar_xdr.InvokeHostFunctionResult(
+                    code=host_code,
+                    success=stellar_xdr.Hash(op_success) if op_success is not None else None,
+                ),
+            ),
+        )]
+    return stellar_xdr.TransactionResult(
+        fee_charged=stellar_xdr.Int64(fee_charged),
+        result=stellar_xdr.TransactionResultResult(code=code, results=results),
+        ext=stellar_xdr.TransactionResultExt(0),
+    ).to_xdr()
+
+
+def _signed_by(envelope: TransactionEnvelope, address: str) -> bool:
+    """True if one of the envelope's signatures is from address."""
+    keypair = Keypair.from_public_key(address)
+    for signature in envelope.signatures:
+        try:
+            keypair.verify(envelope.hash(), signature.signature)
+            return True
+        except Exception:
+            continue
+    return False
+
+
+class RpcError(Exception):
+    """JSON-RPC error returned to the client."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class StandinLedger:
+    """In-memory ledger state and the JSON-RPC methods that act on it."""
+
+    def __init__(self, network_passphrase: str = STANDIN_PASSPHRASE, latency: float = 0.0,
+                 try_again_rate: float = 0.0, pending_polls: int = 1, auto_fund: bool = True,
+                 seed: Optional[int] = None, error_rate: float = 0.0):
+        """
+        Initialize the stand-in ledger.
+
+        Args:
+            network_passphrase: Passphrase transactions must be signed for
+            latency: Seconds added to every RPC call
+            try_again_rate: Probability that sendTransaction answers TRY_AGAIN_LATER
+            pending_polls: getTransaction calls answered NOT_FOUND before a result
+            auto_fund: Create unknown accounts with a default balance when loaded
+            seed: Random seed for failure injection
+            error_rate: Probability that any HTTP request fails with 503
+        """
+        self.network_passphrase = network_passphrase
+        self.latency = latency
+        self.try_again_rate = try_again_rate
+        self.error_rate = error_rate
+        self.pending_polls = pending_polls
+        self.auto_fund = auto_fund
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.sequence = 1000
+        self.started_at = int(time.time())
+        self.accounts: Dict[str, Dict] = {}
+        self.code: Dict[bytes, bytes] = {}
+        self.contracts: Dict[str, bytes] = {}
+        self.transactions: Dict[str, Dict] = {}
+        self.calls: Dict[str, int] = {}
+
+    # -- accounts -----------------------------------------------------------
+
+    def fund(self, address: str, balance: int = DEFAULT_BALANCE) -> Dict:
+        """Create or top up an account (stroops)."""
+        with self._lock:
+            return self._account(address, create=True, balance=balance)
+
+    def _account(self, address: str, create: bool = False, balance: int = DEFAULT_BALANCE) -> Optional[Dict]:
+        account = self.accounts.get(address)
+        if account is not None:
+            if create:
+                account["balance"] += balance
+            return account
+        if not (create or self.auto_fund):
+            return None
+        # Real accounts start at <creation ledger> << 32
+        account = {"balance": balance, "sequence": self.sequence << 32}
+        self.accounts[address] = account
+        return account
+
+    def inject_error(self) -> bool:
+        """Decide whether to fail the current HTTP request (error_rate)."""
+        if not self.error_rate:
+            return False
+        with self._lock:
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.calls["injected_error"] = self.calls.get("injected_error", 0) + 1
+        return failed
+
+    # -- Horizon and Friendbot -------------------------------------------------
+
+    def horizon_account(self, address: str) -> Optional[Dict]:
+        """Horizon /accounts/{id} body, or None if the account does not exist."""
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.calls["horizon_account"] = self.calls.get("horizon_account", 0) + 1
+            account = self.accounts.get(address)
+            if account is None:
+                return None
+            return {
+                "id": address,
+                "account_id": address,
+                "sequence": str(account["sequence"]),
+                "subentry_count": 0,
+                "balances": [{"balance": f"{account['balance'] / 10_000_000:.7f}", "asset_type": "native"}],
+            }
+
+    def friendbot(self, address: str) -> Optional[Dict]:
+        """Create and fund an account like Friendbot; None if it already exists."""
+        if self.latency:
+            time.sleep(self.latency)
+        StrKey.decode_ed25519_public_key(address)
+        with self._lock:
+            self.calls["friendbot"] = self.calls.get("friendbot", 0) + 1
+            if address in self.accounts:
+                return None
+            self._account(address, create=True)
+            self.sequence += 1
+            return {"successful": True, "hash": hashlib.sha256(f"friendbot:{address}".encode()).hexdigest(),
+                    "ledger": self.sequence}
+
+    # -- JSON-RPC dispatch ----------------------------------------------------
+
+    def handle(self, method: str, params: Optional[Dict]) -> Dict:
+        """Run one JSON-RPC method and return its result."""
+        if self.latency:
+            time.sleep(self.latency)
+        handler = getattr(self, f"rpc_{method}", None)
+        if handler is None:
+            raise RpcError(-32601, f"method not found: {method}")
+        with self._lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+            return handler(params or {})
+
+    def _ledger_info(self) -> Dict:
+        return {"latestLedger": self.sequence, "latestLedgerCloseTime": str(int(time.time()))}
+
+    def rpc_getHealth(self, params: Dict) -> Dict:
+        return {"status": "healthy", "latestLedger": self.sequence,
+                "oldestLedger": 1, "ledgerRetentionWindow": 17280}
+
+    def rpc_getNetwork(self, params: Dict) -> Dict:
+        return {"passphrase": self.network_passphrase, "protocolVersion": 22}
+
+    def rpc_getLatestLedger(self, params: Dict) -> Dict:
+        return {"id": hashlib.sha256(str(self.sequence).encode()).hexdigest(),
+                "protocolVersion": 22, "sequence": self.sequence}
+
+    def rpc_getLedgerEntries(self, params: Dict) -> Dict:
+        entries = []
+        for key_xdr in params.get("keys", []):
+            key = stellar_xdr.LedgerKey.from_xdr(key_xdr)
+            data = self._entry_data(key)
+            if data is not None:
+                entries.append({
+                    "key": key_xdr,
+                    "xdr": data.to_xdr(),
+                    "lastModifiedLedgerSeq": self.sequence,
+                    "liveUntilLedgerSeq": self.sequence + 500_000,
+                })
+        return {"entries": entries, "latestLedger": self.sequence}
+
+    def _entry_data(self, key: stellar_xdr.LedgerKey) -> Optional[stellar_xdr.LedgerEntryData]:
+        if key.type == stellar_xdr.LedgerEntryType.ACCOUNT:
+            address = StrKey.encode_ed25519_public_key(key.account.account_id.account_id.ed25519.uint256)
+            account = self._account(address)
+            if account is None:
+                return None
+            return stellar_xdr.LedgerEntryData(
+                type=stellar_xdr.LedgerEntryType.ACCOUNT,
+                account=stellar_xdr.AccountEntry(
+                    account_id=Keypair.from_public_key(address).xdr_account_id(),
+                    balance=stellar_xdr.Int64(account["balance"]),
+                    seq_num=stellar_xdr.SequenceNumber(stellar_xdr.Int64(account["sequence"])),
+                    num_sub_entries=stellar_xdr.Uint32(0),
+                    inflation_dest=None,
+                    flags=stellar_xdr.Uint32(0),
+                    home_domain=stellar_xdr.String32(b""),
+                    thresholds=stellar_xdr.Thresholds(b"\x01\x00\x00\x00"),
+                    signers=[],
+                    ext=stellar_xdr.AccountEntryExt(0),
+                ),
+            )
+
+        if key.type == stellar_xdr.LedgerEntryType.CONTRACT_CODE:
+            wasm_hash = key.contract_code.hash.hash
+            if wasm_hash not in self.code:
+                return None
+            return stellar_xdr.LedgerEntryData(
+                type=stellar_xdr.LedgerEntryType.CONTRACT_CODE,
+                contract_code=stellar_xdr.ContractCodeEntry(
+                    ext=stellar_xdr.ContractCodeEntryExt(0),
+                    hash=stellar_xdr.Hash(wasm_hash),
+                    code=self.code[wasm_hash],
+                ),
+            )
+
+        if (key.type == stellar_xdr.LedgerEntryType.CONTRACT_DATA
+                and key.contract_data.key.type == stellar_xdr.SCValType.SCV_LEDGER_KEY_CONTRACT_INSTANCE):
+            contract_id = Address.from_xdr_sc_address(key.contract_data.contract).address
+            wasm_hash = self.contracts.get(contract_id)
+            if wasm_hash is None:
+                return None
+            return stellar_xdr.LedgerEntryData(
+                type=stellar_xdr.LedgerEntryType.CONTRACT_DATA,
+                contract_data=stellar_xdr.ContractDataEntry(
+                    ext=stellar_xdr.ExtensionPoint(0),
+                    contract=key.contract_data.contract,
+                    key=key.contract_data.key,
+                    durability=stellar_xdr.ContractDataDurability.PERSISTENT,
+                    val=stellar_xdr.SCVal(
+                        stellar_xdr.SCValType.SCV_CONTRACT_INSTANCE,
+                        instance=stellar_xdr.SCContractInstance(
+                            executable=stellar_xdr.ContractExecutable(
+                                stellar_xdr.ContractExecutableType.CONTRACT_EXECUTABLE_WASM,
+                                wasm_hash=stellar_xdr.Hash(wasm_hash),
+                            ),
+                            storage=None,
+                        ),
+                    ),
+                ),
+            )
+        return None
+
+    # -- host function model ------------------------------------------------------
+
+    def _host_function(self, envelope: TransactionEnvelope) -> stellar_xdr.HostFunction:
+        operations = envelope.transaction.operations
+        if len(operations) != 1 or not hasattr(operations[0], "host_function"):
+            raise RpcError(-32602, "stand-in only supports single InvokeHostFunction transactions")
+        return operations[0].host_function
+
+    def _model(self, host_function: stellar_xdr.HostFunction) -> Dict:
+        """Footprint, resources and outcome of a host function, without applying it."""
+        fn_type = stellar_xdr.HostFunctionType
+        if host_function.type == fn_type.HOST_FUNCTION_TYPE_UPLOAD_CONTRACT_WASM:
+            wasm = host_function.wasm
+            wasm_hash = hashlib.sha256(wasm).digest()
+            write_bytes = len(wasm) + 104
+            return {
+                "kind": "upload",
+                "wasm": wasm,
+                "wasm_hash": wasm_hash,
+                "read_only": [],
+                "read_write": [_code_key(wasm_hash)],
+                "instructions": 1_000_000 + 40 * len(wasm),
+                "read_bytes": 0,
+                "write_bytes": write_bytes,
+                "resource_fee": 20_000 + 25 * write_bytes,
+                "return_value": stellar_xdr.SCVal(stellar_xdr.SCValType.SCV_BYTES, bytes=stellar_xdr.SCBytes(wasm_hash)),
+            }
+
+        if host_function.type in (fn_type.HOST_FUNCTION_TYPE_CREATE_CONTRACT,
+                                  fn_type.HOST_FUNCTION_TYPE_CREATE_CONTRACT_V2):
+            args = host_function.create_contract or host_function.create_contract_v2
+            wasm_hash = args.executable.wasm_hash.hash
+            from_address = args.contract_id_preimage.from_address
+            deployer = Address.from_xdr_sc_address(from_address.address).address
+            contract_id = compute_contract_id(deployer, from_address.salt.uint256, self.network_passphrase)
+            wasm_size = len(self.code.get(wasm_hash, b""))
+            return {
+                "kind": "create",
+                "wasm_hash": wasm_hash,
+                "contract_id": contract_id,
+                "error": None if wasm_hash in self.code else
+                "HostError: Error(Storage, MissingValue) contract code not found",
+                "read_only": [_code_key(wasm_hash)],
+                "read_write": [_instance_key(contract_id)],
+                "instructions": 400_000 + 10 * wasm_size,
+                "read_bytes": wasm_size,
+                "write_bytes": 220,
+                "resource_fee": 8_000 + wasm_size // 4,
+                "return_value": stellar_xdr.SCVal(stellar_xdr.SCValType.SCV_ADDRESS,
+                                                  address=Address(contract_id).to_xdr_sc_address()),
+            }
+
+        raise RpcError(-32602, f"stand-in does not support host function {host_function.type}")
+
+    def rpc_simulateTransaction(self, params: Dict) -> Dict:
+        envelope = TransactionEnvelope.from_xdr(params["transaction"], self.network_passphrase)
+        model = self._model(self._host_function(envelope))
+
+        if model.get("error"):
+            return {"error": model["error"], "latestLedger": self.sequence}
+
+        transaction_data = stellar_xdr.SorobanTransactionData(
+            ext=stellar_xdr.SorobanTransactionDataExt(0),
+            resources=stellar_xdr.SorobanResources(
+                footprint=stellar_xdr.LedgerFootprint(read_only=model["read_only"], read_write=model["read_write"]),
+                instructions=stellar_xdr.Uint32(model["instructions"]),
+                disk_read_bytes=stellar_xdr.Uint32(model["read_bytes"]),
+                write_bytes=stellar_xdr.Uint32(model["write_bytes"]),
+            ),
+            resource_fee=stellar_xdr.Int64(model["resource_fee"]),
+        )
+        return {
+            "transactionData": transaction_data.to_xdr(),
+            "minResourceFee": str(model["resource_fee"]),
+            "results": [{"auth": [], "xdr": model["return_value"].to_xdr()}],
+            "cost": {"cpuInsns": str(model["instructions"]), "memBytes": str(2 * model["write_bytes"])},
+            "latestLedger": self.sequence,
+        }
+
+    def rpc_sendTransaction(self, params: Dict) -> Dict:
+        envelope = TransactionEnvelope.from_xdr(params["transaction"], self.network_passphrase)
+        tx = envelope.transaction
+        tx_hash = envelope.hash_hex()
+        source = tx.source.account_id
+        base = {"hash": tx_hash, **self._ledger_info()}
+
+        if tx_hash in self.transactions:
+            return {"status": "DUPLICATE", **base}
+        if self.try_again_rate and self._random.random() < self.try_again_rate:
+            return {"status": "TRY_AGAIN_LATER", **base}
+
+        code = stellar_xdr.TransactionResultCode
+        account = self._account(source)
+        if account is None:
+            return {"status": "ERROR", "errorResultXdr": _result_xdr(code.txNO_ACCOUNT), **base}
+        if not _signed_by(envelope, source):
+            return {"status": "ERROR", "errorResultXdr": _result_xdr(code.txBAD_AUTH), **base}
+        if tx.sequence != account["sequence"] + 1:
+            return {"status": "ERROR", "errorResultXdr": _result_xdr(code.txBAD_SEQ), **base}
+
+        model = self._model(self._host_function(envelope))
+        soroban_data = tx.soroban_data
+        declared_fee = soroban_data.resource_fee.int64 if soroban_data is not None else 0
+        fee_charged = min(tx.fee, INCLUSION_FEE + model["resource_fee"])
+        if soroban_data is None or declared_fee < model["resource_fee"]:
+            return {"status": "ERROR", "errorResultXdr": _result_xdr(code.txSOROBAN_INVALID), **base}
+
+        self.sequence += 1
+        account["sequence"] = tx.sequence
+        account["balance"] -= fee_charged
+
+        if model.get("error"):
+            status, result = "FAILED", _result_xdr(code.txFAILED, fee_charged)
+        else:
+            if model["kind"] == "upload":
+                self.code[model["wasm_hash"]] = model["wasm"]
+            else:
+                self.contracts[model["contract_id"]] = model["wasm_hash"]
+            status = "SUCCESS"
+            result = _result_xdr(code.txSUCCESS, fee_charged,
+                                 hashlib.sha256(model["return_value"].to_xdr_bytes()).digest())
+
+        self.transactions[tx_hash] = {
+            "status": status,
+            "envelopeXdr": params["transaction"],
+            "resultXdr": result,
+            "ledger": self.sequence,
+            "createdAt": str(int(time.time())),
+            "polls_remaining": self.pending_polls,
+        }
+        return {"status": "PENDING", **base}
+
+    def rpc_getTransaction(self, params: Dict) -> Dict:
+        base = {
+            "txHash": params.get("hash", ""),
+            **self._ledger_info(),
+            "oldestLedger": 1,
+            "oldestLedgerCloseTime": str(self.started_at),
+        }
+        record = self.transactions.get(params.get("hash"))
+        if record is None or record["polls_remaining"] > 0:
+            if record is not None:
+                record["polls_remaining"] -= 1
+            return {"status": "NOT_FOUND", **base}
+        return {
+            **base,
+            "status": record["status"],
+            "applicationOrder": 1,
+            "envelopeXdr": record["envelopeXdr"],
+            "resultXdr": record["resultXdr"],
+            "ledger": record["ledger"],
+            "createdAt": record["createdAt"],
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """JSON-RPC over HTTP POST; Horizon accounts and Friendbot over GET."""
+
+    ledger: StandinLedger = None
+
+    def _send_json(self, status: int, body: Dict):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _injected_error(self) -> bool:
+        if not self.ledger.inject_error():
+            return False
+        self._send_json(503, {"status": 503, "title": "Service Unavailable", "detail": "injected failure"})
+        return True
+
+    def do_GET(self):
+        if self._injected_error():
+            return
+        url = urlparse(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        try:
+            if parts == ["friendbot"]:
+                address = parse_qs(url.query).get("addr", [""])[0]
+                result = self.ledger.friendbot(address)
+                if result is None:
+                    self._send_json(400, {"status": 400, "title": "Bad Request",
+                                          "detail": "createAccountAlreadyExist"})
+                else:
+                    self._send_json(200, result)
+                return
+            if len(parts) == 2 and parts[0] == "accounts":
+                account = self.ledger.horizon_account(parts[1])
+                if account is None:
+                    self._send_json(404, {"status": 404, "title": "Resource Missing"})
+                else:
+                    self._send_json(200, account)
+                return
+            if not parts:
+                self._send_json(200, {"network_passphrase": self.ledger.network_passphrase})
+                return
+        except ValueError as e:
+            self._send_json(400, {"status": 400, "title": "Bad Request", "detail": str(e)})
+            return
+        self._send_json(404, {"status": 404, "title": "Resource Missing"})
+
+    def do_POST(self):
+        if self._injected_error():
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        request_id = None
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+            request_id = request.get("id")
+            result = self.ledger.handle(request.get("method", ""), request.get("params"))
+            body = {"jsonrpc": "2.0", "id": request_id, "result": result}
+        except RpcError as e:
+            body = {"jsonrpc": "2.0", "id": request_id, "error": {"code": e.code, "message": e.message}}
+        except Exception as e:
+            body = {"jsonrpc": "2.0", "id": request_id, "error": {"code": -32603, "message": str(e)}}
+        self._send_json(200, body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandinRpcServer:
+    """Serves a StandinLedger (Soroban RPC, Horizon and Friendbot) over HTTP on a background thread."""
+
+    def __init__(self, ledger: Optional[StandinLedger] = None, host: str = "127.0.0.1", port: int = 0):
+        """
+        Initialize the server.
+
+        Args:
+            ledger: Ledger state to serve (a default StandinLedger if not provided)
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+        """
+        self.ledger = ledger or StandinLedger()
+        handler = type("StandinHandler", (_Handler,), {"ledger": self.ledger})
+        self._httpd = ThreadingHTTPServer((host, port), handler)
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def horizon_url(self) -> str:
+        return self.url
+
+    @property
+    def friendbot_url(self) -> str:
+        return f"{self.url}/friendbot"
+
+    def start(self) -> "StandinRpcServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "StandinRpcServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Soroban RPC stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every call")
+    parser.add_argument("--try-again-rate", type=float, default=0.0, help="Share of sends answered TRY_AGAIN_LATER")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of HTTP requests failed with 503")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for failure injection")
+    args = parser.parse_args()
+
+    server = StandinRpcServer(
+        StandinLedger(latency=args.latency, try_again_rate=args.try_again_rate, error_rate=args.error_rate,
+                      seed=args.seed),
+        host=args.host,
+        port=args.port,
+    )
+    print(f"Soroban RPC stand-in listening on {server.url} ({STANDIN_PASSPHRASE})")
+    print(f"Horizon: {server.horizon_url}  Friendbot: {server.friendbot_url}")
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
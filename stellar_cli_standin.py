@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Stellar CLI Stand-in
+A fake `stellar` command covering the subset ContractBuilder and
+ContractDeployer call (`--version`, `contract build`, `contract deploy` and
+`contract info`), for running the generate -> build -> deploy pipeline on a
+machine without the Rust toolchain or network access.
+
+`contract build` writes a small, valid WASM module per crate instead of
+compiling it; its bytes are derived from the crate sources, so unchanged
+sources give identical WASM. `contract deploy` and `contract info` talk to the
+Soroban RPC stand-in (soroban_standin.py) through RpcDeployer.
+
+Behaviour is configured through environment variables:
+    STANDIN_RPC_URL             RPC endpoint used for every network
+    STANDIN_NETWORK_PASSPHRASE  Passphrase used for every network
+    STANDIN_BUILD_SECONDS       Seconds each build takes (default 0)
+    STANDIN_BUILD_FAILURE_RATE  Probability a crate fails to compile (default 0)
+    STANDIN_WASM_SIZE           Approximate WASM size in bytes (default 16384)
+
+A crate containing a file named STANDIN_FAIL always fails to compile.
+
+Usage:
+    install_cli_shim(bin_dir, server.url) then put bin_dir first on PATH, or
+    python stellar_cli_standin.py contract build
+"""
+
+import glob
+import hashlib
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+
+CLI_VERSION = "stellar 22.0.0 (stand-in)"
+DEFAULT_WASM_SIZE = 16384
+DEFAULT_PASSPHRASE = "Standalone Network ; February 2017"
+FAIL_MARKER = "STANDIN_FAIL"
+
+
+def _leb128(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _section(section_id: int, payload: bytes) -> bytes:
+    return bytes([section_id]) + _leb128(len(payload)) + payload
+
+
+def standin_wasm(seed: bytes, size: int = DEFAULT_WASM_SIZE) -> bytes:
+    """
+    A valid WASM module of roughly `size` bytes whose content depends on `seed`
+
+    The module has one memory, one active data segment filled from the seed's
+    digest, and a contractmetav0 custom section so the analyzer and strip step
+    see a Soroban-shaped module.
+    """
+    digest = hashlib.sha256(seed).digest()
+    data_len = max(64, size - 128)
+    data = (digest * (data_len // len(digest) + 1))[:data_len]
+    pages = data_len // 65536 + 1
+
+    memory = _section(5, b"\x01\x00" + _leb128(pages))
+    segment = b"\x00\x41\x00\x0b" + _leb128(len(data)) + data
+    data_section = _section(11, b"\x01" + segment)
+    name = b"contractmetav0"
+    meta = _section(0, _leb128(len(name)) + name + b"standin:" + digest.hex().encode())
+    return b"\0asm\x01\0\0\0" + memory + data_section + meta
+
+
+def _package_name(crate_dir: Path) -> Optional[str]:
+    try:
+        content = (crate_dir / "Cargo.toml").read_text(encoding="utf-8")
+    except OSError:
+        return None
+    match = re.search(r'^\[package\][^\[]*?^name\s*=\s*"([^"]+)"', content, re.MULTILINE | re.DOTALL)
+    return match.group(1).replace("-", "_") if match else None
+
+
+def _workspace_members(root: Path) -> List[Path]:
+    """Member crate dirs of a workspace root, or [root] for a single crate."""
+    content = (root / "Cargo.toml").read_text(encoding="utf-8")
+    if not re.search(r"^\[workspace\]", content, re.MULTILINE):
+        return [root]
+    match = re.search(r"^members\s*=\s*\[([^\]]*)\]", content, re.MULTILINE)
+    patterns = re.findall(r'"([^"]+)"', match.group(1)) if match else []
+    members = []
+    for pattern in patterns:
+        members.extend(Path(p) for p in sorted(glob.glob(str(root / pattern))) if (Path(p) / "Cargo.toml").is_file())
+    return members
+
+
+def _source_digest(crate_dir: Path) -> bytes:
+    digest = hashlib.sha256()
+    for path in sorted(crate_dir.rglob("*")):
+        if path.is_file() and "target" not in path.relative_to(crate_dir).parts:
+            digest.update(str(path.relative_to(crate_dir)).encode())
+            digest.update(path.read_bytes())
+    return digest.digest()
+
+
+def build(cwd: Path) -> int:
+    """`stellar contract build`: write one WASM per crate into the cargo target dir."""
+    if not (cwd / "Cargo.toml").is_file():
+        print(f"error: could not find `Cargo.toml` in `{cwd}`", file=sys.stderr)
+        return 1
+
+    target_dir = Path(os.environ.get("CARGO_TARGET_DIR") or cwd / "target")
+    output_dir = target_dir / "wasm32-unknown-unknown" / "release"
+    build_seconds = float(os.environ.get("STANDIN_BUILD_SECONDS", "0"))
+    failure_rate = float(os.environ.get("STANDIN_BUILD_FAILURE_RATE", "0"))
+    size = int(os.environ.get("STANDIN_WASM_SIZE", DEFAULT_WASM_SIZE))
+
+    for crate_dir in _workspace_members(cwd):
+        name = _package_name(crate_dir)
+        if not name:
+            continue
+        print(f"   Compiling {name} v0.1.0 ({crate_dir})", file=sys.stderr)
+        if build_seconds:
+            time.sleep(build_seconds)
+        if (crate_dir / FAIL_MARKER).exists() or random.random() < failure_rate:
+            print(f"error: could not compile `{name}` (lib) due to 1 previous error", file=sys.stderr)
+            return 101
+        output_dir.mkdir(parents=True, exist_ok=True)
+        wasm = standin_wasm(name.encode() + _source_digest(crate_dir), size)
+        output = output_dir / f"{name}.wasm"
+        # Like cargo, leave an up-to-date output untouched
+        if not output.is_file() or output.read_bytes() != wasm:
+            output.write_bytes(wasm)
+
+    print("    Finished `release` profile [optimized] target(s)", file=sys.stderr)
+    return 0
+
+
+def _option(args: List[str], name: str) -> Optional[str]:
+    if name in args:
+        index = args.index(name)
+        if index + 1 < len(args):
+            return args[index + 1]
+    for arg in args:
+        if arg.startswith(name + "="):
+            return arg.split("=", 1)[1]
+    return None
+
+
+def _rpc(args: List[str], scratch_dir: Path):
+    from soroban_rpc import RpcDeployer, WasmInstallIndex
+
+    rpc_url = _option(args, "--rpc-url") or os.environ.get("STANDIN_RPC_URL")
+    if not rpc_url:
+        raise RuntimeError("no RPC URL: pass --rpc-url or set STANDIN_RPC_URL")
+    passphrase = (_option(args, "--network-passphrase")
+                  or os.environ.get("STANDIN_NETWORK_PASSPHRASE", DEFAULT_PASSPHRASE))
+    # Each invocation is a fresh process, like the real CLI: nothing is remembered between calls
+    index = WasmInstallIndex(scratch_dir / "installs.json")
+    return RpcDeployer(rpc_url, passphrase, install_index=index, poll_interval=0.1)
+
+
+def deploy(args: List[str]) -> int:
+    """`stellar contract deploy --wasm <file> --source <secret> --network <name>`"""
+    from stellar_sdk import Keypair
+
+    wasm_path, source = _option(args, "--wasm"), _option(args, "--source")
+    if not wasm_path or not source:
+        print("error: --wasm and --source are required", file=sys.stderr)
+        return 2
+    try:
+        with tempfile.TemporaryDirectory(prefix="stellar-standin-") as scratch:
+            result = _rpc(args, Path(scratch)).deploy(Keypair.from_secret(source), Path(wasm_path).read_bytes())
+    except Exception as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(result["contract_id"])
+    return 0
+
+
+def info(args: List[str]) -> int:
+    """`stellar contract info --id <contract>`: print the contract's WASM hash."""
+    contract_id = _option(args, "--id")
+    if not contract_id:
+        print("error: --id is required", file=sys.stderr)
+        return 2
+    try:
+        with tempfile.TemporaryDirectory(prefix="stellar-standin-") as scratch:
+            wasm_hash = _rpc(args, Path(scratch)).contract_wasm_hashes([contract_id])[contract_id]
+    except Exception as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    if wasm_hash is None:
+        print(f"error: contract {contract_id} not found", file=sys.stderr)
+        return 1
+    print(f"wasm_hash: {wasm_hash}")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = list(sys.argv[1:] if argv is None else argv)
+    if args[:1] in (["--version"], ["-V"]):
+        print(CLI_VERSION)
+        return 0
+    if args[:2] == ["contract", "build"]:
+        if "--print-commands-only" in args:
+            # There is no cargo command to print; callers fall back to a plain build
+            print("error: --print-commands-only is not supported by the stand-in", file=sys.stderr)
+            return 2
+        return build(Path.cwd())
+    if args[:2] == ["contract", "deploy"]:
+        return deploy(args[2:])
+    if args[:2] == ["contract", "info"]:
+        return info(args[2:])
+    print(f"error: unsupported command: stellar {' '.join(args)}", file=sys.stderr)
+    return 2
+
+
+def install_cli_shim(bin_dir: Path, rpc_url: str, network_passphrase: str = DEFAULT_PASSPHRASE,
+                     build_seconds: float = 0.0, build_failure_rate: float = 0.0,
+                     wasm_size: int = DEFAULT_WASM_SIZE) -> Path:
+    """
+    Write a `stellar` launcher for this stand-in into bin_dir
+
+    Put bin_dir first on PATH to make ContractBuilder and ContractDeployer use
+    it. Settings are baked in as defaults; the STANDIN_* environment still
+    overrides them.
+
+    Returns:
+        Path of the launcher
+    """
+    bin_dir = Path(bin_dir)
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    settings = {
+        "STANDIN_RPC_URL": rpc_url,
+        "STANDIN_NETWORK_PASSPHRASE": network_passphrase,
+        "STANDIN_BUILD_SECONDS": str(build_seconds),
+        "STANDIN_BUILD_FAILURE_RATE": str(build_failure_rate),
+        "STANDIN_WASM_SIZE": str(wasm_size),
+    }
+    script = Path(__file__).resolve()
+
+    if sys.platform == "win32":
+        launcher = bin_dir / "stellar.cmd"
+        lines = ["@echo off"]
+        lines += [f'if not defined {key} set "{key}={value}"' for key, value in settings.items()]
+        lines.append(f'"{sys.executable}" "{script}" %*')
+        launcher.write_text("\r\n".join(lines) + "\r\n", encoding="utf-8")
+    else:
+        launcher = bin_dir / "stellar"
+        lines = ["#!/bin/sh"]
+        lines += [f"{key}=\"${{{key}:-{value}}}\"; export {key}" for key, value in settings.items()]
+        lines.append(f'exec "{sys.executable}" "{script}" "$@"')
+        launcher.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        launcher.chmod(0o755)
+    return launcher
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+Tests for the managed build artifact store.
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_wasm(root, name, size):
+    path = root / name
+    path.write_bytes(b"\0asm" + b"\1" * (size - 4))
+    return path
+
+
+class TestArtifactStore:
+    """Test ArtifactStore."""
+
+    def test_build_and_cache_lookup(self, tmp_path):
+        """Test builds are indexed and cache hits are linked, not copied."""
+        from artifact_store import ArtifactStore
+
+        store = ArtifactStore(store_dir=tmp_path / "store", pinned_paths=lambda: [])
+        cached = store.store("key1", make_wasm(tmp_path, "a.wasm", 100))
+        build = store.add_build("b1", cached["wasm_path"], wasm_name="my_nft.wasm")
+
+        assert build["wasm_path"].endswith(os.path.join("builds", "b1", "my_nft.wasm"))
+        assert store.get_build("b1")["wasm_size"] == 100
+        assert store.lookup("key1")["hits"] == 0
+        assert store.info()["total_bytes"] == 100
+
+    def test_quota_evicts_least_recently_used(self, tmp_path):
+        """Test the oldest unused build is evicted once the quota is exceeded."""
+        from artifact_store import ArtifactStore
+
+        store = ArtifactStore(store_dir=tmp_path / "store", max_bytes=250, pinned_paths=lambda: [])
+        store.add_build("old", make_wasm(tmp_path, "old.wasm", 100))
+        store.add_build("used", make_wasm(tmp_path, "used.wasm", 100))
+        store.get_build("old")
+        store.get_build("used")  # "used" is now the most recently used
+        store.add_build("new", make_wasm(tmp_path, "new.wasm", 100))
+
+        assert store.get_build("old") is None
+        assert store.get_build("used") is not None
+        assert store.get_build("new") is not None
+
+    def test_deployed_wasm_is_pinned(self, tmp_path):
+        """Test WASMs referenced by deployment records survive cleanup."""
+        from artifact_store import ArtifactStore
+
+        deployed = []
+        store = ArtifactStore(store_dir=tmp_path / "store", pinned_paths=lambda: deployed)
+        kept = store.add_build("deployed", make_wasm(tmp_path, "a.wasm", 10))
+        store.add_build("scratch", make_wasm(tmp_path, "b.wasm", 10))
+        deployed.append(kept["wasm_path"])
+
+        result = store.cleanup()
+
+        assert result["evicted_builds"] == ["scratch"]
+        assert store.remove_build("deployed") is False
+        assert [a["pinned"] for a in store.list_artifacts()] == [True]
+
+    def test_pins_read_only_when_evicting(self, tmp_path):
+        """Test deployment records are not consulted while nothing needs evicting."""
+        from artifact_store import ArtifactStore
+
+        lookups = []
+        store = ArtifactStore(store_dir=tmp_path / "store", max_bytes=250,
+                              pinned_paths=lambda: lookups.append(1) or [])
+        store.add_build("b1", make_wasm(tmp_path, "a.wasm", 100))
+        store.store("key1", make_wasm(tmp_path, "b.wasm", 100))
+        assert lookups == []
+
+        store.add_build("b2", make_wasm(tmp_path, "c.wasm", 100))
+        assert lookups == [1]
+        assert store.get_build("b1") is None
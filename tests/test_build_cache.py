@@ -0,0 +1,124 @@
+"""
+Tests for the shared Cargo target cache.
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_contract(root, name, sdk_version="21.0.0"):
+    """Write a minimal contract directory with a Cargo.toml."""
+    path = root / name
+    (path / "src").mkdir(parents=True)
+    (path / "Cargo.toml").write_text(
+        f'[package]\nname = "{name}"\nversion = "0.1.0"\n\n'
+        f'[dependencies]\nsoroban-sdk = "{sdk_version}"\n'
+    )
+    return path
+
+
+def fake_build(target_dir, crate, size):
+    """Simulate the artifacts cargo leaves for one contract crate."""
+    release = target_dir / "wasm32-unknown-unknown" / "release"
+    (release / "deps").mkdir(parents=True, exist_ok=True)
+    (release / f"{crate}.wasm").write_bytes(b"\0" * size)
+    (release / "deps" / f"{crate}-0123abcd.wasm").write_bytes(b"\0" * size)
+
+
+class TestTargetCache:
+    """Test TargetCache."""
+
+    def test_contracts_share_slot_by_sdk_version(self, tmp_path):
+        """Test contracts on the same soroban-sdk reuse one target dir."""
+        from build_cache import TargetCache
+
+        cache = TargetCache(cache_dir=tmp_path / "cache")
+        first = cache.acquire(make_contract(tmp_path, "alpha"))
+        second = cache.acquire(make_contract(tmp_path, "beta"))
+        other = cache.acquire(make_contract(tmp_path, "gamma", sdk_version="22.0.0"))
+
+        assert first == second
+        assert other != first
+        assert first.name == "soroban-sdk-21.0.0"
+
+    def test_lru_crate_eviction(self, tmp_path):
+        """Test the least recently built crate is evicted first."""
+        from build_cache import TargetCache
+
+        cache = TargetCache(cache_dir=tmp_path / "cache", max_bytes=5000)
+
+        for name in ("alpha", "alpha_two", "beta"):
+            target = cache.acquire(make_contract(tmp_path, name))
+            fake_build(target, name, 1000)
+            summary = cache.release(target, keep_crate=name)
+
+        release = target / "wasm32-unknown-unknown" / "release"
+        assert summary["evicted_crates"] == ["soroban-sdk-21.0.0/alpha"]
+        assert not (release / "alpha.wasm").exists()
+        assert not (release / "deps" / "alpha-0123abcd.wasm").exists()
+        # A crate whose name merely starts with the evicted one is kept
+        assert (release / "alpha_two.wasm").exists()
+        assert (release / "beta.wasm").exists()
+
+    def test_clear(self, tmp_path):
+        """Test clear removes idle slots and reports freed bytes."""
+        from build_cache import TargetCache
+
+        cache = TargetCache(cache_dir=tmp_path / "cache")
+        target = cache.acquire(make_contract(tmp_path, "alpha"))
+        fake_build(target, "alpha", 100)
+        cache.release(target)
+
+        result = cache.clear()
+
+        assert result["cleared_slots"] == ["soroban-sdk-21.0.0"]
+        assert result["freed_bytes"] == 200
+        assert cache.info()["slots"] == []
+
+    def test_workspace_crates_are_protected(self, tmp_path):
+        """Test every crate of a workspace build survives the eviction pass."""
+        from build_cache import TargetCache
+
+        cache = TargetCache(cache_dir=tmp_path / "cache", max_bytes=3000)
+        old = cache.acquire(make_contract(tmp_path, "old"))
+        fake_build(old, "old", 1000)
+        cache.release(old, keep_crate="old")
+
+        target = cache.acquire(make_contract(tmp_path, "alpha"), crate_names=["alpha", "beta"])
+        fake_build(target, "alpha", 1000)
+        fake_build(target, "beta", 1000)
+        summary = cache.release(target, keep_crates=["alpha", "beta"])
+
+        assert summary["evicted_crates"] == ["soroban-sdk-21.0.0/old"]
+        assert {c["crate"] for c in cache.crates.all()} == {"alpha", "beta"}
+
+    def test_release_measures_only_the_built_crate(self, tmp_path, monkeypatch):
+        """Test a release under the cap walks the slot once, then tracks crate sizes."""
+        import build_cache
+        from build_cache import TargetCache
+
+        walked = []
+        dir_size = build_cache._dir_size
+        monkeypatch.setattr(build_cache, "_dir_size", lambda path: walked.append(path.name) or dir_size(path))
+        cache = TargetCache(cache_dir=tmp_path / "cache", max_bytes=10000)
+
+        for name in ("alpha", "beta"):
+            target = cache.acquire(make_contract(tmp_path, name))
+            fake_build(target, name, 1000)
+            summary = cache.release(target, keep_crate=name)
+
+        assert walked == ["soroban-sdk-21.0.0"]
+        assert summary["size_before"] == 4000
+        assert {c["crate"]: c["size_bytes"] for c in cache.crates.all()} == {"alpha": 2000, "beta": 2000}
+
+        # Crossing the cap checks the real size first, which includes untracked files
+        (target / "untracked").write_bytes(b"\0" * 500)
+        cache.max_bytes = 3900
+        target = cache.acquire(make_contract(tmp_path, "gamma"))
+        summary = cache.release(target, keep_crate="gamma")
+        assert summary["size_before"] == 4500
+        assert summary["evicted_crates"] == ["soroban-sdk-21.0.0/alpha"]
+        assert summary["size_after"] == 2500
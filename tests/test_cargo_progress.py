@@ -0,0 +1,129 @@
+"""
+Tests for cargo JSON message parsing and streaming subprocess handling.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def artifact(name, kind="lib", filenames=(), package_id=""):
+    return json.dumps({
+        "reason": "compiler-artifact",
+        "package_id": package_id,
+        "target": {"name": name, "kind": [kind]},
+        "fresh": False,
+        "filenames": list(filenames),
+    })
+
+
+class TestCargoProgressParser:
+    """Test CargoProgressParser."""
+
+    def test_tracks_compiled_units(self):
+        """Test artifacts advance progress and compiling lines set the current crate."""
+        from cargo_progress import CargoProgressParser
+
+        parser = CargoProgressParser(total_units=4)
+
+        event = parser.feed_stderr("   Compiling soroban-sdk v21.0.0\n")
+        assert event == {"type": "compiling", "crate": "soroban-sdk", "version": "21.0.0",
+                         "compiled": 0, "total": 4}
+
+        parser.feed_stdout(artifact("build-script-build", "custom-build",
+                                    package_id="registry+https://github.com/rust-lang/crates.io-index#soroban-sdk@21.0.0"))
+        event = parser.feed_stdout(artifact("my_nft", filenames=["/t/release/my_nft.wasm"]))
+
+        assert event["compiled"] == 2
+        assert parser.fraction() == 0.5
+        assert parser.current_crate == "soroban-sdk"
+        assert parser.artifacts["my_nft"] == ["/t/release/my_nft.wasm"]
+        assert "build-script-build" not in parser.artifacts
+        assert parser.feed_stdout("not json\n") is None
+
+    def test_diagnostics_keep_primary_spans(self):
+        """Test compiler errors are reported with their primary span."""
+        from cargo_progress import CargoProgressParser
+
+        parser = CargoProgressParser()
+        line = json.dumps({
+            "reason": "compiler-message",
+            "target": {"name": "my_nft"},
+            "message": {
+                "level": "error",
+                "message": "cannot find value `x` in this scope",
+                "code": {"code": "E0425"},
+                "rendered": "error[E0425]: cannot find value `x` in this scope\n",
+                "spans": [
+                    {"file_name": "src/lib.rs", "line_start": 7, "line_end": 7,
+                     "column_start": 9, "column_end": 10, "is_primary": True, "label": "not found"},
+                    {"file_name": "src/lib.rs", "line_start": 2, "line_end": 2,
+                     "column_start": 1, "column_end": 4, "is_primary": False, "label": None},
+                ],
+            },
+        })
+
+        event = parser.feed_stdout(line)
+
+        assert event["type"] == "diagnostic"
+        assert event["code"] == "E0425"
+        assert event["spans"] == [{"file": "src/lib.rs", "line_start": 7, "line_end": 7,
+                                   "column_start": 9, "column_end": 10, "label": "not found"}]
+        assert parser.error_count == 1
+        assert parser.rendered_diagnostics().startswith("error[E0425]")
+
+    def test_parse_cargo_command_with_env_prefix(self):
+        """Test printed commands are split into environment and arguments."""
+        from cargo_progress import parse_cargo_command
+
+        parsed = parse_cargo_command(
+            "CARGO_BUILD_RUSTFLAGS=--remap-path-prefix=/home/u= cargo rustc "
+            "--manifest-path=Cargo.toml --crate-type=cdylib --target=wasm32-unknown-unknown --release"
+        )
+
+        assert parsed["env"] == {"CARGO_BUILD_RUSTFLAGS": "--remap-path-prefix=/home/u="}
+        assert parsed["args"][:2] == ["cargo", "rustc"]
+        assert parse_cargo_command("ℹ️ Build Summary") is None
+
+
+class TestRunStreaming:
+    """Test run_streaming."""
+
+    def test_lines_arrive_before_exit(self, tmp_path):
+        """Test output is delivered while the process is still running."""
+        from cargo_progress import run_streaming
+
+        seen = []
+        script = "import sys, time; print('first', flush=True); time.sleep(0.5); print('second')"
+
+        result = run_streaming(
+            [sys.executable, "-c", script],
+            cwd=tmp_path,
+            on_stdout=lambda line: seen.append((line.strip(), time.monotonic())),
+        )
+
+        assert result["returncode"] == 0
+        assert [s[0] for s in seen] == ["first", "second"]
+        assert seen[1][1] - seen[0][1] >= 0.3
+
+    def test_cancel_kills_process(self, tmp_path):
+        """Test setting the cancel event stops a long-running process early."""
+        from cargo_progress import run_streaming
+
+        cancel = threading.Event()
+        threading.Timer(0.3, cancel.set).start()
+
+        started = time.monotonic()
+        result = run_streaming(
+            [sys.executable, "-c", "import time; time.sleep(30)"],
+            cwd=tmp_path,
+            cancel_event=cancel,
+        )
+
+        assert result["cancelled"]
+        assert time.monotonic() - started < 10
@@ -0,0 +1,91 @@
+"""
+Tests for concurrent batch deployment against the local stand-in RPC.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WASM_A = b"\0asm\x01\0\0\0" + bytes(range(100))
+WASM_B = b"\0asm\x01\0\0\0" + bytes(range(100, 250))
+
+
+@pytest.fixture
+def make_scheduler(tmp_path, monkeypatch):
+    """Build a scheduler with stub wallets deploying to a stand-in RPC."""
+    from types import SimpleNamespace
+    from stellar_sdk import Keypair
+    import soroban_rpc
+    from deploy_scheduler import BatchDeployScheduler
+    from deployment_manager import DeploymentManager
+    from soroban_standin import StandinLedger, StandinRpcServer
+
+    import deploy_state
+
+    monkeypatch.setattr(soroban_rpc, "_install_index", soroban_rpc.WasmInstallIndex(tmp_path / "installs.json"))
+    monkeypatch.setattr(deploy_state, "_store", deploy_state.DeployStateStore(tmp_path / "state.db"))
+    servers = []
+
+    def make(wallet_count=3, **ledger_options):
+        server = StandinRpcServer(StandinLedger(pending_polls=1, **ledger_options)).start()
+        servers.append(server)
+        keypairs = {kp.public_key: kp for kp in (Keypair.random() for _ in range(wallet_count))}
+        wallets = SimpleNamespace(
+            list_wallets=lambda network=None: [SimpleNamespace(address=a) for a in keypairs],
+            get_wallet=lambda address: SimpleNamespace(address=address, label="", network="testnet"),
+            get_secret_key=lambda address, password=None: keypairs[address].secret,
+        )
+        scheduler = BatchDeployScheduler(network="local", wallet_manager=wallets, rpc_url=server.url,
+                                         deployment_manager=DeploymentManager(tmp_path / "deployments.json"),
+                                         retry_delay=0)
+        scheduler.deployer.get_rpc_deployer().poll_interval = 0.01
+        return scheduler, server
+
+    yield make
+    for server in servers:
+        server.stop()
+
+
+def write_wasm(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+class TestBatchDeployScheduler:
+    """Test BatchDeployScheduler."""
+
+    def test_fans_out_and_uploads_each_wasm_once(self, make_scheduler, tmp_path):
+        """Test every contract deploys, each WASM is uploaded once and records are stored."""
+        scheduler, server = make_scheduler(wallet_count=3)
+        a = write_wasm(tmp_path, "a.wasm", WASM_A)
+        b = write_wasm(tmp_path, "b.wasm", WASM_B)
+        progress = []
+
+        result = scheduler.deploy([a, a, b, a, b, a], progress_callback=lambda done, total, r: progress.append(done))
+
+        assert result["success"], [r["error"] for r in result["results"]]
+        assert [r["index"] for r in result["results"]] == list(range(6))
+        assert len({r["contract_id"] for r in result["results"]}) == 6
+        assert len({r["wallet_address"] for r in result["results"]}) > 1
+        assert server.ledger.calls["sendTransaction"] == 2 + 6
+        assert sorted(progress) == list(range(1, 7))
+        assert result["stored"] == 6
+        assert len(scheduler.deployment_manager.get_deployments()) == 6
+
+    def test_transient_failures_are_retried(self, make_scheduler, tmp_path):
+        """Test TRY_AGAIN_LATER rejections are retried until every contract deploys."""
+        scheduler, server = make_scheduler(wallet_count=2, try_again_rate=0.4, seed=7)
+        scheduler.deployer.get_rpc_deployer().send_retries = 0
+        scheduler.max_retries = 20
+        a = write_wasm(tmp_path, "a.wasm", WASM_A)
+
+        result = scheduler.deploy([a] * 5)
+
+        assert result["success"], [r["error"] for r in result["results"]]
+        assert result["retries"] > 0
+        assert len(server.ledger.contracts) == 5
@@ -0,0 +1,129 @@
+"""
+Tests for durable deployment state tracking and restart reconciliation.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WASM = b"\0asm\x01\0\0\0" + bytes(range(120))
+
+
+@pytest.fixture
+def standin(tmp_path, monkeypatch):
+    """A stand-in RPC server, with the install index kept in tmp_path."""
+    import soroban_rpc
+    from soroban_standin import StandinLedger, StandinRpcServer
+
+    monkeypatch.setattr(soroban_rpc, "_install_index", soroban_rpc.WasmInstallIndex(tmp_path / "installs.json"))
+    with StandinRpcServer(StandinLedger(pending_polls=1)) as server:
+        yield server
+
+
+class TestDeployState:
+    """Test DeployStateStore and reconcile_deployments."""
+
+    def test_stages_survive_deployer_instances(self, standin, tmp_path):
+        """Test stage history and timings are readable from a fresh deployer."""
+        from types import SimpleNamespace
+        from stellar_sdk import Keypair
+        from contract_deployer import ContractDeployer
+        from deploy_state import DeployStateStore
+
+        keypair = Keypair.random()
+        wallets = SimpleNamespace(
+            get_wallet=lambda address: SimpleNamespace(address=address, label="", network="testnet"),
+            get_secret_key=lambda address, password=None: keypair.secret,
+        )
+        wasm_path = tmp_path / "contract.wasm"
+        wasm_path.write_bytes(WASM)
+        store = DeployStateStore(tmp_path / "state.db")
+
+        def deploy():
+            deployer = ContractDeployer(network="local", wallet_manager=wallets, rpc_url=standin.url,
+                                        state_store=store)
+            deployer.get_rpc_deployer().poll_interval = 0.01
+            return deployer.deploy_contract(str(wasm_path), keypair.public_key)
+
+        first, second = deploy(), deploy()
+
+        state = store.get(first["deployment_id"])
+        assert [h["stage"] for h in state["history"]] == ["queued", "uploading", "instantiating", "confirmed"]
+        assert state["contract_id"] == first["contract_id"]
+        assert set(first["stage_timings"]) == {"queued", "uploading", "instantiating", "total"}
+        # Reused WASM skips the upload stage
+        assert [h["stage"] for h in store.get(second["deployment_id"])["history"]] == \
+            ["queued", "instantiating", "confirmed"]
+
+        status = ContractDeployer(network="local", wallet_manager=wallets, state_store=store) \
+            .get_deployment_status(first["deployment_id"])
+        assert status["status"] == "success"
+        assert store.timing_summary()["instantiating"]["count"] == 2
+
+    def test_reconcile_after_restart(self, standin, tmp_path, monkeypatch):
+        """Test an interrupted create is confirmed from the network and a queued one fails."""
+        from stellar_sdk import Keypair
+        import deploy_state
+        from soroban_rpc import RpcDeployer
+        from soroban_standin import STANDIN_PASSPHRASE
+        from deploy_state import DeployStateStore, reconcile_deployments
+        from deployment_manager import DeploymentManager
+
+        store = DeployStateStore(tmp_path / "state.db")
+        manager = DeploymentManager(tmp_path / "deployments.json")
+        # States created by an earlier process
+        with monkeypatch.context() as m:
+            m.setattr(deploy_state, "PROCESS_ID", "earlier-process")
+            for deployment_id in ("sent", "never-sent"):
+                store.create(deployment_id, "local", "GXXX", "/tmp/contract.wasm", "rpc", standin.url,
+                             STANDIN_PASSPHRASE)
+        # A deploy this process is still running
+        store.create("running", "local", "GXXX", "/tmp/contract.wasm", "rpc", standin.url, STANDIN_PASSPHRASE)
+
+        # The create transaction lands, but the process "dies" before the
+        # deployment is marked confirmed
+        rpc = RpcDeployer(standin.url, STANDIN_PASSPHRASE, poll_interval=0.01)
+        result = rpc.deploy(Keypair.random(), WASM,
+                            on_stage=lambda stage, **fields: store.advance("sent", stage, **fields))
+        assert store.get("sent")["stage"] == "instantiating"
+
+        reconciled = reconcile_deployments(store, manager)
+
+        assert {s["deployment_id"]: s["stage"] for s in reconciled} == {"sent": "confirmed", "never-sent": "failed"}
+        assert store.get("sent")["contract_id"] == result["contract_id"]
+        assert manager.get_deployment_by_id("sent")["status"] == "success"
+        assert manager.get_deployment_by_id("never-sent")["status"] == "failed"
+        assert [s["deployment_id"] for s in store.in_flight()] == ["running"]
+        assert manager.get_deployment_by_id("running") is None
+
+    def test_legacy_import_and_prune(self, tmp_path, monkeypatch):
+        """Test states from deploy_state.json are imported once and old finished states are pruned."""
+        import time
+        from tinydb import TinyDB
+        import deploy_state
+        from deploy_state import DeployStateStore
+
+        monkeypatch.setattr(deploy_state, "_get_data_dir", lambda: tmp_path)
+        legacy = TinyDB(str(tmp_path / "deploy_state.json"))
+        legacy.table("states").insert_multiple([
+            {"deployment_id": "old", "stage": "confirmed", "network": "testnet", "history": [],
+             "created_at": "2020-01-01T00:00:00", "updated_at": "2020-01-01T00:00:00"},
+            {"deployment_id": "stuck", "stage": "uploading", "network": "testnet", "history": [],
+             "created_at": "2020-01-01T00:00:00", "updated_at": "2020-01-01T00:00:00"},
+        ])
+        legacy.close()
+
+        store = DeployStateStore()
+        assert store.db_path == tmp_path / "deployments.db"
+        assert (tmp_path / "deploy_state.json.migrated").exists()
+        assert [s["deployment_id"] for s in store.in_flight(interrupted_only=True)] == ["stuck"]
+
+        store.create("new", "testnet", "GXXX", "/tmp/contract.wasm")
+        store.advance("new", "failed", error="boom")
+        assert store.prune() == 1
+        assert sorted(s["deployment_id"] for s in store.list_states()) == ["new", "stuck"]
+        assert [s["deployment_id"] for s in store.list_states(stage="failed", limit=1)] == ["new"]
@@ -0,0 +1,64 @@
+"""
+Tests for streaming deployment export.
+"""
+
+import csv
+import io
+import json
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.test_deployment_manager import make_record
+
+
+class TestDeploymentExport:
+    """Test export formats, filters and time ranges."""
+
+    @pytest.mark.parametrize("filename", ["deployments.db", "deployments.json"])
+    def test_export_formats_with_filters(self, tmp_path, filename):
+        """Test JSON Lines, JSON and CSV exports apply filters and the time range, oldest first."""
+        from deployment_manager import DeploymentManager
+
+        manager = DeploymentManager(tmp_path / filename)
+        manager.store_deployments([make_record(i, extra={"note": i}) for i in range(10)])
+        selection = {"network": "testnet", "since": "2026-01-03", "until": "2026-01-09"}
+        expected = ["dep-3", "dep-5", "dep-7"]
+
+        assert manager.export_deployments_to_file(tmp_path / "out.jsonl", "jsonl", **selection) == 3
+        lines = (tmp_path / "out.jsonl").read_text().splitlines()
+        assert [json.loads(line) for line in lines] == [make_record(i, extra={"note": i}) for i in (3, 5, 7)]
+
+        exported = json.loads(b"".join(manager.stream_export("json", **selection)))
+        assert [r["deployment_id"] for r in exported] == expected
+        assert json.loads(manager.export_deployments(network="nowhere")) == []
+
+        rows = list(csv.DictReader(io.StringIO(manager.export_deployments(format="csv"))))
+        assert len(rows) == 10 and rows[0]["contract_id"] == f"C{0:055d}" and "extra" not in rows[0]
+
+        with pytest.raises(ValueError):
+            manager.stream_export("xml")
+        assert not (tmp_path / "out.xml").exists()
+
+    def test_arrow_export_batches(self, tmp_path, monkeypatch):
+        """Test the Arrow IPC stream is split into record batches with typed columns."""
+        pyarrow = pytest.importorskip("pyarrow")
+        import deployment_export
+        from deployment_manager import DeploymentManager
+
+        monkeypatch.setattr(deployment_export, "ARROW_BATCH_SIZE", 4)
+        manager = DeploymentManager(tmp_path / "deployments.db")
+        manager.store_deployments([make_record(i, exists=i % 2 == 0) for i in range(10)])
+
+        assert manager.export_deployments_to_file(tmp_path / "out.arrow", "arrow") == 10
+        reader = pyarrow.ipc.open_stream((tmp_path / "out.arrow").read_bytes())
+        batches = list(reader)
+        assert [b.num_rows for b in batches] == [4, 4, 2]
+        table = pyarrow.Table.from_batches(batches)
+        assert table.column("wasm_size").to_pylist() == [1000 + i for i in range(10)]
+        assert table.column("exists").to_pylist()[:3] == [True, False, True]
+        assert table.column("verified_at").null_count == 10
@@ -0,0 +1,205 @@
+"""
+Tests for DeploymentManager storage backends.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_record(index: int, **fields) -> dict:
+    record = {
+        "deployment_id": f"dep-{index}",
+        "contract_id": f"C{index:055d}",
+        "network": "testnet" if index % 2 else "mainnet",
+        "wallet_address": f"G{index % 3:055d}",
+        "deployment_wallet": f"Wallet {index % 3}",
+        "transaction_hash": f"{index:064x}",
+        "timestamp": f"2026-01-{index + 1:02d}T00:00:00",
+        "status": "success" if index % 4 else "failed",
+        "wasm_size": 1000 + index,
+    }
+    record.update(fields)
+    return record
+
+
+def page_cursor(manager) -> str:
+    """A valid cursor for an ascending sort by status."""
+    return manager.get_deployments_page(sort_by="status", descending=False, limit=1)["next_cursor"]
+
+
+class TestDeploymentManager:
+    """Test DeploymentManager storage, paging and migration."""
+
+    def test_sqlite_queries_and_updates(self, tmp_path):
+        """Test filtered queries, updates and deletes on the SQLite backend."""
+        from deployment_manager import DeploymentManager
+
+        manager = DeploymentManager(tmp_path / "deployments.db")
+        assert manager.store.backend == "sqlite"
+        assert manager.store_deployments([make_record(i) for i in range(12)]) == 12
+
+        testnet = manager.get_deployments(network="testnet")
+        assert [r["deployment_id"] for r in testnet] == [f"dep-{i}" for i in (11, 9, 7, 5, 3, 1)]
+        assert len(manager.get_deployments(network="all", status="failed")) == 3
+        assert manager.get_deployments(network="testnet", wallet_address=f"G{1:055d}")[0]["deployment_id"] == "dep-7"
+        assert manager.get_deployments_by_contract_id(f"C{5:055d}")[0]["wasm_size"] == 1005
+
+        assert manager.update_deployment_status("dep-5", "failed", "boom")
+        assert manager.get_deployment_by_id("dep-5")["error"] == "boom"
+        assert len(manager.get_deployments(status="failed")) == 4
+
+        assert manager.delete_deployment("dep-5")
+        assert not manager.delete_deployment("dep-5")
+        assert manager.get_deployment_by_id("dep-5") is None
+        assert manager.store.count() == 11
+
+    @pytest.mark.parametrize("filename", ["deployments.db", "deployments.json"])
+    def test_cursor_pagination(self, tmp_path, filename):
+        """Test keyset pages cover every record once, in order, on both backends."""
+        from deployment_manager import DeploymentManager
+
+        manager = DeploymentManager(tmp_path / filename)
+        # Status repeats, so paging by it relies on the insertion-order tie break
+        manager.store_deployments([make_record(i) for i in range(11)])
+
+        pages, cursor = [], None
+        while True:
+            page = manager.get_deployments_page(sort_by="status", descending=False, limit=4, cursor=cursor)
+            assert page["total"] == 11
+            pages.append([r["deployment_id"] for r in page["deployments"]])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert [len(p) for p in pages] == [4, 4, 3]
+        ids = [i for p in pages for i in p]
+        expected = sorted(range(11), key=lambda i: (make_record(i)["status"], i))
+        assert ids == [f"dep-{i}" for i in expected]
+
+        newest = manager.get_deployments(network="testnet", limit=2)
+        assert [r["deployment_id"] for r in newest] == ["dep-9", "dep-7"]
+        with pytest.raises(ValueError):
+            manager.get_deployments_page(sort_by="timestamp", cursor=page_cursor(manager))
+        with pytest.raises(ValueError):
+            manager.get_deployments(sort_by="error")
+
+    def test_default_store_migrates_json_once(self, tmp_path, monkeypatch):
+        """Test the default SQLite store imports an existing deployments.json a single time."""
+        import deployment_manager
+        from deployment_manager import DeploymentManager
+
+        monkeypatch.setattr(deployment_manager, "_get_data_dir", lambda: tmp_path)
+        legacy = DeploymentManager(tmp_path / "deployments.json")
+        legacy.store_deployments([make_record(i) for i in range(3)])
+        legacy.store.close()
+
+        manager = DeploymentManager()
+        assert manager.store.backend == "sqlite"
+        assert [r["deployment_id"] for r in manager.get_deployments()] == ["dep-2", "dep-1", "dep-0"]
+        assert not (tmp_path / "deployments.json").exists()
+        assert (tmp_path / "deployments.json.migrated").exists()
+
+        manager.store_deployment(make_record(3))
+        assert DeploymentManager().store.count() == 4
+
+    @pytest.mark.parametrize("filename", ["deployments.db", "deployments.json"])
+    def test_search_ranking_and_index_updates(self, tmp_path, filename):
+        """Test search ranks exact, prefix then substring matches and follows updates and deletes."""
+        from deployment_manager import DeploymentManager
+
+        manager = DeploymentManager(tmp_path / filename)
+        manager.store_deployments([make_record(i) for i in range(12)])
+        manager.store_deployment(make_record(12, deployment_wallet="Wallet 1 backup"))
+        manager.store_deployment(make_record(13, deployment_wallet="Old wallet 1"))
+
+        ids = [r["deployment_id"] for r in manager.search_deployments("wallet 1")]
+        assert ids == ["dep-10", "dep-7", "dep-4", "dep-1", "dep-12", "dep-13"]
+        assert [r["deployment_id"] for r in manager.search_deployments("WALLET 1", prefix=True, limit=5)] == ids[:5]
+        assert [r["deployment_id"] for r in manager.search_deployments("wallet 1", network="mainnet")] == \
+            ["dep-10", "dep-4", "dep-12"]
+        assert manager.search_deployments("00009") == [make_record(9)]
+        assert manager.search_deployments("allet", prefix=True) == []
+
+        manager.update_deployment_status("dep-3", "failed", "tx_insufficient_fee")
+        assert [r["deployment_id"] for r in manager.search_deployments("insufficient")] == ["dep-3"]
+        manager.delete_deployment("dep-3")
+        assert manager.search_deployments("insufficient") == []
+
+    @pytest.mark.parametrize("filename", ["deployments.db", "deployments.json"])
+    def test_wasm_paths_under_prefix(self, tmp_path, filename):
+        """Test referenced WASM paths are listed once each, limited to a prefix."""
+        from deployment_manager import DeploymentManager
+
+        manager = DeploymentManager(tmp_path / filename)
+        manager.store_deployments([make_record(i, wasm_path=f"/store/builds/b{i % 2}/a.wasm") for i in range(4)])
+        manager.store_deployment(make_record(4, wasm_path="/store2/a.wasm"))
+        manager.store_deployment(make_record(5))
+
+        assert manager.get_wasm_paths("/store/") == ["/store/builds/b0/a.wasm", "/store/builds/b1/a.wasm"]
+        assert len(manager.get_wasm_paths()) == 3
+
+    @pytest.mark.parametrize("filename", ["deployments.db", "deployments.json"])
+    def test_stats_follow_writes(self, tmp_path, filename):
+        """Test maintained statistics match a recount after inserts, updates and deletes."""
+        from deployment_manager import DeploymentManager
+
+        manager = DeploymentManager(tmp_path / filename)
+        manager.store_deployments([make_record(i) for i in range(8)])
+        manager.store_deployment(make_record(8, timestamp="2026-01-01T05:30:00"))
+        manager.update_deployment_status("dep-1", "failed", "boom")
+        manager.delete_deployment("dep-2")
+
+        stats = manager.get_deployment_stats()
+        assert (stats["total"], stats["successful"], stats["failed"]) == (8, 4, 4)
+        assert stats["by_network"] == {"testnet": 4, "mainnet": 4}
+        assert stats["by_wallet"] == {"Wallet 0": 3, "Wallet 1": 3, "Wallet 2": 2}
+        assert manager.get_deployment_stats(network="testnet")["failed"] == 1
+
+        days = manager.get_deployment_timeline("day", limit=2)
+        assert [d["bucket"] for d in days] == ["2026-01-07", "2026-01-08"]
+        first_day = manager.get_deployment_timeline("day", limit=10)[0]
+        assert (first_day["total"], first_day["success_rate"], first_day["avg_wasm_size"]) == (2, 0.0, 1004)
+        assert [h["bucket"] for h in manager.get_deployment_timeline("hour", limit=10)][:2] == \
+            ["2026-01-01T00", "2026-01-01T05"]
+
+        before = (stats, manager.get_deployment_timeline("hour", limit=100))
+        manager.rebuild_stats()
+        assert (manager.get_deployment_stats(), manager.get_deployment_timeline("hour", limit=100)) == before
+        with pytest.raises(ValueError):
+            manager.get_deployment_timeline("week")
+
+    @pytest.mark.parametrize("filename", ["deployments.db", "deployments.json"])
+    def test_change_events(self, tmp_path, filename):
+        """Test writes are published as grouped change events, including writes by another process."""
+        from deployment_manager import DeploymentManager
+
+        manager = DeploymentManager(tmp_path / filename)
+        received = []
+        unsubscribe = manager.subscribe(received.append)
+        start = manager.last_change()
+
+        manager.store_deployments([make_record(i) for i in range(3)])
+        manager.update_deployment_status("dep-1", "failed", "boom")
+        manager.delete_deployment("dep-2")
+        assert [(e["type"], e["deployment_ids"]) for e in received] == \
+            [("insert", ["dep-0", "dep-1", "dep-2"]), ("update", ["dep-1"]), ("delete", ["dep-2"])]
+        assert received[1]["deployments"][0]["error"] == "boom"
+        # Reading the log later gives the same events, with the records as they are now
+        assert [(e["type"], e["seq"]) for e in manager.events_since(start)] == \
+            [(e["type"], e["seq"]) for e in received]
+        assert manager.events_since(received[-1]["seq"]) == []
+
+        unsubscribe()
+        other = DeploymentManager(tmp_path / filename)
+        other.store_deployment(make_record(3))
+        events = manager.events_since(received[-1]["seq"])
+        if manager.store.backend == "sqlite":
+            assert [(e["type"], e["deployment_ids"]) for e in events] == [("insert", ["dep-3"])]
+        else:
+            # Another writer's changes to a JSON file can only be seen as a whole
+            assert [e["type"] for e in events] == ["reload"]
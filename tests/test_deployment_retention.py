@@ -0,0 +1,82 @@
+"""
+Tests for deployment record retention.
+"""
+
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.test_deployment_manager import make_record
+
+
+class TestDeploymentRetention:
+    """Test DeploymentRetention rules, archiving and scheduling."""
+
+    @pytest.mark.parametrize("filename", ["deployments.db", "deployments.json"])
+    def test_rules_archive_and_delete_in_order(self, tmp_path, filename):
+        """Test first-matching rules archive or delete expired records and leave the rest."""
+        from deployment_manager import DeploymentManager
+        from deployment_retention import DeploymentRetention
+
+        manager = DeploymentManager(tmp_path / filename)
+        manager.store_deployments([make_record(i) for i in range(20)])
+        retention = DeploymentRetention(tmp_path, manager=manager)
+        retention.set_policy(rules=[
+            {"network": "mainnet", "status": "success", "days": None},
+            {"network": "mainnet", "status": "*", "days": 10, "action": "delete"},
+            {"network": "testnet", "status": "failed", "days": 7},
+            {"network": "*", "status": "*", "days": 14},
+        ])
+        now = datetime(2026, 1, 21)
+
+        preview = retention.run(dry_run=True, now=now)
+        assert manager.store.count() == 20
+        # mainnet failed (every 4th) older than 10 days: dep-0, 4, 8; no testnet record is failed;
+        # testnet records older than 14 days: dep-1, 3, 5
+        assert [r["matched"] for r in preview["rules"]] == [0, 3, 0, 3]
+        assert (preview["archived"], preview["deleted"]) == (3, 6)
+
+        result = retention.run(now=now)
+        assert result == {**preview, "dry_run": False, "compacted": result["compacted"],
+                          "archive_file": str(tmp_path / "archive" / "deployments-2026-01.jsonl.gz")}
+        remaining = {r["deployment_id"] for r in manager.get_deployments()}
+        assert remaining == {f"dep-{i}" for i in range(20)} - {f"dep-{i}" for i in (0, 4, 8, 1, 3, 5)}
+        assert manager.get_deployment_stats()["total"] == 14
+        assert [r["deployment_id"] for r in retention.iter_archive()] == ["dep-1", "dep-3", "dep-5"]
+
+        # A second run appends a gzip member to the same month's archive
+        manager.store_deployment(make_record(7, deployment_id="dep-old", timestamp="2025-12-01T00:00:00"))
+        assert retention.run(now=now)["archived"] == 1
+        assert [r["deployment_id"] for r in retention.iter_archive()][-1] == "dep-old"
+
+    def test_schedule_and_policy_validation(self, tmp_path):
+        """Test runs are due once per interval and invalid rules are rejected."""
+        from deployment_manager import DeploymentManager
+        from deployment_retention import DeploymentRetention
+
+        manager = DeploymentManager(tmp_path / "deployments.db")
+        manager.store_deployments([make_record(i, timestamp="2025-01-01T00:00:00") for i in range(4)])
+        retention = DeploymentRetention(tmp_path, manager=manager)
+        # Scheduled runs are opt-in
+        assert not retention.due()
+        retention.set_policy(enabled=True)
+        assert retention.due()
+        # The default rules keep successful deployments (dep-2 is on mainnet) and
+        # expire the failed mainnet one after 90 days
+        retention.run(now=datetime(2026, 1, 1, 12))
+        assert [r["deployment_id"] for r in manager.get_deployments()] == ["dep-3", "dep-2", "dep-1"]
+        assert not retention.due(now=datetime(2026, 1, 2, 11))
+        assert retention.due(now=datetime(2026, 1, 2, 12))
+
+        retention.set_policy(enabled=False)
+        assert not retention.due(now=datetime(2026, 2, 1))
+        with pytest.raises(ValueError):
+            retention.set_policy(rules=[{"network": "*", "days": 5, "action": "shred"}])
+        with pytest.raises(ValueError):
+            retention.set_policy(rules=[{"days": -1}])
+        assert DeploymentRetention(tmp_path).get_policy()["enabled"] is False
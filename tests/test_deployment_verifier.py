@@ -0,0 +1,65 @@
+"""
+Tests for bulk on-chain verification of deployment records.
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WASM = b"\0asm\x01\0\0\0" + bytes(range(90))
+
+
+class TestDeploymentVerifier:
+    """Test DeploymentVerifier."""
+
+    def test_verifies_in_batches_and_writes_back(self, tmp_path, monkeypatch):
+        """Test existence and WASM hash checks are stored on each record."""
+        from stellar_sdk import Keypair, StrKey
+        import soroban_rpc
+        from soroban_rpc import RpcDeployer, WasmInstallIndex
+        from soroban_standin import STANDIN_PASSPHRASE, StandinLedger, StandinRpcServer
+        from deployment_manager import DeploymentManager
+        from deployment_verifier import DeploymentVerifier
+
+        monkeypatch.setattr(soroban_rpc, "_install_index", WasmInstallIndex(tmp_path / "installs.json"))
+        manager = DeploymentManager(tmp_path / "deployments.json")
+
+        with StandinRpcServer(StandinLedger(pending_polls=0)) as server:
+            rpc = RpcDeployer(server.url, STANDIN_PASSPHRASE, poll_interval=0.01)
+            keypair = Keypair.random()
+            deployed = [rpc.deploy(keypair, WASM) for _ in range(3)]
+            missing_id = StrKey.encode_contract(bytes(32))
+
+            manager.store_deployments([
+                {"deployment_id": "ok", "contract_id": deployed[0]["contract_id"], "network": "local",
+                 "wasm_hash": deployed[0]["wasm_hash"], "status": "success"},
+                {"deployment_id": "other-wasm", "contract_id": deployed[1]["contract_id"], "network": "local",
+                 "wasm_hash": "00" * 32, "status": "success"},
+                {"deployment_id": "cli", "contract_id": deployed[2]["contract_id"], "network": "local",
+                 "wasm_hash": "", "status": "success"},
+                {"deployment_id": "gone", "contract_id": missing_id, "network": "local",
+                 "wasm_hash": "", "status": "success"},
+                {"deployment_id": "failed", "contract_id": "", "network": "local", "status": "failed"},
+            ])
+            lookups = server.ledger.calls["getLedgerEntries"]
+
+            verifier = DeploymentVerifier(manager, concurrency=2, batch_size=2, rpc_urls={"local": server.url})
+            result = verifier.verify()
+
+            assert server.ledger.calls["getLedgerEntries"] - lookups == 2
+
+        assert (result["verified"], result["exists"], result["missing"], result["wasm_mismatch"]) == (4, 3, 1, 1)
+        assert result["stored"] == 4
+        records = {r["deployment_id"]: r for r in manager.get_deployments()}
+        assert records["ok"]["exists"] is True and records["ok"]["wasm_match"] is True
+        assert records["other-wasm"]["wasm_match"] is False
+        assert records["cli"]["wasm_hash"] == deployed[2]["wasm_hash"]
+        assert records["gone"]["exists"] is False and records["gone"]["verified_at"]
+        assert "verified_at" not in records["failed"]
+
+        with StandinRpcServer(StandinLedger(pending_polls=0)) as server:
+            verifier = DeploymentVerifier(manager, rpc_urls={"local": server.url})
+            result = verifier.verify(deployment_ids=["gone", "failed", "unknown", "gone"])
+        assert [r["deployment_id"] for r in result["results"]] == ["gone"]
@@ -0,0 +1,137 @@
+"""
+Tests for the background job engine.
+"""
+
+import os
+import sys
+import threading
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def wait_for(job, timeout=5.0):
+    """Wait until a job reaches a terminal state."""
+    deadline = time.time() + timeout
+    while not job.is_finished and time.time() < deadline:
+        time.sleep(0.01)
+    return job
+
+
+class TestJobManager:
+    """Test JobManager."""
+
+    def test_submit_returns_immediately_and_succeeds(self):
+        """Test a job runs in the background and stores its result."""
+        from job_manager import JobManager, JobStatus
+
+        manager = JobManager(max_workers=1)
+        release = threading.Event()
+
+        def work(job):
+            job.report_progress("Working...", 50)
+            release.wait(5)
+            return {"value": 42}
+
+        job = manager.submit("build", work)
+        assert job.status in (JobStatus.QUEUED, JobStatus.RUNNING)
+
+        release.set()
+        wait_for(job)
+
+        assert job.status == JobStatus.SUCCEEDED
+        assert job.result == {"value": 42}
+        assert job.progress == 100
+        assert manager.get(job.job_id) is job
+        manager.shutdown()
+
+    def test_failure_records_error(self):
+        """Test exceptions mark the job failed."""
+        from job_manager import JobManager, JobStatus
+
+        manager = JobManager(max_workers=1)
+
+        def work(job):
+            raise RuntimeError("compile exploded")
+
+        job = wait_for(manager.submit("build", work))
+
+        assert job.status == JobStatus.FAILED
+        assert "compile exploded" in job.error
+        manager.shutdown()
+
+    def test_cancel_queued_job(self):
+        """Test a queued job is cancelled without running."""
+        from job_manager import JobManager, JobStatus
+
+        manager = JobManager(max_workers=1)
+        release = threading.Event()
+        ran = []
+
+        blocker = manager.submit("build", lambda job: release.wait(5) and {})
+        queued = manager.submit("build", lambda job: ran.append(True) or {})
+
+        assert manager.cancel(queued.job_id)
+        release.set()
+        wait_for(blocker)
+        wait_for(queued)
+
+        assert queued.status == JobStatus.CANCELLED
+        assert ran == []
+        manager.shutdown()
+
+    def test_cancel_running_job(self):
+        """Test a running job observes its cancel event."""
+        from job_manager import JobManager, JobStatus
+
+        manager = JobManager(max_workers=1)
+        started = threading.Event()
+
+        def work(job):
+            started.set()
+            while True:
+                job.check_cancelled()
+                time.sleep(0.01)
+
+        job = manager.submit("build", work)
+        assert started.wait(5)
+        assert manager.cancel(job.job_id)
+        wait_for(job)
+
+        assert job.status == JobStatus.CANCELLED
+        assert not manager.cancel(job.job_id)
+        manager.shutdown()
+
+    def test_finished_jobs_are_pruned(self):
+        """Test only max_finished_jobs finished jobs are retained."""
+        from job_manager import JobManager
+
+        manager = JobManager(max_workers=1, max_finished_jobs=2)
+
+        for _ in range(4):
+            wait_for(manager.submit("build", lambda job: {}))
+        manager.submit("build", lambda job: {})
+
+        assert len(manager.list_jobs()) <= 3
+        manager.shutdown(wait=True)
+
+    def test_events_are_sequenced(self):
+        """Test progress and status changes are recorded as resumable events."""
+        from job_manager import JobManager
+
+        manager = JobManager(max_workers=1)
+
+        def work(job):
+            job.report_progress("Compiling...", 40)
+            job.emit({"type": "artifact", "crate": "soroban_sdk"})
+            return {}
+
+        job = wait_for(manager.submit("build", work))
+
+        types = [e["type"] for e in job.events]
+        assert types == ["status", "progress", "artifact", "status"]
+        assert [e["seq"] for e in job.events] == [1, 2, 3, 4]
+        assert job.events[-1]["status"] == "succeeded"
+        assert [e["type"] for e in job.events_since(2)] == ["artifact", "status"]
+        manager.shutdown()
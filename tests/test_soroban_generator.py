@@ -0,0 +1,144 @@
+"""
+Tests for Soroban contract generation build profiles and template loading.
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+CONFIG = {"contract_name": "Space Warriors", "symbol": "SWARS", "max_supply": 100}
+
+
+class TestBuildProfiles:
+    """Test build profile selection."""
+
+    def test_default_profile_is_min_size(self):
+        """Test contracts without a build_profile get the size-optimized profile."""
+        from soroban_generator import SorobanGenerator
+
+        cargo = SorobanGenerator().generate(CONFIG)["Cargo.toml"]
+
+        assert 'opt-level = "z"' in cargo
+        assert "lto = true" in cargo
+        assert "codegen-units = 1" in cargo
+        assert "incremental" not in cargo
+
+    def test_fast_compile_profile(self):
+        """Test fast-compile trades size for parallel, incremental codegen."""
+        from soroban_generator import SorobanGenerator
+
+        cargo = SorobanGenerator().generate({**CONFIG, "build_profile": "fast-compile"})["Cargo.toml"]
+
+        assert "opt-level = 1" in cargo
+        assert "lto = false" in cargo
+        assert "codegen-units = 16" in cargo
+        assert 'panic = "abort"' in cargo
+
+    def test_unknown_profile_rejected(self):
+        """Test an unknown build_profile fails validation."""
+        from soroban_generator import SorobanGenerator
+
+        result = SorobanGenerator().validate({**CONFIG, "build_profile": "turbo"})
+
+        assert not result["valid"]
+        assert "Invalid build_profile: turbo" in result["errors"][0]
+
+    def test_workspace_profile_lives_at_root(self, tmp_path):
+        """Test workspace members omit the profile and the root carries it."""
+        from soroban_generator import SorobanGenerator
+
+        result = SorobanGenerator().generate_workspace([CONFIG], tmp_path / "ws", build_profile="balanced")
+
+        member = (result["members"][0]["path"] / "Cargo.toml").read_text()
+        root = (tmp_path / "ws" / "Cargo.toml").read_text()
+        assert "[profile.release]" not in member
+        assert 'lto = "thin"' in root
+        assert '"contracts/space_warriors"' in root
+
+
+class TestTemplateLoading:
+    """Test the shared generator and template compilation."""
+
+    def test_shared_generator(self):
+        """Test the shared generator is created once with templates compiled."""
+        from soroban_generator import get_soroban_generator
+
+        generator = get_soroban_generator()
+        assert get_soroban_generator() is generator
+        assert len(generator.env.cache) >= len(generator.CONTRACT_TEMPLATES)
+
+    def test_auto_reload_picks_up_edited_template(self, tmp_path):
+        """Test a template edited on disk is recompiled on the next render."""
+        import shutil
+        import time
+        from soroban_generator import SorobanGenerator, _get_template_dir
+
+        template_dir = tmp_path / "soroban"
+        shutil.copytree(_get_template_dir(), template_dir)
+        generator = SorobanGenerator(template_dir=template_dir, auto_reload=True, bytecode_cache=False)
+        assert "// edited" not in generator.generate(CONFIG)["src/storage.rs"]
+
+        storage = template_dir / "storage.rs.j2"
+        storage.write_text("// edited\n" + storage.read_text())
+        os.utime(storage, (time.time() + 10, time.time() + 10))
+        assert generator.generate(CONFIG)["src/storage.rs"].startswith("// edited")
+
+    def test_compiled_templates_render_identically(self, tmp_path, monkeypatch):
+        """Test ahead-of-time compiled templates produce the same files."""
+        import soroban_generator
+        from soroban_generator import SorobanGenerator
+
+        expected = SorobanGenerator(bytecode_cache=False).generate(CONFIG)
+
+        compiled = SorobanGenerator(bytecode_cache=False).compile_templates(tmp_path / "compiled")
+        monkeypatch.setattr(soroban_generator, "_get_compiled_template_dir", lambda: compiled)
+        generator = SorobanGenerator(auto_reload=False)
+
+        assert generator.precompiled
+        assert generator.generate(CONFIG) == expected
+
+
+class TestIncrementalWrite:
+    """Test incremental writing of generated files."""
+
+    def test_regenerate_rewrites_only_changed_files(self, tmp_path):
+        """Test unchanged files keep their mtime when a contract is regenerated."""
+        from soroban_generator import SorobanGenerator
+
+        generator = SorobanGenerator()
+        first = generator.generate_and_write(CONFIG, tmp_path / "c")
+        assert sorted(first["manifest"]["changed"]) == sorted(first["files"])
+
+        storage = tmp_path / "c" / "src" / "storage.rs"
+        os.utime(storage, (1, 1))
+
+        second = generator.generate_and_write({**CONFIG, "max_supply": 500}, tmp_path / "c")
+        assert "src/lib.rs" in second["manifest"]["changed"]
+        assert "src/storage.rs" in second["manifest"]["unchanged"]
+        assert storage.stat().st_mtime == 1
+        assert (tmp_path / "c" / "src" / "lib.rs").read_text() == second["files"]["src/lib.rs"]
+        assert not list((tmp_path / "c").rglob("*.tmp"))
+
+
+class TestGenerateBatch:
+    """Test bulk contract generation."""
+
+    def test_batch_reports_every_item(self, tmp_path):
+        """Test valid configs are written and invalid or duplicate ones reported per item."""
+        from soroban_generator import SorobanGenerator
+
+        configs = [{**CONFIG, "contract_name": f"Item {i}"} for i in range(6)]
+        configs.append({**CONFIG, "contract_name": ""})
+        configs.append({**CONFIG, "contract_name": "Item 2"})
+
+        results = list(SorobanGenerator().generate_batch(configs, tmp_path, render_workers=3, io_workers=2))
+
+        assert sorted(r["index"] for r in results) == list(range(8))
+        by_index = {r["index"]: r for r in results}
+        assert [by_index[i]["success"] for i in range(8)] == [True] * 6 + [False, False]
+        assert "Duplicate contract name" in by_index[7]["error"]
+        assert results[0]["index"] == 6
+        assert (tmp_path / "item_5" / "src" / "lib.rs").read_text() == by_index[5]["files"]["src/lib.rs"]
@@ -0,0 +1,145 @@
+"""
+Tests for native Soroban RPC deployment against the local stand-in RPC.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WASM = b"\0asm\x01\0\0\0" + bytes(range(200))
+
+
+@pytest.fixture
+def standin():
+    """A stand-in RPC server on a free local port."""
+    from soroban_standin import StandinLedger, StandinRpcServer
+
+    with StandinRpcServer(StandinLedger(pending_polls=1)) as server:
+        yield server
+
+
+def make_deployer(standin, tmp_path):
+    from soroban_rpc import RpcDeployer, WasmInstallIndex
+    from soroban_standin import STANDIN_PASSPHRASE
+
+    return RpcDeployer(standin.url, STANDIN_PASSPHRASE, install_index=WasmInstallIndex(tmp_path / "installs.json"),
+                       poll_interval=0.01)
+
+
+class TestRpcDeployer:
+    """Test RpcDeployer."""
+
+    def test_wasm_uploaded_once(self, standin, tmp_path):
+        """Test a second deploy of the same WASM only creates a new instance."""
+        from stellar_sdk import Keypair
+
+        deployer = make_deployer(standin, tmp_path)
+        keypair = Keypair.random()
+
+        first = deployer.deploy(keypair, WASM)
+        second = deployer.deploy(keypair, WASM)
+
+        assert first["wasm_reused"] is False
+        assert first["install_transaction_hash"]
+        assert first["fees_paid"] == first["install_fee"] + first["create_fee"] > 0
+        assert second["wasm_reused"] is True
+        assert second["install_fee"] == 0
+        assert first["contract_id"] != second["contract_id"]
+        assert standin.ledger.calls["sendTransaction"] == 3
+        assert set(standin.ledger.contracts) == {first["contract_id"], second["contract_id"]}
+
+    def test_stale_index_entry_reinstalls(self, standin, tmp_path):
+        """Test code missing on chain despite an index entry is uploaded again."""
+        from stellar_sdk import Keypair
+
+        deployer = make_deployer(standin, tmp_path)
+        keypair = Keypair.random()
+        deployer.deploy(keypair, WASM)
+
+        standin.ledger.code.clear()  # e.g. the code entry expired
+        result = deployer.deploy(keypair, WASM)
+
+        assert result["wasm_reused"] is False
+        assert result["contract_id"] in standin.ledger.contracts
+
+    def test_contract_deployer_records_hash_and_fees(self, standin, tmp_path, monkeypatch):
+        """Test ContractDeployer fills transaction_hash and fees_paid in the record."""
+        from types import SimpleNamespace
+        from stellar_sdk import Keypair
+        import soroban_rpc
+        from contract_deployer import ContractDeployer
+
+        monkeypatch.setattr(soroban_rpc, "_install_index", soroban_rpc.WasmInstallIndex(tmp_path / "installs.json"))
+        keypair = Keypair.random()
+        wallet = SimpleNamespace(address=keypair.public_key, label="test", network="testnet")
+        wallets = SimpleNamespace(get_wallet=lambda address: wallet,
+                                  get_secret_key=lambda address, password=None: keypair.secret)
+        wasm_path = tmp_path / "contract.wasm"
+        wasm_path.write_bytes(WASM)
+
+        from deploy_state import DeployStateStore
+
+        deployer = ContractDeployer(network="local", wallet_manager=wallets, rpc_url=standin.url,
+                                    state_store=DeployStateStore(tmp_path / "state.db"))
+        deployer.get_rpc_deployer().poll_interval = 0.01
+        result = deployer.deploy_contract(str(wasm_path), keypair.public_key)
+
+        assert result["success"], result.get("error")
+        record = result["deployment_record"]
+        assert record["contract_id"] == result["contract_id"]
+        assert len(record["transaction_hash"]) == 64
+        assert record["fees_paid"] > 0
+        assert record["wasm_hash"] == soroban_rpc.RpcDeployer.wasm_hash(WASM)
+
+
+class TestFeeEstimation:
+    """Test simulation-based fee estimation."""
+
+    def test_estimate_matches_simulation_and_is_cached(self, standin, tmp_path):
+        """Test upload-only estimates before install, create estimates after, both cached."""
+        from stellar_sdk import Keypair
+        from soroban_rpc import FeeEstimateCache
+
+        deployer = make_deployer(standin, tmp_path)
+        deployer.fee_cache = FeeEstimateCache()
+
+        before = deployer.estimate(WASM)
+        assert before["installed"] is False and before["complete"] is False
+        assert before["install"]["write_bytes"] == len(WASM) + 104
+        assert before["total_fee"] == before["install"]["resource_fee"] + 100
+
+        deployment = deployer.deploy(Keypair.random(), WASM)
+        after = deployer.estimate(WASM)
+        assert after["installed"] is True and after["install"] is None
+        assert after["create"]["read_bytes"] == len(WASM)
+        assert after["create"]["fee"] == deployment["create_fee"]
+
+        simulations = standin.ledger.calls["simulateTransaction"]
+        assert deployer.estimate(WASM)["cached"] is True
+        assert standin.ledger.calls["simulateTransaction"] == simulations
+
+    def test_batch_budget_uploads_each_wasm_once(self, standin, tmp_path, monkeypatch):
+        """Test the batch budget counts one upload per distinct WASM."""
+        import soroban_rpc
+        from contract_deployer import ContractDeployer
+        from types import SimpleNamespace
+
+        monkeypatch.setattr(soroban_rpc, "_fee_cache", soroban_rpc.FeeEstimateCache())
+        monkeypatch.setattr(soroban_rpc, "_install_index", soroban_rpc.WasmInstallIndex(tmp_path / "installs.json"))
+        wasm_path = tmp_path / "contract.wasm"
+        wasm_path.write_bytes(WASM)
+
+        from deploy_state import DeployStateStore
+
+        deployer = ContractDeployer(network="local", wallet_manager=SimpleNamespace(), rpc_url=standin.url,
+                                    state_store=DeployStateStore(tmp_path / "state.db"))
+        result = deployer.estimate_deployment_costs([str(wasm_path)] * 3 + [str(tmp_path / "missing.wasm")])
+
+        estimates = result["estimates"]
+        assert [e["success"] for e in estimates] == [True, True, True, False]
+        assert result["batch_fee_stroops"] == estimates[0]["install"]["fee"]
+        assert standin.ledger.calls["simulateTransaction"] == 1
@@ -0,0 +1,123 @@
+"""
+Tests for the offline `stellar` CLI shim and the stand-in's Horizon/Friendbot endpoints.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def standin():
+    """A stand-in server that only knows Friendbot-funded accounts."""
+    from soroban_standin import StandinLedger, StandinRpcServer
+
+    with StandinRpcServer(StandinLedger(pending_polls=0, auto_fund=False)) as server:
+        yield server
+
+
+class TestStellarCliStandin:
+    """Test the CLI shim and stand-in Horizon."""
+
+    def test_wallet_funded_through_friendbot(self, standin, tmp_path, monkeypatch):
+        """Test WalletManager funds and reads balances through the stand-in."""
+        import wallet_manager
+
+        monkeypatch.setitem(wallet_manager.NETWORKS, "testnet", {
+            **wallet_manager.NETWORKS["testnet"],
+            "horizon_url": standin.horizon_url,
+            "friendbot_url": standin.friendbot_url,
+        })
+        manager = wallet_manager.WalletManager(tmp_path / "wallets.json")
+
+        wallet = manager.create_testnet_wallet(auto_fund=False)
+        assert manager.get_balance(wallet.address)["funded"] is False
+
+        manager.fund_testnet_wallet(wallet.address)
+        balance = manager.get_balance(wallet.address)
+        assert balance["balances"][0]["balance"] == "10000.0000000"
+        with pytest.raises(wallet_manager.NetworkError):
+            manager.fund_testnet_wallet(wallet.address)
+
+    def test_shim_builds_and_deploys(self, standin, tmp_path):
+        """Test the shim writes a valid per-crate WASM and deploys it over the stand-in RPC."""
+        from stellar_sdk import Keypair
+
+        from soroban_standin import STANDIN_PASSPHRASE
+        from stellar_cli_standin import install_cli_shim
+        from wasm_analyzer import analyze_wasm
+
+        shim = install_cli_shim(tmp_path / "bin", standin.url, STANDIN_PASSPHRASE)
+        crate = tmp_path / "counter"
+        (crate / "src").mkdir(parents=True)
+        (crate / "Cargo.toml").write_text('[package]\nname = "my-counter"\nversion = "0.1.0"\n')
+        (crate / "src" / "lib.rs").write_text("#![no_std]\n")
+
+        def stellar(*args):
+            return subprocess.run([str(shim), *args], cwd=crate, capture_output=True, text=True, timeout=60)
+
+        assert stellar("--version").returncode == 0
+        assert stellar("contract", "build", "--print-commands-only").returncode != 0
+        assert stellar("contract", "build").returncode == 0
+        wasm = crate / "target" / "wasm32-unknown-unknown" / "release" / "my_counter.wasm"
+        assert analyze_wasm(wasm)["custom_sections"][0]["name"] == "contractmetav0"
+
+        keypair = Keypair.random()
+        standin.ledger.fund(keypair.public_key)
+        deployed = stellar("contract", "deploy", "--wasm", str(wasm), "--source", keypair.secret,
+                           "--network", "testnet")
+        assert deployed.returncode == 0, deployed.stderr
+        assert deployed.stdout.strip() in standin.ledger.contracts
+
+        (crate / "STANDIN_FAIL").touch()
+        failed = stellar("contract", "build")
+        assert failed.returncode != 0
+        assert "could not compile `my_counter`" in failed.stderr
+
+    def test_workspace_build_uses_up_to_date_wasm(self, standin, tmp_path, monkeypatch):
+        """Test a workspace member cargo leaves untouched still counts as built after a cache miss."""
+        from artifact_store import ArtifactStore
+        from build_cache import TargetCache
+        from contract_builder import ContractBuilder
+        from soroban_standin import STANDIN_PASSPHRASE
+        from stellar_cli_standin import install_cli_shim
+
+        install_cli_shim(tmp_path / "bin", standin.url, STANDIN_PASSPHRASE)
+        monkeypatch.setenv("PATH", str(tmp_path / "bin") + os.pathsep + os.environ.get("PATH", ""))
+        workspace = tmp_path / "workspace"
+        for name in ("alpha", "beta"):
+            (workspace / name / "src").mkdir(parents=True)
+            (workspace / name / "Cargo.toml").write_text(
+                f'[package]\nname = "{name}"\nversion = "0.1.0"\n\n[dependencies]\nsoroban-sdk = "21.0.0"\n')
+            (workspace / name / "src" / "lib.rs").write_text("#![no_std]\n")
+        (workspace / "Cargo.toml").write_text('[workspace]\nmembers = ["alpha", "beta"]\n')
+        members = [workspace / "alpha", workspace / "beta"]
+        target_cache = TargetCache(cache_dir=tmp_path / "targets")
+
+        stores = iter(range(10))
+
+        def build():
+            # A fresh artifact store misses, as after eviction or a toolchain change
+            store = ArtifactStore(store_dir=tmp_path / f"store{next(stores)}", pinned_paths=lambda: [])
+            return ContractBuilder(target_cache=target_cache, artifact_store=store).build_workspace(workspace, members)
+
+        assert build()["success"]
+        # Sources unchanged: the outputs are up to date and not rewritten, so
+        # they predate this build
+        for path in [*workspace.rglob("*.toml"), *workspace.rglob("*.rs")]:
+            os.utime(path, (1000, 1000))
+        for wasm in (tmp_path / "targets").rglob("*.wasm"):
+            os.utime(wasm, (2000, 2000))
+        rebuilt = build()
+        assert rebuilt["success"], rebuilt["results"]
+        assert [r["cache_hit"] for r in rebuilt["results"]] == [False, False]
+
+        (workspace / "beta" / "STANDIN_FAIL").touch()
+        (workspace / "beta" / "src" / "lib.rs").write_text("#![no_std]\n// changed\n")
+        failed = build()
+        assert [r["success"] for r in failed["results"]] == [True, False]
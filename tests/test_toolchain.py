@@ -0,0 +1,77 @@
+"""
+Tests for the cached toolchain registry.
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_tool(bin_dir, name, version):
+    """Write a fake executable that counts its invocations and prints a version."""
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    tool = bin_dir / name
+    counter = bin_dir / f"{name}.calls"
+    tool.write_text(f'#!/bin/sh\necho x >> "{counter}"\necho "{name} {version}"\n')
+    tool.chmod(0o755)
+    return tool, counter
+
+
+def calls(counter):
+    return len(counter.read_text().splitlines()) if counter.exists() else 0
+
+
+class TestToolchainRegistry:
+    """Test ToolchainRegistry."""
+
+    def test_probe_is_cached(self, tmp_path, monkeypatch):
+        """Test repeated checks spawn the CLI only once."""
+        if sys.platform == "win32":
+            return
+        from toolchain import ToolchainRegistry
+
+        _, counter = make_tool(tmp_path / "bin", "stellar", "22.0.0")
+        monkeypatch.setenv("PATH", str(tmp_path / "bin"))
+
+        registry = ToolchainRegistry()
+        for _ in range(3):
+            result = registry.check_stellar_cli()
+            assert result["available"] is True
+            assert result["version"] == "stellar 22.0.0"
+
+        assert calls(counter) == 1
+
+    def test_reprobes_when_binary_or_path_changes(self, tmp_path, monkeypatch):
+        """Test a replaced binary or a new PATH invalidates the cached version."""
+        if sys.platform == "win32":
+            return
+        from toolchain import ToolchainRegistry
+
+        tool, _ = make_tool(tmp_path / "bin", "stellar", "22.0.0")
+        monkeypatch.setenv("PATH", str(tmp_path / "bin"))
+        registry = ToolchainRegistry()
+        assert registry.get("stellar")["version"] == "stellar 22.0.0"
+
+        make_tool(tmp_path / "bin", "stellar", "23.0.0")
+        stat = tool.stat()
+        os.utime(tool, (stat.st_atime, stat.st_mtime + 10))
+        assert registry.get("stellar")["version"] == "stellar 23.0.0"
+
+        other, _ = make_tool(tmp_path / "other", "stellar", "21.0.0")
+        monkeypatch.setenv("PATH", str(tmp_path / "other"))
+        assert registry.get("stellar")["path"] == str(other)
+        assert registry.get("stellar")["version"] == "stellar 21.0.0"
+
+    def test_missing_tool(self, tmp_path, monkeypatch):
+        """Test a missing CLI reports the install hint in the old result shape."""
+        from toolchain import ToolchainRegistry
+
+        monkeypatch.setenv("PATH", str(tmp_path))
+        registry = ToolchainRegistry()
+
+        result = registry.check_stellar_cli()
+        assert result["available"] is False
+        assert "cargo install stellar-cli" in result["error"]
+        assert registry.wasm_targets()["installed"] == []
@@ -0,0 +1,89 @@
+"""
+Tests for the pure-Python WASM analyzer and stripper.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def leb(value):
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def name(text):
+    return leb(len(text)) + text.encode()
+
+
+def section(section_id, body):
+    return bytes([section_id]) + leb(len(body)) + body
+
+
+def custom(section_name, payload):
+    return section(0, name(section_name) + payload)
+
+
+def build_module():
+    """One imported function and two defined ones, the second with a 200 byte body."""
+    types = section(1, leb(1) + b"\x60\x00\x00")
+    imports = section(2, leb(1) + name("x") + name("_") + b"\x00" + leb(0))
+    functions = section(3, leb(2) + leb(0) + leb(0))
+    exports = section(7, leb(2) + name("mint") + b"\x00" + leb(2) + name("memory") + b"\x02" + leb(0))
+    small = b"\x00\x0b"
+    large = b"\x00" + b"\x01" * 198 + b"\x0b"
+    code = section(10, leb(2) + leb(len(small)) + small + leb(len(large)) + large)
+    names = custom("name", b"\x01" + leb(3) + leb(1) + leb(1) + name("init"))
+    return (b"\0asm\x01\0\0\0" + types + imports + functions + exports + code
+            + custom("contractspecv0", b"spec") + names + custom("producers", b"\x00" * 50))
+
+
+class TestWasmAnalyzer:
+    """Test analyze_wasm and strip_custom_sections."""
+
+    def test_report(self):
+        """Test section sizes, exports and largest functions are reported."""
+        from wasm_analyzer import analyze_wasm
+
+        module = build_module()
+        report = analyze_wasm(module)
+
+        assert report["total_size"] == len(module)
+        assert sum(s["size"] for s in report["sections"]) == len(module) - 8
+        assert [s["name"] for s in report["custom_sections"]] == ["contractspecv0", "name", "producers"]
+        assert report["exports"] == [{"name": "mint", "kind": "function"}, {"name": "memory", "kind": "memory"}]
+        assert report["function_count"] == 2
+        # Imported functions shift the index space; names come from "name" and exports
+        assert report["largest_functions"][0] == {"index": 2, "name": "mint", "size": 200}
+        assert report["largest_functions"][1] == {"index": 1, "name": "init", "size": 2}
+
+    def test_strip_keeps_contract_spec(self):
+        """Test stripping drops debug sections but keeps Soroban metadata."""
+        from wasm_analyzer import analyze_wasm, strip_custom_sections
+
+        stripped, removed = strip_custom_sections(build_module())
+
+        assert removed == ["name", "producers"]
+        report = analyze_wasm(stripped)
+        assert [s["name"] for s in report["custom_sections"]] == ["contractspecv0"]
+        assert report["function_count"] == 2
+
+    def test_rejects_non_wasm(self):
+        """Test invalid input raises WasmFormatError."""
+        from wasm_analyzer import analyze_wasm, WasmFormatError
+
+        with pytest.raises(WasmFormatError):
+            analyze_wasm(b"not wasm at all")
+        with pytest.raises(WasmFormatError):
+            analyze_wasm(build_module()[:-10])
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Soroban Toolchain Registry
+Probes the stellar CLI, cargo, rustc and the installed WASM targets once and
+caches the result, so builds and deploys do not spawn `--version` processes
+on every call. A cached probe is redone when PATH changes or the binary it
+resolved to is replaced (different path or modification time).
+"""
+
+import os
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+
+# WASM targets Soroban contracts can be compiled for (wasm32v1-none on newer toolchains)
+WASM_TARGETS = ("wasm32-unknown-unknown", "wasm32v1-none")
+
+INSTALL_HINTS = {
+    "stellar": "Install with: cargo install stellar-cli",
+    "cargo": "Install Rust from https://rustup.rs",
+    "rustc": "Install Rust from https://rustup.rs",
+}
+
+
+class ToolchainRegistry:
+    """Caches version probes of the build toolchain"""
+
+    def __init__(self, probe_timeout: int = 10):
+        """
+        Initialize the registry.
+
+        Args:
+            probe_timeout: Seconds to allow each `--version` probe
+        """
+        self.probe_timeout = probe_timeout
+        self._lock = threading.Lock()
+        self._path_env: Optional[str] = None
+        self._tools: Dict[str, Dict] = {}
+        self._targets: Optional[Dict] = None
+
+    def get(self, tool: str) -> Dict:
+        """
+        Get availability, version and path of a tool
+
+        Args:
+            tool: Command name, e.g. "stellar", "cargo" or "rustc"
+
+        Returns:
+            Dict with available, version, path, and error when unavailable
+        """
+        with self._lock:
+            self._check_path_env()
+            path = shutil.which(tool)
+            fingerprint = (path, _mtime(path))
+
+            cached = self._tools.get(tool)
+            if cached is not None and cached["_fingerprint"] == fingerprint:
+                return _public(cached)
+
+            info = self._probe(tool, path)
+            info["_fingerprint"] = fingerprint
+            self._tools[tool] = info
+            if tool == "rustc":
+                self._targets = None
+            return _public(info)
+
+    def wasm_targets(self) -> Dict:
+        """
+        Report which Soroban WASM targets the active Rust toolchain has installed
+
+        Looks for the target's standard library under `rustc --print sysroot`,
+        which works with and without rustup.
+
+        Returns:
+            Dict with installed (list of target names) and error if rustc is missing
+        """
+        rustc = self.get("rustc")
+        with self._lock:
+            if self._targets is not None:
+                return dict(self._targets)
+
+            if not rustc["available"]:
+                self._targets = {"installed": [], "error": rustc["error"]}
+                return dict(self._targets)
+
+            try:
+                result = subprocess.run(
+                    [rustc["path"], "--print", "sysroot"],
+                    capture_output=True,
+                    text=True,
+                    timeout=self.probe_timeout,
+                    encoding='utf-8',
+                    errors='replace'
+                )
+                sysroot = Path(result.stdout.strip())
+                installed = [t for t in WASM_TARGETS if (sysroot / "lib" / "rustlib" / t).is_dir()]
+                self._targets = {"installed": installed}
+                if not installed:
+                    self._targets["error"] = "No WASM target installed. Run: rustup target add wasm32-unknown-unknown"
+            except (OSError, subprocess.TimeoutExpired) as e:
+                self._targets = {"installed": [], "error": f"Error checking WASM targets: {str(e)}"}
+
+            return dict(self._targets)
+
+    def check_stellar_cli(self, cli_cmd: str = "stellar") -> Dict:
+        """
+        Cached replacement for spawning `stellar --version` per call
+
+        Returns:
+            Dict with availability status and version info
+        """
+        info = self.get(cli_cmd)
+        if info["available"]:
+            return {"available": True, "version": info["version"], "path": info["path"]}
+        return {"available": False, "error": info["error"]}
+
+    def status(self) -> Dict:
+        """All probed tools and WASM targets, for the API status endpoint."""
+        tools = {tool: self.get(tool) for tool in ("stellar", "cargo", "rustc")}
+        return {**tools, "wasm_targets": self.wasm_targets()}
+
+    def invalidate(self):
+        """Forget all cached probes."""
+        with self._lock:
+            self._tools.clear()
+            self._targets = None
+
+    def _check_path_env(self):
+        """Drop every cached probe when PATH changed. Caller holds the lock."""
+        path_env = os.environ.get("PATH", "")
+        if path_env != self._path_env:
+            self._path_env = path_env
+            self._tools.clear()
+            self._targets = None
+
+    def _probe(self, tool: str, path: Optional[str]) -> Dict:
+        """Run `<tool> --version`."""
+        hint = INSTALL_HINTS.get(tool, "")
+        if path is None:
+            return {
+                "available": False,
+                "version": None,
+                "path": None,
+                "error": f"{_label(tool)} not found in PATH. {hint}".strip(),
+            }
+
+        try:
+            result = subprocess.run(
+                [path, "--version"],
+                capture_output=True,
+                text=True,
+                timeout=self.probe_timeout,
+                encoding='utf-8',
+                errors='replace'
+            )
+        except subprocess.TimeoutExpired:
+            return {"available": False, "version": None, "path": path,
+                    "error": f"{_label(tool)} command timed out"}
+        except OSError as e:
+            return {"available": False, "version": None, "path": path,
+                    "error": f"Error checking {_label(tool)}: {str(e)}"}
+
+        if result.returncode != 0:
+            return {"available": False, "version": None, "path": path,
+                    "error": f"{_label(tool)} returned non-zero exit code"}
+
+        return {"available": True, "version": result.stdout.strip(), "path": path, "error": None}
+
+
+def _label(tool: str) -> str:
+    return "Stellar CLI" if tool == "stellar" else tool
+
+
+def _mtime(path: Optional[str]) -> Optional[float]:
+    if path is None:
+        return None
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _public(info: Dict) -> Dict:
+    return {k: v for k, v in info.items() if not k.startswith("_")}
+
+
+# Process-wide registry shared by ContractBuilder and ContractDeployer
+_registry: Optional[ToolchainRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_toolchain_registry() -> ToolchainRegistry:
+    """Get or create the global toolchain registry instance."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ToolchainRegistry()
+        return _registry
@@ -5,30 +5,41 @@ Displays and manages deployment history
 """
 
 from PyQt5.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QTableWidget, QTableWidgetItem,
-    QPushButton, QComboBox, QMessageBox, QHeaderView, QWidget, QMenu
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QTableView, QAbstractItemView,
+    QPushButton, QComboBox, QMessageBox, QHeaderView, QMenu
 )
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QFont, QIcon, QColor, QPalette
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtGui import QFont
 
 import webbrowser
-from deployment_manager import DeploymentManager
+from deployment_manager import get_deployment_manager
+from .deployment_table_model import DeploymentTableModel
 
 
 class DeploymentListDialog(QDialog):
     """Dialog for viewing and managing Soroban deployments"""
+
+    # Most search results shown at once (best matches first)
+    SEARCH_LIMIT = 1000
+    
+    # Deployment change events, delivered on the UI thread
+    deployments_changed = pyqtSignal(dict)
     
     def __init__(self, parent=None, network: str = "testnet"):
         super().__init__(parent)
         self.network = network
-        self.deployment_manager = DeploymentManager()
+        self.deployment_manager = get_deployment_manager()
+        self.model = DeploymentTableModel(self.fetch_page, self)
+        self.showing_search = False
         self.setup_ui()
+        self.model.fetch_failed.connect(lambda error: self.status_label.setText(f"Error loading deployments: {error}"))
+        self.model.rowsInserted.connect(self.update_status_label)
         self.load_deployments()
         
-        # Auto-refresh every 30 seconds
-        self.refresh_timer = QTimer()
-        self.refresh_timer.timeout.connect(self.load_deployments)
-        self.refresh_timer.start(30000)  # 30 seconds
+        # Follow changes made anywhere (this app, the API server, other processes)
+        # instead of polling; events arrive on a worker thread
+        self.deployments_changed.connect(self.on_deployments_changed)
+        self.unsubscribe = self.deployment_manager.subscribe(self.deployments_changed.emit)
     
     def setup_ui(self):
         """Setup the dialog UI"""
@@ -103,27 +114,27 @@ class DeploymentListDialog(QDialog):
         
         layout.addLayout(filter_layout)
         
-        # Deployment Table
-        self.table = QTableWidget()
-        self.table.setColumnCount(7)
-        self.table.setHorizontalHeaderLabels([
-            "Contract ID", "Network", "Wallet", "Date", "Status", "Explorer", "Actions"
-        ])
+        # Deployment Table: rows are fetched a page at a time as the view scrolls,
+        # and clicking a header sorts in the deployment store
+        self.table = QTableView()
+        self.table.setModel(self.model)
         
         # Configure table
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
         self.table.setAlternatingRowColors(True)
+        self.table.horizontalHeader().setSortIndicator(3, Qt.DescendingOrder)  # Newest first
         self.table.setSortingEnabled(True)
+        self.table.clicked.connect(self.on_table_clicked)
+        self.table.doubleClicked.connect(lambda index: self.show_selected_details())
         
-        # Set column widths
+        # Fixed row heights and interactive column widths keep layout independent of row count
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         header = self.table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)  # Contract ID
-        header.setSectionResizeMode(1, QHeaderView.ResizeToContents)  # Network
+        header.setSectionResizeMode(QHeaderView.Interactive)
         header.setSectionResizeMode(2, QHeaderView.Stretch)           # Wallet
-        header.setSectionResizeMode(3, QHeaderView.ResizeToContents)  # Date
-        header.setSectionResizeMode(4, QHeaderView.ResizeToContents)  # Status
-        header.setSectionResizeMode(5, QHeaderView.ResizeToContents)  # Explorer
-        header.setSectionResizeMode(6, QHeaderView.ResizeToContents)  # Actions
+        for column, width in ((0, 140), (1, 90), (3, 150), (4, 110), (5, 80)):
+            header.resizeSection(column, width)
         
         layout.addWidget(self.table)
         
@@ -167,6 +178,28 @@ class DeploymentListDialog(QDialog):
             }
         """)
         
+        small_style = """
+            QPushButton {
+                background-color: %s;
+                color: white;
+                border: none;
+                padding: 8px;
+                border-radius: 4px;
+                font-weight: bold;
+            }
+        """
+        copy_btn = QPushButton("📋 Copy ID")
+        copy_btn.clicked.connect(lambda: self.copy_contract_id((self.selected_deployment() or {}).get("contract_id", "")))
+        copy_btn.setStyleSheet(small_style % "#4CAF50")
+        
+        details_btn = QPushButton("📄 Details")
+        details_btn.clicked.connect(self.show_selected_details)
+        details_btn.setStyleSheet(small_style % "#FF9800")
+        
+        delete_btn = QPushButton("🗑️ Delete")
+        delete_btn.clicked.connect(lambda: self.delete_deployment((self.selected_deployment() or {}).get("deployment_id", "")))
+        delete_btn.setStyleSheet(small_style % "#F44336")
+        
         close_btn = QPushButton("✖ Close")
         close_btn.clicked.connect(self.close)
         close_btn.setStyleSheet("""
@@ -186,6 +219,9 @@ class DeploymentListDialog(QDialog):
         button_layout.addWidget(export_btn)
         button_layout.addWidget(cleanup_btn)
         button_layout.addStretch()
+        button_layout.addWidget(copy_btn)
+        button_layout.addWidget(details_btn)
+        button_layout.addWidget(delete_btn)
         button_layout.addWidget(close_btn)
         layout.addLayout(button_layout)
         
@@ -195,171 +231,102 @@ class DeploymentListDialog(QDialog):
         self.table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.table.customContextMenuRequested.connect(self.show_context_menu)
     
+    def current_filters(self) -> dict:
+        """Network and status filters selected in the combo boxes (None = all)"""
+        network_filter = self.network_filter.currentText().lower()
+        status_filter = self.status_filter.currentText().lower()
+        return {
+            "network": None if network_filter == "all" else network_filter,
+            "status": None if status_filter == "all" else status_filter,
+        }
+    
+    def fetch_page(self, **paging) -> dict:
+        """One page of deployments matching the current filters"""
+        return self.deployment_manager.get_deployments_page(**self.current_filters(), **paging)
+    
     def load_deployments(self):
-        """Load deployment records"""
+        """Load the first page of deployment records"""
         try:
-            network_filter = self.network_filter.currentText().lower()
-            if network_filter == "all":
-                network_filter = None
-            
-            status_filter = self.status_filter.currentText().lower()
-            if status_filter == "all":
-                status_filter = None
-            
-            deployments = self.deployment_manager.get_deployments(
-                network=network_filter, 
-                status=status_filter
-            )
-            
-            self.table.setRowCount(len(deployments))
-            self.status_label.setText(f"Found {len(deployments)} deployments")
-            
-            for row, deployment in enumerate(deployments):
-                self.populate_table_row(row, deployment)
-                
+            self.showing_search = False
+            self.model.set_fetcher(self.fetch_page)
+            self.update_status_label()
         except Exception as e:
             self.status_label.setText(f"Error loading deployments: {e}")
             QMessageBox.critical(self, "Error", f"Failed to load deployments: {str(e)}")
     
-    def populate_table_row(self, row: int, deployment: dict):
-        """Populate a single table row with deployment data"""
-        # Contract ID
-        contract_id = deployment.get("contract_id", "")
-        contract_item = QTableWidgetItem(contract_id[:12] + "..." if len(contract_id) > 15 else contract_id)
-        contract_item.setToolTip(contract_id)
-        contract_item.setData(Qt.UserRole, deployment)  # Store full deployment data
-        self.table.setItem(row, 0, contract_item)
-        
-        # Network with color coding
-        network = deployment.get("network", "unknown")
-        network_item = QTableWidgetItem(network.upper())
-        if network == "mainnet":
-            network_item.setBackground(QColor("#ffebee"))
-            network_item.setToolTip("Mainnet deployment (real XLM)")
-        elif network == "testnet":
-            network_item.setBackground(QColor("#e8f5e8"))
-            network_item.setToolTip("Testnet deployment (test XLM)")
-        else:
-            network_item.setBackground(QColor("#fff3e0"))
-            network_item.setToolTip(f"{network.capitalize()} deployment")
-        self.table.setItem(row, 1, network_item)
-        
-        # Wallet
-        wallet_name = deployment.get("deployment_wallet", "Unknown")
-        wallet_item = QTableWidgetItem(wallet_name)
-        wallet_item.setToolTip(f"Address: {deployment.get('wallet_address', 'N/A')}")
-        self.table.setItem(row, 2, wallet_item)
-        
-        # Date
-        timestamp = deployment.get("timestamp", "")
-        if timestamp:
-            date_str = timestamp[:19].replace("T", " ")
-        else:
-            date_str = "Unknown"
-        date_item = QTableWidgetItem(date_str)
-        self.table.setItem(row, 3, date_item)
-        
-        # Status with icon and color
-        status = deployment.get("status", "unknown")
-        status_item = QTableWidgetItem(status.title())
-        
-        if status == "success":
-            status_item.setText("✅ Success")
-            status_item.setBackground(QColor("#e8f5e8"))
-            status_item.setForeground(QColor("#2e7d32"))
-        elif status == "failed":
-            status_item.setText("❌ Failed")
-            status_item.setBackground(QColor("#ffebee"))
-            status_item.setForeground(QColor("#c62828"))
-        elif status == "pending":
-            status_item.setText("⏳ Pending")
-            status_item.setBackground(QColor("#fff3e0"))
-            status_item.setForeground(QColor("#f57c00"))
+    def matches_filters(self, deployment: dict) -> bool:
+        """Whether a record belongs in the unsearched listing"""
+        return all(value is None or deployment.get(field) == value
+                   for field, value in self.current_filters().items())
+    
+    def on_deployments_changed(self, event: dict):
+        """Patch a deployment change into the table, reloading only when it can't be patched"""
+        try:
+            if event["type"] == "reload":
+                if not self.showing_search:
+                    self.load_deployments()
+                return
+            
+            ids = event["deployment_ids"]
+            if event["type"] == "delete":
+                self.model.remove_ids(ids)
+            elif self.showing_search:
+                # Search results are a fixed set; only refresh the rows shown
+                self.model.replace_records(event.get("deployments", []))
+                return
+            elif "deployments" not in event:
+                self.load_deployments()
+                return
+            elif event["type"] == "insert":
+                added = [d for d in event["deployments"] if self.matches_filters(d)]
+                if (self.model.sort_by, self.model.descending) == ("timestamp", True):
+                    self.model.insert_records(added)
+                elif added:
+                    self.load_deployments()
+                    return
+            else:
+                # Updates that move a record into, out of or within the listing need a reload
+                loaded = {d.get("deployment_id"): d for d in map(self.model.deployment, range(self.model.rowCount()))}
+                sort_by = self.model.sort_by
+                for deployment in event["deployments"]:
+                    current = loaded.get(deployment.get("deployment_id"))
+                    moved = (current.get(sort_by) != deployment.get(sort_by)) if current else True
+                    if self.matches_filters(deployment) != (current is not None) or (current and moved):
+                        self.load_deployments()
+                        return
+                self.model.replace_records(event["deployments"])
+            
+            if not self.showing_search:
+                self.model.total = self.deployment_manager.count_deployments(**self.current_filters())
+                self.update_status_label()
+        except Exception as e:
+            self.status_label.setText(f"Error updating deployments: {e}")
+    
+    def update_status_label(self, *args):
+        """Show how many of the matching deployments are loaded"""
+        loaded, total = self.model.rowCount(), self.model.total
+        if loaded < total:
+            self.status_label.setText(f"Found {total} deployments (showing {loaded}, scroll for more)")
         else:
-            status_item.setText("❓ Error")
-            status_item.setBackground(QColor("#fce4ec"))
-            status_item.setForeground(QColor("#ad1457"))
-        
-        self.table.setItem(row, 4, status_item)
-        
-        # Explorer Link
-        if deployment.get("stellar_expert_url"):
-            explorer_btn = QPushButton("🔗 View")
-            explorer_btn.clicked.connect(lambda checked, url=deployment["stellar_expert_url"]: self.open_explorer(url))
-            explorer_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #2196F3;
-                    color: white;
-                    border: none;
-                    padding: 4px;
-                    border-radius: 3px;
-                    font-size: 9px;
-                }
-                QPushButton:hover {
-                    background-color: #1976D2;
-                }
-            """)
-            self.table.setCellWidget(row, 5, explorer_btn)
-        
-        # Actions
-        actions_widget = QWidget()
-        actions_layout = QHBoxLayout()
-        actions_layout.setContentsMargins(2, 2, 2, 2)
-        
-        copy_btn = QPushButton("📋 ID")
-        copy_btn.clicked.connect(lambda checked, cid=deployment.get("contract_id", ""): self.copy_contract_id(cid))
-        copy_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #4CAF50;
-                color: white;
-                border: none;
-                padding: 4px;
-                border-radius: 3px;
-                font-size: 9px;
-            }
-            QPushButton:hover {
-                background-color: #45a049;
-            }
-        """)
-        
-        details_btn = QPushButton("📄 Details")
-        details_btn.clicked.connect(lambda checked, d=deployment: self.show_deployment_details(d))
-        details_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #FF9800;
-                color: white;
-                border: none;
-                padding: 4px;
-                border-radius: 3px;
-                font-size: 9px;
-            }
-            QPushButton:hover {
-                background-color: #F57C00;
-            }
-        """)
-        
-        delete_btn = QPushButton("🗑️")
-        delete_btn.clicked.connect(lambda checked, did=deployment.get("deployment_id", ""): self.delete_deployment(did))
-        delete_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #F44336;
-                color: white;
-                border: none;
-                padding: 4px;
-                border-radius: 3px;
-                font-size: 9px;
-            }
-            QPushButton:hover {
-                background-color: #d32f2f;
-            }
-        """)
-        
-        actions_layout.addWidget(copy_btn)
-        actions_layout.addWidget(details_btn)
-        actions_layout.addWidget(delete_btn)
-        actions_widget.setLayout(actions_layout)
-        
-        self.table.setCellWidget(row, 6, actions_widget)
+            self.status_label.setText(f"Found {total} deployments")
+    
+    def selected_deployment(self):
+        """Record of the selected row, or None"""
+        rows = self.table.selectionModel().selectedRows()
+        return self.model.deployment(rows[0].row()) if rows else None
+    
+    def on_table_clicked(self, index):
+        """Open the explorer when its cell is clicked"""
+        if index.column() == DeploymentTableModel.EXPLORER_COLUMN:
+            url = (self.model.deployment(index.row()) or {}).get("stellar_expert_url")
+            if url:
+                self.open_explorer(url)
+    
+    def show_selected_details(self):
+        """Show details of the selected deployment"""
+        deployment = self.selected_deployment()
+        if deployment:
+            self.show_deployment_details(deployment)
     
     def filter_deployments(self):
         """Apply current filters and reload"""
@@ -371,7 +338,7 @@ class DeploymentListDialog(QDialog):
         
         search_term, ok = QInputDialog.getText(
             self, "Search Deployments", 
-            "Enter contract ID, wallet address, or transaction hash:"
+            "Enter contract ID, wallet address or name, transaction hash, or error text:"
         )
         
         if ok and search_term:
@@ -380,16 +347,20 @@ class DeploymentListDialog(QDialog):
                 if network_filter == "all":
                     network_filter = None
                 
-                results = self.deployment_manager.search_deployments(search_term, network_filter)
+                results = self.deployment_manager.search_deployments(search_term, network_filter,
+                                                                     limit=self.SEARCH_LIMIT)
+                
+                def fetch_results(sort_by, descending, limit, cursor):
+                    ordered = sorted(results, key=lambda d: str(d.get(sort_by) or ""), reverse=descending)
+                    return {"deployments": ordered, "next_cursor": None, "total": len(ordered)}
                 
-                if results:
-                    self.table.setRowCount(len(results))
+                self.model.set_fetcher(fetch_results)
+                self.showing_search = True
+                if len(results) == self.SEARCH_LIMIT:
+                    self.status_label.setText(f"Showing the best {len(results)} matches")
+                elif results:
                     self.status_label.setText(f"Found {len(results)} matching deployments")
-                    
-                    for row, deployment in enumerate(results):
-                        self.populate_table_row(row, deployment)
                 else:
-                    self.table.setRowCount(0)
                     self.status_label.setText("No matching deployments found")
                     
             except Exception as e:
@@ -397,11 +368,11 @@ class DeploymentListDialog(QDialog):
     
     def show_context_menu(self, position):
         """Show context menu for table"""
-        item = self.table.itemAt(position)
-        if not item:
+        index = self.table.indexAt(position)
+        if not index.isValid():
             return
         
-        deployment = item.data(Qt.UserRole)
+        deployment = self.model.deployment(index.row())
         if not deployment:
             return
         
@@ -422,7 +393,7 @@ class DeploymentListDialog(QDialog):
         delete_action = menu.addAction("🗑️ Delete Record")
         delete_action.triggered.connect(lambda: self.delete_deployment(deployment.get("deployment_id", "")))
         
-        menu.exec_(self.table.mapToGlobal(position))
+        menu.exec_(self.table.viewport().mapToGlobal(position))
     
     def open_explorer(self, url: str):
         """Open Stellar Expert URL"""
@@ -460,7 +431,6 @@ class DeploymentListDialog(QDialog):
         
         if reply == QMessageBox.Yes:
             if self.deployment_manager.delete_deployment(deployment_id):
-                self.load_deployments()
                 QMessageBox.information(self, "Deleted", "Deployment record deleted successfully")
             else:
                 QMessageBox.warning(self, "Error", "Failed to delete deployment record")
@@ -468,39 +438,36 @@ class DeploymentListDialog(QDialog):
     def export_deployments(self):
         """Export deployments to file"""
         from PyQt5.QtWidgets import QFileDialog, QInputDialog
+        from deployment_export import EXPORT_FORMATS, PYARROW_AVAILABLE
         
         # Ask for export format
-        format_items = ["JSON", "CSV"]
+        formats = {"JSON": "json", "JSON Lines": "jsonl", "CSV": "csv"}
+        if PYARROW_AVAILABLE:
+            formats["Arrow"] = "arrow"
         format_item, ok = QInputDialog.getItem(
-            self, "Export Format", "Select export format:", format_items, 0, False
+            self, "Export Format", "Select export format:", list(formats), 0, False
         )
         
         if not ok or not format_item:
             return
         
         # Ask for file location
-        file_filter = f"{format_item} files (*.{format_item.lower()})"
+        export_format = formats[format_item]
+        extension = EXPORT_FORMATS[export_format][1]
+        file_filter = f"{format_item} files (*.{extension})"
         file_path, _ = QFileDialog.getSaveFileName(
             self, f"Export Deployments ({format_item})", 
-            f"deployments.{format_item.lower()}", 
+            f"deployments.{extension}", 
             file_filter
         )
         
         if file_path:
             try:
-                network_filter = self.network_filter.currentText().lower()
-                if network_filter == "all":
-                    network_filter = None
-                
-                export_data = self.deployment_manager.export_deployments(
-                    network=network_filter, 
-                    format=format_item.lower()
+                count = self.deployment_manager.export_deployments_to_file(
+                    file_path, export_format, **self.current_filters()
                 )
                 
-                with open(file_path, 'w') as f:
-                    f.write(export_data)
-                
-                QMessageBox.information(self, "Export Complete", f"Deployments exported to {file_path}")
+                QMessageBox.information(self, "Export Complete", f"{count} deployments exported to {file_path}")
                 
             except Exception as e:
                 QMessageBox.critical(self, "Export Error", f"Failed to export deployments: {str(e)}")
@@ -518,7 +485,6 @@ class DeploymentListDialog(QDialog):
             deleted_count = self.deployment_manager.cleanup_old_deployments(days)
             
             if deleted_count > 0:
-                self.load_deployments()
                 QMessageBox.information(
                     self, "Cleanup Complete", 
                     f"Deleted {deleted_count} old deployment records"
@@ -529,10 +495,9 @@ class DeploymentListDialog(QDialog):
                     "No old deployment records found to delete"
                 )
     
-    def closeEvent(self, event):
-        """Handle dialog close event"""
-        # Stop refresh timer
-        if hasattr(self, 'refresh_timer'):
-            self.refresh_timer.stop()
-        
-        event.accept()
+    def done(self, result):
+        """Stop following deployment changes however the dialog is dismissed"""
+        # Close, Esc, accept() and reject() all end here; closeEvent alone misses Esc
+        if hasattr(self, 'unsubscribe'):
+            self.unsubscribe()
+        super().done(result)
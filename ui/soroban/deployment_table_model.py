@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Deployment Table Model
+Lazily fetching Qt model for deployment history. Rows are pulled from the
+deployment store one page at a time as the view scrolls, and sorting is done
+by the store, so memory and refresh cost depend on what is on screen rather
+than on the size of the history. Changed records can be patched into the
+loaded rows without refetching.
+"""
+
+from typing import Callable, Dict, List, Optional
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal
+from PyQt5.QtGui import QColor
+
+
+NETWORK_COLORS = {"mainnet": "#ffebee", "testnet": "#e8f5e8"}
+
+STATUS_STYLES = {
+    "success": ("✅ Success", "#e8f5e8", "#2e7d32"),
+    "failed": ("❌ Failed", "#ffebee", "#c62828"),
+    "pending": ("⏳ Pending", "#fff3e0", "#f57c00"),
+}
+UNKNOWN_STATUS_STYLE = ("❓ Error", "#fce4ec", "#ad1457")
+
+
+class DeploymentTableModel(QAbstractTableModel):
+    """Table model over paged deployment records"""
+
+    # (header, record field the column sorts by; None = not sortable)
+    COLUMNS = [
+        ("Contract ID", "contract_id"),
+        ("Network", "network"),
+        ("Wallet", "wallet_address"),
+        ("Date", "timestamp"),
+        ("Status", "status"),
+        ("Explorer", None),
+    ]
+    EXPLORER_COLUMN = 5
+    PAGE_SIZE = 200
+
+    # Emitted with the error message when a page cannot be fetched
+    fetch_failed = pyqtSignal(str)
+
+    def __init__(self, fetch_page: Callable[..., Dict], parent=None):
+        """
+        Initialize the model.
+
+        Args:
+            fetch_page: Called as fetch_page(sort_by=, descending=, limit=, cursor=) and
+                        returning a dict with deployments, next_cursor and total, like
+                        DeploymentManager.get_deployments_page
+            parent: Optional Qt parent
+        """
+        super().__init__(parent)
+        self._fetch_page = fetch_page
+        self._rows: List[Dict] = []
+        self._cursor: Optional[str] = None
+        self._exhausted = True
+        self.total = 0
+        self.sort_by = "timestamp"
+        self.descending = True
+
+    def set_fetcher(self, fetch_page: Callable[..., Dict]):
+        """Show another record source (e.g. search results) from its first page."""
+        self._fetch_page = fetch_page
+        self.reload()
+
+    def reload(self):
+        """Drop loaded rows and fetch the first page again."""
+        self.beginResetModel()
+        self._rows = []
+        self._cursor = None
+        self._exhausted = True
+        self.total = 0
+        try:
+            self._rows = self._next_page()
+        finally:
+            self.endResetModel()
+
+    def _next_page(self) -> List[Dict]:
+        page = self._fetch_page(sort_by=self.sort_by, descending=self.descending, limit=self.PAGE_SIZE,
+                                cursor=self._cursor)
+        self._cursor = page.get("next_cursor")
+        self._exhausted = self._cursor is None
+        if "total" in page:
+            self.total = page["total"]
+        return page["deployments"]
+
+    def remove_ids(self, deployment_ids) -> int:
+        """Remove loaded rows for these deployments; returns how many were loaded."""
+        deployment_ids = set(deployment_ids)
+        removed = 0
+        for row in range(len(self._rows) - 1, -1, -1):
+            if self._rows[row].get("deployment_id") in deployment_ids:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._rows[row]
+                self.endRemoveRows()
+                removed += 1
+        return removed
+
+    def replace_records(self, records: List[Dict]) -> List[Dict]:
+        """Show new versions of loaded records in place; returns the records that weren't loaded."""
+        by_id = {record.get("deployment_id"): record for record in records}
+        for row, current in enumerate(self._rows):
+            record = by_id.pop(current.get("deployment_id"), None)
+            if record is not None:
+                self._rows[row] = record
+                self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.COLUMNS) - 1))
+        return list(by_id.values())
+
+    def insert_records(self, records: List[Dict]):
+        """Add records at the top (for new deployments in a newest-first listing)."""
+        if records:
+            self.beginInsertRows(QModelIndex(), 0, len(records) - 1)
+            self._rows[:0] = records
+            self.endInsertRows()
+
+    def deployment(self, row: int) -> Optional[Dict]:
+        """Full record shown in a row."""
+        return self._rows[row] if 0 <= row < len(self._rows) else None
+
+    # -- QAbstractTableModel --------------------------------------------------
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted:
+            return
+        try:
+            rows = self._next_page()
+        except Exception as e:
+            self._exhausted = True
+            self.fetch_failed.emit(str(e))
+            return
+        if rows:
+            self.beginInsertRows(QModelIndex(), len(self._rows), len(self._rows) + len(rows) - 1)
+            self._rows.extend(rows)
+            self.endInsertRows()
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNS[section][0]
+        return None
+
+    def sort(self, column: int, order=Qt.AscendingOrder):
+        field = self.COLUMNS[column][1]
+        if field is None:
+            return
+        self.sort_by = field
+        self.descending = order == Qt.DescendingOrder
+        try:
+            self.reload()
+        except Exception as e:
+            self.fetch_failed.emit(str(e))
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        deployment = self._rows[index.row()]
+        column = index.column()
+
+        if role == Qt.UserRole:
+            return deployment
+        if column == 0:
+            contract_id = deployment.get("contract_id", "")
+            if role == Qt.DisplayRole:
+                return contract_id[:12] + "..." if len(contract_id) > 15 else contract_id
+            if role == Qt.ToolTipRole:
+                return contract_id
+        elif column == 1:
+            network = deployment.get("network", "unknown")
+            if role == Qt.DisplayRole:
+                return network.upper()
+            if role == Qt.BackgroundRole:
+                return QColor(NETWORK_COLORS.get(network, "#fff3e0"))
+            if role == Qt.ToolTipRole:
+                if network == "mainnet":
+                    return "Mainnet deployment (real XLM)"
+                if network == "testnet":
+                    return "Testnet deployment (test XLM)"
+                return f"{network.capitalize()} deployment"
+        elif column == 2:
+            if role == Qt.DisplayRole:
+                return deployment.get("deployment_wallet", "Unknown")
+            if role == Qt.ToolTipRole:
+                return f"Address: {deployment.get('wallet_address', 'N/A')}"
+        elif column == 3:
+            if role == Qt.DisplayRole:
+                timestamp = deployment.get("timestamp", "")
+                return timestamp[:19].replace("T", " ") if timestamp else "Unknown"
+        elif column == 4:
+            text, background, foreground = STATUS_STYLES.get(deployment.get("status", "unknown"),
+                                                             UNKNOWN_STATUS_STYLE)
+            if role == Qt.DisplayRole:
+                return text
+            if role == Qt.BackgroundRole:
+                return QColor(background)
+            if role == Qt.ForegroundRole:
+                return QColor(foreground)
+        elif column == self.EXPLORER_COLUMN:
+            if deployment.get("stellar_expert_url"):
+                if role == Qt.DisplayRole:
+                    return "🔗 View"
+                if role == Qt.ForegroundRole:
+                    return QColor("#1976D2")
+                if role == Qt.ToolTipRole:
+                    return deployment["stellar_expert_url"]
+        return None
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+WASM Module Analyzer
+Pure-Python reader for compiled contract WASM: reports section sizes, exports
+and the largest function bodies, and strips custom sections before deploy.
+Parsing slices a memoryview of the module, so no section bytes are copied.
+"""
+
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+
+WASM_MAGIC = b"\0asm"
+WASM_VERSION = b"\x01\0\0\0"
+
+SECTION_NAMES = {
+    0: "custom",
+    1: "type",
+    2: "import",
+    3: "function",
+    4: "table",
+    5: "memory",
+    6: "global",
+    7: "export",
+    8: "start",
+    9: "element",
+    10: "code",
+    11: "data",
+    12: "datacount",
+}
+
+EXPORT_KINDS = {0: "function", 1: "table", 2: "memory", 3: "global"}
+
+# Custom sections the Soroban host and tooling read from a deployed contract:
+# the contract interface spec, contract metadata and the SDK/env version
+SOROBAN_CUSTOM_SECTIONS = ("contractspecv0", "contractmetav0", "contractenvmetav0")
+
+
+class WasmFormatError(Exception):
+    """Raised when the input is not a well-formed WASM module."""
+    pass
+
+
+class _Reader:
+    """Cursor over a memoryview with LEB128 decoding."""
+
+    def __init__(self, view: memoryview, pos: int = 0, end: Optional[int] = None):
+        self.view = view
+        self.pos = pos
+        self.end = len(view) if end is None else end
+
+    def byte(self) -> int:
+        if self.pos >= self.end:
+            raise WasmFormatError("Unexpected end of module")
+        value = self.view[self.pos]
+        self.pos += 1
+        return value
+
+    def u32(self) -> int:
+        result = 0
+        shift = 0
+        while True:
+            byte = self.byte()
+            result |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                return result
+            shift += 7
+            if shift > 35:
+                raise WasmFormatError("LEB128 value too long")
+
+    def bytes(self, length: int) -> memoryview:
+        if self.pos + length > self.end:
+            raise WasmFormatError("Unexpected end of module")
+        chunk = self.view[self.pos:self.pos + length]
+        self.pos += length
+        return chunk
+
+    def name(self) -> str:
+        return bytes(self.bytes(self.u32())).decode("utf-8", errors="replace")
+
+    def limits(self):
+        flags = self.byte()
+        self.u32()
+        if flags & 0x01:
+            self.u32()
+
+
+def _as_view(wasm: Union[bytes, bytearray, memoryview, str, Path]) -> memoryview:
+    """Accept module bytes or a path to a .wasm file."""
+    if isinstance(wasm, (str, Path)):
+        wasm = Path(wasm).read_bytes()
+    view = memoryview(wasm)
+    if bytes(view[:4]) != WASM_MAGIC or bytes(view[4:8]) != WASM_VERSION:
+        raise WasmFormatError("Not a WASM module (bad magic or version)")
+    return view
+
+
+def iter_sections(view: memoryview) -> List[Dict]:
+    """
+    List the sections of a module in file order
+
+    Args:
+        view: Module bytes as a memoryview (see _as_view)
+
+    Returns:
+        Dicts with id, name, custom_name (custom sections only), offset and size.
+        offset is the start of the section header; size counts the whole
+        section including its id byte and length prefix.
+    """
+    reader = _Reader(view, 8)
+    sections = []
+    while reader.pos < reader.end:
+        offset = reader.pos
+        section_id = reader.byte()
+        length = reader.u32()
+        body_start = reader.pos
+        if body_start + length > reader.end:
+            raise WasmFormatError(f"Section {section_id} runs past end of module")
+
+        custom_name = None
+        if section_id == 0:
+            custom_name = _Reader(view, body_start, body_start + length).name()
+
+        sections.append({
+            "id": section_id,
+            "name": SECTION_NAMES.get(section_id, f"unknown_{section_id}"),
+            "custom_name": custom_name,
+            "offset": offset,
+            "body_start": body_start,
+            "size": body_start + length - offset,
+        })
+        reader.pos = body_start + length
+    return sections
+
+
+def _section_reader(view: memoryview, section: Dict) -> _Reader:
+    return _Reader(view, section["body_start"], section["offset"] + section["size"])
+
+
+def _imported_function_count(view: memoryview, section: Dict) -> int:
+    reader = _section_reader(view, section)
+    count = 0
+    for _ in range(reader.u32()):
+        reader.name()
+        reader.name()
+        kind = reader.byte()
+        if kind == 0:
+            reader.u32()
+            count += 1
+        elif kind == 1:
+            reader.byte()
+            reader.limits()
+        elif kind == 2:
+            reader.limits()
+        elif kind == 3:
+            reader.byte()
+            reader.byte()
+        else:
+            raise WasmFormatError(f"Unknown import kind {kind}")
+    return count
+
+
+def _exports(view: memoryview, section: Dict) -> List[Dict]:
+    reader = _section_reader(view, section)
+    exports = []
+    for _ in range(reader.u32()):
+        name = reader.name()
+        kind = reader.byte()
+        index = reader.u32()
+        exports.append({"name": name, "kind": EXPORT_KINDS.get(kind, str(kind)), "index": index})
+    return exports
+
+
+def _function_body_sizes(view: memoryview, section: Dict) -> List[int]:
+    reader = _section_reader(view, section)
+    sizes = []
+    for _ in range(reader.u32()):
+        size = reader.u32()
+        reader.pos += size
+        sizes.append(size)
+    return sizes
+
+
+def _function_names(view: memoryview, section: Dict) -> Dict[int, str]:
+    """Function names from the "name" custom section, if present."""
+    reader = _section_reader(view, section)
+    reader.name()
+    names = {}
+    while reader.pos < reader.end:
+        subsection_id = reader.byte()
+        length = reader.u32()
+        end = reader.pos + length
+        if subsection_id == 1:
+            for _ in range(reader.u32()):
+                index = reader.u32()
+                names[index] = reader.name()
+        reader.pos = end
+    return names
+
+
+def analyze_wasm(wasm: Union[bytes, bytearray, memoryview, str, Path], top_n: int = 10) -> Dict:
+    """
+    Report where the bytes of a WASM module go
+
+    Args:
+        wasm: Module bytes or path to a .wasm file
+        top_n: How many of the largest function bodies to list
+
+    Returns:
+        Dict with total_size, sections (name and size in file order),
+        custom_sections, exports, function_count and largest_functions
+        ({index, name, size}). Functions are named from the "name" section
+        when present, otherwise from exports.
+
+    Raises:
+        WasmFormatError: If the module cannot be parsed
+    """
+    view = _as_view(wasm)
+    sections = iter_sections(view)
+
+    imported = 0
+    exports: List[Dict] = []
+    body_sizes: List[int] = []
+    names: Dict[int, str] = {}
+
+    for section in sections:
+        if section["id"] == 2:
+            imported = _imported_function_count(view, section)
+        elif section["id"] == 7:
+            exports = _exports(view, section)
+        elif section["id"] == 10:
+            body_sizes = _function_body_sizes(view, section)
+        elif section["custom_name"] == "name":
+            try:
+                names = _function_names(view, section)
+            except WasmFormatError:
+                # A malformed debug name section should not break the report
+                names = {}
+
+    for export in exports:
+        if export["kind"] == "function":
+            names.setdefault(export["index"], export["name"])
+
+    functions = [
+        {"index": imported + i, "name": names.get(imported + i), "size": size}
+        for i, size in enumerate(body_sizes)
+    ]
+    functions.sort(key=lambda f: f["size"], reverse=True)
+
+    return {
+        "total_size": len(view),
+        "sections": [
+            {"name": s["custom_name"] if s["id"] == 0 else s["name"], "id": s["id"], "size": s["size"]}
+            for s in sections
+        ],
+        "custom_sections": [
+            {"name": s["custom_name"], "size": s["size"]} for s in sections if s["id"] == 0
+        ],
+        "exports": [{"name": e["name"], "kind": e["kind"]} for e in exports],
+        "function_count": len(body_sizes),
+        "largest_functions": functions[:top_n],
+    }
+
+
+def strip_custom_sections(wasm: Union[bytes, bytearray, memoryview, str, Path],
+                          keep: Iterable[str] = SOROBAN_CUSTOM_SECTIONS) -> Tuple[bytes, List[str]]:
+    """
+    Remove custom sections (names, producers, DWARF debug info, ...)
+
+    The Soroban contract spec and metadata sections are kept by default;
+    removing them would break contract invocation tooling.
+
+    Args:
+        wasm: Module bytes or path to a .wasm file
+        keep: Custom section names to keep
+
+    Returns:
+        Tuple of (stripped module bytes, names of removed sections)
+
+    Raises:
+        WasmFormatError: If the module cannot be parsed
+    """
+    view = _as_view(wasm)
+    keep = set(keep)
+    parts = [view[:8]]
+    removed = []
+
+    for section in iter_sections(view):
+        if section["id"] == 0 and section["custom_name"] not in keep:
+            removed.append(section["custom_name"])
+            continue
+        parts.append(view[section["offset"]:section["offset"] + section["size"]])
+
+    return b"".join(parts), removed
+
+
+if __name__ == "__main__":
+    import json
+
+    if len(sys.argv) < 2:
+        print("Usage: python wasm_analyzer.py <contract.wasm> [--strip <output.wasm>]")
+        sys.exit(1)
+
+    if len(sys.argv) == 4 and sys.argv[2] == "--strip":
+        data, removed_sections = strip_custom_sections(sys.argv[1])
+        Path(sys.argv[3]).write_bytes(data)
+        print(json.dumps({"removed": removed_sections, "size": len(data)}, indent=2))
+    else:
+        print(json.dumps(analyze_wasm(sys.argv[1]), indent=2))